@@ -26,6 +26,70 @@ options:
           The configuration file is optional. If the file path is not provided, the configuration will be loaded from
           environment variables.
       required: false
+    cache_dir:
+      description:
+        - Path to a directory on the Ansible controller where the modules keep state shared across task executions.
+          When provided, the OneView login session is stored in this directory and reused by the subsequent tasks
+          using the same hostname, username, login domain and API version, instead of logging in on every task.
+          When the C(api_version) is not provided, the API version negotiated with the appliance is stored in this
+          directory as well, so the subsequent tasks skip the request that reads the appliance version. The login
+          still validates the version with a request of its own.
+        - The server profile and server profile template modules also keep in this directory the URIs of the
+          resources referenced by name, reused without requests for up to C(name_cache_ttl) seconds. When the
+          appliance does not find a resource referenced by a cached URI, the names are resolved again.
+        - The facts modules keep in this directory the responses received from the appliance, and request them again
+          with their ETag, so that a response not modified since the previous task is read from this directory.
+        - The directory is created when missing. Keep it private, since it holds valid session tokens.
+      required: false
+    session_cache_ttl:
+      description:
+        - Time, in seconds, a cached session is reused since the last task that used it. Only used together with
+          C(cache_dir).
+      default: 1800
+      required: false
+    api_version_cache_ttl:
+      description:
+        - Time, in seconds, a negotiated API version is reused. A cached version refused by the appliance is
+          negotiated again. Only used together with C(cache_dir).
+      default: 3600
+      required: false
+    name_cache_ttl:
+      description:
+        - Time, in seconds, the URI of a resource referenced by name is reused. Only used together with
+          C(cache_dir).
+      default: 3600
+      required: false
+    prefetch:
+      description:
+        - When enabled, the collection of the managed resource type is loaded once, page by page, and the resource
+          is looked up by name or URI in memory instead of querying the appliance. Together with C(cache_dir), the
+          loaded collection is reused by the following tasks and kept up to date with the changes done by the
+          modules. Only used by the modules looking up the resource through the generic implementation.
+        - A cached collection is only used to find the resource. The resource found is read again by URI before it
+          is compared or updated, and a resource missing from the collection is looked up in the appliance, so the
+          changes made outside the modules are seen.
+      type: bool
+      default: false
+      required: false
+    prefetch_ttl:
+      description:
+        - Time, in seconds, a prefetched collection is reused since it was loaded. Only used together with
+          C(prefetch) and C(cache_dir).
+      default: 600
+      required: false
+    timing:
+      description:
+        - When enabled, the module result has the C(oneview_timing) key, with the time spent on the login, the number,
+          total and maximum duration of the requests of each HTTP method, and, for each task the module waited for,
+          the time until it finished and the number of polls.
+      type: bool
+      default: false
+      required: false
+    timing_file:
+      description:
+        - Path of a local JSON Lines file where the timing of each module execution, including the duration of every
+          request, is appended for later analysis. It can be used without C(timing).
+      required: false
 
 notes:
     - "A sample configuration file for the config parameter can be found at:
@@ -56,5 +120,63 @@ options:
             C(count): The number of resources to return.
             C(filter): A general filter/query string to narrow the list of items returned.
             C(sort): The sort order of the returned data set."
+        - "When gathering all the resources of a collection, the params also allow:
+            C(fields): Comma separated list of the attributes returned for each resource.
+            C(view): Name of a predefined subset of the resource attributes.
+            C(page_size): Number of resources requested at a time, to page through large collections.
+            C(output_file): Path of a local file where the resources are written as JSON Lines, one resource per
+            line, instead of being returned in the facts. The resources are requested page by page, 500 at a time
+            unless C(page_size) is provided, and each page is written as soon as it is received. The file path and
+            the number of resources written are returned in C(facts_output)."
+        required: false
+'''
+
+    FACTSOPTIONS = '''
+options:
+    max_workers:
+        description:
+            - Maximum number of facts options requested concurrently. The options are independent requests to the
+              appliance.
+        default: 4
+    request_timeout:
+        description:
+            - Maximum time, in seconds, to wait for each facts option request. The module fails when a request does
+              not complete in time. When not provided, the module waits until the requests complete.
+        required: false
+'''
+
+    TRANSFER = '''
+options:
+    chunk_size:
+        description:
+            - Number of bytes read and written at a time by the file transfers.
+        default: 1048576
+    max_bandwidth:
+        description:
+            - Maximum rate of each file transfer, in kilobytes per second. When not provided, there is no limit.
+        required: false
+    transfer_retries:
+        description:
+            - Number of times a file transfer interrupted by a connection failure is retried. Downloads are resumed
+              from the partial file kept next to the destination; uploads are started again.
+        default: 3
+    max_workers:
+        description:
+            - Maximum number of files transferred concurrently.
+        default: 4
+    task_timeout:
+        description:
+            - Maximum time, in seconds, to wait for the task started by an upload. When not provided, the module
+              waits until the task completes.
         required: false
 '''
+
+    BUSYRETRY = '''
+options:
+    busy_timeout:
+        description:
+            - Maximum time, in seconds, to retry an operation refused because the resource is busy with another
+              operation or was changed concurrently. Between the attempts, the module waits for the task running on
+              the resource or, when none is found, for an exponentially growing delay. C(0) does not retry.
+        default: 600
+'''
@@ -26,6 +26,10 @@ module: image_streamer_artifact_bundle
 short_description: Manage the Artifact Bundle resource.
 description:
     - "Provides an interface to manage the Artifact Bundle. Can create, update, remove, and download, upload, extract"
+    - "The files are streamed from and to disk in chunks. An interrupted download is resumed from the partial file
+      kept next to the destination, and its size is verified. A download is skipped when the local file already
+      matches the C(checksum) provided or, with C(cache_dir), the SHA-256 digest recorded after downloading the same
+      version of the Artifact Bundle. Several Artifact Bundles can be downloaded concurrently with C(downloads)."
 version_added: "2.3"
 requirements:
     - "python >= 3.4.2"
@@ -51,10 +55,14 @@ options:
     data:
       description:
         - List with Artifact Bundle properties and its associated states.
+        - "On states C(download) and C(archive_download), C(checksum) is the expected SHA-256 digest of the file. On
+          state C(download), C(downloads) is a list of files to download instead of a single one, each with the
+          C(name), the C(destinationFilePath) and, optionally, the C(checksum)."
       required: true
 
 extends_documentation_fragment:
     - oneview
+    - oneview.transfer
 '''
 
 EXAMPLES = '''
@@ -79,6 +87,24 @@ EXAMPLES = '''
       destinationFilePath: '~/downloaded_artifact.zip'
   delegate_to: localhost
 
+- name: Download three Artifact Bundles concurrently, skipping the ones already downloaded
+  image_streamer_artifact_bundle:
+    config: "{{ config }}"
+    cache_dir: '~/.oneview'
+    state: download
+    max_workers: 3
+    data:
+      downloads:
+        - name: 'Artifact Bundle'
+          destinationFilePath: '~/downloaded_artifact.zip'
+        - name: 'Artifact Bundle 2'
+          destinationFilePath: '~/downloaded_artifact_2.zip'
+        - name: 'Artifact Bundle 3'
+          destinationFilePath: '~/downloaded_artifact_3.zip'
+  delegate_to: localhost
+
+- debug: var=artifact_bundle_downloads
+
 - name: Download the Archive for Artifact Bundle to the file path provided
   image_streamer_artifact_bundle:
     config: "{{ config }}"
@@ -157,9 +183,24 @@ artifact_bundle_deployment_group:
     description: Has the OneView facts about the Deployment Group.
     returned: On state 'backup_extract', 'backup_upload', and 'backup_create'.
     type: dict
+
+artifact_bundle_upload:
+    description: The path and size of the file uploaded, the number of attempts, the duration and the average rate,
+        in bytes per second, of the upload.
+    returned: On state 'present', when the Artifact Bundle is uploaded, and 'backup_upload'.
+    type: dict
+
+artifact_bundle_downloads:
+    description: For each file, the path, size and SHA-256 digest, whether it was downloaded and, when so, the number
+        of attempts, the bytes resumed from a partial file, the duration and the average rate of the download.
+    returned: On states 'download' and 'archive_download'.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, compare
+import os
+
+from ansible.module_utils.oneview import (OneViewFileTransfer, OneViewModule, OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError, TRANSFER_ARGS, compare)
 
 
 class ArtifactBundleModule(OneViewModule):
@@ -169,6 +210,7 @@ class ArtifactBundleModule(OneViewModule):
     MSG_ALREADY_ABSENT = 'Artifact Bundle is already absent.'
     MSG_ALREADY_PRESENT = 'Artifact Bundle is already present.'
     MSG_DOWNLOADED = 'Artifact Bundle downloaded successfully.'
+    MSG_ALREADY_DOWNLOADED = 'Artifact Bundle is already downloaded.'
     MSG_UPLOADED = 'Artifact Bundle uploaded successfully.'
     MSG_BACKUP_UPLOADED = 'Backup for Artifact Bundle uploaded successfully.'
     MSG_ARCHIVE_DOWNLOADED = 'Archive of Artifact Bundle downloaded successfully.'
@@ -177,6 +219,11 @@ class ArtifactBundleModule(OneViewModule):
     MSG_BACKUP_EXTRACTED = 'Artifact Bundle extracted successfully.'
     MSG_REQUIRED = "An existing Artifact Bundle is required."
     MSG_BACKUP_REQUIRED = "An existing Backup is required"
+    MSG_FILE_NOT_FOUND = 'Artifact Bundle file not found: {0}'
+
+    ARTIFACT_BUNDLES_URI = '/rest/artifact-bundles'
+    DOWNLOAD_URI = '/rest/artifact-bundles/download/'
+    BACKUP_ARCHIVE_URI = '/rest/artifact-bundles/backups/archive'
 
     argument_spec = dict(
         state=dict(
@@ -184,13 +231,16 @@ class ArtifactBundleModule(OneViewModule):
             choices=['present', 'absent', 'download', 'archive_download', 'backup_create',
                      'backup_upload', 'extract', 'backup_extract']
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        **TRANSFER_ARGS
     )
 
     def __init__(self):
         super(ArtifactBundleModule, self).__init__(additional_arg_spec=self.argument_spec)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
         self.set_resource_object(self.i3s_client.artifact_bundles)
+        self.transfer = OneViewFileTransfer.from_params(self.module.params, self.i3s_client.connection,
+                                                        log=self.module.log)
 
     def execute_module(self):
         ansible_facts = {}
@@ -225,9 +275,13 @@ class ArtifactBundleModule(OneViewModule):
         return changed, msg, facts
 
     def __upload(self):
-        file_name = self.data['localArtifactBundleFilePath']
-        artifact_bundle = self.resource_client.upload_bundle_from_file(file_name)
-        return True, self.MSG_UPLOADED, dict(artifact_bundle=artifact_bundle)
+        artifact_bundle, upload = self.__upload_file(self.ARTIFACT_BUNDLES_URI, self.data['localArtifactBundleFilePath'])
+        return True, self.MSG_UPLOADED, dict(artifact_bundle=artifact_bundle, artifact_bundle_upload=upload)
+
+    def __upload_file(self, uri, file_path):
+        if not os.path.isfile(os.path.expanduser(file_path)):
+            raise OneViewModuleValueError(self.MSG_FILE_NOT_FOUND.format(file_path))
+        return self.transfer.upload(uri, file_path)
 
     def __create(self):
         self.current_resource = self.resource_client.create(self.data)
@@ -247,10 +301,32 @@ class ArtifactBundleModule(OneViewModule):
             return False, self.MSG_ALREADY_PRESENT, dict(artifact_bundle=self.current_resource.data)
 
     def __download(self):
+        if self.data.get('downloads'):
+            return self.__download_all(self.data['downloads'])
         if not self.current_resource:
             raise OneViewModuleResourceNotFound(self.MSG_REQUIRED)
-        self.current_resource.download(self.data['destinationFilePath'])
-        return False, self.MSG_DOWNLOADED, {}
+
+        download = self.__download_file(self.DOWNLOAD_URI, self.current_resource.data, self.data)
+        msg = self.MSG_DOWNLOADED if download['downloaded'] else self.MSG_ALREADY_DOWNLOADED
+        return download['downloaded'], msg, dict(artifact_bundle_downloads=[download])
+
+    def __download_all(self, downloads):
+        resources = dict((resource['name'], resource) for resource in self.resource_client.get_all())
+        for download in downloads:
+            if download.get('name') not in resources:
+                raise OneViewModuleResourceNotFound(self.MSG_REQUIRED + ' ' + str(download.get('name')))
+
+        results = self.transfer.run_concurrently(
+            lambda download: self.__download_file(self.DOWNLOAD_URI, resources[download['name']], download),
+            downloads)
+        changed = any(result['downloaded'] for result in results)
+        msg = self.MSG_DOWNLOADED if changed else self.MSG_ALREADY_DOWNLOADED
+        return changed, msg, dict(artifact_bundle_downloads=results)
+
+    def __download_file(self, download_uri, resource, data):
+        return self.transfer.download(download_uri + resource['uri'].split('/')[-1], data['destinationFilePath'],
+                                      version=resource.get('eTag') or resource.get('modified'),
+                                      checksum=data.get('checksum'))
 
     def __extract(self):
         if not self.current_resource:
@@ -267,9 +343,9 @@ class ArtifactBundleModule(OneViewModule):
         if len(self.allbackups) == 0:
             raise OneViewModuleResourceNotFound(self.MSG_BACKUP_REQUIRED)
 
-        self.current_resource = self.resource_client.get_backup(self.allbackups[0]['uri'])
-        self.current_resource.download_archive(self.data['destinationFilePath'])
-        return False, self.MSG_ARCHIVE_DOWNLOADED, {}
+        download = self.__download_file(self.BACKUP_ARCHIVE_URI + '/', self.allbackups[0], self.data)
+        msg = self.MSG_ARCHIVE_DOWNLOADED if download['downloaded'] else self.MSG_ALREADY_DOWNLOADED
+        return download['downloaded'], msg, dict(artifact_bundle_downloads=[download])
 
     def __extract_backup(self):
         self.allbackups = self.resource_client.get_all_backups()
@@ -282,9 +358,11 @@ class ArtifactBundleModule(OneViewModule):
 
     def __upload_backup(self):
         if self.data.get('localBackupArtifactBundleFilePath') and self.data.get('deploymentGroupURI'):
-            deployment_group = self.resource_client.upload_backup_bundle_from_file(
-                self.data['localBackupArtifactBundleFilePath'], self.data['deploymentGroupURI'])
-        return True, self.MSG_BACKUP_UPLOADED, dict(artifact_bundle_deployment_group=deployment_group)
+            deployment_group, upload = self.__upload_file(
+                self.BACKUP_ARCHIVE_URI + "?deploymentGrpUri=" + self.data['deploymentGroupURI'],
+                self.data['localBackupArtifactBundleFilePath'])
+        return True, self.MSG_BACKUP_UPLOADED, dict(artifact_bundle_deployment_group=deployment_group,
+                                                    artifact_bundle_upload=upload)
 
 
 def main():
@@ -96,7 +96,7 @@ class BuildPlanFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(BuildPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(BuildPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -105,7 +105,7 @@ class BuildPlanFactsModule(OneViewModuleBase):
         if name:
             build_plans = self.i3s_client.build_plans.get_by("name", name)
         else:
-            build_plans = self.i3s_client.build_plans.get_all(**self.facts_params)
+            build_plans = self.get_all_facts(self.i3s_client.build_plans)
 
         return dict(changed=False, ansible_facts=dict(build_plans=build_plans))
 
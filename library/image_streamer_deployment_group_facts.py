@@ -89,7 +89,7 @@ class DeploymentGroupFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(DeploymentGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(DeploymentGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -98,7 +98,7 @@ class DeploymentGroupFactsModule(OneViewModuleBase):
         if name:
             deployment_groups = self.i3s_client.deployment_groups.get_by('name', name)
         else:
-            deployment_groups = self.i3s_client.deployment_groups.get_all(**self.facts_params)
+            deployment_groups = self.get_all_facts(self.i3s_client.deployment_groups)
 
         return dict(changed=False, ansible_facts=dict(deployment_groups=deployment_groups))
 
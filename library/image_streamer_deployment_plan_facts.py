@@ -118,7 +118,7 @@ class DeploymentPlanFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(DeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(DeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -136,7 +136,7 @@ class DeploymentPlanFactsModule(OneViewModule):
                 environmental_configuration = self.i3s_client.deployment_plans.get_osdp(deployment_plan['uri'])
                 ansible_facts['deployment_plans'][0]['deployment_plan_osdp'] = environmental_configuration
         else:
-            ansible_facts['deployment_plans'] = self.i3s_client.deployment_plans.get_all(**self.facts_params)
+            ansible_facts['deployment_plans'] = self.get_all_facts(self.i3s_client.deployment_plans)
 
         return dict(changed=False, ansible_facts=ansible_facts)
 
@@ -26,6 +26,10 @@ module: image_streamer_golden_image
 short_description: Manage Image Streamer Golden Image resources.
 description:
     - "Provides an interface to manage Image Streamer Golden Image. Can create, add, update, and remove."
+    - "The files are streamed from and to disk in chunks. An interrupted download is resumed from the partial file
+      kept next to the destination, and its size is verified. A download is skipped when the local file already
+      matches the C(checksum) provided or, with C(cache_dir), the SHA-256 digest recorded after downloading the same
+      version of the Golden Image. Several Golden Images can be downloaded concurrently with C(downloads)."
 version_added: "2.3"
 requirements:
     - "python >= 2.7.9"
@@ -44,10 +48,14 @@ options:
     data:
         description:
             - List with Golden Image properties and its associated states.
+            - "On states C(downloaded) and C(archive_downloaded), C(checksum) is the expected SHA-256 digest of the
+              file, and C(downloads) is a list of files to download instead of a single one, each with the C(name),
+              the C(destination_file_path) and, optionally, the C(checksum)."
         required: true
 
 extends_documentation_fragment:
     - oneview
+    - oneview.transfer
 '''
 
 EXAMPLES = '''
@@ -104,6 +112,27 @@ EXAMPLES = '''
       destination_file_path: '~/downloaded_image.zip'
   delegate_to: localhost
 
+- name: Download two Golden Images concurrently, skipping the ones already downloaded
+  image_streamer_golden_image:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 600
+    cache_dir: '~/.oneview'
+    state: downloaded
+    max_workers: 2
+    max_bandwidth: 51200
+    data:
+      downloads:
+        - name: 'Demo Golden Image'
+          destination_file_path: '~/downloaded_image.zip'
+        - name: 'Other Golden Image'
+          destination_file_path: '~/other_image.zip'
+          checksum: '9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08'
+  delegate_to: localhost
+
+- debug: var=golden_image_downloads
+
 - name: Download the Golden Image archive log to the file path provided
   image_streamer_golden_image:
     hostname: 172.16.101.48
@@ -133,9 +162,29 @@ golden_image:
     description: Has the OneView facts about the Golden Image.
     returned: On state 'present'.
     type: dict
+
+golden_image_upload:
+    description: The path and size of the file uploaded, the number of attempts, the duration and the average rate,
+        in bytes per second, of the upload.
+    returned: On state 'present', when the Golden Image is uploaded.
+    type: dict
+
+golden_image_downloads:
+    description: For each file, the path, size and SHA-256 digest, whether it was downloaded and, when so, the number
+        of attempts, the bytes resumed from a partial file, the duration and the average rate of the download.
+    returned: On states 'downloaded' and 'archive_downloaded'.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase, OneViewModuleValueError, OneViewModuleResourceNotFound, compare
+import os
+
+from ansible.module_utils.oneview import (OneViewFileTransfer, OneViewModuleBase, OneViewModuleValueError,
+                                          OneViewModuleResourceNotFound, TRANSFER_ARGS, compare)
+
+try:
+    from ansible.module_utils.six.moves.urllib.parse import quote
+except ImportError:
+    from six.moves.urllib.parse import quote
 
 
 class GoldenImageModule(OneViewModuleBase):
@@ -146,27 +195,41 @@ class GoldenImageModule(OneViewModuleBase):
     MSG_DELETED = 'Golden Image deleted successfully.'
     MSG_DOWNLOADED = 'Golden Image downloaded successfully.'
     MSG_ARCHIVE_DOWNLOADED = 'Golden Image archive downloaded successfully.'
+    MSG_ALREADY_DOWNLOADED = 'Golden Image is already downloaded.'
     MSG_ALREADY_ABSENT = 'Golden Image is already absent.'
     MSG_WAS_NOT_FOUND = 'Golden Image was not found.'
     MSG_CANT_CREATE_AND_UPLOAD = "You can use an existent OS Volume or upload an Image, you cannot do both."
     MSG_MISSING_MANDATORY_ATTRIBUTES = 'Mandatory field is missing: osVolumeURI or localImageFilePath are required.'
     MSG_OS_VOLUME_WAS_NOT_FOUND = 'OS Volume was not found.'
     MSG_BUILD_PLAN_WAS_NOT_FOUND = 'OS Build Plan was not found.'
+    MSG_FILE_NOT_FOUND = 'Golden Image file not found: {0}'
+
+    GOLDEN_IMAGES_URI = '/rest/golden-images'
+    # Download URI of each download state, followed by the Golden Image ID
+    DOWNLOAD_URIS = dict(downloaded='/rest/golden-images/download/',
+                         archive_downloaded='/rest/golden-images/archive/')
 
     argument_spec = dict(
         state=dict(
             required=True,
             choices=['present', 'absent', 'downloaded', 'archive_downloaded']
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        **TRANSFER_ARGS
     )
 
     def __init__(self):
         super(GoldenImageModule, self).__init__(additional_arg_spec=self.argument_spec)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
         self.resource_client = self.i3s_client.golden_images
+        self.transfer = OneViewFileTransfer.from_params(self.module.params, self.i3s_client.connection,
+                                                        log=self.module.log)
 
     def execute_module(self):
+        if self.state in self.DOWNLOAD_URIS and self.data.get('downloads'):
+            changed, msg, ansible_facts = self.__download_all(self.data['downloads'])
+            return dict(changed=changed, msg=msg, ansible_facts=ansible_facts)
+
         resource = self.get_by_name(self.data['name'])
 
         if self.state == 'present':
@@ -177,10 +240,9 @@ class GoldenImageModule(OneViewModuleBase):
             if not resource:
                 raise OneViewModuleResourceNotFound(self.MSG_WAS_NOT_FOUND)
 
-            if self.state == 'downloaded':
-                changed, msg, ansible_facts = self.__download(self.data, resource)
-            elif self.state == 'archive_downloaded':
-                changed, msg, ansible_facts = self.__download_archive(self.data, resource)
+            download = self.__download(self.data, resource)
+            changed, msg = self.__get_download_result([download])
+            ansible_facts = dict(golden_image_downloads=[download])
 
         return dict(changed=changed,
                     msg=msg,
@@ -194,6 +256,7 @@ class GoldenImageModule(OneViewModuleBase):
 
         changed = False
         msg = ''
+        ansible_facts = {}
 
         if "newName" in data:
             data["name"] = data.pop("newName")
@@ -209,7 +272,7 @@ class GoldenImageModule(OneViewModuleBase):
                 msg = self.MSG_CREATED
                 changed = True
             elif file_path:
-                resource = self.i3s_client.golden_images.upload(file_path, data)
+                resource, ansible_facts['golden_image_upload'] = self.__upload(file_path, data)
                 msg = self.MSG_UPLOADED
                 changed = True
             else:
@@ -225,7 +288,8 @@ class GoldenImageModule(OneViewModuleBase):
             else:
                 msg = self.MSG_ALREADY_PRESENT
 
-        return changed, msg, dict(golden_image=resource)
+        ansible_facts['golden_image'] = resource
+        return changed, msg, ansible_facts
 
     def __replace_name_by_uris(self, data):
         vol_name = data.pop('osVolumeName', None)
@@ -249,13 +313,37 @@ class GoldenImageModule(OneViewModuleBase):
         else:
             raise OneViewModuleResourceNotFound(self.MSG_BUILD_PLAN_WAS_NOT_FOUND)
 
-    def __download(self, data, resource):
-        self.i3s_client.golden_images.download(resource['uri'], data['destination_file_path'])
-        return True, self.MSG_DOWNLOADED, {}
+    def __upload(self, file_path, data):
+        if not os.path.isfile(os.path.expanduser(file_path)):
+            raise OneViewModuleValueError(self.MSG_FILE_NOT_FOUND.format(file_path))
+        uri = "{0}?name={1}&description={2}".format(self.GOLDEN_IMAGES_URI,
+                                                    quote(data.get('name', '')),
+                                                    quote(data.get('description', '')))
+        return self.transfer.upload(uri, file_path)
 
-    def __download_archive(self, data, resource):
-        self.i3s_client.golden_images.download_archive(resource['uri'], data['destination_file_path'])
-        return True, self.MSG_ARCHIVE_DOWNLOADED, {}
+    def __download(self, data, resource):
+        uri = self.DOWNLOAD_URIS[self.state] + resource['uri'].split('/')[-1]
+        version = resource.get('eTag') or resource.get('modified')
+        return self.transfer.download(uri, data['destination_file_path'], version=version,
+                                      checksum=data.get('checksum'))
+
+    def __download_all(self, downloads):
+        resources = dict((resource['name'], resource) for resource in self.resource_client.get_all())
+        for download in downloads:
+            if download.get('name') not in resources:
+                raise OneViewModuleResourceNotFound(self.MSG_WAS_NOT_FOUND + ' ' + str(download.get('name')))
+
+        results = self.transfer.run_concurrently(
+            lambda download: self.__download(download, resources[download['name']]), downloads)
+        changed, msg = self.__get_download_result(results)
+        return changed, msg, dict(golden_image_downloads=results)
+
+    def __get_download_result(self, downloads):
+        if not any(download['downloaded'] for download in downloads):
+            return False, self.MSG_ALREADY_DOWNLOADED
+        if self.state == 'archive_downloaded':
+            return True, self.MSG_ARCHIVE_DOWNLOADED
+        return True, self.MSG_DOWNLOADED
 
 
 def main():
@@ -95,7 +95,7 @@ class GoldenImageFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(GoldenImageFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(GoldenImageFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -106,7 +106,7 @@ class GoldenImageFactsModule(OneViewModuleBase):
         if name:
             golden_images = self.i3s_client.golden_images.get_by("name", name)
         else:
-            golden_images = self.i3s_client.golden_images.get_all(**self.facts_params)
+            golden_images = self.get_all_facts(self.i3s_client.golden_images)
 
         ansible_facts['golden_images'] = golden_images
 
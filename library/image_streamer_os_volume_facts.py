@@ -138,7 +138,7 @@ class OsVolumeFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(OsVolumeFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(OsVolumeFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -148,7 +148,7 @@ class OsVolumeFactsModule(OneViewModuleBase):
         if name:
             os_volumes = self.i3s_client.os_volumes.get_by('name', name)
         else:
-            os_volumes = self.i3s_client.os_volumes.get_all(**self.facts_params)
+            os_volumes = self.get_all_facts(self.i3s_client.os_volumes)
 
         ansible_facts["os_volumes"] = os_volumes
 
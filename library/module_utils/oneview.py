@@ -20,17 +20,33 @@ from __future__ import (absolute_import, division, print_function, unicode_liter
 
 import abc
 import collections
+import csv
+import hashlib
+import io
 import json
 import logging
 import os
+import random
+import tempfile
+import threading
+import time
 import traceback
 
+from contextlib import contextmanager
+
 try:
     from hpeOneView.oneview_client import OneViewClient
+    from hpeOneView.exceptions import HPEOneViewException
     HAS_HPE_ONEVIEW = True
 except ImportError:
     HAS_HPE_ONEVIEW = False
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
 try:
     from ansible.module_utils import six
     from ansible.module_utils._text import to_native
@@ -49,6 +65,29 @@ from collections import OrderedDict
 
 logger = logging.getLogger(__name__)  # Logger for development purposes only
 
+# Default number of resources requested at a time by the paged facts
+FACTS_PAGE_SIZE = 500
+
+# Arguments of the facts modules that gather their options concurrently
+FACTS_OPTIONS_ARGS = dict(
+    max_workers=dict(type='int', default=4),
+    request_timeout=dict(type='int')
+)
+
+# Arguments of the modules that retry the operations refused because the resource is busy
+BUSY_RETRY_ARGS = dict(
+    busy_timeout=dict(type='int', default=600)
+)
+
+# Arguments of the modules that transfer files to and from the appliance
+TRANSFER_ARGS = dict(
+    chunk_size=dict(type='int', default=1048576),
+    max_bandwidth=dict(type='int'),
+    transfer_retries=dict(type='int', default=3),
+    max_workers=dict(type='int', default=4),
+    task_timeout=dict(type='int')
+)
+
 
 def get_logger(mod_name):
     """
@@ -108,6 +147,25 @@ def dict_merge(original_resource_dict, data_dict):
     return resource_dict
 
 
+def merge_copy_on_write(original_resource_dict, data_dict):
+    """
+    Merges two dictionaries as dict_merge does, without copying the whole original dictionary.
+    Only the dictionaries changed by the data are copied, shallowly, and the unchanged values are shared with the
+    original dictionary, so the merged dictionary must not be changed in place below the keys of the data.
+    :arg dict original_resource_dict: original dictionary, it is not changed.
+    :arg dict data_dict: dictionary with changes.
+    :return: dict: Dictionaries merged.
+    """
+    resource_dict = dict(original_resource_dict)
+    for key, val in data_dict.items():
+        if resource_dict.get(key) and isinstance(resource_dict[key], dict) and isinstance(val, collections.Mapping):
+            resource_dict[key] = merge_copy_on_write(resource_dict[key], val)
+        else:
+            resource_dict[key] = val
+
+    return resource_dict
+
+
 def merge_list_by_key(original_list, updated_list, key, ignore_when_null=None, replace_key=None, replace_value=None):
     """
     Merge two lists by the key. It basically:
@@ -147,14 +205,24 @@ def merge_list_by_key(original_list, updated_list, key, ignore_when_null=None, r
     return list(merged_items.values())
 
 
-def _sort_by_keys(resource1, resource2):
-    keys = ['name', 'enclosureIndex']
-
-    if isinstance(resource1, list) and isinstance(resource1[0], dict):
-        for key in keys:
-            if key in resource1[0]:
-                resource1 = sorted(resource1, key=lambda k: k[key])
-                resource2 = sorted(resource2, key=lambda k: k[key])
+def _sort_by_keys(resource1, resource2, keys=('enclosureIndex', 'name')):
+    """
+    Sorts two lists of dicts by the keys identifying their elements, so the same elements get the same positions.
+    Only the keys present in the first element of the first list are used. The sort keys are computed once
+    per element.
+    :arg list resource1: first list
+    :arg list resource2: second list
+    :arg tuple keys: Identifying keys, by priority.
+    :return: tuple: The sorted lists.
+    """
+    if isinstance(resource1, list) and resource1 and isinstance(resource1[0], collections.Mapping):
+        keys = [key for key in keys if key in resource1[0]]
+        if keys:
+            def sort_key(item):
+                return [_standardize_value(item.get(key)) for key in keys]
+
+            resource1 = sorted(resource1, key=sort_key)
+            resource2 = sorted(resource2, key=sort_key)
     return resource1, resource2
 
 
@@ -179,254 +247,261 @@ def _standardize_value(value):
     return str(value)
 
 
-def compare_lig(first_resource, second_resource):
+class _ResourceComparator(object):
     """
-    Recursively compares dictionary contents equivalence, ignoring types and elements order.
-    Particularities of the comparison:
-        - Inexistent key = None
-        - These values are considered equal: None, empty, False
-        - Lists are compared value by value after a sort, if they have same size.
-        - Each element is converted to str before the comparison.
-    :arg dict first_resource: first dictionary
-    :arg dict second_resource: second dictionary
-    :return: bool: True when equal, False when different.
+    Comparison engine used by all the compare functions.
+    Each dict and list is reduced once to a hashable canonical form, where equivalent values are equal, so equal
+    subtrees are accepted without walking them again and list elements are matched as a multiset instead of
+    being sorted by their serialized form. The debug messages are only formatted when debug logging is enabled.
+    The comparison rules of a resource type customize it:
+        - key_comparators: Functions comparing the values of the given keys, at any level, instead of the
+          equivalence. They must consider equal any equivalent values.
+        - list_keys: Keys identifying the dict elements of lists, by priority. The elements not matched by
+          equivalence are paired by these keys before being compared.
+    Attributes:
+       differences (list): When provided, the differences found are appended to it instead of stopping
+           at the first one.
     """
-    resource1 = first_resource
-    resource2 = second_resource
+    EMPTY = ('empty',)
 
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
-    # The first resource is True / Not Null and the second resource is False / Null
-    if resource1 and not resource2:
-        logger.debug("resource1 and not resource2. " + debug_resources)
-        return False
+    def __init__(self, differences=None, key_comparators=None, list_keys=None):
+        self.differences = differences
+        self.key_comparators = key_comparators or {}
+        self.list_keys = list_keys
+        self._canonical_forms = {}
 
-    # Checks all keys in first dict against the second dict
-    for key in resource1:
-        # compare uplinkset property logicalPortConfigInfos
-        if key == 'logicalPortConfigInfos':
-            if sort_by_uplink_set_location(resource1[key], resource2[key]):
+    def canonical(self, value):
+        if isinstance(value, collections.Mapping):
+            form = self._canonical_forms.get(id(value))
+            if form is None:
+                form = ('dict', frozenset((key, self._canonical_value(item))
+                                          for key, item in value.items() if item is not None))
+                self._canonical_forms[id(value)] = form
+            return form
+        elif isinstance(value, list):
+            form = self._canonical_forms.get(id(value))
+            if form is None:
+                form = ('list', frozenset(collections.Counter(self.canonical(item) for item in value).items()))
+                self._canonical_forms[id(value)] = form
+            return form
+        return _standardize_value(value)
+
+    def _canonical_value(self, value):
+        # If both values are null, empty or False they are considered equal
+        return self.canonical(value) if value else self.EMPTY
+
+    def compare_dict(self, resource1, resource2, path=None):
+        # The first resource is True / Not Null and the second resource is False / Null
+        if resource1 and not resource2:
+            logger.debug("resource1 and not resource2. resource1 = %s, resource2 = %s", resource1, resource2)
+            self._add_difference(path, resource1, resource2)
+            return False
+
+        if self.canonical(resource1) == self.canonical(resource2):
+            return True
+
+        equal = True
+        # Checks all keys in first dict against the second dict
+        for key in resource1:
+            if key not in resource2:
+                # Inexistent key is equivalent to exist with value None
+                different = resource1[key] is not None
+            # If both values are null, empty or False it will be considered equal.
+            elif not resource1[key] and not resource2[key]:
+                different = False
+            elif key in self.key_comparators:
+                different = not self.key_comparators[key](resource1[key], resource2[key])
+            elif isinstance(resource1[key], collections.Mapping):
+                # recursive call, the nested differences are reported with their own paths
+                if not self.compare_dict(resource1[key], resource2[key], self._join_path(path, key)):
+                    self._debug_difference(key, resource1, resource2)
+                    if self.differences is None:
+                        return False
+                    equal = False
                 continue
+            elif isinstance(resource1[key], list):
+                different = not self.compare_list(resource1[key], resource2[key])
             else:
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        if key not in resource2:
-            if resource1[key] is not None:
+                different = _standardize_value(resource1[key]) != _standardize_value(resource2[key])
+
+            if different:
+                self._debug_difference(key, resource1, resource2)
+                self._add_difference(self._join_path(path, key), resource1[key],
+                                     resource2[key] if key in resource2 else None)
+                if self.differences is None:
+                    return False
+                equal = False
+
+        # Checks all keys in the second dict, looking for missing elements
+        for key in resource2.keys():
+            if key not in resource1 and resource2[key] is not None:
                 # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        # If both values are null, empty or False it will be considered equal.
-        elif not resource1[key] and not resource2[key]:
-            continue
-        elif isinstance(resource1[key], collections.Mapping):
-            # recursive call
-            if not compare_lig(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        elif isinstance(resource1[key], list):
-            # change comparison function to compare_list
-            if not compare_list_lig(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        elif _standardize_value(resource1[key]) != _standardize_value(resource2[key]):
-            logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                self._debug_difference(key, resource1, resource2)
+                self._add_difference(self._join_path(path, key), None, resource2[key])
+                if self.differences is None:
+                    return False
+                equal = False
+
+        return equal
+
+    def compare_list(self, resource1, resource2):
+        # The second list is null / empty  / False
+        if not resource2:
+            logger.debug("resource 2 is null. resource1 = %s, resource2 = %s", resource1, resource2)
             return False
 
-    # Checks all keys in the second dict, looking for missing elements
-    for key in resource2.keys():
-        if key not in resource1:
-            if resource2[key] is not None:
-                # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+        if len(resource1) != len(resource2):
+            logger.debug("resources have different length. resource1 = %s, resource2 = %s", resource1, resource2)
+            return False
+
+        # Matches the elements by their canonical forms, ignoring the order
+        unmatched = {}
+        for item in resource2:
+            unmatched.setdefault(self.canonical(item), []).append(item)
+
+        remaining1 = []
+        for item in resource1:
+            matches = unmatched.get(self.canonical(item))
+            if matches:
+                matches.pop()
+            else:
+                remaining1.append(item)
+
+        if not remaining1:
+            return True
+
+        # Elements equivalent only through null and empty values or the comparison rules are compared
+        # value by value after a sort
+        remaining1 = sorted(remaining1, key=_str_sorted)
+        remaining2 = sorted([item for items in unmatched.values() for item in items], key=_str_sorted)
+        if self.list_keys:
+            remaining1, remaining2 = _sort_by_keys(remaining1, remaining2, self.list_keys)
+
+        comparator = _ResourceComparator(key_comparators=self.key_comparators, list_keys=self.list_keys)
+        comparator._canonical_forms = self._canonical_forms
+        for i, val in enumerate(remaining1):
+            if isinstance(val, collections.Mapping):
+                # change comparison function to compare dictionaries
+                if not comparator.compare_dict(val, remaining2[i]):
+                    logger.debug("resources are different. resource1 = %s, resource2 = %s", resource1, resource2)
+                    return False
+            elif isinstance(val, list):
+                # recursive call
+                if not comparator.compare_list(val, remaining2[i]):
+                    logger.debug("lists are different. resource1 = %s, resource2 = %s", resource1, resource2)
+                    return False
+            elif _standardize_value(val) != _standardize_value(remaining2[i]):
+                logger.debug("values are different. resource1 = %s, resource2 = %s", resource1, resource2)
                 return False
 
-    return True
+        # no differences found
+        return True
+
+    def _add_difference(self, path, old_value, new_value):
+        if self.differences is not None and path is not None:
+            self.differences.append(dict(path=path, old=old_value, new=new_value))
+
+    def _join_path(self, path, key):
+        if path is None:
+            return None
+        return '{0}.{1}'.format(path, key) if path else to_native(key)
 
+    def _debug_difference(self, key, resource1, resource2):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + "resource1 = %s, resource2 = %s",
+                         resource1, resource2)
 
-def compare(first_resource, second_resource):
+
+def compare(first_resource, second_resource, differences=None, rules=None):
     """
     Recursively compares dictionary contents equivalence, ignoring types and elements order.
     Particularities of the comparison:
         - Inexistent key = None
         - These values are considered equal: None, empty, False
-        - Lists are compared value by value after a sort, if they have same size.
+        - Lists are compared ignoring the elements order, if they have same size.
         - Each element is converted to str before the comparison.
     :arg dict first_resource: first dictionary
     :arg dict second_resource: second dictionary
+    :arg list differences: When provided, all the differences are appended to it instead of stopping at the first
+        one. Each difference is a dict with the path of the key, the old value (from the first dictionary) and the
+        new value (from the second dictionary). Lists are reported as a whole.
+    :arg dict rules: Comparison rules of the resource type, such as LIG_COMPARISON_RULES.
     :return: bool: True when equal, False when different.
     """
-    resource1 = first_resource
-    resource2 = second_resource
-
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
-    # The first resource is True / Not Null and the second resource is False / Null
-    if resource1 and not resource2:
-        logger.debug("resource1 and not resource2. " + debug_resources)
-        return False
+    comparator = _ResourceComparator(differences, **(rules or {}))
+    return comparator.compare_dict(first_resource, second_resource, '')
 
-    # Checks all keys in first dict against the second dict
-    for key in resource1:
-        if key not in resource2:
-            if resource1[key] is not None:
-                # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        # If both values are null, empty or False it will be considered equal.
-        elif not resource1[key] and not resource2[key]:
-            continue
-        elif isinstance(resource1[key], collections.Mapping):
-            # recursive call
-            if not compare(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        elif isinstance(resource1[key], list):
-            # change comparison function to compare_list
-            if not compare_list(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-        elif _standardize_value(resource1[key]) != _standardize_value(resource2[key]):
-            logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-            return False
 
-    # Checks all keys in the second dict, looking for missing elements
-    for key in resource2.keys():
-        if key not in resource1:
-            if resource2[key] is not None:
-                # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
-                return False
-
-    return True
-
-
-def compare_list(first_resource, second_resource):
+def compare_list(first_resource, second_resource, rules=None):
     """
     Recursively compares lists contents equivalence, ignoring types and element orders.
-    Lists with same size are compared value by value after a sort,
+    Lists with same size are compared ignoring the elements order,
     each element is converted to str before the comparison.
     :arg list first_resource: first list
     :arg list second_resource: second list
+    :arg dict rules: Comparison rules of the resource type, such as LIG_COMPARISON_RULES.
     :return: True when equal; False when different.
     """
+    return _ResourceComparator(**(rules or {})).compare_list(first_resource, second_resource)
 
-    resource1 = first_resource
-    resource2 = second_resource
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
-    # The second list is null / empty  / False
-    if not resource2:
-        logger.debug("resource 2 is null. " + debug_resources)
-        return False
 
-    if len(resource1) != len(resource2):
-        logger.debug("resources have different length. " + debug_resources)
-        return False
-
-    resource1 = sorted(resource1, key=_str_sorted)
-    resource2 = sorted(resource2, key=_str_sorted)
+def differences_to_diff(differences):
+    """
+    Converts the differences found by compare into the before and after dicts of the Ansible diff mode.
+    :arg list differences: Differences found by compare.
+    :return: dict: The before and after values, by path.
+    """
+    return dict(before=dict((difference['path'], difference['old']) for difference in differences),
+                after=dict((difference['path'], difference['new']) for difference in differences))
 
-    for i, val in enumerate(resource1):
-        if isinstance(val, collections.Mapping):
-            # change comparison function to compare dictionaries
-            if not compare(val, resource2[i]):
-                logger.debug("resources are different. " + debug_resources)
-                return False
-        elif isinstance(val, list):
-            # recursive call
-            if not compare_list(val, resource2[i]):
-                logger.debug("lists are different. " + debug_resources)
-                return False
-        elif _standardize_value(val) != _standardize_value(resource2[i]):
-            logger.debug("values are different. " + debug_resources)
-            return False
 
-    # no differences found
-    return True
+def compare_lig(first_resource, second_resource, differences=None):
+    """
+    Recursively compares logical interconnect group contents equivalence, with the LIG comparison rules:
+    the uplink set ports are compared by their locations and the list elements are paired by enclosure index
+    and name.
+    :arg dict first_resource: first dictionary
+    :arg dict second_resource: second dictionary
+    :arg list differences: When provided, all the differences are appended to it. See compare.
+    :return: bool: True when equal, False when different.
+    """
+    return compare(first_resource, second_resource, differences, LIG_COMPARISON_RULES)
 
 
 def compare_list_lig(first_resource, second_resource):
     """
-    Recursively compares lists contents equivalence, ignoring types and element orders.
-    Lists with same size are compared value by value after a sort,
-    each element is converted to str before the comparison.
+    Recursively compares lists contents equivalence, with the LIG comparison rules.
     :arg list first_resource: first list
     :arg list second_resource: second list
     :return: True when equal; False when different.
     """
+    return compare_list(first_resource, second_resource, LIG_COMPARISON_RULES)
 
-    resource1 = first_resource
-    resource2 = second_resource
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
-    # The second list is null / empty  / False
-    if not resource2:
-        logger.debug("resource 2 is null. " + debug_resources)
-        return False
-
-    if len(resource1) != len(resource2):
-        logger.debug("resources have different length. " + debug_resources)
-        return False
-
-    resource1 = sorted(resource1, key=_str_sorted)
-    resource2 = sorted(resource2, key=_str_sorted)
 
-    # sort resources by specific keys
-    resource1, resource2 = _sort_by_keys(resource1, resource2)
-
-    for i, val in enumerate(resource1):
-        if isinstance(val, collections.Mapping):
-            # change comparison function to compare dictionaries
-            if not compare_lig(val, resource2[i]):
-                logger.debug("resources are different. " + debug_resources)
-                return False
-        elif isinstance(val, list):
-            # recursive call
-            if not compare_list_lig(val, resource2[i]):
-                logger.debug("lists are different. " + debug_resources)
-                return False
-        elif _standardize_value(val) != _standardize_value(resource2[i]):
-            logger.debug("values are different. " + debug_resources)
-            return False
-
-    # no differences found
-    return True
+def _uplink_set_location(config_info):
+    # Combines the location entries as 'Bay_3' if type='Bay' and relative value=3
+    location_entries = config_info["logicalLocation"]["locationEntries"]
+    return tuple(sorted(local_entry.get('type', '') + "_" + str(local_entry.get('relativeValue', ''))
+                        for local_entry in location_entries))
 
 
 def sort_by_uplink_set_location(resource1, resource2):
     """
     Compares lists contents equivalence, sorting element orders.
-    Inner dict elements(Bay, Enclosure, Port) are concatenated to compare unique values in the obj.
+    Inner dict elements(Bay, Enclosure, Port) are combined to compare unique values in the obj.
+    The locations of the second list are computed once.
     :arg list resource1: first list of dicts
     :arg list resource2: second list of dicts
     :return: True when equal; False when different.
     """
+    all_entries = set(_uplink_set_location(config_dict) for config_dict in resource2 or [])
 
-    # Check first list elements
-    for config_dict in resource1:
-        location_entries = config_dict["logicalLocation"]["locationEntries"]
-
-        # Append all types together ['Bay_3', 'Enclosure_1', 'Port_75']
-        each_location = []
-        for local_entry in location_entries:
-            # Combine the values for comparison, 'Bay_3' if type='Bay' and relative value=3
-            value = local_entry.get('type', '') + "_" + str(local_entry.get('relativeValue', ''))
-            each_location.append(value)
-
-        # Check second elements and add each entry in all_entries list
-        all_entries = []
-        for config_dict_res2 in resource2:
-            location_entries_res2 = config_dict_res2["logicalLocation"]["locationEntries"]
-
-            each_location_res2 = []
-            for local_entry_res2 in location_entries_res2:
-                value_res2 = local_entry_res2.get('type', '') + "_" + str(local_entry_res2.get('relativeValue', ''))
-                each_location_res2.append(value_res2)
+    # Check first list elements are present in second list
+    return all(_uplink_set_location(config_dict) in all_entries for config_dict in resource1 or [])
 
-            if each_location_res2 not in all_entries:
-                all_entries.append(sorted(each_location_res2))
 
-        # Check first list element is present in second list
-        if not sorted(each_location) in all_entries:
-            return False
-
-    return True
+LIG_COMPARISON_RULES = dict(key_comparators=dict(logicalPortConfigInfos=sort_by_uplink_set_location),
+                            list_keys=('enclosureIndex', 'name'))
 
 
 class OneViewModuleException(Exception):
@@ -488,6 +563,1774 @@ class OneViewModuleResourceNotFound(OneViewModuleException):
     pass
 
 
+class OneViewFileCache(object):
+    """
+    Key/value cache persisted in a JSON file, shared by the module executions running on the same host.
+    Every access is serialized with an advisory lock, so parallel forks never read a partially written file.
+    Entries older than the TTL are evicted when the file is read.
+    Attributes:
+       path (str): Cache file path.
+       ttl (int): Time, in seconds, an entry remains valid after it was stored.
+    """
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+
+    @classmethod
+    def from_params(cls, params, file_name, ttl):
+        """
+        Builds a cache kept in a file of the cache directory of the module parameters.
+        :arg dict params: Module parameters.
+        :arg str file_name: Cache file name.
+        :arg int ttl: Time, in seconds, an entry remains valid after it was stored.
+        :return: OneViewFileCache or None when the cache is not enabled.
+        """
+        cache_dir = params.get('cache_dir')
+        if not cache_dir:
+            return None
+
+        _ensure_cache_dir(cache_dir)
+        return cls(os.path.join(cache_dir, file_name), ttl)
+
+    @contextmanager
+    def lock(self):
+        with open(self.path + '.lock', 'a') as lock_file:
+            if HAS_FCNTL:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if HAS_FCNTL:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key):
+        with self.lock():
+            entry = self._load().get(key)
+        return entry['value'] if entry else None
+
+    def set(self, key, value):
+        with self.lock():
+            entries = self._load()
+            entries[key] = dict(value=value, timestamp=time.time())
+            self._dump(entries)
+
+    def delete(self, key):
+        with self.lock():
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._dump(entries)
+
+    def update(self, key, function):
+        """
+        Replaces the value of an entry atomically, keeping the time it was stored.
+        :arg str key: Entry key.
+        :arg function: Function called with the current value, or None when there is no entry. It returns the new
+            value, or None to remove the entry.
+        """
+        with self.lock():
+            entries = self._load()
+            entry = entries.get(key)
+            value = function(entry['value'] if entry else None)
+            if value is not None:
+                entries[key] = dict(value=value, timestamp=entry['timestamp'] if entry else time.time())
+            elif entry is None:
+                return
+            else:
+                del entries[key]
+            self._dump(entries)
+
+    def _load(self):
+        try:
+            with open(self.path) as cache_file:
+                entries = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        now = time.time()
+        return dict((key, entry) for key, entry in entries.items() if now - entry.get('timestamp', 0) < self.ttl)
+
+    def _dump(self, entries):
+        # Writes to a private temporary file and renames it, so readers always see a complete file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(entries, cache_file)
+        os.rename(temp_path, self.path)
+
+
+class OneViewSessionCache(object):
+    """
+    Reuses the OneView login sessions across module executions.
+    Sessions are keyed by hostname, username, login domain and API version. A cached session rejected by the
+    appliance is discarded and a new login with the configured credentials is performed.
+    """
+    CACHE_FILE_NAME = 'oneview_sessions.json'
+    DEFAULT_TTL = 1800
+
+    def __init__(self, cache_dir, ttl=None):
+        self.cache = OneViewFileCache(os.path.join(cache_dir, self.CACHE_FILE_NAME), ttl or self.DEFAULT_TTL)
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds the session cache from the module parameters.
+        :arg dict params: Module parameters.
+        :return: OneViewSessionCache or None when the cache is not enabled.
+        """
+        cache_dir = params.get('cache_dir')
+        if not cache_dir:
+            return None
+
+        _ensure_cache_dir(cache_dir)
+        return cls(cache_dir, params.get('session_cache_ttl'))
+
+    def create_client(self, config):
+        """
+        Creates a OneViewClient, reusing a cached session when there is a valid one.
+        :arg dict config: OneViewClient configuration.
+        :return: OneViewClient
+        """
+        key = self._build_key(config, config.get('api_version'))
+
+        session_id = self.cache.get(key)
+        if session_id:
+            session_config = dict(config, credentials=dict(config['credentials'], sessionID=session_id))
+            try:
+                oneview_client = OneViewClient(session_config)
+                self.cache.set(key, session_id)
+                return oneview_client
+            except HPEOneViewException:
+                logger.debug("Cached session rejected by the appliance, logging in again.")
+                self.cache.delete(key)
+
+        oneview_client = OneViewClient(config)
+        # Stores with the negotiated API version, which is the one the next executions will be configured with
+        api_version = config.get('api_version') or oneview_client.api_version
+        self.cache.set(self._build_key(config, api_version), oneview_client.connection.get_session_id())
+        return oneview_client
+
+    def _build_key(self, config, api_version):
+        credentials = config.get('credentials') or {}
+        return '|'.join(to_native(value) for value in (config.get('ip'), credentials.get('userName'),
+                                                       credentials.get('authLoginDomain') or '', api_version))
+
+
+class OneViewVersionCache(object):
+    """
+    Keeps the API version negotiated with each appliance, so that the modules skip the request that reads the
+    appliance version when the api_version is not provided. The SDK login still validates the version with its own
+    request. A cached version refused by the appliance is discarded.
+    """
+    CACHE_FILE_NAME = 'oneview_versions.json'
+    DEFAULT_TTL = 3600
+
+    def __init__(self, cache_dir, ttl=None):
+        self.cache = OneViewFileCache(os.path.join(cache_dir, self.CACHE_FILE_NAME), ttl or self.DEFAULT_TTL)
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds the version cache from the module parameters.
+        :arg dict params: Module parameters.
+        :return: OneViewVersionCache or None when the cache is not enabled.
+        """
+        cache_dir = params.get('cache_dir')
+        if not cache_dir:
+            return None
+
+        _ensure_cache_dir(cache_dir)
+        return cls(cache_dir, params.get('api_version_cache_ttl'))
+
+    def get_version(self, hostname):
+        """
+        Gets the cached appliance version.
+        :arg str hostname: Appliance hostname.
+        :return: dict: It has the currentVersion and, when known, the minimumVersion. None when not cached.
+        """
+        return self.cache.get(hostname)
+
+    def set_version(self, hostname, version):
+        self.cache.set(hostname, version)
+
+    def create_client(self, config, client_factory):
+        """
+        Creates a OneViewClient configured with the cached API version when the configuration has none.
+        :arg dict config: OneViewClient configuration.
+        :arg client_factory: Function that creates the OneViewClient from the configuration.
+        :return: OneViewClient
+        """
+        if config.get('api_version'):
+            return client_factory(config)
+
+        hostname = config.get('ip')
+        version = self.get_version(hostname) or {}
+        if version.get('currentVersion'):
+            try:
+                return client_factory(dict(config, api_version=version['currentVersion']))
+            except HPEOneViewException as exception:
+                # Other login failures, such as invalid credentials, are not related to the cached version
+                if not self._is_version_error(exception):
+                    raise
+                logger.debug("Cached API version refused by the appliance, negotiating it again.")
+                self.cache.delete(hostname)
+
+        oneview_client = client_factory(config)
+        self.set_version(hostname, dict(currentVersion=oneview_client.api_version))
+        return oneview_client
+
+    @staticmethod
+    def _is_version_error(exception):
+        # The SDK login wraps the errors of the version validation, keeping their traceback in the message
+        message = ' '.join(to_native(arg) for arg in exception.args)
+        return 'Unsupported API Version' in message or 'validateVersion' in message
+
+
+class OneViewResponseCache(object):
+    """
+    Keeps the responses of the GET requests on disk and revalidates them with a conditional request, sending the
+    ETag of the stored response in the If-None-Match header. A response not modified since it was stored is read
+    from disk instead of being transferred again.
+    Responses are stored per hostname, API version and URI, including the query string. A response not used for
+    CACHE_TTL seconds is discarded, and the least recently used responses are removed when there are more than
+    MAX_ENTRIES.
+    """
+    CACHE_DIR_NAME = 'oneview_responses'
+    CACHE_TTL = 86400
+    MAX_ENTRIES = 1000
+
+    def __init__(self, cache_dir, connection):
+        self.path = os.path.join(cache_dir, self.CACHE_DIR_NAME)
+        self.connection = connection
+
+    @classmethod
+    def from_params(cls, params, connection):
+        """
+        Builds the response cache from the module parameters.
+        :arg dict params: Module parameters.
+        :arg connection: OneView connection whose GET requests are cached.
+        :return: OneViewResponseCache or None when the cache is not enabled.
+        """
+        cache_dir = params.get('cache_dir')
+        if not cache_dir:
+            return None
+
+        _ensure_cache_dir(os.path.join(cache_dir, cls.CACHE_DIR_NAME))
+        return cls(cache_dir, connection)
+
+    def install(self):
+        """
+        Makes the GET requests of the connection go through the cache.
+        :return: OneViewResponseCache: self.
+        """
+        self.connection.get = self.get
+        return self
+
+    def get(self, uri, custom_headers=None):
+        """
+        Performs a GET request, as the OneView connection does, through the cache.
+        :arg str uri: Resource URI, including the query string.
+        :arg dict custom_headers: Additional request headers.
+        :return: The response body.
+        """
+        headers = dict(custom_headers or {})
+        # Conditional requests done by the caller are handled by the caller
+        entry = None if 'If-None-Match' in headers else self._load(uri)
+        if entry:
+            headers['If-None-Match'] = entry['eTag']
+
+        response, body = self.connection.do_http('GET', uri, '', custom_headers=headers)
+        if response.status == 304 and entry:
+            logger.debug("Response not modified, read from the cache: %s", uri)
+            body = entry['body']
+        elif response.status >= 400:
+            raise HPEOneViewException(body)
+        elif response.status == 302:
+            return self.get(response.getheader('Location'), custom_headers)
+        elif response.status == 200:
+            etag = response.getheader('ETag') or (body.get('eTag') if isinstance(body, dict) else None)
+            if etag:
+                self._store(uri, dict(eTag=etag, body=body))
+
+        if isinstance(body, dict):
+            # Keeps the paging state of the connection, as set by its own GET
+            for attribute, key in (('_nextPage', 'nextPageUri'), ('_prevPage', 'prevPageUri'),
+                                   ('_numTotalRecords', 'total'), ('_numDisplayedRecords', 'count')):
+                if key in body:
+                    setattr(self.connection, attribute, body[key])
+        return body
+
+    def _file_path(self, uri):
+        api_version = getattr(self.connection, '_apiVersion', '')
+        key = '|'.join(to_native(value) for value in (self.connection.get_host(), api_version, uri))
+        return os.path.join(self.path, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self, uri):
+        file_path = self._file_path(uri)
+        try:
+            if os.path.getmtime(file_path) + self.CACHE_TTL < time.time():
+                os.remove(file_path)
+                return None
+            with open(file_path) as cache_file:
+                entry = json.load(cache_file)
+            # The modification time tracks the last use, for the expiration and the eviction
+            os.utime(file_path, None)
+            return entry
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _store(self, uri, entry):
+        fd, temp_path = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(entry, cache_file)
+        os.rename(temp_path, self._file_path(uri))
+        self._evict()
+
+    def _evict(self):
+        file_paths = [os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith('.json')]
+        if len(file_paths) <= self.MAX_ENTRIES:
+            return
+
+        used = []
+        for file_path in file_paths:
+            try:
+                used.append((os.path.getmtime(file_path), file_path))
+            except OSError:
+                # Removed by another fork meanwhile
+                pass
+        for mtime, file_path in sorted(used)[:len(used) - self.MAX_ENTRIES]:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+
+def _ensure_cache_dir(cache_dir):
+    try:
+        os.makedirs(cache_dir, 0o700)
+    except OSError:
+        # Another fork may have created it meanwhile
+        if not os.path.isdir(cache_dir):
+            raise
+
+
+def _load_environment_config():
+    """
+    Loads the OneViewClient configuration from the same environment variables read by the SDK.
+    :return: dict: OneViewClient configuration.
+    """
+    return dict(ip=os.environ.get('ONEVIEWSDK_IP', ''),
+                image_streamer_ip=os.environ.get('ONEVIEWSDK_IMAGE_STREAMER_IP', ''),
+                api_version=os.environ.get('ONEVIEWSDK_API_VERSION', ''),
+                ssl_certificate=os.environ.get('ONEVIEWSDK_SSL_CERTIFICATE', ''),
+                credentials=dict(userName=os.environ.get('ONEVIEWSDK_USERNAME', ''),
+                                 authLoginDomain=os.environ.get('ONEVIEWSDK_AUTH_LOGIN_DOMAIN', ''),
+                                 password=os.environ.get('ONEVIEWSDK_PASSWORD', ''),
+                                 sessionID=os.environ.get('ONEVIEWSDK_SESSIONID', '')),
+                proxy=os.environ.get('ONEVIEWSDK_PROXY', ''),
+                timeout=os.environ.get('ONEVIEWSDK_CONNECTION_TIMEOUT'))
+
+
+def create_oneview_client(params):
+    """
+    Creates the OneViewClient from the module parameters, the config file or the environment variables.
+    When the cache directory is provided, the login session and the negotiated API version are reused
+    across module executions.
+    :arg dict params: Module parameters.
+    :return: OneViewClient
+    """
+    cache_enabled = bool(params.get('cache_dir'))
+
+    if params.get('hostname'):
+        config = dict(ip=params['hostname'],
+                      credentials=dict(userName=params['username'], password=params['password'],
+                                       authLoginDomain=params.get('auth_login_domain', '')),
+                      api_version=params['api_version'],
+                      image_streamer_ip=params['image_streamer_hostname'])
+    elif not params['config']:
+        if not cache_enabled:
+            return OneViewClient.from_environment_variables()
+        config = _load_environment_config()
+    else:
+        if not cache_enabled:
+            return OneViewClient.from_json_file(params['config'])
+        with open(params['config']) as json_data:
+            config = json.load(json_data)
+
+    if not cache_enabled:
+        return OneViewClient(config)
+
+    session_cache = OneViewSessionCache.from_params(params)
+    version_cache = OneViewVersionCache.from_params(params)
+    return version_cache.create_client(config, session_cache.create_client)
+
+
+def create_module_client(params, timer=None, cache_responses=False):
+    """
+    Creates the OneViewClient of a module execution, measuring the login and the requests with the timer and
+    serving the GET requests through the response cache when enabled.
+    :arg dict params: Module parameters.
+    :arg OneViewTimer timer: Timer of the module execution, or None.
+    :arg bool cache_responses: Whether the GET responses are revalidated instead of transferred again.
+    :return: OneViewClient
+    """
+    if timer:
+        with timer.measure('login'):
+            oneview_client = create_oneview_client(params)
+    else:
+        oneview_client = create_oneview_client(params)
+
+    if cache_responses:
+        response_cache = OneViewResponseCache.from_params(params, oneview_client.connection)
+        if response_cache:
+            response_cache.install()
+
+    if timer:
+        timer.install(oneview_client.connection)
+    return oneview_client
+
+
+def _get_all_pages(resource_client, params, on_page=None):
+    """
+    Gets the resources of a collection with the facts params, which are passed to get_all, including the fields
+    and view projections.
+    With the page_size param, the collection is requested one page at a time. With the output_file param, each page
+    is written to the file as JSON Lines as soon as it is received, instead of being returned, so that the memory
+    used does not depend on the collection size.
+    :arg resource_client: OneView resource client.
+    :arg dict params: Facts params.
+    :arg on_page: Function called with the resources of each page as soon as it is received, such as to gather
+        facts about them when they are written to the output file.
+    :return: tuple: The resources, empty when written to the output file, and the output file summary or None.
+    """
+    params = dict(params)
+    page_size = params.pop('page_size', None)
+    output_file = params.pop('output_file', None)
+
+    if not page_size and not output_file:
+        resources = resource_client.get_all(**params)
+        if on_page:
+            on_page(resources)
+        return resources, None
+
+    page_size = page_size or FACTS_PAGE_SIZE
+    start = params.pop('start', 0)
+    limit = params.pop('count', -1)
+    resources = []
+    output = open(os.path.expanduser(output_file), 'w') if output_file else None
+    total = 0
+
+    try:
+        while limit < 0 or total < limit:
+            count = page_size if limit < 0 else min(page_size, limit - total)
+            page = resource_client.get_all(start=start + total, count=count, **params)
+            if on_page:
+                on_page(page)
+            if output:
+                for resource in page:
+                    output.write(json.dumps(resource) + '\n')
+            else:
+                resources.extend(page)
+            total += len(page)
+            if len(page) < count:
+                break
+    finally:
+        if output:
+            output.close()
+
+    return resources, dict(path=output_file, count=total) if output_file else None
+
+
+MSG_GATHER_TIMEOUT = "Waited {0} seconds for '{1}' to be retrieved."
+
+
+def run_concurrently(function, items, max_workers, timeout=None):
+    """
+    Calls the function for each item through a bounded pool of threads.
+    The calls run sequentially when max_workers is 1 and there is no timeout. The threads do not keep the module
+    running when a call does not finish within the timeout.
+    :arg function: Function called with each item.
+    :arg list items: Items.
+    :arg int max_workers: Maximum number of concurrent calls.
+    :arg int timeout: Maximum time, in seconds, to wait for each call since it started. None waits until the
+        calls finish.
+    :return: list: The results, in the same order of the items. The first exception raised, in the order of the
+        items, is re-raised after all the calls finish.
+    :raises OneViewModuleException: When a call does not finish within the timeout.
+    """
+    items = list(items)
+    if not timeout and (max_workers <= 1 or len(items) <= 1):
+        return [function(item) for item in items]
+
+    lock = threading.Lock()
+    pending = list(range(len(items)))
+    finished = [threading.Event() for item in items]
+    started, results, errors = {}, [None] * len(items), {}
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                index = pending.pop(0)
+                started[index] = time.time()
+            try:
+                results[index] = function(items[index])
+            except Exception as exception:
+                errors[index] = exception
+            finished[index].set()
+
+    for thread_index in range(max(min(max_workers, len(items)), 1)):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    for index, item in enumerate(items):
+        while not finished[index].is_set():
+            start = started.get(index)
+            if start is None:
+                # Not started yet, the calls before it are still running
+                finished[index].wait(0.1)
+            elif not timeout:
+                finished[index].wait()
+            elif time.time() < start + timeout:
+                finished[index].wait(start + timeout - time.time())
+            else:
+                raise OneViewModuleException(MSG_GATHER_TIMEOUT.format(timeout, item))
+
+    if errors:
+        raise errors[min(errors)]
+    return results
+
+
+def run_concurrently_by_key(function, items, max_workers, key, max_per_key=None):
+    """
+    Calls the function for each item through a bounded pool of threads, limiting also the concurrent calls for
+    the items of the same key, such as the servers of the same enclosure. The items are started in the given order,
+    skipping the ones whose key is at the limit until a call of that key finishes.
+    :arg function: Function called with each item.
+    :arg list items: Items.
+    :arg int max_workers: Maximum number of concurrent calls.
+    :arg key: Function that returns the key of an item.
+    :arg int max_per_key: Maximum number of concurrent calls for the items of the same key. None has no limit.
+    :return: list: The results, in the same order of the items. The first exception raised is re-raised
+        after all the calls finish.
+    """
+    items = list(items)
+    max_per_key = max_per_key or len(items)
+    if max_per_key >= len(items):
+        return run_concurrently(function, items, max_workers)
+
+    condition = threading.Condition()
+    pending = list(range(len(items)))
+    running = collections.defaultdict(int)
+    results, errors = [None] * len(items), {}
+
+    def take():
+        for position, index in enumerate(pending):
+            if running[key(items[index])] < max_per_key:
+                return pending.pop(position)
+        return None
+
+    def worker():
+        while True:
+            with condition:
+                index = take()
+                while index is None and pending:
+                    condition.wait()
+                    index = take()
+                if index is None:
+                    return
+                item_key = key(items[index])
+                running[item_key] += 1
+            try:
+                results[index] = function(items[index])
+            except Exception as exception:
+                errors[index] = exception
+            with condition:
+                running[item_key] -= 1
+                condition.notify_all()
+
+    threads = [threading.Thread(target=worker) for index in range(max(min(max_workers, len(items)), 1))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[min(errors)]
+    return results
+
+
+def gather_concurrently(functions, max_workers, timeout=None):
+    """
+    Calls independent functions, such as the requests of the facts options, through run_concurrently.
+    :arg dict functions: Functions without arguments, by key.
+    :arg int max_workers: Maximum number of concurrent calls.
+    :arg int timeout: Maximum time, in seconds, to wait for each call since it started. None waits until the
+        calls finish.
+    :return: dict: The result of each function, by key. The exception raised by the first function, in the order
+        of the keys, is re-raised after all the calls finish.
+    :raises OneViewModuleException: When a call does not finish within the timeout.
+    """
+    keys = list(functions.keys())
+    return dict(zip(keys, run_concurrently(lambda key: functions[key](), keys, max_workers, timeout)))
+
+
+class OneViewUtilizationExport(object):
+    """
+    Writes the metric samples of the utilization of many resources to a local file, instead of returning the
+    nested utilization of each resource in the facts.
+    The CSV format has one row per sample, with the resource URI, the metric name, the sample timestamp and the
+    value. The JSON format has, for each resource and metric, an array of timestamps and an array of values.
+    The newest sample written for each resource and metric is kept in a state file next to the output file, so
+    that incremental exports only request and write the samples taken since the last run.
+    Attributes:
+       path (str): Output file path.
+       output_format (str): csv or json.
+       incremental (bool): Whether the samples are added to the ones of the previous runs.
+    """
+    OUTPUT_FORMATS = ['csv', 'json']
+    STATE_FILE_SUFFIX = '.state.json'
+    CSV_HEADER = ['uri', 'metric', 'timestamp', 'value']
+    MSG_INVALID_FORMAT = "Invalid utilization output_format '{0}', expected one of: {1}."
+
+    def __init__(self, path, output_format='csv', incremental=True):
+        if output_format not in self.OUTPUT_FORMATS:
+            raise OneViewModuleValueError(self.MSG_INVALID_FORMAT.format(output_format, ', '.join(self.OUTPUT_FORMATS)))
+        self.path = os.path.expanduser(path)
+        self.output_format = output_format
+        self.incremental = incremental
+        self.state = self._load_state() if incremental and os.path.exists(self.path) else {}
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Creates the export from the params of the utilization facts option.
+        :arg params: Utilization option value.
+        :return: OneViewUtilizationExport: The export, or None when there is no output_file param.
+        """
+        if not isinstance(params, dict) or not params.get('output_file'):
+            return None
+        incremental = params.get('incremental')
+        return cls(params['output_file'], params.get('output_format') or 'csv',
+                   True if incremental is None else incremental)
+
+    def filter(self, uri, filter=None):
+        """
+        Gets the filter of the utilization request of a resource, with a startDate after the newest sample already
+        written, which replaces the one given.
+        :arg str uri: Resource URI.
+        :arg filter: Filter of the utilization option, a string or a list.
+        :return: The filter.
+        """
+        since = min(self.state[uri].values()) if self.state.get(uri) else None
+        if since is None:
+            return filter
+        filters = [filter] if isinstance(filter, six.string_types) else list(filter or [])
+        filters = [item for item in filters if not item.startswith('startDate=')]
+        return filters + ['startDate=' + _format_utilization_time(since + 1)]
+
+    def write(self, utilizations):
+        """
+        Writes the samples of the utilizations newer than the ones already written.
+        :arg dict utilizations: Utilization of each resource, by resource URI.
+        :return: dict: The output file path and the number of samples written.
+        """
+        columns = OrderedDict()
+        count = 0
+        for uri, utilization in utilizations.items():
+            newest = self.state.setdefault(uri, {})
+            for metric in (utilization or {}).get('metricList') or []:
+                name = metric.get('metricName')
+                last = newest.get(name)
+                samples = sorted(sample for sample in metric.get('metricSamples') or []
+                                 if last is None or sample[0] > last)
+                if samples:
+                    columns.setdefault(uri, OrderedDict())[name] = samples
+                    newest[name] = samples[-1][0]
+                    count += len(samples)
+
+        if self.output_format == 'csv':
+            self._write_csv(columns)
+        else:
+            self._write_json(columns)
+        if self.incremental:
+            self._dump_state()
+
+        return dict(path=self.path, count=count)
+
+    def _write_csv(self, columns):
+        append = self.incremental and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        with self._open_csv('a' if append else 'w') as output:
+            writer = csv.writer(output)
+            if not append:
+                writer.writerow(self.CSV_HEADER)
+            for uri, metrics in columns.items():
+                for name, samples in metrics.items():
+                    writer.writerows([uri, name, timestamp, value] for timestamp, value in samples)
+
+    def _open_csv(self, mode):
+        # The csv module of Python 2 writes bytes, the one of Python 3 writes text with its own line endings
+        if six.PY2:
+            return open(self.path, mode + 'b')
+        return io.open(self.path, mode, newline='')
+
+    def _write_json(self, columns):
+        resources = {}
+        if self.incremental:
+            try:
+                with open(self.path) as output:
+                    resources = json.load(output).get('resources', {})
+            except (IOError, OSError, ValueError):
+                resources = {}
+
+        for uri, metrics in columns.items():
+            for name, samples in metrics.items():
+                column = resources.setdefault(uri, {}).setdefault(name, dict(timestamps=[], values=[]))
+                column['timestamps'].extend(timestamp for timestamp, value in samples)
+                column['values'].extend(value for timestamp, value in samples)
+
+        self._dump(self.path, dict(resources=resources))
+
+    def _load_state(self):
+        try:
+            with open(self.path + self.STATE_FILE_SUFFIX) as state_file:
+                return json.load(state_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _dump_state(self):
+        self._dump(self.path + self.STATE_FILE_SUFFIX, self.state)
+
+    def _dump(self, path, data):
+        # Writes to a temporary file and renames it, so an interrupted run does not leave a partial file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(fd, 'w') as output:
+            json.dump(data, output)
+        os.rename(temp_path, path)
+
+
+def _format_utilization_time(timestamp):
+    """
+    Formats a sample timestamp, in milliseconds since the epoch, as the dates of the utilization filters.
+    """
+    seconds, milliseconds = divmod(int(timestamp), 1000)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + '.{0:03d}Z'.format(milliseconds)
+
+
+class OneViewTaskWaiter(object):
+    """
+    Waits for the completion of OneView tasks, polling the task resource with an exponential backoff and jitter,
+    so that short tasks are noticed quickly, long tasks do not flood the appliance with requests, and the modules
+    running in parallel do not poll in lockstep.
+    Attributes:
+       timeout (int): Maximum time, in seconds, to wait for a task. None waits until the task completes.
+    """
+    PENDING_STATES = ['New', 'Starting', 'Pending', 'Running', 'Suspended', 'Stopping']
+    ERROR_STATES = ['Error', 'Terminated', 'Killed']
+    MSG_TIMEOUT = "Waited {0} seconds for the task '{1}' to complete."
+    MSG_TASK_FAILED = "Task '{0}' finished with state '{1}'."
+
+    def __init__(self, connection, timeout=None, initial_delay=1, max_delay=30, factor=2):
+        self.connection = connection
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+
+    def delay(self, attempt):
+        """
+        Gets the time to wait before the given attempt: it grows exponentially up to the maximum delay, and a random
+        jitter of up to half of it is subtracted.
+        :arg int attempt: Attempt number, starting at 0.
+        :return: float: Delay in seconds.
+        """
+        delay = min(self.max_delay, self.initial_delay * self.factor ** attempt)
+        return delay - random.uniform(0, delay / 2.0)
+
+    def wait(self, task):
+        """
+        Waits for a task to complete.
+        :arg dict task: OneView task resource.
+        :return: dict: The completed task.
+        :raises OneViewModuleTaskError: When the task fails or the timeout expires.
+        """
+        deadline = time.time() + self.timeout if self.timeout else None
+        attempt = 0
+
+        while task.get('taskState') in self.PENDING_STATES:
+            delay = self.delay(attempt)
+            if deadline and time.time() + delay > deadline:
+                raise OneViewModuleTaskError(self.MSG_TIMEOUT.format(self.timeout, task.get('name')))
+            time.sleep(delay)
+            attempt += 1
+            task = self.connection.get(task['uri'])
+
+        if task.get('taskState') in self.ERROR_STATES:
+            errors = task.get('taskErrors') or [{}]
+            msg = errors[0].get('message') or task.get('taskStatus') or \
+                self.MSG_TASK_FAILED.format(task.get('name'), task['taskState'])
+            raise OneViewModuleTaskError(msg, errors[0].get('errorCode'))
+
+        return task
+
+    def update(self, uri, data):
+        """
+        Sends a PUT request and waits for the task started by it.
+        :arg str uri: Resource URI.
+        :arg dict data: Request body.
+        :return: dict: The completed task, or the response body when no task was started.
+        """
+        task, body = self.connection.put(uri, data)
+        return self.wait(task) if task else body
+
+
+class OneViewBusyRetry(object):
+    """
+    Retries an operation refused because the resource is busy: an operation ongoing on it, such as the task started
+    by another module execution, or a concurrent change that made the eTag of the request stale.
+    Between the attempts, it waits for the task running on the resource, when one is found, so that the operation is
+    retried as soon as the resource is free; otherwise it sleeps with an exponential backoff and jitter. The operation
+    is not retried after the maximum time.
+    Attributes:
+       max_time (int): Maximum time, in seconds, to retry the operation. 0 does not retry it.
+    """
+    BUSY_ERROR_CODES = ['CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT', 'CRM_ETAG_CHECK_FAILED']
+    RUNNING_TASKS_URI = '/rest/tasks?filter={0}&filter={1}&sort=created:descending'
+
+    def __init__(self, max_time=600, connection=None, error_codes=None, initial_delay=2, max_delay=60, factor=2):
+        """
+        :arg int max_time: Maximum time, in seconds, to retry the operation.
+        :arg connection: OneView connection, used to find and wait for the task running on the resource.
+        :arg list error_codes: Error codes of the busy resource errors.
+        """
+        self.max_time = max_time
+        self.connection = connection
+        self.error_codes = error_codes or self.BUSY_ERROR_CODES
+        self.backoff = OneViewTaskWaiter(connection, initial_delay=initial_delay, max_delay=max_delay, factor=factor)
+        self.attempts = 0
+
+    @classmethod
+    def from_params(cls, params, connection=None, error_codes=None):
+        """
+        Builds the retry policy from the module parameters.
+        :arg dict params: Module parameters.
+        :arg connection: OneView connection.
+        :arg list error_codes: Error codes of the busy resource errors.
+        :return: OneViewBusyRetry
+        """
+        busy_timeout = params.get('busy_timeout')
+        return cls(BUSY_RETRY_ARGS['busy_timeout']['default'] if busy_timeout is None else busy_timeout,
+                   connection, error_codes)
+
+    def call(self, function, resource_uri=None, before_retry=None):
+        """
+        Calls the function, and calls it again while it fails because the resource is busy.
+        :arg function: Function called without arguments.
+        :arg str resource_uri: URI of the resource, whose running task is waited for between the attempts.
+        :arg before_retry: Function called before each new attempt, such as to reload the resource.
+        :return: The result of the function.
+        :raises: The exception of the last attempt, when it is not a busy resource error or the time is over.
+        """
+        deadline = time.time() + (self.max_time or 0)
+        self.attempts = 0
+        while True:
+            self.attempts += 1
+            try:
+                return function()
+            except Exception as exception:
+                if not self.is_busy(exception) or not self._wait(resource_uri, deadline):
+                    raise
+                logger.debug("Resource busy, retrying: %s", to_native(exception))
+            if before_retry:
+                before_retry()
+
+    def is_busy(self, exception):
+        """
+        Checks if an exception means that the resource is busy.
+        :arg Exception exception: Exception raised by the operation.
+        :return: bool
+        """
+        error_code = getattr(exception, 'error_code', None)
+        response = getattr(exception, 'oneview_response', None)
+        if not error_code and isinstance(response, dict):
+            error_code = response.get('errorCode')
+        return error_code in self.error_codes
+
+    def _wait(self, resource_uri, deadline):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+
+        task = self._get_running_task(resource_uri)
+        if task:
+            try:
+                OneViewTaskWaiter(self.connection, timeout=remaining).wait(task)
+            except OneViewModuleTaskError:
+                # The task of the other operation failed, or did not finish in time: the next attempt tells
+                pass
+            return True
+
+        delay = self.backoff.delay(self.attempts - 1)
+        if delay > remaining:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _get_running_task(self, resource_uri):
+        if not self.connection or not resource_uri:
+            return None
+        quote = six.moves.urllib.parse.quote
+        uri = self.RUNNING_TASKS_URI.format(quote('"associatedResource.resourceUri=\'{0}\'"'.format(resource_uri)),
+                                            quote('"taskState=\'Running\'"'))
+        try:
+            tasks = self.connection.get(uri).get('members') or []
+        except HPEOneViewException:
+            return None
+        return tasks[0] if tasks else None
+
+
+class OneViewTimer(object):
+    """
+    Records the time spent by a module execution on the appliance: the login, each request and the wait for each
+    task, which is the time from the request that started the task until the poll that saw it finished.
+    The summary is returned in the module result and, with a timing file, appended to it as a JSON line with every
+    call, for later analysis.
+    Attributes:
+       path (str): Path of the JSON Lines file the executions are appended to, or None.
+    """
+    REQUEST_METHODS = ['get', 'post', 'put', 'patch', 'delete']
+    TASKS_URI = '/rest/tasks/'
+
+    def __init__(self, path=None):
+        self.path = os.path.expanduser(path) if path else None
+        self.started = time.time()
+        self.calls = []
+        self.tasks = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds the timer from the module parameters.
+        :arg dict params: Module parameters.
+        :return: OneViewTimer or None when the timing is not enabled.
+        """
+        if not params.get('timing') and not params.get('timing_file'):
+            return None
+        return cls(params.get('timing_file'))
+
+    @contextmanager
+    def measure(self, operation, uri=None):
+        """
+        Records the time spent by a block of code, such as the login.
+        :arg str operation: Operation name.
+        :arg str uri: URI the operation refers to.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._record(operation, uri, start, time.time())
+
+    def install(self, connection):
+        """
+        Makes the requests of the connection, including the task polls, be recorded.
+        :arg connection: OneView connection.
+        :return: OneViewTimer: self.
+        """
+        for method in self.REQUEST_METHODS:
+            setattr(connection, method, self._wrap(method.upper(), getattr(connection, method)))
+        return self
+
+    def summary(self):
+        """
+        Summarizes the calls recorded.
+        :return: dict: The total duration, the count, total and maximum duration of each operation, and the
+            duration, number of polls and final state of each task waited for.
+        """
+        operations = OrderedDict()
+        with self._lock:
+            for call in self.calls:
+                stats = operations.setdefault(call['operation'], dict(count=0, total=0.0, max=0.0))
+                stats['count'] += 1
+                stats['total'] += call['duration']
+                stats['max'] = max(stats['max'], call['duration'])
+            task_waits = [dict(uri=task['uri'], name=task.get('name'), state=task.get('state'), polls=task['polls'],
+                               duration=round(task['finished'] - task['started'], 3))
+                          for task in self.tasks.values() if task.get('finished')]
+
+        for stats in operations.values():
+            stats['total'] = round(stats['total'], 3)
+        return dict(duration=round(time.time() - self.started, 3), operations=operations, task_waits=task_waits)
+
+    def write(self, module_name, summary):
+        """
+        Appends the execution to the timing file, as a JSON line with the summary and every call.
+        :arg str module_name: Name of the module executed.
+        :arg dict summary: The summary of the execution.
+        """
+        if not self.path:
+            return
+        line = dict(module=module_name, started=round(self.started, 3), calls=self.calls, **summary)
+        with open(self.path, 'a') as timing_file:
+            timing_file.write(json.dumps(line) + '\n')
+
+    def _wrap(self, operation, request):
+        def timed_request(uri, *args, **kwargs):
+            start = time.time()
+            try:
+                response = request(uri, *args, **kwargs)
+            finally:
+                end = time.time()
+                self._record(operation, uri, start, end)
+            self._track_task(operation, uri, response, start, end)
+            return response
+        return timed_request
+
+    def _record(self, operation, uri, start, end):
+        with self._lock:
+            self.calls.append(dict(operation=operation, uri=uri, start=round(start, 3), duration=round(end - start, 3)))
+
+    def _track_task(self, operation, uri, response, start, end):
+        if operation == 'GET':
+            task = response if isinstance(uri, six.string_types) and uri.startswith(self.TASKS_URI) else None
+            started = start
+        else:
+            task = response[0] if isinstance(response, tuple) else None
+            started = end
+        if not isinstance(task, dict) or not task.get('uri'):
+            return
+
+        with self._lock:
+            entry = self.tasks.setdefault(task['uri'], dict(uri=task['uri'], started=started, polls=0))
+            entry.update(name=task.get('name'), state=task.get('taskState'))
+            if operation == 'GET':
+                entry['polls'] += 1
+            if task.get('taskState') not in OneViewTaskWaiter.PENDING_STATES:
+                entry.setdefault('finished', end)
+
+
+class OneViewBandwidthLimiter(object):
+    """
+    Limits the rate of a transfer, sleeping as needed after each chunk so that the average rate since the start
+    does not exceed the ceiling.
+    Attributes:
+       max_bandwidth (int): Maximum rate, in bytes per second. None has no limit.
+    """
+
+    def __init__(self, max_bandwidth=None):
+        self.max_bandwidth = max_bandwidth
+        self.started = time.time()
+        self.transferred = 0
+
+    def consume(self, size):
+        """
+        Accounts the bytes of a chunk transferred, waiting until the rate is below the ceiling.
+        :arg int size: Number of bytes transferred.
+        """
+        self.transferred += size
+        if not self.max_bandwidth:
+            return
+        delay = self.started + float(self.transferred) / self.max_bandwidth - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def file_sha256(file_path, chunk_size=1048576):
+    """
+    Computes the SHA-256 digest of a file, reading it in chunks so that the memory used does not depend on its size.
+    :arg str file_path: File path.
+    :arg int chunk_size: Number of bytes read at a time.
+    :return: str: The hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as input_file:
+        for chunk in iter(lambda: input_file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OneViewMultipartUpload(object):
+    """
+    Uploads a file to the appliance as a multipart request, as the SDK does, but streaming it from disk chunk by
+    chunk instead of writing an encoded copy of it first, with a bandwidth ceiling and progress reporting.
+    The appliance does not resume partial uploads, so an upload interrupted by a connection failure is started
+    again, up to the given number of retries, with an exponential backoff.
+    """
+    BOUNDARY = '----------OneViewAnsibleUploadBoundary'
+    MSG_UPLOAD_FAILED = "Upload of '{0}' failed after {1} attempt(s): {2}"
+
+    def __init__(self, connection, chunk_size=1048576, max_bandwidth=None, retries=3, progress=None):
+        """
+        :arg connection: OneView connection.
+        :arg int chunk_size: Number of bytes read and sent at a time.
+        :arg int max_bandwidth: Maximum upload rate, in bytes per second. None has no limit.
+        :arg int retries: Number of times an interrupted upload is started again.
+        :arg progress: Function called with the number of bytes sent and the total after each chunk.
+        """
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.max_bandwidth = max_bandwidth
+        self.retries = retries
+        self.progress = progress
+        self.attempts = 0
+
+    def post(self, uri, file_path):
+        """
+        Uploads the file.
+        :arg str uri: Collection URI.
+        :arg str file_path: Local file path.
+        :return: tuple: The task started by the upload, or None, and the response body.
+        :raises OneViewModuleException: When the upload fails after all the retries.
+        """
+        task_waiter = OneViewTaskWaiter(self.connection)
+        while True:
+            self.attempts += 1
+            try:
+                return self._post(uri, file_path)
+            except (IOError, OSError, six.moves.http_client.HTTPException) as exception:
+                if self.attempts > self.retries:
+                    raise OneViewModuleException(
+                        self.MSG_UPLOAD_FAILED.format(file_path, self.attempts, to_native(exception)))
+                logger.debug("Upload interrupted, starting it again: %s", to_native(exception))
+                time.sleep(task_waiter.delay(self.attempts - 1))
+
+    def _post(self, uri, file_path):
+        file_name = os.path.basename(file_path)
+        header = ('--{0}\r\nContent-Disposition: form-data; name="file"; filename="{1}"\r\n'
+                  'Content-Type: application/octet-stream\r\n\r\n').format(self.BOUNDARY, file_name).encode('utf-8')
+        footer = '\r\n--{0}--\r\n\r\n'.format(self.BOUNDARY).encode('utf-8')
+        total = len(header) + os.path.getsize(file_path) + len(footer)
+        limiter = OneViewBandwidthLimiter(self.max_bandwidth)
+
+        conn = self.connection.get_connection()
+        try:
+            conn.connect()
+            conn.putrequest('POST', uri)
+            conn.putheader('uploadfilename', file_name)
+            conn.putheader('auth', self.connection._headers['auth'])
+            conn.putheader('Content-Type', 'multipart/form-data; boundary=' + self.BOUNDARY)
+            conn.putheader('Content-Length', str(total))
+            conn.putheader('X-API-Version', self.connection._apiVersion)
+            conn.endheaders()
+
+            conn.send(header)
+            sent = len(header)
+            with open(file_path, 'rb') as input_file:
+                for chunk in iter(lambda: input_file.read(self.chunk_size), b''):
+                    conn.send(chunk)
+                    sent += len(chunk)
+                    limiter.consume(len(chunk))
+                    if self.progress:
+                        self.progress(sent, total)
+            conn.send(footer)
+
+            response = conn.getresponse()
+            body = response.read().decode('utf-8')
+        finally:
+            conn.close()
+
+        try:
+            body = json.loads(body) if body else {}
+        except ValueError:
+            pass
+        if response.status >= 400:
+            raise HPEOneViewException(body)
+
+        if response.status == 202 and response.getheader('Location'):
+            return self.connection.get(response.getheader('Location')), body
+        if isinstance(body, dict) and body.get('category') == 'tasks':
+            return body, body
+        return None, body
+
+
+class OneViewFileDownload(object):
+    """
+    Downloads a file from the appliance, streaming the response to disk chunk by chunk, with a bandwidth ceiling and
+    progress reporting.
+    The data is written to a partial file next to the destination, which is renamed when complete. A download
+    interrupted by a connection failure, in this or in a previous execution, is resumed from the end of the partial
+    file with an HTTP Range request, up to the given number of retries, with an exponential backoff. The size received
+    is verified against the one announced by the appliance and, when given, the SHA-256 digest against the expected one.
+    """
+    PARTIAL_SUFFIX = '.part'
+    REDIRECT_STATUSES = [301, 302, 303, 307]
+    MSG_DOWNLOAD_FAILED = "Download of '{0}' failed after {1} attempt(s): {2}"
+    MSG_INCOMPLETE = 'Received {0} of {1} bytes.'
+    MSG_RANGE_NOT_SATISFIABLE = 'The partial file does not match the file on the appliance.'
+    MSG_CHECKSUM_MISMATCH = "The SHA-256 digest of '{0}' is {1}, but {2} was expected."
+
+    def __init__(self, connection, chunk_size=1048576, max_bandwidth=None, retries=3, progress=None):
+        """
+        :arg connection: OneView or Image Streamer connection.
+        :arg int chunk_size: Number of bytes read and written at a time.
+        :arg int max_bandwidth: Maximum download rate, in bytes per second. None has no limit.
+        :arg int retries: Number of times an interrupted download is resumed.
+        :arg progress: Function called with the number of bytes received and the total, or None when it is unknown,
+            after each chunk.
+        """
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.max_bandwidth = max_bandwidth
+        self.retries = retries
+        self.progress = progress
+        self.attempts = 0
+        self.resumed_from = 0
+
+    def get(self, uri, file_path, checksum=None):
+        """
+        Downloads the file.
+        :arg str uri: Download URI.
+        :arg str file_path: Local file path.
+        :arg str checksum: Expected SHA-256 digest of the file, in hexadecimal.
+        :return: dict: The path, size and SHA-256 digest of the file.
+        :raises OneViewModuleException: When the download fails after all the retries, or the file does not match
+            the checksum.
+        """
+        partial_path = file_path + self.PARTIAL_SUFFIX
+        task_waiter = OneViewTaskWaiter(self.connection)
+        while True:
+            self.attempts += 1
+            try:
+                digest, size = self._get(uri, partial_path)
+                break
+            except (IOError, OSError, six.moves.http_client.HTTPException) as exception:
+                if self.attempts > self.retries:
+                    raise OneViewModuleException(
+                        self.MSG_DOWNLOAD_FAILED.format(uri, self.attempts, to_native(exception)))
+                logger.debug("Download interrupted, resuming it: %s", to_native(exception))
+                time.sleep(task_waiter.delay(self.attempts - 1))
+
+        sha256 = digest.hexdigest()
+        if checksum and sha256 != checksum.lower():
+            os.remove(partial_path)
+            raise OneViewModuleException(self.MSG_CHECKSUM_MISMATCH.format(file_path, sha256, checksum))
+        os.rename(partial_path, file_path)
+        return dict(path=file_path, size=size, sha256=sha256)
+
+    def _get(self, uri, partial_path):
+        offset = os.path.getsize(partial_path) if os.path.isfile(partial_path) else 0
+        headers = self.connection._headers.copy()
+        if offset:
+            headers['Range'] = 'bytes={0}-'.format(offset)
+
+        conn = self.connection.get_connection()
+        try:
+            conn.request('GET', uri, '', headers)
+            response = conn.getresponse()
+
+            if response.status in self.REDIRECT_STATUSES and response.getheader('Location'):
+                response.read()
+                return self._get(response.getheader('Location'), partial_path)
+
+            if response.status == 416 and offset:
+                # A previous attempt was interrupted after receiving the whole file
+                response.read()
+                if _parse_content_range(response.getheader('Content-Range'))[1] == offset:
+                    return self._digest(partial_path, offset), offset
+                os.remove(partial_path)
+                raise IOError(self.MSG_RANGE_NOT_SATISFIABLE)
+
+            if response.status >= 400:
+                body = response.read().decode('utf-8')
+                try:
+                    body = json.loads(body) if body else {}
+                except ValueError:
+                    pass
+                raise HPEOneViewException(body)
+
+            if response.status == 206:
+                start, total = _parse_content_range(response.getheader('Content-Range'))
+                if start != offset:
+                    os.remove(partial_path)
+                    raise IOError(self.MSG_RANGE_NOT_SATISFIABLE)
+                digest = self._digest(partial_path, offset)
+            else:
+                # The appliance may ignore the range and send the whole file
+                offset = 0
+                length = response.getheader('Content-Length')
+                total = int(length) if length else None
+                digest = hashlib.sha256()
+
+            self.resumed_from = offset
+            size = offset
+            limiter = OneViewBandwidthLimiter(self.max_bandwidth)
+            with open(partial_path, 'ab' if offset else 'wb') as output_file:
+                for chunk in iter(lambda: response.read(self.chunk_size), b''):
+                    output_file.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    limiter.consume(len(chunk))
+                    if self.progress:
+                        self.progress(size, total)
+        finally:
+            conn.close()
+
+        if total is not None and size != total:
+            raise IOError(self.MSG_INCOMPLETE.format(size, total))
+        return digest, size
+
+    def _digest(self, file_path, size):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as input_file:
+            remaining = size
+            while remaining > 0:
+                chunk = input_file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        return digest
+
+
+def _parse_content_range(content_range):
+    """
+    Parses a Content-Range header, such as 'bytes 100-999/1000' or 'bytes */1000'.
+    :return: tuple: The first byte position and the total size, each None when unknown.
+    """
+    try:
+        byte_range, total = (content_range or '').split(' ', 1)[-1].split('/')
+        start = byte_range.split('-')[0]
+        return (int(start) if start.isdigit() else None), (int(total) if total.isdigit() else None)
+    except ValueError:
+        return None, None
+
+
+class OneViewFileTransfer(object):
+    """
+    Transfers the files of the modules that download resources from the appliance or upload them to it, with the
+    options of TRANSFER_ARGS, streaming them chunk by chunk from and to disk.
+    A download is skipped when the local file already matches: when its SHA-256 digest is the expected one, or, with
+    a cache directory, when the digest recorded after the previous download of the same version of the resource.
+    Several files can be transferred concurrently.
+    """
+    CACHE_FILE_NAME = 'oneview_downloads.json'
+    CACHE_TTL = 30 * 86400
+    # The transfer progress is logged every time this fraction of the file is transferred
+    PROGRESS_STEP = 0.1
+
+    def __init__(self, connection, chunk_size=1048576, max_bandwidth=None, retries=3, max_workers=4,
+                 task_timeout=None, cache=None, log=None):
+        """
+        :arg connection: OneView or Image Streamer connection.
+        :arg int chunk_size: Number of bytes transferred at a time.
+        :arg int max_bandwidth: Maximum rate of each transfer, in bytes per second. None has no limit.
+        :arg int retries: Number of times an interrupted transfer is resumed or started again.
+        :arg int max_workers: Maximum number of concurrent transfers.
+        :arg int task_timeout: Maximum time, in seconds, to wait for the task started by an upload.
+        :arg OneViewFileCache cache: Cache of the digests of the files downloaded.
+        :arg log: Function called with the progress messages.
+        """
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.max_bandwidth = max_bandwidth
+        self.retries = retries
+        self.max_workers = max_workers
+        self.task_timeout = task_timeout
+        self.cache = cache
+        self.log = log
+
+    @classmethod
+    def from_params(cls, params, connection, log=None):
+        """
+        Builds the transfer from the module parameters.
+        :arg dict params: Module parameters.
+        :arg connection: OneView or Image Streamer connection.
+        :arg log: Function called with the progress messages.
+        :return: OneViewFileTransfer
+        """
+        max_bandwidth = params.get('max_bandwidth')
+        return cls(connection,
+                   chunk_size=params.get('chunk_size') or 1048576,
+                   max_bandwidth=max_bandwidth * 1024 if max_bandwidth else None,
+                   retries=params.get('transfer_retries', 3),
+                   max_workers=params.get('max_workers') or 4,
+                   task_timeout=params.get('task_timeout'),
+                   cache=OneViewFileCache.from_params(params, cls.CACHE_FILE_NAME, cls.CACHE_TTL),
+                   log=log)
+
+    def download(self, uri, file_path, version=None, checksum=None):
+        """
+        Downloads a file, unless the local file already matches.
+        :arg str uri: Download URI.
+        :arg str file_path: Local file path.
+        :arg str version: Version of the resource downloaded, such as its eTag, used to reuse the digest of the
+            previous download.
+        :arg str checksum: Expected SHA-256 digest of the file, in hexadecimal.
+        :return: dict: The path, size and SHA-256 digest of the file, whether it was downloaded and, when so, the
+            number of attempts, the number of bytes resumed from a partial file, the duration and the average rate.
+        """
+        file_path = os.path.expanduser(file_path)
+        cache_key = '|'.join([self.connection.get_host(), uri]) if self.cache else None
+
+        expected = dict(sha256=checksum.lower()) if checksum else None
+        if not expected and cache_key and version:
+            entry = self.cache.get(cache_key)
+            expected = entry if entry and entry.get('version') == version else None
+        if expected and self._matches(file_path, expected):
+            return dict(path=file_path, size=os.path.getsize(file_path), sha256=expected['sha256'],
+                        downloaded=False)
+
+        downloader = OneViewFileDownload(self.connection, chunk_size=self.chunk_size,
+                                         max_bandwidth=self.max_bandwidth, retries=self.retries,
+                                         progress=self._progress('Downloading', file_path))
+        started = time.time()
+        result = downloader.get(uri, file_path, checksum)
+        duration = time.time() - started
+
+        if cache_key and version:
+            self.cache.set(cache_key, dict(version=version, size=result['size'], sha256=result['sha256']))
+
+        transferred = result['size'] - downloader.resumed_from
+        result.update(downloaded=True, attempts=downloader.attempts, resumed_from=downloader.resumed_from,
+                      duration=round(duration, 3), rate=int(transferred / duration) if duration else transferred)
+        return result
+
+    def upload(self, uri, file_path):
+        """
+        Uploads a file as a multipart request and waits for the task started by it.
+        :arg str uri: Upload URI.
+        :arg str file_path: Local file path.
+        :return: tuple: The resource associated to the task, or the response body, and a dict with the path and size
+            of the file, the number of attempts, the duration and the average rate of the upload.
+        """
+        file_path = os.path.expanduser(file_path)
+        uploader = OneViewMultipartUpload(self.connection, chunk_size=self.chunk_size,
+                                          max_bandwidth=self.max_bandwidth, retries=self.retries,
+                                          progress=self._progress('Uploading', file_path))
+        started = time.time()
+        task, body = uploader.post(uri, file_path)
+        duration = time.time() - started
+
+        if task:
+            task = OneViewTaskWaiter(self.connection, self.task_timeout).wait(task)
+            resource_uri = (task.get('associatedResource') or {}).get('resourceUri')
+            body = self.connection.get(resource_uri) if resource_uri else task
+
+        size = os.path.getsize(file_path)
+        return body, dict(path=file_path, size=size, attempts=uploader.attempts, duration=round(duration, 3),
+                          rate=int(size / duration) if duration else size)
+
+    def run_concurrently(self, function, items):
+        """
+        Calls the function for each item, running up to max_workers transfers at a time.
+        :arg function: Function called with each item.
+        :arg list items: Items.
+        :return: list: The results, in the same order of the items.
+        """
+        return run_concurrently(function, items, self.max_workers)
+
+    def _matches(self, file_path, expected):
+        if not os.path.isfile(file_path):
+            return False
+        if expected.get('size') is not None and os.path.getsize(file_path) != expected['size']:
+            return False
+        return file_sha256(file_path, self.chunk_size) == expected['sha256']
+
+    def _progress(self, operation, file_path):
+        if not self.log:
+            return None
+        progress = dict(next=self.PROGRESS_STEP)
+
+        def log_progress(transferred, total):
+            ratio = float(transferred) / total if total else 0
+            if ratio >= progress['next']:
+                self.log('{0} {1}: {2} of {3} bytes transferred.'.format(operation, file_path, transferred, total))
+                progress['next'] = (int(ratio / self.PROGRESS_STEP) + 1) * self.PROGRESS_STEP
+
+        return log_progress
+
+
+class ServerHardwareAllocator(object):
+    """
+    Selects the server hardware assigned to new server profiles among the available ones, so that the profiles
+    created in parallel do not compete for the same server hardware.
+    Selection methods:
+       first: The first server hardware, in the order returned by the appliance.
+       random: A random server hardware.
+       hash: The server hardware are ranked by a hash of the profile and hardware URI, so each profile prefers a
+           different server hardware, and the same one on every execution.
+    With a lease file, the selected server hardware are reserved for the lease TTL, and the forks running on the
+    controller select the server hardware not reserved by the others.
+    """
+    SELECTION_METHODS = ['first', 'random', 'hash']
+    CACHE_FILE_NAME = 'oneview_server_hardware_leases.json'
+    LEASES_KEY = 'leases'
+    # The leases expire individually, the cache entry holding them is kept
+    LEASES_CACHE_TTL = 86400
+
+    def __init__(self, method='first', leases=None, lease_ttl=None):
+        self.method = method or 'first'
+        self.leases = leases
+        self.lease_ttl = lease_ttl
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds the allocator from the module parameters.
+        :arg dict params: Module parameters.
+        :return: ServerHardwareAllocator
+        """
+        cache_dir = params.get('cache_dir')
+        lease_ttl = params.get('server_hardware_lease_ttl')
+        leases = None
+        if cache_dir and lease_ttl:
+            _ensure_cache_dir(cache_dir)
+            leases = OneViewFileCache(os.path.join(cache_dir, cls.CACHE_FILE_NAME), cls.LEASES_CACHE_TTL)
+        return cls(params.get('server_hardware_selection'), leases, lease_ttl)
+
+    def rank(self, profile_name, server_hardware_uris):
+        """
+        Orders the server hardware by preference for a profile.
+        :arg str profile_name: Server profile name.
+        :arg list server_hardware_uris: Available server hardware URIs.
+        :return: list: The server hardware URIs, most preferred first.
+        """
+        uris = [uri for index, uri in enumerate(server_hardware_uris) if uri and uri not in server_hardware_uris[:index]]
+        if self.method == 'random':
+            random.shuffle(uris)
+        elif self.method == 'hash':
+            uris.sort(key=lambda uri: hashlib.sha256((profile_name + '|' + uri).encode('utf-8')).hexdigest())
+        return uris
+
+    def select(self, profile_name, server_hardware_uris, avoid=None):
+        """
+        Selects a server hardware for a profile, leasing it when the lease file is enabled.
+        The server hardware leased to other profiles are never selected, the ones in the avoid list are only selected
+        when there is no other.
+        :arg str profile_name: Server profile name.
+        :arg list server_hardware_uris: Available server hardware URIs.
+        :arg list avoid: Server hardware URIs to select last, such as the ones another profile was assigned to.
+        :return: str: The selected server hardware URI, or None when none is available.
+        """
+        avoid = avoid or []
+        return self._allocate([profile_name], server_hardware_uris,
+                              lambda uris, leased: sorted([uri for uri in uris if uri not in leased],
+                                                          key=lambda uri: uri in avoid))[profile_name]
+
+    def plan(self, profile_names, server_hardware_uris):
+        """
+        Assigns a distinct server hardware to each profile in one pass, leasing them when the lease file is enabled.
+        :arg list profile_names: Server profile names.
+        :arg list server_hardware_uris: Available server hardware URIs.
+        :return: OrderedDict: The server hardware URI of each profile, or None for the profiles left without one.
+        """
+        return self._allocate(profile_names, server_hardware_uris,
+                              lambda uris, leased: [uri for uri in uris if uri not in leased])
+
+    def release(self, server_hardware_uri):
+        """
+        Releases the lease of a server hardware, such as when the profile creation fails.
+        :arg str server_hardware_uri: Server hardware URI.
+        """
+        def release(leases):
+            leases = self._active_leases(leases)
+            leases.pop(server_hardware_uri, None)
+            return leases or None
+
+        if self.leases and server_hardware_uri:
+            self.leases.update(self.LEASES_KEY, release)
+
+    def _allocate(self, profile_names, server_hardware_uris, candidates):
+        plan = OrderedDict()
+
+        def allocate(leases):
+            leases = self._active_leases(leases)
+            taken = set()
+            for profile_name in profile_names:
+                leased = set(uri for uri, lease in leases.items() if lease['profile'] != profile_name)
+                uris = [uri for uri in self.rank(profile_name, server_hardware_uris) if uri not in taken]
+                uris = candidates(uris, leased)
+                plan[profile_name] = uris[0] if uris else None
+                if plan[profile_name]:
+                    taken.add(plan[profile_name])
+                    leases[plan[profile_name]] = dict(profile=profile_name, expires=time.time() + (self.lease_ttl or 0))
+            return leases or None
+
+        if self.leases:
+            self.leases.update(self.LEASES_KEY, allocate)
+        else:
+            allocate({})
+        return plan
+
+    def _active_leases(self, leases):
+        now = time.time()
+        return dict((uri, lease) for uri, lease in (leases or {}).items() if lease['expires'] > now)
+
+
+class OneViewResourceIndex(object):
+    """
+    In-memory index of a resource collection, loaded page by page, to look up the resources by name or URI without
+    querying the appliance for each one. Names are matched regardless of case, as done by get_by.
+    When a persistent cache is provided, the loaded collection is reused by the following module executions until
+    the cache TTL expires. Each collection is kept in its own file. Callers keep the index up to date with set and
+    remove when they change the resources, and write the changes to the cache once with save, or invalidate it when
+    the change is not known. Since a cached collection misses the changes made by others, read gets the current
+    resources before they are compared or updated.
+    """
+    CACHE_DIR_NAME = 'oneview_index'
+    PAGE_SIZE = 500
+
+    def __init__(self, resource_client, cache=None, cache_key=None):
+        self.resource_client = resource_client
+        self.cache = cache
+        self.cache_key = cache_key
+        self.loaded_from_cache = False
+        self._by_name = {}
+        self._by_uri = {}
+        self._changes = OrderedDict()
+
+    @classmethod
+    def from_params(cls, params, resource_client, connection):
+        """
+        Builds the index, with a persistent cache when the cache directory is provided.
+        :arg dict params: Module parameters.
+        :arg resource_client: OneView resource client of the collection.
+        :arg connection: OneView connection, used to identify the appliance.
+        :return: OneViewResourceIndex
+        """
+        cache_dir = params.get('cache_dir')
+        resource_uri = getattr(resource_client, 'URI', None)
+        if not cache_dir or not isinstance(resource_uri, six.string_types):
+            return cls(resource_client)
+
+        cache_key = '|'.join([to_native(connection.get_host()), resource_uri])
+        cache_path = os.path.join(cache_dir, cls.CACHE_DIR_NAME)
+        _ensure_cache_dir(cache_path)
+        file_name = hashlib.sha256(cache_key.encode('utf-8')).hexdigest() + '.json'
+        cache = OneViewFileCache(os.path.join(cache_path, file_name), params.get('prefetch_ttl'))
+        return cls(resource_client, cache, cache_key)
+
+    def load(self, page_size=None):
+        """
+        Loads the whole collection, unless it is already cached.
+        :arg int page_size: Number of resources requested at a time.
+        :return: OneViewResourceIndex: self.
+        """
+        resources = self.cache.get(self.cache_key) if self.cache else None
+        self.loaded_from_cache = resources is not None
+
+        if resources is None:
+            page_size = page_size or self.PAGE_SIZE
+            resources = []
+            while True:
+                page = self.resource_client.get_all(start=len(resources), count=page_size)
+                resources.extend(page)
+                if len(page) < page_size:
+                    break
+            if self.cache:
+                self.cache.set(self.cache_key, resources)
+
+        self._by_name, self._by_uri = {}, {}
+        for resource in resources:
+            self._add(resource)
+        return self
+
+    def get_by_name(self, name):
+        """
+        Gets a resource by name.
+        :arg str name: Resource name.
+        :return: dict: The resource found or None.
+        """
+        return self._by_name.get(to_native(name).lower())
+
+    def get_by_uri(self, uri):
+        """
+        Gets a resource by URI.
+        :arg str uri: Resource URI.
+        :return: dict: The resource found or None.
+        """
+        return self._by_uri.get(uri)
+
+    def read(self, name=None, uri=None):
+        """
+        Gets the current resource by name or URI. The resource found is read again by URI before it is compared or
+        updated, since it may have been changed after the collection was loaded. A resource not found, or deleted
+        since, is looked up in the appliance when the collection was loaded from the cache. The index is updated with
+        the resources read.
+        :arg str name: Resource name.
+        :arg str uri: Resource URI, used when the name is not provided.
+        :return: The resource object found or None.
+        """
+        data = self.get_by_name(name) if name else self.get_by_uri(uri)
+        resource = None
+        if data:
+            try:
+                resource = self.resource_client.get_by_uri(data['uri'])
+            except HPEOneViewException as exception:
+                if not _is_not_found(exception):
+                    raise
+            if resource:
+                self.set(resource.data)
+            else:
+                self.remove(data)
+            if resource and name and to_native(resource.data.get('name')).lower() != to_native(name).lower():
+                resource = None
+
+        if not resource and self.loaded_from_cache and (name or not data):
+            resource = self.resource_client.get_by_name(name) if name else self.resource_client.get_by_uri(uri)
+            if resource:
+                self.set(resource.data)
+        return resource
+
+    def set(self, resource):
+        """
+        Adds or replaces a resource, after it is created or updated.
+        :arg dict resource: Resource data.
+        """
+        self._add(resource)
+        self._changes.pop(resource.get('uri'), None)
+        self._changes[resource.get('uri')] = resource
+
+    def remove(self, resource):
+        """
+        Removes a resource, after it is deleted.
+        :arg dict resource: Resource data.
+        """
+        self._by_uri.pop(resource.get('uri'), None)
+        key = to_native(resource.get('name')).lower()
+        indexed = self._by_name.get(key)
+        if indexed and indexed.get('uri') == resource.get('uri'):
+            self._by_name.pop(key)
+        self._changes.pop(resource.get('uri'), None)
+        self._changes[resource.get('uri')] = None
+
+    def save(self):
+        """
+        Writes the resources set and removed since the last save to the cached collection, with a single update.
+        An expired collection is not rebuilt from the changed resources.
+        """
+        changes, self._changes = self._changes, OrderedDict()
+        if not self.cache or not changes:
+            return
+
+        def apply(resources):
+            if resources is None:
+                return None
+            resources = [item for item in resources if item.get('uri') not in changes]
+            return resources + [resource for resource in changes.values() if resource is not None]
+
+        self.cache.update(self.cache_key, apply)
+
+    def invalidate(self):
+        """
+        Discards the cached collection, so that the next module execution loads it again.
+        """
+        self._changes = OrderedDict()
+        if self.cache:
+            self.cache.delete(self.cache_key)
+
+    def _add(self, resource):
+        if resource.get('uri'):
+            previous = self._by_uri.get(resource['uri'])
+            if previous and previous.get('name') != resource.get('name'):
+                self._by_name.pop(to_native(previous.get('name')).lower(), None)
+            self._by_uri[resource['uri']] = resource
+        if resource.get('name'):
+            self._by_name[to_native(resource['name']).lower()] = resource
+
+
 # @six.add_metaclass(abc.ABCMeta)
 class OneViewModule(object):
     MSG_CREATED = 'Resource created successfully.'
@@ -506,16 +2349,25 @@ class OneViewModule(object):
         image_streamer_hostname=dict(type='str'),
         password=dict(type='str', no_log=True),
         username=dict(type='str'),
-        auth_login_domain=dict(type='str')
+        auth_login_domain=dict(type='str'),
+        cache_dir=dict(type='path'),
+        session_cache_ttl=dict(type='int', default=1800),
+        api_version_cache_ttl=dict(type='int', default=3600),
+        name_cache_ttl=dict(type='int', default=3600),
+        prefetch=dict(type='bool', default=False),
+        prefetch_ttl=dict(type='int', default=600),
+        timing=dict(type='bool', default=False),
+        timing_file=dict(type='path')
     )
 
     ONEVIEW_VALIDATE_ETAG_ARGS = dict(validate_etag=dict(type='bool', default=True))
 
-    def __init__(self, additional_arg_spec=None, validate_etag_support=False):
+    def __init__(self, additional_arg_spec=None, validate_etag_support=False, cache_responses=False):
         """
         OneViewModuleBase constructor.
         :arg dict additional_arg_spec: Additional argument spec definition.
         :arg bool validate_etag_support: Enables support to eTag validation.
+        :arg bool cache_responses: Enables the response cache, for the modules that only read.
         """
         argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support)
 
@@ -523,15 +2375,20 @@ class OneViewModule(object):
 
         self.resource_client = None
         self.current_resource = None
+        self.resource_index = None
+        self.resource_index_updated = False
+        self.differences = None
 
         self.state = self.module.params.get('state')
         self.data = self.module.params.get('data')
 
+        self.timer = OneViewTimer.from_params(self.module.params)
         self._check_hpe_oneview_sdk()
-        self._create_oneview_client()
+        self._create_oneview_client(cache_responses)
 
         # Preload params for get_all - used by facts
         self.facts_params = self.module.params.get('params') or {}
+        self.facts_output = None
 
         # Preload options as dict - used by facts
         self.options = transform_list_to_dict(self.module.params.get('options'))
@@ -555,18 +2412,20 @@ class OneViewModule(object):
         if not HAS_HPE_ONEVIEW:
             self.module.fail_json(msg=self.HPE_ONEVIEW_SDK_REQUIRED)
 
-    def _create_oneview_client(self):
-        if self.module.params.get('hostname'):
-            config = dict(ip=self.module.params['hostname'],
-                          credentials=dict(userName=self.module.params['username'], password=self.module.params['password'],
-                                           authLoginDomain=self.module.params.get('auth_login_domain', '')),
-                          api_version=self.module.params['api_version'],
-                          image_streamer_ip=self.module.params['image_streamer_hostname'])
-            self.oneview_client = OneViewClient(config)
-        elif not self.module.params['config']:
-            self.oneview_client = OneViewClient.from_environment_variables()
-        else:
-            self.oneview_client = OneViewClient.from_json_file(self.module.params['config'])
+    def _create_oneview_client(self, cache_responses=False):
+        self.oneview_client = create_module_client(self.module.params, self.timer, cache_responses)
+
+    def _get_timing_result(self):
+        """
+        Gets the timing of the module execution, appending it to the timing file when provided.
+        :return: dict: The oneview_timing result key, when the timing is requested.
+        """
+        if not self.timer:
+            return {}
+
+        summary = self.timer.summary()
+        self.timer.write(type(self).__name__, summary)
+        return dict(oneview_timing=summary) if self.module.params.get('timing') else {}
 
     def set_resource_object(self, resource_client, name=None):
         self.resource_client = resource_client
@@ -584,11 +2443,36 @@ class OneViewModule(object):
             elif self.module.params.get("uri"):
                 uri = self.module.params["uri"]
 
-        if name:
+        if self.module.params.get('prefetch') and (name or uri):
+            self.current_resource = self._get_from_resource_index(name, uri)
+        elif name:
             self.current_resource = self.resource_client.get_by_name(name)
         elif uri:
             self.current_resource = self.resource_client.get_by_uri(uri)
 
+    def _get_from_resource_index(self, name, uri):
+        connection = self.oneview_client.connection
+        if not self.resource_index:
+            self.resource_index = OneViewResourceIndex.from_params(self.module.params, self.resource_client,
+                                                                   connection).load()
+
+        data = self.resource_index.get_by_name(name) if name else self.resource_index.get_by_uri(uri)
+        if not self.resource_index.loaded_from_cache:
+            return self.resource_client.new(connection, data) if data else None
+
+        # The cached collection only resolves the URI, since others may have changed the resources after it was loaded
+        return self.resource_index.read(name, uri)
+
+    def _set_in_resource_index(self, resource):
+        if self.resource_index:
+            self.resource_index.set(resource)
+            self.resource_index_updated = True
+
+    def _remove_from_resource_index(self, resource):
+        if self.resource_index:
+            self.resource_index.remove(resource)
+            self.resource_index_updated = True
+
     @abc.abstractmethod
     def execute_module(self):
         """
@@ -618,11 +2502,84 @@ class OneViewModule(object):
             if "changed" not in result:
                 result['changed'] = False
 
+            if self.facts_output:
+                result.setdefault('ansible_facts', {})['facts_output'] = self.facts_output
+
+            result.update(self._get_timing_result())
+
+            # Changes done outside the generic implementations are not tracked in the prefetched collection
+            if result['changed'] and self.resource_index and not self.resource_index_updated:
+                self.resource_index.invalidate()
+            elif self.resource_index:
+                self.resource_index.save()
+
             self.module.exit_json(**result)
 
         except OneViewModuleException as exception:
+            # The changes done before the failure are kept
+            if self.resource_index:
+                self.resource_index.save()
             error_msg = '; '.join(to_native(e) for e in exception.args)
-            self.module.fail_json(msg=error_msg, exception=traceback.format_exc())
+            self.module.fail_json(msg=error_msg, exception=traceback.format_exc(), **self._get_timing_result())
+
+    def get_all_facts(self, resource_client, on_page=None):
+        """
+        Gets the resources of a collection with the facts params, for the facts modules.
+        The params page_size and output_file request the collection page by page, and write it to a JSON Lines file
+        instead of returning it. The file path and the number of resources written are returned in the facts_output
+        fact.
+        :arg resource_client: OneView resource client.
+        :arg on_page: Function called with the resources of each page, such as to gather the facts options of the
+            resources that are written to the output file.
+        :return: list: The resources found, empty when written to the output file.
+        """
+        resources, self.facts_output = _get_all_pages(resource_client, self.facts_params, on_page)
+        return resources
+
+    def gather_facts_concurrently(self, functions):
+        """
+        Gets independent facts, such as the ones of the facts options, concurrently. Up to max_workers requests run
+        at a time, and each one is waited for up to request_timeout seconds, when the module has these arguments.
+        :arg dict functions: Functions without arguments that get each fact, by fact name.
+        :return: dict: The facts.
+        """
+        return gather_concurrently(functions, self.module.params.get('max_workers') or 1,
+                                   self.module.params.get('request_timeout'))
+
+    def gather_resources_facts(self, resources, get_functions):
+        """
+        Gets the facts options of many resources, such as the ones matched by the facts params, in a single pool of
+        concurrent requests bounded by max_workers.
+        :arg list resources: The resources data.
+        :arg get_functions: Function that receives a resource object and returns the functions that get each of its
+            facts, by fact name.
+        :return: dict: The facts of each resource, by resource URI.
+        """
+        functions = OrderedDict()
+        keys = {}
+        facts = OrderedDict()
+        for data in resources:
+            resource = self.resource_client.new(self.oneview_client.connection, data)
+            facts[data['uri']] = {}
+            for fact, function in get_functions(resource).items():
+                key = '{0} of {1}'.format(fact, data['uri'])
+                functions[key] = function
+                keys[key] = (data['uri'], fact)
+
+        for key, value in self.gather_facts_concurrently(functions).items():
+            uri, fact = keys[key]
+            facts[uri][fact] = value
+        return facts
+
+    def export_utilization(self, export, facts_by_uri, fact):
+        """
+        Writes the utilization fact of each resource to the export file, removing it from the facts.
+        :arg OneViewUtilizationExport export: Utilization export.
+        :arg dict facts_by_uri: The facts of each resource, by resource URI.
+        :arg str fact: Name of the utilization fact.
+        :return: dict: The output file path and the number of samples written.
+        """
+        return export.write(OrderedDict((uri, facts.pop(fact, None)) for uri, facts in facts_by_uri.items()))
 
     def resource_absent(self, method='delete'):
         """
@@ -634,6 +2591,7 @@ class OneViewModule(object):
         """
         if self.current_resource:
             getattr(self.current_resource, method)()
+            self._remove_from_resource_index(self.current_resource.data)
 
             return {"changed": True, "msg": self.MSG_DELETED}
         else:
@@ -645,6 +2603,10 @@ class OneViewModule(object):
         :arg str name: Resource name to search for.
         :return: The resource found or None.
         """
+        if self.resource_index:
+            resource = self._get_from_resource_index(name, None)
+            return resource.data if resource else None
+
         result = self.resource_client.get_by('name', name)
         return result[0] if result else None
 
@@ -664,27 +2626,29 @@ class OneViewModule(object):
 
         if not self.current_resource:
             self.current_resource = getattr(self.resource_client, create_method)(self.data)
+            self._set_in_resource_index(self.current_resource.data)
             msg = self.MSG_CREATED
             changed = True
         else:
             changed, msg = self._update_resource()
 
         data = self.current_resource.data
-        return dict(
+        return self._add_diff(dict(
             msg=msg,
             changed=changed,
             ansible_facts={fact_name: data}
-        )
+        ))
 
     def _update_resource(self):
         updated_data = self.current_resource.data.copy()
         updated_data = dict_merge(updated_data, self.data)
         changed = False
 
-        if compare(self.current_resource.data, updated_data):
+        if compare(self.current_resource.data, updated_data, self._new_differences()):
             msg = self.MSG_ALREADY_PRESENT
         else:
             self.current_resource.update(updated_data)
+            self._set_in_resource_index(self.current_resource.data)
             changed = True
             msg = self.MSG_UPDATED
 
@@ -709,6 +2673,7 @@ class OneViewModule(object):
         if resource.get('scopeUris') is None or set(resource['scopeUris']) != set(scope_uris):
             operation_data = dict(operation='replace', path='/scopeUris', value=scope_uris)
             updated_resource = self.current_resource.patch(**operation_data)
+            self._set_in_resource_index(updated_resource.data)
             state['ansible_facts'][fact_name] = updated_resource.data
             state['changed'] = True
             state['msg'] = self.MSG_UPDATED
@@ -735,11 +2700,11 @@ class OneViewModule(object):
         else:
             changed, msg = self.check_update_resource()
         data = self.data
-        return dict(
+        return self._add_diff(dict(
             msg=msg,
             changed=changed,
             ansible_facts={fact_name: data}
-        )
+        ))
 
     def check_update_resource(self):
         """
@@ -751,13 +2716,31 @@ class OneViewModule(object):
         updated_data.update(self.data)
         changed = False
 
-        if compare(self.current_resource.data, updated_data):
+        if compare(self.current_resource.data, updated_data, self._new_differences()):
             msg = self.MSG_ALREADY_PRESENT
         else:
             changed = True
             msg = self.MSG_UPDATED
         return (changed, msg)
 
+    def _new_differences(self):
+        """
+        Starts collecting the differences found by compare, when the module runs in diff mode.
+        :return: list: The list filled by compare, or None when not in diff mode.
+        """
+        self.differences = [] if self.module._diff else None
+        return self.differences
+
+    def _add_diff(self, result):
+        """
+        Adds the differences found on the resource update to the module result, in the Ansible diff format.
+        :arg dict result: Module result.
+        :return: The module result.
+        """
+        if self.differences:
+            result['diff'] = differences_to_diff(self.differences)
+        return result
+
     def check_resource_absent(self, method='delete'):
         """
         The following implementation will work for resource_absent under check mode.
@@ -811,31 +2794,42 @@ class OneViewModuleBase(object):
         image_streamer_hostname=dict(type='str'),
         password=dict(type='str', no_log=True),
         username=dict(type='str'),
-        auth_login_domain=dict(type='str')
+        auth_login_domain=dict(type='str'),
+        cache_dir=dict(type='path'),
+        session_cache_ttl=dict(type='int', default=1800),
+        api_version_cache_ttl=dict(type='int', default=3600),
+        name_cache_ttl=dict(type='int', default=3600),
+        prefetch=dict(type='bool', default=False),
+        prefetch_ttl=dict(type='int', default=600),
+        timing=dict(type='bool', default=False),
+        timing_file=dict(type='path')
     )
 
     resource_client = None
 
     ONEVIEW_VALIDATE_ETAG_ARGS = dict(validate_etag=dict(type='bool', default=True))
 
-    def __init__(self, additional_arg_spec=None, validate_etag_support=False):
+    def __init__(self, additional_arg_spec=None, validate_etag_support=False, cache_responses=False):
         """
         OneViewModuleBase constructor.
         :arg dict additional_arg_spec: Additional argument spec definition.
         :arg bool validate_etag_support: Enables support to eTag validation.
+        :arg bool cache_responses: Enables the response cache, for the modules that only read.
         """
         argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support)
 
         self.module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
 
+        self.timer = OneViewTimer.from_params(self.module.params)
         self._check_hpe_oneview_sdk()
-        self._create_oneview_client()
+        self._create_oneview_client(cache_responses)
 
         self.state = self.module.params.get('state')
         self.data = self.module.params.get('data')
 
         # Preload params for get_all - used by facts
         self.facts_params = self.module.params.get('params') or {}
+        self.facts_output = None
 
         # Preload options as dict - used by facts
         self.options = transform_list_to_dict(self.module.params.get('options'))
@@ -859,18 +2853,20 @@ class OneViewModuleBase(object):
         if not HAS_HPE_ONEVIEW:
             self.module.fail_json(msg=self.HPE_ONEVIEW_SDK_REQUIRED)
 
-    def _create_oneview_client(self):
-        if self.module.params.get('hostname'):
-            config = dict(ip=self.module.params['hostname'],
-                          credentials=dict(userName=self.module.params['username'], password=self.module.params['password'],
-                                           authLoginDomain=self.module.params.get('auth_login_domain', '')),
-                          api_version=self.module.params['api_version'],
-                          image_streamer_ip=self.module.params['image_streamer_hostname'])
-            self.oneview_client = OneViewClient(config)
-        elif not self.module.params['config']:
-            self.oneview_client = OneViewClient.from_environment_variables()
-        else:
-            self.oneview_client = OneViewClient.from_json_file(self.module.params['config'])
+    def _create_oneview_client(self, cache_responses=False):
+        self.oneview_client = create_module_client(self.module.params, self.timer, cache_responses)
+
+    def _get_timing_result(self):
+        """
+        Gets the timing of the module execution, appending it to the timing file when provided.
+        :return: dict: The oneview_timing result key, when the timing is requested.
+        """
+        if not self.timer:
+            return {}
+
+        summary = self.timer.summary()
+        self.timer.write(type(self).__name__, summary)
+        return dict(oneview_timing=summary) if self.module.params.get('timing') else {}
 
     @abc.abstractmethod
     def execute_module(self):
@@ -901,11 +2897,30 @@ class OneViewModuleBase(object):
             if "changed" not in result:
                 result['changed'] = False
 
+            if self.facts_output:
+                result.setdefault('ansible_facts', {})['facts_output'] = self.facts_output
+
+            result.update(self._get_timing_result())
+
             self.module.exit_json(**result)
 
         except OneViewModuleException as exception:
             error_msg = '; '.join(to_native(e) for e in exception.args)
-            self.module.fail_json(msg=error_msg, exception=traceback.format_exc())
+            self.module.fail_json(msg=error_msg, exception=traceback.format_exc(), **self._get_timing_result())
+
+    def get_all_facts(self, resource_client, on_page=None):
+        """
+        Gets the resources of a collection with the facts params, for the facts modules.
+        The params page_size and output_file request the collection page by page, and write it to a JSON Lines file
+        instead of returning it. The file path and the number of resources written are returned in the facts_output
+        fact.
+        :arg resource_client: OneView resource client.
+        :arg on_page: Function called with the resources of each page, such as to gather the facts options of the
+            resources that are written to the output file.
+        :return: list: The resources found, empty when written to the output file.
+        """
+        resources, self.facts_output = _get_all_pages(resource_client, self.facts_params, on_page)
+        return resources
 
     def resource_absent(self, resource, method='delete'):
         """
@@ -1067,10 +3082,18 @@ class SPKeys(object):
     LUN = 'lun'
 
 
+# Connections, volume attachments and JBODs are identified by id, controllers by slot and the other lists by name
+SERVER_PROFILE_COMPARISON_RULES = dict(list_keys=(SPKeys.ID, SPKeys.DEVICE_SLOT, SPKeys.NAME))
+
+
 class ServerProfileMerger(object):
+    """
+    Merges the server profile data into the server profile resource. The resource is not copied as a whole: only the
+    dictionaries and lists changed by the data are copied, and the unchanged values are shared with the resource.
+    """
+
     def merge_data(self, resource, data):
-        merged_data = deepcopy(resource)
-        merged_data = dict_merge(merged_data, data)
+        merged_data = merge_copy_on_write(resource, data)
 
         merged_data = self._merge_bios_and_boot(merged_data, resource, data)
         merged_data = self._merge_connections(merged_data, resource, data)
@@ -1116,16 +3139,15 @@ class ServerProfileMerger(object):
         return merged_data
 
     def _merge_connections_boot(self, merged_data, resource):
-        existing_connection_map = {x[SPKeys.ID]: x.copy() for x in resource[SPKeys.CONNECTIONS]}
+        existing_connection_map = {x[SPKeys.ID]: x for x in resource[SPKeys.CONNECTIONS]}
         for merged_connection in merged_data[SPKeys.CONNECTIONS]:
             conn_id = merged_connection[SPKeys.ID]
             existing_conn_has_boot = conn_id in existing_connection_map and SPKeys.BOOT in existing_connection_map[
                 conn_id]
             if existing_conn_has_boot and SPKeys.BOOT in merged_connection:
                 current_connection = existing_connection_map[conn_id]
-                boot_settings_merged = deepcopy(current_connection[SPKeys.BOOT])
-                boot_settings_merged = dict_merge(boot_settings_merged, merged_connection[SPKeys.BOOT])
-                merged_connection[SPKeys.BOOT] = boot_settings_merged
+                merged_connection[SPKeys.BOOT] = merge_copy_on_write(current_connection[SPKeys.BOOT],
+                                                                     merged_connection[SPKeys.BOOT])
         return merged_data
 
     def _merge_san_storage(self, merged_data, data, resource):
@@ -1259,12 +3281,262 @@ class ServerProfileMerger(object):
 
     def _merge_dict(self, merged_data, resource, data, key):
         if resource[key]:
-            merged_dict = deepcopy(resource[key])
-            merged_dict.update(deepcopy(data[key]))
+            merged_dict = dict(resource[key])
+            merged_dict.update(data[key])
         merged_data[key] = merged_dict
         return merged_data
 
 
+def _is_not_found(exception):
+    """
+    Checks whether an exception raised by a request or a task means that a resource does not exist.
+    """
+    error_code = getattr(exception, 'error_code', None)
+    response = getattr(exception, 'oneview_response', None)
+    if not error_code and isinstance(response, dict):
+        error_code = response.get('errorCode')
+    error_code = to_native(error_code or '').upper()
+    return 'NOT_FOUND' in error_code or 'NOTFOUND' in error_code
+
+
+def _is_filter_value(value):
+    """
+    Checks whether a value can be written between the quotes of a filter query, which has no escape sequence.
+    """
+    return "'" not in value and '"' not in value
+
+
+class OneViewNameResolver(object):
+    """
+    Resolves resource names, memoizing the lookups done during the module execution.
+    Names of the same resource type are deduplicated and looked up together with a single filtered query. The
+    names with quotes, which can not be written in the query, are looked up one by one.
+    When a persistent cache is provided, the resolved URIs are reused across module executions, without any
+    request, until the entry expires. Since a cached URI may refer to a resource deleted since, the callers discard
+    the cached entries and resolve the names again when the appliance does not find a resource.
+    """
+    CACHE_FILE_NAME = 'oneview_names.json'
+    CACHE_TTL = 3600
+
+    def __init__(self, cache=None, connection=None):
+        self.cache = cache
+        self.connection = connection
+        self._resources = {}
+        self._cached_keys = []
+
+    @classmethod
+    def from_params(cls, params, oneview_client):
+        """
+        Builds the resolver, with a persistent cache when the cache directory is provided.
+        :arg dict params: Module parameters.
+        :arg oneview_client: OneViewClient, whose host is part of the cache keys.
+        :return: OneViewNameResolver
+        """
+        cache_dir = params.get('cache_dir')
+        if not cache_dir:
+            return cls()
+
+        _ensure_cache_dir(cache_dir)
+        cache = OneViewFileCache(os.path.join(cache_dir, cls.CACHE_FILE_NAME),
+                                 params.get('name_cache_ttl') or cls.CACHE_TTL)
+        return cls(cache, oneview_client.connection)
+
+    def call(self, function):
+        """
+        Calls a function that sends the resolved URIs to the appliance. When it fails because a resource was not
+        found and names were resolved from the persistent cache, the cached entries are discarded and the function
+        is called again, resolving the names with the appliance.
+        :arg function: Function called without arguments, which resolves the names with this resolver.
+        :return: The result of the function.
+        """
+        try:
+            return function()
+        except Exception as exception:
+            if not _is_not_found(exception) or not self.discard_cached():
+                raise
+            logger.debug("Resource not found, resolving again the cached names: %s", to_native(exception))
+        return function()
+
+    def discard_cached(self):
+        """
+        Discards the names resolved from the persistent cache, so that they are looked up again.
+        :return: bool: Whether any cached name was discarded.
+        """
+        keys, self._cached_keys = self._cached_keys, []
+        for key in keys:
+            self._resources.pop(key, None)
+            self.cache.delete(self._cache_key(key))
+        return bool(keys)
+
+    def get(self, resource_client, name):
+        """
+        Gets a resource by name.
+        :arg resource_client: OneView resource client.
+        :arg str name: Resource name.
+        :return: dict: The resource found or None.
+        """
+        self.prefetch(resource_client, [name])
+        return self._resources[self._build_key(resource_client, name)]
+
+    def prefetch(self, resource_client, names):
+        """
+        Resolves the names not resolved yet, with a single query to the resource collection.
+        :arg resource_client: OneView resource client.
+        :arg list names: Resource names.
+        """
+        pending = []
+        for name in names:
+            key = self._build_key(resource_client, name)
+            if key not in self._resources and name not in pending:
+                cached = self._get_from_cache(key, name)
+                if cached:
+                    self._resources[key] = cached
+                    self._cached_keys.append(key)
+                else:
+                    pending.append(name)
+
+        if not pending:
+            return
+
+        found = {}
+        single = [name for name in pending if len(pending) == 1 or not _is_filter_value(name)]
+        for name in single:
+            results = resource_client.get_by('name', name)
+            if results:
+                found[to_native(name).lower()] = results[0]
+
+        queried = [name for name in pending if name not in single]
+        if queried:
+            query = ' OR '.join("name='{0}'".format(name) for name in queried)
+            for resource in resource_client.get_all(filter='"{0}"'.format(query)):
+                found.setdefault(to_native(resource.get('name', '')).lower(), resource)
+
+        for name in pending:
+            key = self._build_key(resource_client, name)
+            self._resources[key] = found.get(to_native(name).lower())
+            if self._resources[key]:
+                self._set_in_cache(key, self._resources[key])
+
+    def _build_key(self, resource_client, name):
+        resource_uri = getattr(resource_client, 'URI', None)
+        if not isinstance(resource_uri, six.string_types):
+            resource_uri = to_native(id(resource_client))
+        return '|'.join([resource_uri, to_native(name).lower()])
+
+    def _get_from_cache(self, key, name):
+        if not self.cache:
+            return None
+
+        # The entries are trusted until they expire, revalidating them would take a request per name
+        entry = self.cache.get(self._cache_key(key))
+        return dict(name=name, uri=entry['uri'], eTag=entry['eTag']) if entry else None
+
+    def _set_in_cache(self, key, resource):
+        if self.cache and resource.get('eTag'):
+            self.cache.set(self._cache_key(key), dict(uri=resource['uri'], eTag=resource['eTag']))
+
+    def _cache_key(self, key):
+        return '|'.join([to_native(self.connection.get_host()), key])
+
+
+class OneViewNetworkResolver(object):
+    """
+    Resolves network names through the index search API, looking up the names of all the network types with a
+    single query instead of querying each network type in turn. The lookups are memoized per category and name.
+    The index is updated asynchronously, so the names it does not return in a category, such as the ones of networks
+    just created, and the names with quotes, which can not be written in the query, are looked up in the network
+    collection of the category.
+    """
+    FC_NETWORKS = 'fc-networks'
+    FCOE_NETWORKS = 'fcoe-networks'
+    NETWORK_SETS = 'network-sets'
+    ETHERNET_NETWORKS = 'ethernet-networks'
+    CATEGORIES = [FC_NETWORKS, FCOE_NETWORKS, NETWORK_SETS, ETHERNET_NETWORKS]
+
+    # Resource client of each category
+    RESOURCE_CLIENTS = {FC_NETWORKS: 'fc_networks',
+                        FCOE_NETWORKS: 'fcoe_networks',
+                        NETWORK_SETS: 'network_sets',
+                        ETHERNET_NETWORKS: 'ethernet_networks'}
+
+    def __init__(self, oneview_client):
+        self.oneview_client = oneview_client
+        self._networks = {}
+
+    def prefetch(self, names, categories=None):
+        """
+        Resolves the names not resolved yet in the given categories, with a single index search. Each category
+        and name the index does not return is then looked up in the network collection of the category.
+        :arg list names: Network names.
+        :arg list categories: Index categories to search. Defaults to all the network categories.
+        """
+        categories = categories or self.CATEGORIES
+        pending = []
+        for name in names:
+            if name not in pending and any(self._build_key(category, name) not in self._networks
+                                           for category in categories):
+                pending.append(name)
+
+        if not pending:
+            return
+
+        found = {}
+        queried = [name for name in pending if _is_filter_value(name)]
+        if queried:
+            query = ' OR '.join("name='{0}'".format(name) for name in queried)
+            resources = self.oneview_client.index_resources.get_all(category=categories, filter='"{0}"'.format(query))
+            for resource in resources:
+                found.setdefault(self._build_key(resource.get('category'), resource.get('name', '')), resource['uri'])
+
+        # A name found in the index under a category may still be missing from the index under another one
+        for name in pending:
+            for category in categories:
+                key = self._build_key(category, name)
+                if key not in found and key not in self._networks:
+                    results = getattr(self.oneview_client, self.RESOURCE_CLIENTS[category]).get_by('name', name)
+                    if results:
+                        found[key] = results[0]['uri']
+
+        for category in categories:
+            for name in pending:
+                key = self._build_key(category, name)
+                if key not in self._networks:
+                    self._networks[key] = found.get(key)
+
+    def get_uri(self, name, category):
+        """
+        Gets the URI of a network of the given category.
+        :arg str name: Network name.
+        :arg str category: Index category of the network.
+        :return: str: The network URI or None.
+        """
+        self.prefetch([name], [category])
+        return self._networks[self._build_key(category, name)]
+
+    def resolve(self, names, categories=None):
+        """
+        Resolves the network names, searching the categories in the given order.
+        :arg list names: Network names.
+        :arg list categories: Index categories to search. Defaults to FC networks, FCoE networks, network sets and
+            Ethernet networks, in this order.
+        :return: dict: The category and URI of the networks found, by name.
+        """
+        categories = categories or self.CATEGORIES
+        self.prefetch(names, categories)
+
+        networks = {}
+        for name in names:
+            for category in categories:
+                uri = self._networks[self._build_key(category, name)]
+                if uri:
+                    networks[name] = dict(category=category, uri=uri)
+                    break
+        return networks
+
+    def _build_key(self, category, name):
+        return '|'.join([to_native(category), to_native(name).lower()])
+
+
 class ServerProfileReplaceNamesByUris(object):
     SCOPE_NOT_FOUND = 'Scope not found: '
     SERVER_PROFILE_OS_DEPLOYMENT_NOT_FOUND = 'OS Deployment Plan not found: '
@@ -1280,8 +3552,10 @@ class ServerProfileReplaceNamesByUris(object):
     SAS_LOGICAL_JBOD_NOT_FOUND = 'SAS logical JBOD not found: '
     ENCLOSURE_NOT_FOUND = 'Enclosure not found: '
 
-    def replace(self, oneview_client, data):
+    def replace(self, oneview_client, data, resolver=None):
         self.oneview_client = oneview_client
+        self.resolver = resolver or OneViewNameResolver()
+        self._prefetch_names(data)
         self._replace_os_deployment_name_by_uri(data)
         self._replace_enclosure_group_name_by_uri(data)
         self._replace_networks_name_by_uri(data)
@@ -1293,10 +3567,41 @@ class ServerProfileReplaceNamesByUris(object):
         self._replace_sas_logical_jbod_name_by_uri(data)
         self._replace_initial_scope_name_by_uri(data)
 
+    def _prefetch_names(self, data):
+        """
+        Resolves together the names of the same resource type used in the connections, volume attachments
+        and logical JBODs, instead of looking up one name at a time.
+        """
+        names = collections.defaultdict(list)
+
+        for connection in self._get_connections(data):
+            if connection.get('interconnectName'):
+                names['interconnects'].append(connection['interconnectName'])
+
+        for volume in (data.get('sanStorage') or {}).get('volumeAttachments') or []:
+            if not volume.get('volumeUri') and volume.get('volumeName'):
+                names['volumes'].append(volume['volumeName'])
+            if volume.get('volumeStoragePoolName'):
+                names['storage_pools'].append(volume['volumeStoragePoolName'])
+            if volume.get('volumeStorageSystemName'):
+                names['storage_systems'].append(volume['volumeStorageSystemName'])
+            if volume.get('volume'):
+                if volume['volume'].get('templateName'):
+                    names['storage_volume_templates'].append(volume['volume']['templateName'])
+                if (volume['volume'].get('properties') or {}).get('storagePoolName'):
+                    names['storage_pools'].append(volume['volume']['properties']['storagePoolName'])
+
+        for jbod in (data.get('localStorage') or {}).get('sasLogicalJBODs') or []:
+            if jbod.get('sasLogicalJBODName'):
+                names['sas_logical_jbods'].append(jbod['sasLogicalJBODName'])
+
+        for resource_name, resource_names in names.items():
+            self.resolver.prefetch(getattr(self.oneview_client, resource_name), resource_names)
+
     def _get_resource_uri_from_name(self, name, message, resource_client):
-        resource_by_name = resource_client.get_by('name', name)
+        resource_by_name = self.resolver.get(resource_client, name)
         if resource_by_name:
-            return resource_by_name[0]['uri']
+            return resource_by_name['uri']
         else:
             raise OneViewModuleResourceNotFound(message + name)
 
@@ -1329,19 +3634,24 @@ class ServerProfileReplaceNamesByUris(object):
         self._replace_name_by_uri(data, 'enclosureGroupName', self.SERVER_PROFILE_ENCLOSURE_GROUP_NOT_FOUND,
                                   self.oneview_client.enclosure_groups)
 
-    def _replace_networks_name_by_uri(self, data):
+    def _get_connections(self, data):
         if data.get("connections"):
-            connections = data["connections"]
+            return data["connections"]
         elif data.get("connectionSettings") and data["connectionSettings"].get("connections"):
-            connections = data["connectionSettings"]["connections"]
-        else:
-            return
+            return data["connectionSettings"]["connections"]
+        return []
+
+    def _replace_networks_name_by_uri(self, data):
+        connections = self._get_connections(data)
+
+        names = [connection['networkName'] for connection in connections if connection.get('networkName')]
+        networks = self._get_networks_by_name(names)
 
         for connection in connections:
             if 'networkName' in connection:
                 name = connection.pop('networkName')
                 if name is not None:
-                    connection['networkUri'] = self._get_network_by_name(name)['uri']
+                    connection['networkUri'] = networks[name]['uri']
 
     def _replace_server_hardware_type_name_by_uri(self, data):
         self._replace_name_by_uri(data, 'serverHardwareTypeName', self.SERVER_HARDWARE_TYPE_NOT_FOUND,
@@ -1353,9 +3663,9 @@ class ServerProfileReplaceNamesByUris(object):
         if len(volume_attachments) > 0:
             for volume in volume_attachments:
                 if not volume.get('volumeUri') and volume.get('volumeName'):
-                    resource_by_name = self.oneview_client.volumes.get_by('name', volume['volumeName'])
+                    resource_by_name = self.resolver.get(self.oneview_client.volumes, volume['volumeName'])
                     if resource_by_name:
-                        volume['volumeUri'] = resource_by_name[0]['uri']
+                        volume['volumeUri'] = resource_by_name['uri']
                         del volume['volumeName']
                     else:
                         logger.debug("The volumeUri is null in the volumeAttachments list, it will be understood "
@@ -1403,20 +3713,16 @@ class ServerProfileReplaceNamesByUris(object):
                 self._replace_name_by_uri(jbod, 'sasLogicalJBODName', self.SAS_LOGICAL_JBOD_NOT_FOUND,
                                           self.oneview_client.sas_logical_jbods)
 
-    def _get_network_by_name(self, name):
-        fc_networks = self.oneview_client.fc_networks.get_by('name', name)
-        if fc_networks:
-            return fc_networks[0]
-
-        fcoe_networks = self.oneview_client.fcoe_networks.get_by('name', name)
-        if fcoe_networks:
-            return fcoe_networks[0]
-
-        network_sets = self.oneview_client.network_sets.get_by('name', name)
-        if network_sets:
-            return network_sets[0]
+    def _get_networks_by_name(self, names):
+        """
+        Gets the networks by name, searching FC networks, FCoE networks, network sets and Ethernet networks,
+        in this order, with a single index search for all the names.
+        :arg list names: Network names.
+        :return: dict: The category and URI of the networks found, by name.
+        """
+        networks = OneViewNetworkResolver(self.oneview_client).resolve(names)
 
-        ethernet_networks = self.oneview_client.ethernet_networks.get_by('name', name)
-        if not ethernet_networks:
-            raise OneViewModuleResourceNotFound(self.SERVER_PROFILE_NETWORK_NOT_FOUND + name)
-        return ethernet_networks[0]
+        pending = [name for name in names if name not in networks]
+        if pending:
+            raise OneViewModuleResourceNotFound(self.SERVER_PROFILE_NETWORK_NOT_FOUND + pending[0])
+        return networks
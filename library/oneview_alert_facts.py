@@ -35,6 +35,8 @@ options:
       description:
         - "List with parameters to help filter the alerts.
           Params allowed: C(count), C(fields), C(filter), C(query), C(sort), C(start), and C(view)."
+        - "To page through the alerts: C(page_size), the number of alerts requested at a time, and C(output_file), the
+          path of a local file where the alerts are written as JSON Lines instead of being returned in the facts."
       required: false
 
 extends_documentation_fragment:
@@ -53,6 +55,19 @@ EXAMPLES = '''
 
 - debug: var=alerts
 
+- name: Write the alerts with state 'Active' to a JSON Lines file, page by page
+  oneview_alert_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 600
+    params:
+      filter: "alertState='Active'"
+      output_file: /tmp/active_alerts.jsonl
+  delegate_to: localhost
+
+- debug: var=facts_output
+
 - name: Gather facts about the alerts with state 'Cleared'
   oneview_alert_facts:
     hostname: 172.16.101.48
@@ -83,6 +98,11 @@ alerts:
     description: The list of alerts.
     returned: Always, but can be null.
     type: list
+
+facts_output:
+    description: The path of the output file and the number of resources written to it.
+    returned: When the output_file param is provided.
+    type: dict
 '''
 
 from ansible.module_utils.oneview import OneViewModuleBase
@@ -93,10 +113,10 @@ class AlertFactsModule(OneViewModuleBase):
         argument_spec = dict(
             params=dict(required=False, type='dict')
         )
-        super(AlertFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(AlertFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
 
     def execute_module(self):
-        facts = self.oneview_client.alerts.get_all(**self.facts_params)
+        facts = self.get_all_facts(self.oneview_client.alerts)
 
         return dict(changed=False, ansible_facts=dict(alerts=facts))
 
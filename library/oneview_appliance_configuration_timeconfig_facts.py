@@ -57,7 +57,7 @@ from ansible.module_utils.oneview import OneViewModule
 
 class ApplianceConfigurationTimeconfigFactsModule(OneViewModule):
     def __init__(self):
-        super(ApplianceConfigurationTimeconfigFactsModule, self).__init__(additional_arg_spec=dict())
+        super(ApplianceConfigurationTimeconfigFactsModule, self).__init__(additional_arg_spec=dict(), cache_responses=True)
         self.set_resource_object(self.oneview_client.appliance_configuration_timeconfig)
 
     def execute_module(self):
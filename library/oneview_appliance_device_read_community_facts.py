@@ -60,7 +60,7 @@ from ansible.module_utils.oneview import OneViewModuleBase
 
 class ApplianceDeviceReadCommunityFactsModule(OneViewModuleBase):
     def __init__(self):
-        super(ApplianceDeviceReadCommunityFactsModule, self).__init__(additional_arg_spec=dict())
+        super(ApplianceDeviceReadCommunityFactsModule, self).__init__(additional_arg_spec=dict(), cache_responses=True)
 
     def execute_module(self):
         appliance_device_read_community = self.oneview_client.appliance_device_read_community.get()
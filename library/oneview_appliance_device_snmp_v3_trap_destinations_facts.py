@@ -117,7 +117,7 @@ class ApplianceDeviceSnmpV3TrapDestinationsFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ApplianceDeviceSnmpV3TrapDestinationsFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ApplianceDeviceSnmpV3TrapDestinationsFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.appliance_device_snmp_v3_trap_destinations)
 
     def execute_module(self):
@@ -126,7 +126,7 @@ class ApplianceDeviceSnmpV3TrapDestinationsFactsModule(OneViewModule):
         if self.current_resource:
             appliance_device_snmp_v3_trap_destinations = self.current_resource.data
         elif not self.module.params.get('name') or self.module.params.get('uri'):
-            appliance_device_snmp_v3_trap_destinations = self.resource_client.get_all(**self.facts_params)
+            appliance_device_snmp_v3_trap_destinations = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(appliance_device_snmp_v3_trap_destinations=appliance_device_snmp_v3_trap_destinations))
 
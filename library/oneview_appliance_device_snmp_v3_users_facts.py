@@ -96,7 +96,7 @@ class ApplianceDeviceSnmpV3UsersFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ApplianceDeviceSnmpV3UsersFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ApplianceDeviceSnmpV3UsersFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.appliance_device_snmp_v3_users)
 
     def execute_module(self):
@@ -105,7 +105,7 @@ class ApplianceDeviceSnmpV3UsersFactsModule(OneViewModule):
         if self.current_resource:
             appliance_device_snmp_v3_users = self.current_resource.data
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            appliance_device_snmp_v3_users = self.resource_client.get_all(**self.facts_params)
+            appliance_device_snmp_v3_users = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(appliance_device_snmp_v3_users=appliance_device_snmp_v3_users))
 
@@ -58,7 +58,7 @@ from ansible.module_utils.oneview import OneViewModule
 
 class ApplianceSshAccessFactsModule(OneViewModule):
     def __init__(self):
-        super(ApplianceSshAccessFactsModule, self).__init__(additional_arg_spec=dict())
+        super(ApplianceSshAccessFactsModule, self).__init__(additional_arg_spec=dict(), cache_responses=True)
         self.set_resource_object(self.oneview_client.appliance_ssh_access)
 
     def execute_module(self):
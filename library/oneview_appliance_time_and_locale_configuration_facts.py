@@ -57,7 +57,7 @@ from ansible.module_utils.oneview import OneViewModule
 
 class ApplianceTimeAndLocaleConfigurationFactsModule(OneViewModule):
     def __init__(self):
-        super(ApplianceTimeAndLocaleConfigurationFactsModule, self).__init__(additional_arg_spec=dict())
+        super(ApplianceTimeAndLocaleConfigurationFactsModule, self).__init__(additional_arg_spec=dict(), cache_responses=True)
         self.set_resource_object(self.oneview_client.appliance_time_and_locale_configuration)
 
     def execute_module(self):
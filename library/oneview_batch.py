@@ -0,0 +1,310 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = '''
+---
+module: oneview_batch
+short_description: Manage many OneView resources in a single task
+description:
+    - Ensures the state of a list of OneView resources in a single module execution, instead of running one task
+      per resource. All the items share one authenticated client, the existing resources of each type are loaded
+      once and the items of different resources are processed concurrently. With C(cache_dir), the loaded
+      collections are shared with the modules run with C(prefetch). The loaded collections are only used to find
+      the resources, each resource found is read again by URI before it is compared or changed.
+    - Each item is handled as the generic C(present) and C(absent) states of the corresponding module, including
+      the C(newName) and C(scopeUris) data properties. Module specific options, such as name to URI replacements
+      or bandwidth settings, are not supported.
+version_added: "2.5"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "Hewlett Packard Enterprise"
+options:
+    items:
+        description:
+            - List of resources to manage. Each item is a dict with the C(module) name, the C(state) and the
+              C(data) of the resource, as provided to the module.
+            - The supported modules are C(oneview_enclosure_group), C(oneview_ethernet_network),
+              C(oneview_fc_network), C(oneview_fcoe_network), C(oneview_logical_switch_group) and
+              C(oneview_network_set).
+            - Items of the same module and name are processed in the given order. An item with C(newName) is
+              processed in order with the items of both its current name and its new name.
+        required: true
+    max_workers:
+        description:
+            - Maximum number of resources changed concurrently.
+        default: 8
+notes:
+    - The task fails when any item fails, after all the items are processed. The result of each item is returned.
+    - This module supports the check mode.
+
+extends_documentation_fragment:
+    - oneview
+    - oneview.validateetag
+'''
+
+EXAMPLES = '''
+- name: Ensure that the Ethernet Networks and the Network Set are present
+  oneview_batch:
+    config: "{{ config }}"
+    max_workers: 4
+    items:
+      - module: oneview_ethernet_network
+        state: present
+        data:
+          name: Test Ethernet Network 1
+          vlanId: 201
+          ethernetNetworkType: Tagged
+          purpose: General
+      - module: oneview_ethernet_network
+        state: present
+        data:
+          name: Test Ethernet Network 2
+          vlanId: 202
+          ethernetNetworkType: Tagged
+          purpose: General
+      - module: oneview_network_set
+        state: present
+        data:
+          name: Test Network Set
+          networkUris: []
+  delegate_to: localhost
+
+- name: Ensure that the Ethernet Networks are absent
+  oneview_batch:
+    config: "{{ config }}"
+    items:
+      - module: oneview_ethernet_network
+        state: absent
+        data:
+          name: Test Ethernet Network 1
+      - module: oneview_ethernet_network
+        state: absent
+        data:
+          name: Test Ethernet Network 2
+  delegate_to: localhost
+'''
+
+RETURN = '''
+batch_results:
+    description: The result of each item, in the given order, with the module, name, state, changed, msg and
+        failed flag, and the resource data on state 'present'.
+    returned: Always.
+    type: list
+'''
+
+from collections import OrderedDict
+from copy import deepcopy
+
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleException, OneViewModuleValueError,
+                                          OneViewResourceIndex, compare, dict_merge, run_concurrently)
+
+try:
+    from ansible.module_utils.six import string_types
+except ImportError:
+    from six import string_types
+
+try:
+    from hpeOneView.exceptions import HPEOneViewException
+except ImportError:
+    HPEOneViewException = OneViewModuleException
+
+
+class BatchModule(OneViewModule):
+    MSG_COMPLETED = 'Batch completed: {0} item(s) changed.'
+    MSG_FAILED = 'Batch failed: {0} item(s) failed.'
+    MSG_UNSUPPORTED_MODULE = 'Module not supported in batch: '
+    MSG_UNSUPPORTED_STATE = 'State not supported in batch: '
+    MSG_MANDATORY_FIELD_MISSING = 'Missing mandatory field in batch item data: name'
+    MSG_INVALID_NAME = 'Invalid {0} in batch item data, a string is expected: '
+
+    # Resource client of each supported module
+    RESOURCE_CLIENTS = dict(
+        oneview_enclosure_group='enclosure_groups',
+        oneview_ethernet_network='ethernet_networks',
+        oneview_fc_network='fc_networks',
+        oneview_fcoe_network='fcoe_networks',
+        oneview_logical_switch_group='logical_switch_groups',
+        oneview_network_set='network_sets'
+    )
+
+    argument_spec = dict(
+        items=dict(required=True, type='list', elements='dict'),
+        max_workers=dict(type='int', default=8)
+    )
+
+    def __init__(self):
+        super(BatchModule, self).__init__(additional_arg_spec=self.argument_spec,
+                                          validate_etag_support=True)
+
+    def execute_module(self):
+        items = self.module.params['items']
+        max_workers = self.module.params['max_workers']
+        self.__validate_items(items)
+
+        modules = sorted(set(item['module'] for item in items))
+        indexes = run_concurrently(self.__load_index, modules, max_workers)
+        self.indexes = dict(zip(modules, indexes))
+
+        results = [None] * len(items)
+        for group_results in run_concurrently(self.__run_group, self.__group_items(items), max_workers):
+            for position, result in group_results:
+                results[position] = result
+
+        # The cached collections are written once, with the changes of all the items
+        for index in self.indexes.values():
+            index.save()
+
+        changed = any(result['changed'] for result in results)
+        failed = [result for result in results if result['failed']]
+        if failed:
+            self.module.fail_json(msg=self.MSG_FAILED.format(len(failed)), changed=changed,
+                                  ansible_facts=dict(batch_results=results), **self._get_timing_result())
+        return dict(changed=changed,
+                    msg=self.MSG_COMPLETED.format(len([x for x in results if x['changed']])),
+                    ansible_facts=dict(batch_results=results))
+
+    def __validate_items(self, items):
+        for item in items:
+            if item.get('module') not in self.RESOURCE_CLIENTS:
+                raise OneViewModuleValueError(self.MSG_UNSUPPORTED_MODULE + str(item.get('module')))
+            if item.get('state', 'present') not in ['present', 'absent']:
+                raise OneViewModuleValueError(self.MSG_UNSUPPORTED_STATE + str(item.get('state')))
+            data = item.get('data') or {}
+            if not data.get('name'):
+                raise OneViewModuleValueError(self.MSG_MANDATORY_FIELD_MISSING)
+            for key in ('name', 'newName'):
+                if key in data and not isinstance(data[key], string_types):
+                    raise OneViewModuleValueError(self.MSG_INVALID_NAME.format(key) + str(data[key]))
+
+    def __group_items(self, items):
+        # Items of the same resource depend on each other, the groups are independent. An item with newName joins
+        # the items of its current name and of its new name in a single group
+        parents = list(range(len(items)))
+
+        def find(position):
+            while parents[position] != position:
+                position = parents[position]
+            return position
+
+        owners = {}
+        for position, item in enumerate(items):
+            for name in (item['data']['name'], item['data'].get('newName')):
+                if not name:
+                    continue
+                key = (item['module'], name.lower())
+                if key in owners:
+                    parents[find(position)] = find(owners[key])
+                else:
+                    owners[key] = position
+
+        groups = OrderedDict()
+        for position, item in enumerate(items):
+            groups.setdefault(find(position), []).append((position, item))
+        return list(groups.values())
+
+    def __load_index(self, module):
+        return OneViewResourceIndex.from_params(self.module.params, self.__get_resource_client(module),
+                                                self.oneview_client.connection).load()
+
+    def __get_resource_client(self, module):
+        return getattr(self.oneview_client, self.RESOURCE_CLIENTS[module])
+
+    def __run_group(self, group):
+        return [(position, self.__run_item(item)) for position, item in group]
+
+    def __run_item(self, item):
+        data = deepcopy(item['data'])
+        state = item.get('state', 'present')
+        result = dict(module=item['module'], name=data['name'], state=state, failed=False)
+
+        try:
+            if state == 'present':
+                changed, msg, resource = self.__present(item['module'], data)
+                result['resource'] = resource
+            else:
+                changed, msg = self.__absent(item['module'], data)
+            result.update(changed=changed, msg=msg)
+        except (OneViewModuleException, HPEOneViewException) as exception:
+            # The resource may have changed before the failure
+            self.indexes[item['module']].invalidate()
+            result.update(changed=False, failed=True, msg='; '.join(str(e) for e in exception.args))
+
+        return result
+
+    def __present(self, module, data):
+        resource_client = self.__get_resource_client(module)
+        index = self.indexes[module]
+        scope_uris = data.pop('scopeUris', None)
+        # The index only resolves the URI, the resource is read again before it is compared or updated
+        resource = index.read(data['name'])
+
+        if "newName" in data:
+            data["name"] = data.pop("newName")
+
+        if not resource:
+            changed, msg = True, self.MSG_CREATED
+            if self.module.check_mode:
+                return changed, msg, data
+            resource = resource_client.create(data)
+        else:
+            current_data = resource.data
+            updated_data = dict_merge(current_data.copy(), data)
+            if compare(current_data, updated_data):
+                changed, msg = False, self.MSG_ALREADY_PRESENT
+            else:
+                changed, msg = True, self.MSG_UPDATED
+                if self.module.check_mode:
+                    return changed, msg, updated_data
+                index.remove(current_data)
+                resource.update(updated_data)
+
+        if scope_uris is not None and set(resource.data.get('scopeUris') or []) != set(scope_uris):
+            changed, msg = True, self.MSG_UPDATED
+            if not self.module.check_mode:
+                resource = resource.patch(operation='replace', path='/scopeUris', value=scope_uris)
+
+        index.set(resource.data)
+        return changed, msg, resource.data
+
+    def __absent(self, module, data):
+        index = self.indexes[module]
+        resource = index.read(data['name'])
+
+        if not resource:
+            return False, self.MSG_ALREADY_ABSENT
+
+        if not self.module.check_mode:
+            resource.delete()
+            index.remove(resource.data)
+        return True, self.MSG_DELETED
+
+
+def main():
+    BatchModule().run()
+
+
+if __name__ == '__main__':
+    main()
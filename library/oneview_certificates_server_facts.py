@@ -83,7 +83,7 @@ class CertificatesServerFactsModule(OneViewModule):
             aliasName=dict(required=False, type='str'),
         )
 
-        super(CertificatesServerFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(CertificatesServerFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.certificates_server
 
     def execute_module(self):
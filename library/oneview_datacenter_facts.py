@@ -104,7 +104,7 @@ class DatacenterFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(DatacenterFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(DatacenterFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
 
     def execute_module(self):
 
@@ -122,7 +122,7 @@ class DatacenterFactsModule(OneViewModuleBase):
 
             ansible_facts['datacenters'] = datacenters
         else:
-            ansible_facts['datacenters'] = client.get_all(**self.facts_params)
+            ansible_facts['datacenters'] = self.get_all_facts(client)
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
@@ -109,7 +109,7 @@ class DriveEnclosureFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(DriveEnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(DriveEnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.drive_enclosures
 
     def execute_module(self):
@@ -124,7 +124,7 @@ class DriveEnclosureFactsModule(OneViewModuleBase):
                     if self.options.get('portMap'):
                         facts['drive_enclosure_port_map'] = self.resource_client.get_port_map(drive_enclosures_uri)
         else:
-            drive_enclosures = self.resource_client.get_all(**self.facts_params)
+            drive_enclosures = self.get_all_facts(self.resource_client)
 
         facts['drive_enclosures'] = drive_enclosures
 
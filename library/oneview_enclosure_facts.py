@@ -45,10 +45,18 @@ options:
         - "List with options to gather additional facts about an Enclosure and related resources.
           Options allowed: C(script), C(environmentalConfiguration), and C(utilization). For the option C(utilization),
           you can provide specific parameters."
+        - "Without C(name), the options are gathered for every Enclosure matched by C(params), and returned by
+          Enclosure URI in C(enclosure_options). They are also gathered when C(params.output_file) is provided,
+          for each page as it is written to the file."
+        - "The C(utilization) option accepts C(output_file), the path of a local file where the metric samples of
+          the Enclosures are written instead of being returned, C(output_format), C(csv) with one row per sample
+          or C(json) with arrays of timestamps and values per metric, and C(incremental), true by default, to only
+          request and add the samples taken since the previous run."
 
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsoptions
 '''
 
 EXAMPLES = '''
@@ -126,6 +134,36 @@ EXAMPLES = '''
   delegate_to: localhost
 - debug: var=enclosures
 - debug: var=enclosure_utilization
+
+- name: Gather the environmental configuration of all the Enclosures with status OK
+  oneview_enclosure_facts:
+    params:
+      filter: status=OK
+    options:
+      - environmentalConfiguration
+    max_workers: 8
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+  no_log: true
+  delegate_to: localhost
+- debug: var=enclosure_options
+
+- name: Add the temperature samples of all the Enclosures taken since the last run to a columnar JSON file
+  oneview_enclosure_facts:
+    options:
+      - utilization:
+          fields: AmbientTemperature
+          output_file: /var/lib/capacity/enclosure_utilization.json
+          output_format: json
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+  no_log: true
+  delegate_to: localhost
+- debug: var=utilization_output
 '''
 
 RETURN = '''
@@ -148,28 +186,52 @@ enclosure_utilization:
     description: Has all the OneView facts about the utilization of an Enclosure.
     returned: When requested, but can be null.
     type: dict
+
+enclosure_options:
+    description: Has the facts of the requested options of each Enclosure, by Enclosure URI.
+    returned: When options are requested without name.
+    type: dict
+
+utilization_output:
+    description: The path of the utilization output file and the number of samples written to it.
+    returned: When the output_file param of the utilization option is provided.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, OneViewUtilizationExport, FACTS_OPTIONS_ARGS
 
 
 class EnclosureFactsModule(OneViewModule):
-    argument_spec = dict(name=dict(type='str'), options=dict(type='list'), params=dict(type='dict'))
+    argument_spec = dict(name=dict(type='str'), options=dict(type='list'), params=dict(type='dict'), **FACTS_OPTIONS_ARGS)
 
     def __init__(self):
-        super(EnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(EnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.enclosures)
 
     def execute_module(self):
 
         ansible_facts = {}
+        self.utilization_export = OneViewUtilizationExport.from_params(self.options.get('utilization'))
 
         if self.current_resource:
             enclosures = [self.current_resource.data]
             if self.options:
-                ansible_facts = self._gather_optional_facts(self.options)
+                ansible_facts = self._gather_optional_facts()
+                if self.utilization_export:
+                    ansible_facts['utilization_output'] = self.export_utilization(
+                        self.utilization_export, {self.current_resource.data['uri']: ansible_facts}, 'enclosure_utilization')
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            enclosures = self.resource_client.get_all(**self.facts_params)
+            if self.options:
+                # Gathered for each page, since the pages are not returned when written to the output file
+                options_facts = {}
+                enclosures = self.get_all_facts(self.resource_client, lambda page: options_facts.update(
+                    self.gather_resources_facts(page, self._get_option_functions)))
+                if self.utilization_export:
+                    ansible_facts['utilization_output'] = self.export_utilization(
+                        self.utilization_export, options_facts, 'enclosure_utilization')
+                ansible_facts['enclosure_options'] = options_facts
+            else:
+                enclosures = self.get_all_facts(self.resource_client)
         else:
             enclosures = []
 
@@ -178,21 +240,24 @@ class EnclosureFactsModule(OneViewModule):
         return dict(changed=False,
                     ansible_facts=ansible_facts)
 
-    def _gather_optional_facts(self, options):
+    def _gather_optional_facts(self):
+        return self.gather_facts_concurrently(self._get_option_functions(self.current_resource))
 
-        ansible_facts = {}
+    def _get_option_functions(self, resource):
+
+        options = self.options
+        functions = {}
 
         if options.get('script'):
-            ansible_facts['enclosure_script'] = self.current_resource.get_script()
+            functions['enclosure_script'] = resource.get_script
         if options.get('environmentalConfiguration'):
-            env_config = self.current_resource.get_environmental_configuration()
-            ansible_facts['enclosure_environmental_configuration'] = env_config
+            functions['enclosure_environmental_configuration'] = resource.get_environmental_configuration
         if options.get('utilization'):
-            ansible_facts['enclosure_utilization'] = self._get_utilization(options['utilization'])
+            functions['enclosure_utilization'] = lambda: self._get_utilization(resource, options['utilization'])
 
-        return ansible_facts
+        return functions
 
-    def _get_utilization(self, params):
+    def _get_utilization(self, resource, params):
         fields = view = refresh = filter = ''
         if isinstance(params, dict):
             fields = params.get('fields')
@@ -200,10 +265,13 @@ class EnclosureFactsModule(OneViewModule):
             refresh = params.get('refresh')
             filter = params.get('filter')
 
-        return self.current_resource.get_utilization(fields=fields,
-                                                     filter=filter,
-                                                     refresh=refresh,
-                                                     view=view)
+        if self.utilization_export:
+            filter = self.utilization_export.filter(resource.data['uri'], filter)
+
+        return resource.get_utilization(fields=fields,
+                                        filter=filter,
+                                        refresh=refresh,
+                                        view=view)
 
 
 def main():
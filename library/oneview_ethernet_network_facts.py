@@ -126,7 +126,7 @@ class EthernetNetworkFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(EthernetNetworkFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(EthernetNetworkFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.ethernet_networks)
 
     def execute_module(self):
@@ -139,7 +139,7 @@ class EthernetNetworkFactsModule(OneViewModule):
                 if self.module.params.get('options'):
                     ansible_facts = self.__gather_optional_facts()
         else:
-            ethernet_networks = self.resource_client.get_all(**self.facts_params)
+            ethernet_networks = self.get_all_facts(self.resource_client)
 
         ansible_facts['ethernet_networks'] = ethernet_networks
 
@@ -80,11 +80,11 @@ class EventFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict')
         )
 
-        super(EventFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(EventFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
 
     def execute_module(self):
 
-        events = self.oneview_client.events.get_all(**self.facts_params)
+        events = self.get_all_facts(self.oneview_client.events)
 
         return dict(changed=False, ansible_facts=dict(events=events))
 
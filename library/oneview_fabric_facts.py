@@ -103,7 +103,7 @@ class FabricFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(FabricFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(FabricFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.fabrics
 
     def execute_module(self):
@@ -115,7 +115,7 @@ class FabricFactsModule(OneViewModuleBase):
             if self.options and fabrics:
                 ansible_facts = self.__gather_optional_facts(fabrics[0])
         else:
-            fabrics = self.oneview_client.fabrics.get_all(**self.facts_params)
+            fabrics = self.get_all_facts(self.oneview_client.fabrics)
 
         ansible_facts['fabrics'] = fabrics
 
@@ -26,8 +26,12 @@ module: oneview_firmware_bundle
 short_description: Upload OneView Firmware Bundle resources.
 description:
     - Upload an SPP ISO image file or a hotfix file to the appliance.
-notes:
-   - "This module is non-idempotent"
+    - The file is not uploaded again when the appliance already has it. When C(cache_dir) is provided, the SHA-256
+      digest of each file uploaded is kept there, with the URI of the resulting bundle. The firmware drivers of the
+      appliance with the same file name and size are considered the same bundle as well.
+    - The file is streamed from disk in chunks, with an optional bandwidth ceiling, and the upload progress is logged.
+      The appliance does not resume partial uploads, so an upload interrupted by a connection failure is started
+      again, up to C(upload_retries) times.
 version_added: "2.3"
 requirements:
     - "python >= 2.7.9"
@@ -43,6 +47,23 @@ options:
       description:
         - The full path of a local file to be loaded.
       required: true
+    chunk_size:
+      description:
+        - Number of bytes read from the file and sent at a time.
+      default: 1048576
+    max_bandwidth:
+      description:
+        - Maximum upload rate, in kilobytes per second. When not provided, there is no limit.
+      required: false
+    upload_retries:
+      description:
+        - Number of times an upload interrupted by a connection failure is started again.
+      default: 3
+    task_timeout:
+      description:
+        - Maximum time, in seconds, to wait for the task that adds the uploaded bundle. When not provided, the module
+          waits until the task completes.
+      required: false
 
 extends_documentation_fragment:
     - oneview
@@ -55,6 +76,17 @@ EXAMPLES = '''
     state: present
     file_path: "/home/user/Downloads/hp-firmware-hdd-a1b08f8a6b-HPGH-1.1.x86_64.rpm"
 
+- name: Ensure that the SPP is present, uploading it at up to 50 MB per second
+  oneview_firmware_bundle:
+    config: "{{ config_file_path }}"
+    cache_dir: "{{ playbook_dir }}/.oneview"
+    state: present
+    file_path: "/home/user/Downloads/SPP2021.05.0.iso"
+    max_bandwidth: 51200
+    upload_retries: 5
+    task_timeout: 3600
+
+- debug: var=firmware_bundle_upload
 '''
 
 RETURN = '''
@@ -62,29 +94,100 @@ firmware_bundle:
     description: Has the facts about the OneView Firmware Bundle.
     returned: Always. Can be null.
     type: dict
+
+firmware_bundle_upload:
+    description: The size of the file, its SHA-256 digest when C(cache_dir) is provided, and, when uploaded, the
+        number of attempts, the duration and the average rate, in bytes per second, of the upload.
+    returned: Always.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase
+import os
+
+from ansible.module_utils.oneview import (OneViewFileCache, OneViewFileTransfer, OneViewModuleBase,
+                                          OneViewModuleException, OneViewModuleValueError, file_sha256)
+
+try:
+    from hpeOneView.exceptions import HPEOneViewException
+except ImportError:
+    HPEOneViewException = OneViewModuleException
 
 
 class FirmwareBundleModule(OneViewModuleBase):
     MSG_FIRMWARE_BUNDLE_UPLOADED = 'Firmware Bundle uploaded sucessfully.'
+    MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT = 'Firmware Bundle is already present.'
+    MSG_FILE_NOT_FOUND = 'Firmware Bundle file not found: {0}'
+
+    FIRMWARE_BUNDLES_URI = '/rest/firmware-bundles'
+    CACHE_FILE_NAME = 'oneview_firmware_bundles.json'
+    CACHE_TTL = 30 * 86400
 
     argument_spec = dict(
         state=dict(required=True, choices=['present']),
-        file_path=dict(required=True, type='str')
+        file_path=dict(required=True, type='str'),
+        chunk_size=dict(type='int', default=1048576),
+        max_bandwidth=dict(type='int'),
+        upload_retries=dict(type='int', default=3),
+        task_timeout=dict(type='int')
     )
 
     def __init__(self):
         super(FirmwareBundleModule, self).__init__(additional_arg_spec=self.argument_spec)
 
     def execute_module(self):
-        file_path = self.module.params['file_path']
+        file_path = os.path.expanduser(self.module.params['file_path'])
+        if not os.path.isfile(file_path):
+            raise OneViewModuleValueError(self.MSG_FILE_NOT_FOUND.format(file_path))
+
+        upload = dict(size=os.path.getsize(file_path))
+        cache = OneViewFileCache.from_params(self.module.params, self.CACHE_FILE_NAME, self.CACHE_TTL)
+        cache_key = None
+        if cache:
+            # The digest is only needed to look up the bundles uploaded before
+            upload['sha256'] = file_sha256(file_path, self.module.params['chunk_size'])
+            cache_key = '|'.join([self.oneview_client.connection.get_host(), upload['sha256']])
+
+        existing_bundle = self.__get_existing_bundle(cache, cache_key, os.path.basename(file_path), upload['size'])
+        if existing_bundle:
+            return dict(changed=False,
+                        msg=self.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+                        ansible_facts=dict(firmware_bundle=existing_bundle, firmware_bundle_upload=upload))
+
+        new_firmware, stats = self.__upload(file_path)
+        upload.update(stats)
+        if cache and isinstance(new_firmware, dict) and new_firmware.get('uri'):
+            cache.set(cache_key, new_firmware['uri'])
 
-        new_firmware = self.oneview_client.firmware_bundles.upload(file_path)
         return dict(changed=True,
                     msg=self.MSG_FIRMWARE_BUNDLE_UPLOADED,
-                    ansible_facts=dict(firmware_bundle=new_firmware))
+                    ansible_facts=dict(firmware_bundle=new_firmware, firmware_bundle_upload=upload))
+
+    def __get_existing_bundle(self, cache, cache_key, file_name, size):
+        uri = cache.get(cache_key) if cache else None
+        if uri:
+            try:
+                return self.oneview_client.connection.get(uri)
+            except HPEOneViewException:
+                # Removed from the appliance since it was uploaded
+                cache.delete(cache_key)
+
+        for firmware_driver in self.oneview_client.firmware_drivers.get_all():
+            file_names = [firmware_driver.get('isoFileName')]
+            file_names.extend(component.get('fileName') for component in firmware_driver.get('fwComponents') or [])
+            if file_name in file_names and str(firmware_driver.get('bundleSize')) == str(size):
+                return firmware_driver
+        return None
+
+    def __upload(self, file_path):
+        max_bandwidth = self.module.params.get('max_bandwidth')
+        transfer = OneViewFileTransfer(self.oneview_client.connection,
+                                       chunk_size=self.module.params['chunk_size'],
+                                       max_bandwidth=max_bandwidth * 1024 if max_bandwidth else None,
+                                       retries=self.module.params['upload_retries'],
+                                       task_timeout=self.module.params.get('task_timeout'),
+                                       log=self.module.log)
+        body, stats = transfer.upload(self.FIRMWARE_BUNDLES_URI, file_path)
+        return body, dict(attempts=stats['attempts'], duration=stats['duration'], rate=stats['rate'])
 
 
 def main():
@@ -129,7 +129,7 @@ class FirmwareDriverFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict')
         )
-        super(FirmwareDriverFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(FirmwareDriverFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.firmware_drivers
 
     def execute_module(self):
@@ -151,7 +151,7 @@ class FirmwareDriverFactsModule(OneViewModule):
             if self.options.get('schema'):
                 ansible_facts['schema'] = self.resource_client.get_schema()
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            firmware_drivers = self.resource_client.get_all(**self.facts_params)
+            firmware_drivers = self.get_all_facts(self.resource_client)
 
         ansible_facts['firmware_drivers'] = firmware_drivers
 
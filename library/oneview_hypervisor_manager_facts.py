@@ -97,7 +97,7 @@ class HypervisorManagerFactsModule(OneViewModule):
             params=dict(required=False, type='dict')
         )
 
-        super(HypervisorManagerFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(HypervisorManagerFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.hypervisor_managers
 
     def execute_module(self):
@@ -105,7 +105,7 @@ class HypervisorManagerFactsModule(OneViewModule):
         if self.module.params['name']:
             hypervisor_managers = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            hypervisor_managers = self.resource_client.get_all(**self.facts_params)
+            hypervisor_managers = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(hypervisor_managers=hypervisor_managers))
 
@@ -117,7 +117,7 @@ class IdPoolsFactsModule(OneViewModule):
             data=dict(required=True, type='dict'),
         )
 
-        super(IdPoolsFactsModule, self).__init__(additional_arg_spec=argument_spec, validate_etag_support=True)
+        super(IdPoolsFactsModule, self).__init__(additional_arg_spec=argument_spec, validate_etag_support=True, cache_responses=True)
 
         self.set_resource_object(self.oneview_client.id_pools)
 
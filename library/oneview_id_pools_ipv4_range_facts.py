@@ -136,7 +136,7 @@ class IdPoolsIpv4RangeFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict')
         )
-        super(IdPoolsIpv4RangeFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(IdPoolsIpv4RangeFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.id_pools_ipv4_ranges
 
     def execute_module(self):
@@ -88,7 +88,7 @@ class IdPoolsIpv4SubnetFactsModule(OneViewModule):
             uri=dict(required=False, type='str'),
             params=dict(required=False, type='dict')
         )
-        super(IdPoolsIpv4SubnetFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(IdPoolsIpv4SubnetFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.id_pools_ipv4_subnets)
 
     def execute_module(self):
@@ -98,7 +98,7 @@ class IdPoolsIpv4SubnetFactsModule(OneViewModule):
         elif self.module.params.get('networkId', ''):
             id_pools_ipv4_subnets = [self.resource_client.get_by_field('networkId', self.module.params['networkId']).data]
         else:
-            id_pools_ipv4_subnets = self.resource_client.get_all(**self.facts_params)
+            id_pools_ipv4_subnets = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(id_pools_ipv4_subnets=id_pools_ipv4_subnets))
 
@@ -53,6 +53,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsoptions
 '''
 
 EXAMPLES = '''
@@ -227,7 +228,7 @@ interconnect_pluggable_module_information:
     type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, FACTS_OPTIONS_ARGS
 from hpeOneView.resources.resource import extract_id_from_uri
 
 
@@ -239,8 +240,9 @@ class InterconnectFactsModule(OneViewModule):
             name=dict(required=False, type='str'),
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
+            **FACTS_OPTIONS_ARGS
         )
-        super(InterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(InterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.interconnects)
 
     def execute_module(self):
@@ -252,7 +254,7 @@ class InterconnectFactsModule(OneViewModule):
             if self.module.params.get('options'):
                 self.__get_options(facts)
         else:
-            facts['interconnects'] = self.resource_client.get_all(**self.facts_params)
+            facts['interconnects'] = self.get_all_facts(self.resource_client)
 
         return dict(
             changed=False,
@@ -260,38 +262,38 @@ class InterconnectFactsModule(OneViewModule):
         )
 
     def __get_options(self, facts):
+        # The options are independent requests, gathered concurrently
+        functions = {}
+
         if self.options.get('nameServers'):
-            name_servers = self.current_resource.get_name_servers()
-            facts['interconnect_name_servers'] = name_servers
+            functions['interconnect_name_servers'] = self.current_resource.get_name_servers
 
         if self.options.get('statistics'):
-            facts['interconnect_statistics'] = self.current_resource.get_statistics()
+            functions['interconnect_statistics'] = self.current_resource.get_statistics
 
         if self.options.get('portStatistics'):
             port_name = self.options['portStatistics']
-            port_statistics = self.current_resource.get_statistics(port_name)
-            facts['interconnect_port_statistics'] = port_statistics
+            functions['interconnect_port_statistics'] = lambda: self.current_resource.get_statistics(port_name)
 
         if self.options.get('subPortStatistics'):
             facts['interconnect_subport_statistics'] = None
             sub_options = self.options['subPortStatistics']
             if isinstance(sub_options, dict) and sub_options.get('portName') and sub_options.get('subportNumber'):
-                facts['interconnect_subport_statistics'] = self.current_resource.get_subport_statistics(
+                functions['interconnect_subport_statistics'] = lambda: self.current_resource.get_subport_statistics(
                     sub_options['portName'], sub_options['subportNumber'])
 
         if self.options.get('ports'):
-            ports = self.current_resource.get_ports()
-            facts['interconnect_ports'] = ports
+            functions['interconnect_ports'] = self.current_resource.get_ports
 
         if self.options.get('port'):
-            port_name = self.options.get('port')
-            port_id = "{}:{}".format(extract_id_from_uri(self.current_resource.data['uri']), port_name)
-            port = self.current_resource.get_port(port_id)
-            facts['interconnect_port'] = port
+            port_id = "{}:{}".format(extract_id_from_uri(self.current_resource.data['uri']), self.options.get('port'))
+            functions['interconnect_port'] = lambda: self.current_resource.get_port(port_id)
 
         if self.options.get('pluggableModuleInformation'):
-            sfp_info = self.current_resource.get_pluggable_module_information()
-            facts['interconnect_pluggable_module_information'] = sfp_info
+            functions['interconnect_pluggable_module_information'] = \
+                self.current_resource.get_pluggable_module_information
+
+        facts.update(self.gather_facts_concurrently(functions))
 
 
 def main():
@@ -93,7 +93,7 @@ class InterconnectTypeFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(InterconnectTypeFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(InterconnectTypeFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.interconnect_types
 
     def execute_module(self):
@@ -101,7 +101,7 @@ class InterconnectTypeFactsModule(OneViewModule):
         if self.module.params.get('name'):
             interconnect_types = self.resource_client.get_by("name", self.module.params['name'])
         else:
-            interconnect_types = self.resource_client.get_all(**self.facts_params)
+            interconnect_types = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(interconnect_types=interconnect_types))
 
@@ -108,7 +108,7 @@ class InternalLinkSetFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(InternalLinkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(InternalLinkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.internal_link_sets
 
     def execute_module(self):
@@ -116,7 +116,7 @@ class InternalLinkSetFactsModule(OneViewModule):
         if name:
             internal_links = self.resource_client.get_by('name', name)
         else:
-            internal_links = self.resource_client.get_all(**self.facts_params)
+            internal_links = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(internal_link_sets=internal_links))
 
@@ -110,7 +110,7 @@ class LabelFactsModule(OneViewModule):
             resourceUri=dict(required=False, type='str'),
             params=dict(required=False, type='dict')
         )
-        super(LabelFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(LabelFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.labels
 
     def execute_module(self):
@@ -119,7 +119,7 @@ class LabelFactsModule(OneViewModule):
         elif self.module.params.get('resourceUri'):
             labels = self.oneview_client.labels.get_by_resource(self.module.params['resourceUri']).data
         else:
-            labels = self.resource_client.get_all(**self.facts_params)
+            labels = self.get_all_facts(self.resource_client)
         return dict(changed=False, ansible_facts=dict(labels=labels))
 
 
@@ -99,7 +99,7 @@ class LogicalDownlinksFactsModule(OneViewModuleBase):
             excludeEthernet=dict(type='bool', default=False),
             params=dict(required=False, type='dict'),
         )
-        super(LogicalDownlinksFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(LogicalDownlinksFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.logical_downlinks
 
     def execute_module(self):
@@ -120,7 +120,7 @@ class LogicalDownlinksFactsModule(OneViewModuleBase):
         elif exclude_ethernet:
             logical_downlinks = self.resource_client.get_all_without_ethernet()
         else:
-            logical_downlinks = self.resource_client.get_all(**self.facts_params)
+            logical_downlinks = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(logical_downlinks=logical_downlinks))
 
@@ -124,7 +124,7 @@ class LogicalEnclosureFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(LogicalEnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(LogicalEnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.logical_enclosures)
 
     def execute_module(self):
@@ -135,7 +135,7 @@ class LogicalEnclosureFactsModule(OneViewModule):
             if self.options and logical_enclosures:
                 ansible_facts = self.__gather_optional_facts()
         else:
-            logical_enclosures = self.resource_client.get_all(**self.facts_params)
+            logical_enclosures = self.get_all_facts(self.resource_client)
 
         ansible_facts['logical_enclosures'] = logical_enclosures
 
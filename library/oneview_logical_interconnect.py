@@ -37,8 +37,8 @@ options:
             - Indicates the desired state for the Logical Interconnect resource.
               C(compliant) brings the logical interconnect back to a consistent state.
               C(ethernet_settings_updated) updates the Ethernet interconnect settings for the logical interconnect.
-              C(internal_networks_updated) updates the internal networks on the logical interconnect. This operation is
-              non-idempotent.
+              C(internal_networks_updated) updates the internal networks on the logical interconnect, when they
+              differ from the current internal networks.
               C(settings_updated) updates the Logical Interconnect settings.
               C(forwarding_information_base_generated) generates the forwarding information base dump file for the
               logical interconnect. This operation is non-idempotent and asynchronous.
@@ -66,11 +66,39 @@ options:
     data:
         description:
             - List with the options.
+            - "On states C(compliant) and C(firmware_installed), C(filter), a Logical Interconnect collection filter,
+              C(logicalInterconnectGroupUri) or C(logicalInterconnectGroupName) select many Logical Interconnects
+              at once instead of C(name). They are requested with a single query, and on state C(compliant) the
+              ones whose C(consistencyStatus) is already C(CONSISTENT) are skipped."
         required: true
+    max_workers:
+        description:
+            - Maximum number of Logical Interconnect tasks in flight, on states C(compliant) and
+              C(firmware_installed) with many Logical Interconnects.
+        default: 4
+    batch_size:
+        description:
+            - Number of Logical Interconnects of each wave, on states C(compliant) and C(firmware_installed) with
+              many Logical Interconnects. A wave starts when all the tasks of the previous one complete, and the
+              remaining waves are not started when a task fails. When not provided, all the Logical Interconnects
+              are in the same wave.
+        required: false
+    max_per_enclosure_group:
+        description:
+            - Maximum number of Logical Interconnects of the same enclosure group updated at a time, on states
+              C(compliant) and C(firmware_installed) with many Logical Interconnects. C(0) has no limit.
+        default: 1
+    task_timeout:
+        description:
+            - Maximum time, in seconds, to wait for each Logical Interconnect task, on states C(compliant) and
+              C(firmware_installed) with many Logical Interconnects. When not provided, the module waits until the
+              tasks complete.
+        required: false
 
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
+    - oneview.busyretry
 '''
 
 EXAMPLES = '''
@@ -221,6 +249,36 @@ EXAMPLES = '''
         command: Stage
         spp: "filename"  # could also be sppUri: '/rest/firmware-drivers/<filename>'
 
+- name: Bring the Logical Interconnects of a Logical Interconnect Group back to a consistent state, 4 at a time
+  oneview_logical_interconnect:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 2400
+    state: compliant
+    max_workers: 4
+    max_per_enclosure_group: 1
+    batch_size: 10
+    task_timeout: 3600
+    data:
+      logicalInterconnectGroupName: "Name of the Logical Interconnect Group"
+
+- debug: var=logical_interconnect_results
+
+- name: Stage a firmware on the Logical Interconnects matched by a filter
+  oneview_logical_interconnect:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 2400
+    state: firmware_installed
+    max_workers: 8
+    data:
+      filter: "enclosureType='SY12000'"
+      firmware:
+        command: Stage
+        spp: "filename"
+
 - name: Validates the bulk update from group operation of the given LI URLs
   oneview_logical_interconnect:
     hostname: 172.16.101.48
@@ -317,14 +375,32 @@ scope_uris:
     returned: On 'scopes_updated' state, but can be null.
     type: dict
 
+internal_networks_changes:
+    description: The URIs of the internal networks added and removed.
+    returned: On 'internal_networks_updated' state.
+    type: dict
+
 li_inconsistency_report:
     description: Has the OneView facts about the LIs consolidated inconsistency report .
     returned: On 'bulk_inconsistency_validated' state, but can be null.
     type: dict
+
+logical_interconnect_results:
+    description: The result of each Logical Interconnect selected, with its name, URI, changed and failed flags,
+        message and wave.
+    returned: On 'compliant' and 'firmware_installed' states with many Logical Interconnects.
+    type: list
 '''
 
-import time
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError, compare
+from ansible.module_utils.oneview import (OneViewBusyRetry, OneViewModule, OneViewModuleException,
+                                          OneViewModuleResourceNotFound, OneViewModuleValueError,
+                                          OneViewNetworkResolver, OneViewTaskWaiter, BUSY_RETRY_ARGS, compare,
+                                          run_concurrently_by_key)
+
+try:
+    from hpeOneView.exceptions import HPEOneViewException
+except ImportError:
+    HPEOneViewException = OneViewModuleException
 
 
 class LogicalInterconnectModule(OneViewModule):
@@ -346,6 +422,15 @@ class LogicalInterconnectModule(OneViewModule):
     MSG_ETH_NETWORK_NOT_FOUND = 'Ethernet network not found: '
     MSG_NO_CHANGES_PROVIDED = 'Nothing to do.'
     MSG_NO_OPTIONS_PROVIDED = 'No options provided.'
+    MSG_ALREADY_CONSISTENT = 'Logical Interconnect is already consistent.'
+    MSG_NOT_STARTED = 'Not started, a previous wave failed.'
+    MSG_LOGICAL_INTERCONNECTS_UPDATED = '{0} Logical Interconnect(s) updated successfully.'
+    MSG_LOGICAL_INTERCONNECTS_FAILED = 'Failed to update {0} Logical Interconnect(s).'
+    MSG_LIG_NOT_FOUND = 'Logical Interconnect Group not found: {0}'
+
+    # States that can update many Logical Interconnects, selected by the data keys
+    BULK_STATES = ['compliant', 'firmware_installed']
+    BULK_SELECTORS = ['filter', 'logicalInterconnectGroupUri', 'logicalInterconnectGroupName']
 
     argument_spec = dict(
         state=dict(
@@ -356,7 +441,12 @@ class LogicalInterconnectModule(OneViewModule):
                      'firmware_installed', 'telemetry_configuration_updated', 'scopes_updated', 'igmp_settings_updated',
                      'bulk_inconsistency_validated', 'port_flap_settings_updated']
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        max_workers=dict(type='int', default=4),
+        batch_size=dict(type='int'),
+        max_per_enclosure_group=dict(type='int', default=1),
+        task_timeout=dict(type='int'),
+        **BUSY_RETRY_ARGS
     )
 
     def __init__(self):
@@ -365,6 +455,8 @@ class LogicalInterconnectModule(OneViewModule):
         self.set_resource_object(self.oneview_client.logical_interconnects)
 
     def execute_module(self):
+        if self.state in self.BULK_STATES and any(key in self.data for key in self.BULK_SELECTORS):
+            return self.__update_logical_interconnects()
 
         if not self.current_resource:
             raise OneViewModuleResourceNotFound(self.MSG_NOT_FOUND)
@@ -410,17 +502,10 @@ class LogicalInterconnectModule(OneViewModule):
         return result
 
     def __compliance(self):
-        # This block will handle the exception caused by parallel operations made on same resource
-        try:
-            li = self.current_resource.update_compliance()
-            return True, self.MSG_CONSISTENT, dict(logical_interconnect=li)
-        except Exception as e:
-            attrib_val = getattr(e, 'oneview_response', None)
-            if attrib_val and attrib_val.get('errorCode') == 'CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT':
-                time.sleep(60)
-                main()
-            else:
-                raise e
+        # Another operation may be ongoing on the logical interconnect, such as the compliance started by a parallel run
+        busy_retry = OneViewBusyRetry.from_params(self.module.params, self.oneview_client.connection)
+        li = busy_retry.call(self.current_resource.update_compliance, resource_uri=self.current_resource.data['uri'])
+        return True, self.MSG_CONSISTENT, dict(logical_interconnect=li)
 
     def __update_ethernet_settings(self):
         self.__validate_options('ethernetSettings', self.data)
@@ -437,23 +522,57 @@ class LogicalInterconnectModule(OneViewModule):
     def __update_internal_networks(self):
         self.__validate_options('internalNetworks', self.data)
 
+        network_resolver = OneViewNetworkResolver(self.oneview_client)
+        network_resolver.prefetch([x['name'] for x in self.data['internalNetworks'] if 'name' in x],
+                                  [OneViewNetworkResolver.ETHERNET_NETWORKS])
+
         networks = []
         for network_uri_or_name in self.data['internalNetworks']:
             if 'name' in network_uri_or_name:
-                ethernet_network = self.__get_ethernet_network_by_name(
-                    network_uri_or_name['name'])
+                ethernet_network_uri = network_resolver.get_uri(network_uri_or_name['name'],
+                                                                OneViewNetworkResolver.ETHERNET_NETWORKS)
 
-                if not ethernet_network:
+                if not ethernet_network_uri:
                     msg = self.MSG_ETH_NETWORK_NOT_FOUND + network_uri_or_name['name']
                     raise OneViewModuleResourceNotFound(msg)
 
-                networks.append(ethernet_network['uri'])
+                networks.append(ethernet_network_uri)
             elif 'uri' in network_uri_or_name:
                 networks.append(network_uri_or_name['uri'])
 
+        current_networks = self.__get_internal_network_uris()
+        changes = dict(added=[uri for uri in networks if uri not in current_networks],
+                       removed=sorted(current_networks - set(networks)))
+
+        if not changes['added'] and not changes['removed']:
+            return False, self.MSG_NO_CHANGES_PROVIDED, dict(internal_networks_changes=changes)
+
         li = self.current_resource.update_internal_networks(networks)
 
-        return True, self.MSG_INTERNAL_NETWORKS_UPDATED, dict(logical_interconnect=li)
+        return True, self.MSG_INTERNAL_NETWORKS_UPDATED, dict(logical_interconnect=li,
+                                                              internal_networks_changes=changes)
+
+    def __get_internal_network_uris(self):
+        # The internal VLANs are the ones of every network provisioned on the logical interconnect, so the networks
+        # of its uplink sets are left out. The collection is read page by page.
+        uri = '{0}/internalVlans'.format(self.current_resource.data['uri'])
+        network_uris = set()
+        while uri:
+            response = self.oneview_client.connection.get(uri)
+            network_uris.update(vlan['generalNetworkUri'] for vlan in response.get('members') or []
+                                if vlan.get('generalNetworkUri'))
+            next_page_uri = response.get('nextPageUri')
+            uri = next_page_uri if next_page_uri != response.get('uri') else None
+
+        uplink_sets = self.oneview_client.uplink_sets.get_all(
+            filter="logicalInterconnectUri='{0}'".format(self.current_resource.data['uri']))
+        for uplink_set in uplink_sets:
+            for key in ('networkUris', 'fcNetworkUris', 'fcoeNetworkUris'):
+                network_uris.difference_update(uplink_set.get(key) or [])
+            for network_set_uri in uplink_set.get('networkSetUris') or []:
+                network_set = self.oneview_client.network_sets.get_by_uri(network_set_uri)
+                network_uris.difference_update(network_set.data.get('networkUris') or [])
+        return network_uris
 
     def __update_settings(self):
         self.__validate_settings(self.data)
@@ -550,15 +669,93 @@ class LogicalInterconnectModule(OneViewModule):
             return True, self.MSG_PORT_FLAP_SETTINGS_UPDATED, result
 
     def __install_firmware(self):
+        firmware = self.current_resource.install_firmware(self.__get_firmware_options())
+
+        return True, self.MSG_FIRMWARE_INSTALLED, dict(li_firmware=firmware)
+
+    def __get_firmware_options(self):
         self.__validate_options('firmware', self.data)
 
         options = self.data['firmware'].copy()
         if 'spp' in options:
             options['sppUri'] = self.__build_firmware_uri(options.pop('spp'))
+        return options
 
-        firmware = self.current_resource.install_firmware(options)
-
-        return True, self.MSG_FIRMWARE_INSTALLED, dict(li_firmware=firmware)
+    def __update_logical_interconnects(self):
+        connection = self.oneview_client.connection
+        if self.state == 'compliant':
+            path, options, msg = '/compliance', None, self.MSG_CONSISTENT
+        else:
+            path, options, msg = '/firmware', self.__get_firmware_options(), self.MSG_FIRMWARE_INSTALLED
+
+        logical_interconnects = self.__get_logical_interconnects()
+        results = dict((li['uri'], dict(name=li.get('name'), uri=li['uri'], changed=False, failed=False,
+                                        msg=self.MSG_ALREADY_CONSISTENT, wave=None))
+                       for li in logical_interconnects)
+        pending = [li for li in logical_interconnects
+                   if self.state != 'compliant' or li.get('consistencyStatus') != 'CONSISTENT']
+
+        task_waiter = OneViewTaskWaiter(connection, self.module.params.get('task_timeout'))
+        enclosure_groups = self.__get_enclosure_groups(pending)
+        batch_size = self.module.params.get('batch_size') or len(pending) or 1
+        waves = [pending[index:index + batch_size] for index in range(0, len(pending), batch_size)]
+
+        def update(li):
+            result = results[li['uri']]
+            busy_retry = OneViewBusyRetry.from_params(self.module.params, connection)
+            try:
+                busy_retry.call(lambda: task_waiter.update(li['uri'] + path, options), resource_uri=li['uri'])
+                result.update(changed=True, msg=msg)
+            except (OneViewModuleException, HPEOneViewException) as exception:
+                result.update(failed=True, msg='; '.join(str(e) for e in exception.args))
+            return result
+
+        failed = False
+        for number, wave in enumerate(waves, 1):
+            for li in wave:
+                results[li['uri']].update(wave=number)
+                if failed:
+                    results[li['uri']]['msg'] = self.MSG_NOT_STARTED
+            if not failed:
+                wave_results = run_concurrently_by_key(update, wave, self.module.params['max_workers'],
+                                                       key=lambda li: enclosure_groups.get(li['uri']),
+                                                       max_per_key=self.module.params.get('max_per_enclosure_group'))
+                failed = any(result['failed'] for result in wave_results)
+
+        results = [results[li['uri']] for li in logical_interconnects]
+        changed = [result for result in results if result['changed']]
+        failed = [result for result in results if result['failed']]
+        if failed:
+            self.module.fail_json(msg=self.MSG_LOGICAL_INTERCONNECTS_FAILED.format(len(failed)), changed=bool(changed),
+                                  ansible_facts=dict(logical_interconnect_results=results), **self._get_timing_result())
+        return dict(changed=bool(changed),
+                    msg=self.MSG_LOGICAL_INTERCONNECTS_UPDATED.format(len(changed)),
+                    ansible_facts=dict(logical_interconnect_results=results))
+
+    def __get_logical_interconnects(self):
+        filters = [self.data['filter']] if self.data.get('filter') else []
+
+        lig_uri = self.data.get('logicalInterconnectGroupUri')
+        lig_name = self.data.get('logicalInterconnectGroupName')
+        if lig_name:
+            lig = self.oneview_client.logical_interconnect_groups.get_by_name(lig_name)
+            if not lig:
+                raise OneViewModuleResourceNotFound(self.MSG_LIG_NOT_FOUND.format(lig_name))
+            lig_uri = lig.data['uri']
+        if lig_uri:
+            filters.append("logicalInterconnectGroupUri='{0}'".format(lig_uri))
+
+        return self.resource_client.get_all(filter=filters)
+
+    # maps the URI of each Logical Interconnect to the enclosure group of its enclosures, with a single request
+    def __get_enclosure_groups(self, logical_interconnects):
+        if not self.module.params.get('max_per_enclosure_group') or len(logical_interconnects) < 2:
+            return {}
+
+        enclosure_groups = dict((enclosure['uri'], enclosure.get('enclosureGroupUri'))
+                                for enclosure in self.oneview_client.enclosures.get_all())
+        return dict((li['uri'], enclosure_groups.get((li.get('enclosureUris') or [None])[0]) or li['uri'])
+                    for li in logical_interconnects)
 
     def __validate_bulk_inconsistency(self):
         self.__validate_options('bulk_update', self.data)
@@ -595,10 +792,6 @@ class LogicalInterconnectModule(OneViewModule):
 
         return result['changed'], result['msg'], result['ansible_facts']
 
-    def __get_ethernet_network_by_name(self, name):
-        result = self.oneview_client.ethernet_networks.get_by('name', name)
-        return result[0] if result else None
-
     def __get_qos_aggregated_configuration(self):
         return self.current_resource.get_qos_aggregated_configuration()
 
@@ -62,6 +62,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsoptions
 '''
 
 EXAMPLES = '''
@@ -198,7 +199,7 @@ ethernet_settings:
     type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound
+from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, FACTS_OPTIONS_ARGS
 
 
 class LogicalInterconnectFactsModule(OneViewModule):
@@ -208,10 +209,11 @@ class LogicalInterconnectFactsModule(OneViewModule):
         name=dict(required=False, type='str'),
         options=dict(required=False, type='list'),
         params=dict(required=False, type='dict'),
+        **FACTS_OPTIONS_ARGS
     )
 
     def __init__(self):
-        super(LogicalInterconnectFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(LogicalInterconnectFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
 
         self.set_resource_object(self.oneview_client.logical_interconnects)
 
@@ -221,7 +223,7 @@ class LogicalInterconnectFactsModule(OneViewModule):
         if name:
             facts = self.__get_by_options(name)
         else:
-            logical_interconnects = self.resource_client.get_all(**self.facts_params)
+            logical_interconnects = self.get_all_facts(self.resource_client)
             facts = dict(logical_interconnects=logical_interconnects)
 
         return dict(changed=False, ansible_facts=facts)
@@ -255,12 +257,7 @@ class LogicalInterconnectFactsModule(OneViewModule):
         return facts
 
     def __get_options(self, options):
-        facts = dict()
-
-        for option in options:
-            facts[option] = self.options[option]()
-
-        return facts
+        return self.gather_facts_concurrently(dict((option, self.options[option]) for option in options))
 
 
 def main():
@@ -45,6 +45,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
+    - oneview.busyretry
 '''
 
 EXAMPLES = '''
@@ -138,8 +139,10 @@ logical_interconnect_group:
     type: dict
 '''
 
-from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound,
-                                          compare_lig, dict_merge, LIGMerger)
+from copy import deepcopy
+
+from ansible.module_utils.oneview import (OneViewBusyRetry, OneViewModule, OneViewModuleResourceNotFound,
+                                          OneViewNetworkResolver, BUSY_RETRY_ARGS, compare_lig, dict_merge, LIGMerger)
 
 
 class LogicalInterconnectGroupModule(OneViewModule):
@@ -157,12 +160,14 @@ class LogicalInterconnectGroupModule(OneViewModule):
     def __init__(self):
         argument_spec = dict(
             state=dict(required=True, choices=['present', 'absent']),
-            data=dict(required=True, type='dict')
+            data=dict(required=True, type='dict'),
+            **BUSY_RETRY_ARGS
         )
 
         super(LogicalInterconnectGroupModule, self).__init__(additional_arg_spec=argument_spec,
                                                              validate_etag_support=True)
         self.set_resource_object(self.oneview_client.logical_interconnect_groups)
+        self.network_resolver = OneViewNetworkResolver(self.oneview_client)
 
     def execute_module(self):
         if self.state == 'present':
@@ -174,6 +179,7 @@ class LogicalInterconnectGroupModule(OneViewModule):
         changed = False
         scope_uris = self.data.pop('scopeUris', None)
 
+        self.__prefetch_network_names()
         self.__replace_name_by_uris()
 
         if 'uplinkSets' in self.data:
@@ -193,19 +199,25 @@ class LogicalInterconnectGroupModule(OneViewModule):
         if scope_uris is not None:
             result = self.resource_scopes_set(result, 'logical_interconnect_group', scope_uris)
 
-        return result
+        return self._add_diff(result)
 
     def __create(self):
         self.current_resource = self.resource_client.create(self.data)
         return True, self.MSG_CREATED
 
     def __update(self):
-        changed = False
-        current_data = self.current_resource.data.copy()
-
         if "newName" in self.data:
             self.data["name"] = self.data.pop("newName")
 
+        # A concurrent update makes the eTag stale: the resource is reloaded and merged again
+        busy_retry = OneViewBusyRetry.from_params(self.module.params, self.oneview_client.connection)
+        return busy_retry.call(self.__update_resource, resource_uri=self.current_resource.data.get('uri'),
+                               before_retry=self.current_resource.refresh)
+
+    def __update_resource(self):
+        changed = False
+        current_data = self.current_resource.data.copy()
+
         # escaping logicalDownlinkUri from current_data while comparing
         map_template = current_data.get('interconnectMapTemplate')
         if map_template:
@@ -214,19 +226,13 @@ class LogicalInterconnectGroupModule(OneViewModule):
                 for value in map_entry_templates:
                     value.pop('logicalDownlinkUri', None)
 
-        merged_data = LIGMerger().merge_data(current_data, self.data)
+        # The merge changes the data in place, so that a retry would add back what the first attempt merged
+        merged_data = LIGMerger().merge_data(current_data, deepcopy(self.data))
 
-        if compare_lig(current_data, merged_data):
+        if compare_lig(current_data, merged_data, self._new_differences()):
             msg = self.MSG_ALREADY_PRESENT
         else:
-            # This block will handle the exception caused by concurrent update calls made on same resource
-            try:
-                self.current_resource.update(merged_data)
-            except Exception as e:
-                if e.error_code == 'CRM_ETAG_CHECK_FAILED':
-                    main()
-                else:
-                    raise e
+            self.current_resource.update(merged_data)
             changed = True
             msg = self.MSG_UPDATED
         return changed, msg
@@ -245,6 +251,17 @@ class LogicalInterconnectGroupModule(OneViewModule):
                         value['permittedInterconnectTypeUri'] = self.__get_interconnect_type_by_name(
                             permitted_interconnect_type_name)
 
+    # resolves the network and network set names of the internal networks and uplink sets with a single search
+    def __prefetch_network_names(self):
+        names = list(self.data.get('internalNetworkNames') or [])
+        for uplinkSet in self.data.get('uplinkSets') or []:
+            names.extend(uplinkSet.get('networkNames') or [])
+            names.extend(uplinkSet.get('networkSetNames') or [])
+
+        self.network_resolver.prefetch(names, [OneViewNetworkResolver.ETHERNET_NETWORKS,
+                                               OneViewNetworkResolver.FC_NETWORKS,
+                                               OneViewNetworkResolver.NETWORK_SETS])
+
     # replace internalNetworkNames with internalNetworkUris
     def __replace_internal_network_names_by_uris(self):
         internalNetworkUris = self.data.get('internalNetworkUris', [])
@@ -274,19 +291,19 @@ class LogicalInterconnectGroupModule(OneViewModule):
 
     def __get_network_uri(self, name, network_type):
         if network_type == 'Ethernet':
-            network_name = self.oneview_client.ethernet_networks.get_by_name(name)
+            network_uri = self.network_resolver.get_uri(name, OneViewNetworkResolver.ETHERNET_NETWORKS)
         else:
-            network_name = self.oneview_client.fc_networks.get_by_name(name)
+            network_uri = self.network_resolver.get_uri(name, OneViewNetworkResolver.FC_NETWORKS)
 
-        if network_name:
-            return network_name.data['uri']
+        if network_uri:
+            return network_uri
         else:
             raise OneViewModuleResourceNotFound(self.MSG_NETWORK_NOT_FOUND)
 
     def __get_network_set(self, name):
-        network_set = self.oneview_client.network_sets.get_by_name(name)
-        if network_set:
-            return network_set.data['uri']
+        network_set_uri = self.network_resolver.get_uri(name, OneViewNetworkResolver.NETWORK_SETS)
+        if network_set_uri:
+            return network_set_uri
         else:
             raise OneViewModuleResourceNotFound(self.MSG_NETWORK_SET_NOT_FOUND)
 
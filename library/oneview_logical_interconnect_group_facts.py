@@ -119,14 +119,14 @@ class LogicalInterconnectGroupFactsModule(OneViewModule):
             params=dict(type='dict'),
         )
 
-        super(LogicalInterconnectGroupFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(LogicalInterconnectGroupFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.logical_interconnect_groups
 
     def execute_module(self):
         if self.module.params.get('name'):
             ligs = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            ligs = self.resource_client.get_all(**self.facts_params)
+            ligs = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(logical_interconnect_groups=ligs))
 
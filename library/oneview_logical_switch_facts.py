@@ -96,14 +96,14 @@ class LogicalSwitchFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict'),
         )
 
-        super(LogicalSwitchFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(LogicalSwitchFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
 
     def execute_module(self):
         name = self.module.params.get('name')
         if name:
             logical_switches = self.oneview_client.logical_switches.get_by('name', name)
         else:
-            logical_switches = self.oneview_client.logical_switches.get_all(**self.facts_params)
+            logical_switches = self.get_all_facts(self.oneview_client.logical_switches)
 
         return dict(changed=False, ansible_facts=dict(logical_switches=logical_switches))
 
@@ -56,7 +56,7 @@ from ansible.module_utils.oneview import OneViewModuleBase
 
 class LoginDetailFactsModule(OneViewModuleBase):
     def __init__(self):
-        super(LoginDetailFactsModule, self).__init__()
+        super(LoginDetailFactsModule, self).__init__(cache_responses=True)
 
     def execute_module(self):
         login_details = self.oneview_client.login_details.get_login_details()
@@ -151,7 +151,7 @@ class ManagedSanFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ManagedSanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ManagedSanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
 
         self.set_resource_object(self.oneview_client.managed_sans)
 
@@ -171,7 +171,7 @@ class ManagedSanFactsModule(OneViewModule):
                     facts['managed_san_endpoints'] = environmental_configuration
 
         else:
-            facts['managed_sans'] = self.resource_client.get_all(**self.facts_params)
+            facts['managed_sans'] = self.get_all_facts(self.resource_client)
 
         if self.options:
             if self.options.get('wwn'):
@@ -140,7 +140,7 @@ class NetworkSetFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(NetworkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(NetworkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.network_sets)
 
     def execute_module(self):
@@ -153,7 +153,7 @@ class NetworkSetFactsModule(OneViewModule):
         elif name:
             network_sets = self.resource_client.get_by('name', name)
         else:
-            network_sets = self.resource_client.get_all(**self.facts_params)
+            network_sets = self.get_all_facts(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(network_sets=network_sets))
@@ -124,7 +124,7 @@ class OsDeploymentPlanFactsModule(OneViewModuleBase):
     }
 
     def __init__(self):
-        super(OsDeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(OsDeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
 
     def execute_module(self):
         ansible_facts = {}
@@ -136,7 +136,7 @@ class OsDeploymentPlanFactsModule(OneViewModuleBase):
                 ansible_facts.update(option_facts)
 
         else:
-            os_deployment_plans = self.oneview_client.os_deployment_plans.get_all(**self.facts_params)
+            os_deployment_plans = self.get_all_facts(self.oneview_client.os_deployment_plans)
 
         ansible_facts['os_deployment_plans'] = os_deployment_plans
 
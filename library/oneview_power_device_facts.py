@@ -144,7 +144,7 @@ class PowerDeviceFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(PowerDeviceFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(PowerDeviceFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
 
     def execute_module(self):
 
@@ -156,7 +156,7 @@ class PowerDeviceFactsModule(OneViewModuleBase):
             if self.options and power_devices:
                 ansible_facts = self.gather_option_facts(self.options, power_devices[0])
         else:
-            power_devices = self.oneview_client.power_devices.get_all(**self.facts_params)
+            power_devices = self.get_all_facts(self.oneview_client.power_devices)
 
         ansible_facts["power_devices"] = power_devices
 
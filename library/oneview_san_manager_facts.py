@@ -98,7 +98,7 @@ class SanManagerFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(SanManagerFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(SanManagerFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.san_managers
 
     def execute_module(self):
@@ -110,7 +110,7 @@ class SanManagerFactsModule(OneViewModuleBase):
             else:
                 resources = []
         else:
-            resources = self.oneview_client.san_managers.get_all(**self.facts_params)
+            resources = self.get_all_facts(self.oneview_client.san_managers)
 
         return dict(changed=False, ansible_facts=dict(san_managers=resources))
 
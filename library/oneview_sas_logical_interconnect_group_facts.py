@@ -103,7 +103,7 @@ class SasLogicalInterconnectGroupFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(SasLogicalInterconnectGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(SasLogicalInterconnectGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.sas_logical_interconnect_groups
 
     def execute_module(self):
@@ -111,7 +111,7 @@ class SasLogicalInterconnectGroupFactsModule(OneViewModule):
             name = self.module.params['name']
             resources = self.resource_client.get_by('name', name)
         else:
-            resources = self.resource_client.get_all(**self.facts_params)
+            resources = self.get_all_facts(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(sas_logical_interconnect_groups=resources))
@@ -107,7 +107,7 @@ class SasLogicalJbodFactsModule(OneViewModuleBase):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
         )
-        super(SasLogicalJbodFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(SasLogicalJbodFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
 
     def execute_module(self):
         ansible_facts = {}
@@ -119,7 +119,7 @@ class SasLogicalJbodFactsModule(OneViewModuleBase):
             if self.module.params.get('options') and sas_logical_jbods:
                 ansible_facts = self.__gather_optional_facts(self.module.params['options'], sas_logical_jbods[0])
         else:
-            sas_logical_jbods = self.oneview_client.sas_logical_jbods.get_all(**self.facts_params)
+            sas_logical_jbods = self.get_all_facts(self.oneview_client.sas_logical_jbods)
 
         ansible_facts['sas_logical_jbods'] = sas_logical_jbods
 
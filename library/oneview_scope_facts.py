@@ -103,14 +103,14 @@ class ScopeFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ScopeFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ScopeFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.scopes)
 
     def execute_module(self):
         if self.current_resource:
             scopes = [self.current_resource.data]
         else:
-            scopes = self.resource_client.get_all(**self.facts_params)
+            scopes = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(scopes=scopes))
 
@@ -54,7 +54,33 @@ options:
     data:
         description:
             - List with Server Hardware properties and its associated states.
+            - "On state C(power_state_set), C(names), a list of Server Hardware names, or C(filter), a Server
+              Hardware collection filter, set the power state of many Server Hardware at once instead of C(name).
+              The Server Hardware already in the requested power state are skipped, unless the power control is
+              C(Reset) or C(ColdBoot)."
         required: true
+    max_workers:
+        description:
+            - Maximum number of Server Hardware power state changes in flight, on state C(power_state_set) with
+              C(names) or C(filter).
+        default: 8
+    batch_size:
+        description:
+            - Number of Server Hardware of each batch, on state C(power_state_set) with C(names) or C(filter).
+              A batch starts when all the tasks of the previous one complete, and the remaining batches are not
+              started when a change fails. When not provided, all the Server Hardware are in the same batch.
+        required: false
+    max_per_enclosure:
+        description:
+            - Maximum number of Server Hardware of the same enclosure whose power state is changed at a time, on
+              state C(power_state_set) with C(names) or C(filter). When not provided, there is no limit.
+        required: false
+    task_timeout:
+        description:
+            - Maximum time, in seconds, to wait for each power state task, on state C(power_state_set) with C(names)
+              or C(filter). The tasks are polled with an exponential backoff. When not provided, the module waits
+              until the tasks complete.
+        required: false
 
 extends_documentation_fragment:
     - oneview
@@ -124,6 +150,42 @@ EXAMPLES = '''
             powerControl: "MomentaryPress"
   delegate_to: localhost
 
+- name: Power cycle the server hardware of an enclosure, 8 at a time and at most 4 of the same enclosure, in batches of 16
+  oneview_server_hardware:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    state: power_state_set
+    max_workers: 8
+    max_per_enclosure: 4
+    batch_size: 16
+    task_timeout: 600
+    data:
+        filter: "locationUri='/rest/enclosures/09SGH100X6J1'"
+        powerStateData:
+            powerState: "On"
+            powerControl: "ColdBoot"
+  delegate_to: localhost
+
+- debug: var=server_hardware_power_results
+
+- name: Power off a list of server hardware
+  oneview_server_hardware:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    state: power_state_set
+    data:
+        names:
+          - "0000A66101, bay 3"
+          - "0000A66101, bay 4"
+        powerStateData:
+            powerState: "Off"
+            powerControl: "PressAndHold"
+  delegate_to: localhost
+
 - name: Refresh the server hardware
   oneview_server_hardware:
     hostname: 172.16.101.48
@@ -212,9 +274,22 @@ server_hardware:
     returned: On states 'present', 'power_state_set', 'refresh_state_set', and 'ilo_firmware_version_updated'.
               Can be null.
     type: dict
+
+server_hardware_power_results:
+    description: The result of the power state change of each Server Hardware, with the name, URI, batch, changed and
+        failed flags and message.
+    returned: On state 'power_state_set' with names or filter.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleException, OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError, OneViewNameResolver, OneViewTaskWaiter,
+                                          run_concurrently_by_key)
+
+try:
+    from hpeOneView.exceptions import HPEOneViewException
+except ImportError:
+    HPEOneViewException = OneViewModuleException
 
 
 class ServerHardwareModule(OneViewModule):
@@ -233,6 +308,14 @@ class ServerHardwareModule(OneViewModule):
     MSG_ALREADY_ABSENT = 'Server Hardware is already absent.'
     MSG_MANDATORY_FIELD_MISSING = "Mandatory field was not informed: {0}"
     MSG_MULTIPLE_RACK_MOUNT_SERVERS_ADDED = "Servers added successfully."
+    MSG_POWER_STATES_UPDATED = 'Power state of {0} Server Hardware changed successfully.'
+    MSG_POWER_STATES_FAILED = 'Failed to change the power state of {0} Server Hardware.'
+    MSG_SERVER_HARDWARE_NAME_NOT_FOUND = "Server Hardware '{0}' not found."
+    MSG_POWER_STATE_ALREADY_SET = 'Server Hardware is already in the requested power state.'
+    MSG_NOT_STARTED = 'Not started, a previous batch failed.'
+
+    # Power controls that act even when the server hardware is already in the requested power state
+    RESET_POWER_CONTROLS = ['Reset', 'ColdBoot']
 
     patch_success_message = dict(
         ilo_state_reset=MSG_ILO_STATE_RESET,
@@ -268,7 +351,11 @@ class ServerHardwareModule(OneViewModule):
                 'multiple_servers_added'
             ]
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        max_workers=dict(type='int', default=8),
+        batch_size=dict(type='int'),
+        max_per_enclosure=dict(type='int'),
+        task_timeout=dict(type='int')
     )
 
     def __init__(self):
@@ -281,6 +368,8 @@ class ServerHardwareModule(OneViewModule):
 
         if self.state == 'present':
             return self.__present()
+        elif self.state == 'power_state_set' and ('names' in self.data or 'filter' in self.data):
+            return self.__set_power_states()
         elif self.state == 'multiple_servers_added':
             changed, msg, ansible_facts = self.__add_multiple_rack_mount_servers()
         else:
@@ -342,6 +431,64 @@ class ServerHardwareModule(OneViewModule):
         resource = self.current_resource.update_power_state(self.data['powerStateData'])
         return True, self.MSG_POWER_STATE_UPDATED, dict(server_hardware=resource)
 
+    def __set_power_states(self):
+        power_state_data = self.data['powerStateData']
+        server_hardwares = self.__get_server_hardwares()
+        task_waiter = OneViewTaskWaiter(self.oneview_client.connection, self.module.params.get('task_timeout'))
+        batch_size = self.module.params.get('batch_size') or len(server_hardwares) or 1
+        batches = [server_hardwares[index:index + batch_size] for index in range(0, len(server_hardwares), batch_size)]
+
+        def set_power_state(server_hardware):
+            result = dict(name=server_hardware.get('name'), uri=server_hardware['uri'], changed=False, failed=False)
+            if server_hardware.get('powerState') == power_state_data.get('powerState') and \
+                    power_state_data.get('powerControl') not in self.RESET_POWER_CONTROLS:
+                result['msg'] = self.MSG_POWER_STATE_ALREADY_SET
+                return result
+            try:
+                task_waiter.update(server_hardware['uri'] + '/powerState', power_state_data)
+                result.update(changed=True, msg=self.MSG_POWER_STATE_UPDATED)
+            except (OneViewModuleException, HPEOneViewException) as exception:
+                result.update(failed=True, msg='; '.join(str(e) for e in exception.args))
+            return result
+
+        results = []
+        for number, batch in enumerate(batches, 1):
+            if any(result['failed'] for result in results):
+                batch_results = [dict(name=server_hardware.get('name'), uri=server_hardware['uri'], changed=False,
+                                      failed=False, msg=self.MSG_NOT_STARTED) for server_hardware in batch]
+            else:
+                batch_results = run_concurrently_by_key(set_power_state, batch, self.module.params['max_workers'],
+                                                        key=lambda server_hardware: server_hardware.get('locationUri'),
+                                                        max_per_key=self.module.params.get('max_per_enclosure'))
+            for result in batch_results:
+                result['batch'] = number
+            results.extend(batch_results)
+
+        changed = [result for result in results if result['changed']]
+        failed = [result for result in results if result['failed']]
+        if failed:
+            self.module.fail_json(msg=self.MSG_POWER_STATES_FAILED.format(len(failed)), changed=bool(changed),
+                                  ansible_facts=dict(server_hardware_power_results=results), **self._get_timing_result())
+        return dict(changed=bool(changed),
+                    msg=self.MSG_POWER_STATES_UPDATED.format(len(changed)),
+                    ansible_facts=dict(server_hardware_power_results=results))
+
+    def __get_server_hardwares(self):
+        if 'filter' in self.data:
+            return self.resource_client.get_all(filter=self.data['filter'])
+
+        names = self.data['names']
+        name_resolver = OneViewNameResolver.from_params(self.module.params, self.oneview_client)
+        name_resolver.prefetch(self.resource_client, names)
+        server_hardwares = []
+        for name in names:
+            server_hardware = name_resolver.get(self.resource_client, name)
+            if not server_hardware:
+                raise OneViewModuleResourceNotFound(self.MSG_SERVER_HARDWARE_NAME_NOT_FOUND.format(name))
+            if server_hardware not in server_hardwares:
+                server_hardwares.append(server_hardware)
+        return server_hardwares
+
     def __set_environmental_configuration(self):
         resource = self.current_resource.update_environmental_configuration(
             self.data['environmentalConfigurationData'])
@@ -41,6 +41,13 @@ options:
         - "List with options to gather additional facts about Server Hardware related resources.
           Options allowed: C(bios), C(javaRemoteConsoleUrl), C(environmentalConfig), C(iloSsoUrl), C(remoteConsoleUrl),
           C(utilization), C(firmware), C(firmwares) and C(physicalServerHardware)."
+        - "Without C(name) and C(uri), the options other than C(firmwares) are gathered for every Server Hardware
+          matched by C(params), and returned by Server Hardware URI in C(server_hardware_options). They are also
+          gathered when C(params.output_file) is provided, for each page as it is written to the file."
+        - "The C(utilization) option accepts C(output_file), the path of a local file where the metric samples of
+          the Server Hardware are written instead of being returned, C(output_format), C(csv) with one row per sample
+          or C(json) with arrays of timestamps and values per metric, and C(incremental), true by default, to only
+          request and add the samples taken since the previous run."
       required: false
 notes:
     - The options C(firmware) and C(firmwares) are only available for API version 300 or later.
@@ -48,6 +55,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsoptions
 '''
 
 EXAMPLES = '''
@@ -78,6 +86,21 @@ EXAMPLES = '''
 - debug: msg="{{server_hardwares | map(attribute='name') | list }}"
 
 
+- name: Write the name, status and power state of all Server Hardware to a JSON Lines file, 200 at a time
+  oneview_server_hardware_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    params:
+      fields: name,uri,status,powerState
+      page_size: 200
+      output_file: /tmp/server_hardware.jsonl
+  delegate_to: localhost
+
+- debug: var=facts_output
+
+
 - name: Gather facts about a Server Hardware by name
   oneview_server_hardware_facts:
     hostname: 172.16.101.48
@@ -115,13 +138,15 @@ EXAMPLES = '''
 - debug: var=server_hardware_bios
 
 
-- name: Gather all facts about a Server Hardware
+- name: Gather all facts about a Server Hardware, 8 options at a time and waiting up to 30 seconds for each one
   oneview_server_hardware_facts:
    hostname: 172.16.101.48
    username: administrator
    password: my_password
    api_version: 1200
    name : "Encl1, bay 1"
+   max_workers: 8
+   request_timeout: 30
    options:
        - bios                   # optional
        - javaRemoteConsoleUrl   # optional
@@ -146,6 +171,40 @@ EXAMPLES = '''
 - debug: var=server_hardware_utilization
 - debug: var=server_hardware_firmware
 
+- name: Gather the BIOS and firmware facts about all the Server Hardware powered off, 16 requests at a time
+  oneview_server_hardware_facts:
+   hostname: 172.16.101.48
+   username: administrator
+   password: my_password
+   api_version: 1200
+   max_workers: 16
+   params:
+       filter: powerState='Off'
+   options:
+       - bios
+       - firmware
+  delegate_to: localhost
+
+- debug: var=server_hardware_options
+
+- name: Add the power and temperature samples of the Server Hardware of a rack taken since the last run to a CSV file
+  oneview_server_hardware_facts:
+   hostname: 172.16.101.48
+   username: administrator
+   password: my_password
+   api_version: 1200
+   max_workers: 16
+   params:
+       filter: "locationUri='/rest/racks/Rack-1'"
+   options:
+       - utilization:
+                fields: 'AveragePower,AmbientTemperature'
+                output_file: /var/lib/capacity/server_hardware_utilization.csv
+                output_format: csv
+  delegate_to: localhost
+
+- debug: var=utilization_output
+
 - name: Gather facts about the Server Hardware firmware
   oneview_server_hardware_facts:
    hostname: 172.16.101.48
@@ -166,6 +225,11 @@ server_hardwares:
     returned: Always, but can be null.
     type: dict
 
+facts_output:
+    description: The path of the output file and the number of resources written to it.
+    returned: When the output_file param is provided.
+    type: dict
+
 server_hardware_bios:
     description: Has all the facts about the Server Hardware BIOS.
     returned: When requested, but can be null.
@@ -210,33 +274,71 @@ server_hardware_physical_server_hardware:
     description: Has all the facts describing an 'SDX' partition. Used with SDX enclosures only.
     returned: When requested, but can be null.
     type: dict
+
+server_hardware_options:
+    description: Has the facts of the requested options of each Server Hardware, by Server Hardware URI.
+    returned: When options are requested without name and uri.
+    type: dict
+
+utilization_output:
+    description: The path of the utilization output file and the number of samples written to it.
+    returned: When the output_file param of the utilization option is provided.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, OneViewUtilizationExport, FACTS_OPTIONS_ARGS
 
 
 class ServerHardwareFactsModule(OneViewModule):
+    # Options of each server hardware, with the fact and the resource method that gets it
+    OPTION_FACTS = [
+        ('bios', 'server_hardware_bios', 'get_bios'),
+        ('environmentalConfig', 'server_hardware_env_config', 'get_environmental_configuration'),
+        ('javaRemoteConsoleUrl', 'server_hardware_java_remote_console_url', 'get_java_remote_console_url'),
+        ('iloSsoUrl', 'server_hardware_ilo_sso_url', 'get_ilo_sso_url'),
+        ('physicalServerHardware', 'server_hardware_physical_server_hardware', 'get_physical_server_hardware'),
+        ('remoteConsoleUrl', 'server_hardware_remote_console_url', 'get_remote_console_url'),
+        ('firmware', 'server_hardware_firmware', 'get_firmware'),
+    ]
+    RESOURCE_OPTIONS = [option for option, fact, method in OPTION_FACTS] + ['utilization']
+
     def __init__(self):
         argument_spec = dict(
             name=dict(required=False, type='str'),
             uri=dict(required=False, type='str'),
             options=dict(required=False, type='list'),
-            params=dict(required=False, type='dict')
+            params=dict(required=False, type='dict'),
+            **FACTS_OPTIONS_ARGS
         )
-        super(ServerHardwareFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(ServerHardwareFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.server_hardware)
 
     def execute_module(self):
         ansible_facts = {}
         server_hardwares = []
 
+        self.utilization_export = OneViewUtilizationExport.from_params(self.options.get('utilization'))
+
         if self.module.params.get('name') or self.module.params.get('uri'):
             if self.current_resource:
                 server_hardwares = self.current_resource.data
                 if self.options:
                     ansible_facts = self.gather_option_facts()
+                    if self.utilization_export:
+                        ansible_facts['utilization_output'] = self.export_utilization(
+                            self.utilization_export, {server_hardwares['uri']: ansible_facts}, 'server_hardware_utilization')
         else:
-            server_hardwares = self.resource_client.get_all(**self.facts_params)
+            if self.options and any(self.options.get(option) for option in self.RESOURCE_OPTIONS):
+                # Gathered for each page, since the pages are not returned when written to the output file
+                options_facts = {}
+                server_hardwares = self.get_all_facts(self.resource_client, lambda page: options_facts.update(
+                    self.gather_resources_facts(page, self.get_option_functions)))
+                if self.utilization_export:
+                    ansible_facts['utilization_output'] = self.export_utilization(
+                        self.utilization_export, options_facts, 'server_hardware_utilization')
+                ansible_facts['server_hardware_options'] = options_facts
+            else:
+                server_hardwares = self.get_all_facts(self.resource_client)
 
         if self.options and self.options.get('firmwares'):
             ansible_facts['server_hardware_firmwares'] = self.get_all_firmwares()
@@ -246,26 +348,15 @@ class ServerHardwareFactsModule(OneViewModule):
         return dict(changed=False, ansible_facts=ansible_facts)
 
     def gather_option_facts(self):
-        ansible_facts = {}
+        # The options are independent requests, gathered concurrently
+        return self.gather_facts_concurrently(self.get_option_functions(self.current_resource))
 
-        if self.options.get('bios'):
-            ansible_facts['server_hardware_bios'] = self.current_resource.get_bios()
-        if self.options.get('environmentalConfig'):
-            ansible_facts['server_hardware_env_config'] = self.current_resource.get_environmental_configuration()
-        if self.options.get('javaRemoteConsoleUrl'):
-            ansible_facts['server_hardware_java_remote_console_url'] = self.current_resource.get_java_remote_console_url()
-        if self.options.get('iloSsoUrl'):
-            ansible_facts['server_hardware_ilo_sso_url'] = self.current_resource.get_ilo_sso_url()
-        if self.options.get('physicalServerHardware'):
-            ansible_facts['server_hardware_physical_server_hardware'] = self.current_resource.get_physical_server_hardware()
-        if self.options.get('remoteConsoleUrl'):
-            ansible_facts['server_hardware_remote_console_url'] = self.current_resource.get_remote_console_url()
+    def get_option_functions(self, resource):
+        functions = dict((fact, getattr(resource, method)) for option, fact, method in self.OPTION_FACTS
+                         if self.options.get(option))
         if self.options.get('utilization'):
-            ansible_facts['server_hardware_utilization'] = self.get_utilization()
-        if self.options.get('firmware'):
-            ansible_facts['server_hardware_firmware'] = self.current_resource.get_firmware()
-
-        return ansible_facts
+            functions['server_hardware_utilization'] = lambda: self.get_utilization(resource)
+        return functions
 
     def get_all_firmwares(self):
         if isinstance(self.options['firmwares'], bool):
@@ -275,7 +366,7 @@ class ServerHardwareFactsModule(OneViewModule):
 
         return self.resource_client.get_all_firmwares(**params)
 
-    def get_utilization(self):
+    def get_utilization(self, resource):
 
         fields = view = refresh = filter = ''
         data = self.options['utilization']
@@ -286,10 +377,13 @@ class ServerHardwareFactsModule(OneViewModule):
             refresh = data.get('refresh')
             filter = data.get('filter')
 
-        return self.current_resource.get_utilization(fields=fields,
-                                                     filter=filter,
-                                                     refresh=refresh,
-                                                     view=view)
+        if self.utilization_export:
+            filter = self.utilization_export.filter(resource.data['uri'], filter)
+
+        return resource.get_utilization(fields=fields,
+                                        filter=filter,
+                                        refresh=refresh,
+                                        view=view)
 
 
 def main():
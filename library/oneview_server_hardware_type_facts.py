@@ -99,7 +99,7 @@ class ServerHardwareTypeFactsModule(OneViewModule):
             uri=dict(required=False, type='str'),
             params=dict(required=False, type='dict')
         )
-        super(ServerHardwareTypeFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(ServerHardwareTypeFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.server_hardware_types)
 
     def execute_module(self):
@@ -107,7 +107,7 @@ class ServerHardwareTypeFactsModule(OneViewModule):
         if self.current_resource:
             server_hardware_types = [self.current_resource.data]
         else:
-            server_hardware_types = self.resource_client.get_all(**self.facts_params)
+            server_hardware_types = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(server_hardware_types=server_hardware_types))
 
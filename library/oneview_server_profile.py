@@ -45,11 +45,20 @@ options:
         C(compliant) will make the server profile compliant with its server profile template, when this option was
         specified. If there are Offline updates, the Server Hardware is turned off before remediate compliance issues
         and turned on after that.
+        When C(data) has no name nor uri but a template, given by serverProfileTemplateName or serverProfileTemplateUri,
+        C(compliant) makes all the non-compliant Server Profiles of the template compliant, in rolling waves of up to
+        C(max_workers) profiles, of which up to C(max_offline) have Offline updates.
     default: present
     choices: ['present', 'absent', 'compliant']
   data:
     description:
       - List with Server Profile properties.
+      - "To create many Server Profiles at once on C(present) state, provide their list under C(profiles). Each item
+        is a profile name, or a dict with the name and the properties specific to the profile, such as
+        serverHardwareName or serverHardwareUri. The other properties of C(data) are shared by all the profiles. The
+        new profile skeleton of the template is requested once, the server hardware of the profiles without one are
+        selected together, each profile with a distinct server hardware, and the profiles are created concurrently.
+        The profiles that already exist are not updated."
     required: true
   auto_assign_server_hardware:
     description:
@@ -64,6 +73,39 @@ options:
     description:
       - Dict with query parameters.
     required: False
+  task_timeout:
+    description:
+      - Maximum time, in seconds, to wait for each task started by the module, such as the server profile creation
+        or update and the server hardware power operations. The tasks are polled with an exponential backoff.
+        When not provided, the module waits until the tasks complete.
+    required: False
+  server_hardware_selection:
+    description:
+      - Method to select the server hardware automatically assigned to a new server profile among the available ones.
+        C(first) selects the first one returned by the appliance, C(random) selects a random one, and C(hash) ranks
+        them by a hash of the server profile name, so that each profile prefers a different server hardware. Use
+        C(random) or C(hash) when creating many server profiles in parallel, to avoid retrying the creation because
+        another profile was assigned to the same server hardware.
+    default: first
+    choices: ['first', 'random', 'hash']
+  server_hardware_lease_ttl:
+    description:
+      - Time, in seconds, a server hardware automatically selected for a new server profile is reserved for it in a
+        lease file in C(cache_dir). The tasks running in parallel on the controller select the server hardware not
+        reserved by the others. Only used together with C(cache_dir).
+    required: False
+  max_workers:
+    description:
+      - Maximum number of Server Profiles created concurrently when C(profiles) are listed in C(data), or made
+        compliant concurrently with the template on C(compliant) state.
+    default: 8
+  max_offline:
+    description:
+      - Maximum number of Server Profiles with Offline updates, whose Server Hardware is powered off, made compliant
+        concurrently with the template on C(compliant) state. Defaults to C(max_workers).
+      - With C(0), no Server Hardware is powered off, the Server Profiles with Offline updates are not remediated
+        and are reported as skipped in C(compliance_results).
+    required: False
 notes:
     - "For the following data, you can provide either a name or a URI: enclosureGroupName or enclosureGroupUri,
        osDeploymentPlanName or osDeploymentPlanUri (on the osDeploymentSettings), networkName or networkUri (on the
@@ -160,6 +202,32 @@ EXAMPLES = '''
             networkName: eth-demo
   delegate_to: localhost
 
+- name: Create Server Profiles in parallel, selecting distinct server hardware for each one
+  oneview_server_profile:
+    config: "{{ config }}"
+    cache_dir: /tmp/oneview_cache
+    server_hardware_selection: hash
+    server_hardware_lease_ttl: 600
+    data:
+        name: "{{ inventory_hostname }}"
+        server_template: Compute-node-template
+  delegate_to: localhost
+
+- name: Create many Server Profiles from a Server Profile Template
+  oneview_server_profile:
+    config: "{{ config }}"
+    max_workers: 16
+    data:
+        serverProfileTemplateName: Compute-node-template
+        profiles:
+          - Compute-node-01
+          - Compute-node-02
+          - name: Compute-node-03
+            serverHardwareName: "0000A66102, bay 3"
+  delegate_to: localhost
+
+- debug: var=server_profiles_results
+
 - name: Unassign Server Hardware from Server Profile
   oneview_server_profile:
     hostname: 172.16.101.48
@@ -185,6 +253,18 @@ EXAMPLES = '''
         name: Web-Server-L2
   delegate_to: localhost
 
+- name : Remediate compliance issues of all the Server Profiles of a template, powering off 2 servers at a time
+  oneview_server_profile:
+    config: "{{ config }}"
+    state: compliant
+    max_workers: 20
+    max_offline: 2
+    data:
+        serverProfileTemplateName: Compute-node-template
+  delegate_to: localhost
+
+- debug: var=compliance_results
+
 - name : Remove the server profile
   oneview_server_profile:
     hostname: 172.16.101.48
@@ -220,6 +300,19 @@ created:
     description: Indicates if the Server Profile was created.
     returned: On states 'present' and 'compliant'.
     type: bool
+server_profiles_results:
+    description:
+        The result of each Server Profile listed in C(profiles), in the given order, with the name, uri,
+        serverHardwareUri, created, changed and failed flags and message.
+    returned: On state 'present', when C(profiles) are listed in C(data).
+    type: list
+compliance_results:
+    description:
+        The result of each Server Profile of the template made compliant, in the order they were remediated, with
+        the name, uri, online update flag, wave number, changed and failed flags and message. The Server Profiles
+        with Offline updates skipped because C(max_offline) is 0 come last, with no wave number.
+    returned: On state 'compliant', when a template is provided instead of a Server Profile name.
+    type: list
 '''
 
 import time
@@ -227,13 +320,24 @@ import time
 from copy import deepcopy
 
 from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewNameResolver,
                                           ServerProfileReplaceNamesByUris,
                                           OneViewModuleValueError,
                                           ServerProfileMerger,
+                                          ServerHardwareAllocator,
                                           OneViewModuleTaskError,
                                           SPKeys,
                                           OneViewModuleException,
-                                          compare)
+                                          OneViewTaskWaiter,
+                                          SERVER_PROFILE_COMPARISON_RULES,
+                                          compare,
+                                          run_concurrently)
+
+try:
+    from hpeOneView.exceptions import HPEOneViewException, HPEOneViewTaskError
+except ImportError:
+    HPEOneViewException = OneViewModuleException
+    HPEOneViewTaskError = OneViewModuleTaskError
 
 
 class ServerProfileModule(OneViewModule):
@@ -252,6 +356,15 @@ class ServerProfileModule(OneViewModule):
     MSG_ALREADY_COMPLIANT = "Server Profile is already compliant."
     MSG_NOT_FOUND = "Server Profile is required for this operation."
     MSG_ERROR_ALLOCATE_SERVER_HARDWARE = 'Could not allocate server hardware'
+    MSG_PROFILES_CREATED = 'Server Profiles created: {0}.'
+    MSG_PROFILES_FAILED = 'Server Profiles failed: {0}.'
+    MSG_PROFILE_NAME_MISSING = 'A name is required for each server profile in data.profiles.'
+    MSG_PROFILE_NAME_DUPLICATED = "Server Profile '{}' is listed more than once in data.profiles."
+    MSG_PROFILES_REMEDIATED = 'Remediated compliance issues of {0} Server Profiles.'
+    MSG_PROFILES_REMEDIATION_FAILED = 'Failed to remediate compliance issues of {0} Server Profiles.'
+    MSG_TEMPLATE_REQUIRED = 'A Server Profile name or template is required to make the Server Profiles compliant.'
+    MSG_INVALID_MAX_OFFLINE = 'max_offline must be 0 or greater.'
+    MSG_OFFLINE_UPDATE_SKIPPED = 'Not remediated, the Offline update would power off the Server Hardware and max_offline is 0.'
     MSG_MAKE_COMPLIANT_NOT_SUPPORTED = "Update from template is not supported for server profile '{}' because it is" \
                                        " not associated with a server profile template."
 
@@ -261,7 +374,12 @@ class ServerProfileModule(OneViewModule):
         state=dict(choices=['present', 'absent', 'compliant'], default='present'),
         data=dict(type='dict', required=True),
         params=dict(type='dict', required=False),
-        auto_assign_server_hardware=dict(type='bool', default=True)
+        auto_assign_server_hardware=dict(type='bool', default=True),
+        task_timeout=dict(type='int'),
+        server_hardware_selection=dict(choices=ServerHardwareAllocator.SELECTION_METHODS, default='first'),
+        server_hardware_lease_ttl=dict(type='int'),
+        max_workers=dict(type='int', default=8),
+        max_offline=dict(type='int')
     )
 
     def __init__(self):
@@ -274,14 +392,25 @@ class ServerProfileModule(OneViewModule):
         self.server_hardware = self.oneview_client.server_hardware
         self.os_deployment_plans = self.oneview_client.os_deployment_plans
         self.server_template = None
+        self.name_resolver = OneViewNameResolver.from_params(self.module.params, self.oneview_client)
+        self.task_waiter = OneViewTaskWaiter(self.oneview_client.connection, self.module.params.get('task_timeout'))
+        self.server_hardware_allocator = ServerHardwareAllocator.from_params(self.module.params)
+        # Server hardware assigned to other profiles while this one was being created
+        self.unavailable_server_hardware = []
 
     def execute_module(self):
         self.auto_assign_server_hardware = self.module.params.get('auto_assign_server_hardware')
         params = self.module.params.get("params")
         self.params = params if params else {}
-
-        if self.state == 'present':
-            created, changed, msg, server_profile = self.__present()
+        if self.task_waiter.timeout and 'timeout' not in self.params:
+            self.params['timeout'] = self.task_waiter.timeout
+
+        if self.state == 'present' and self.data.get('profiles') is not None:
+            return self.__present_profiles()
+        elif self.state == 'present':
+            # A name resolved from the cache may refer to a resource deleted since, it is then resolved again
+            data = deepcopy(self.data)
+            created, changed, msg, server_profile = self.name_resolver.call(lambda: self.__present(deepcopy(data)))
             facts = self.__gather_facts()
             facts['created'] = created
             return dict(
@@ -292,33 +421,21 @@ class ServerProfileModule(OneViewModule):
             return dict(
                 changed=changed, msg=msg
             )
+        elif self.state == "compliant" and not self.current_resource and not self.data.get('name') \
+                and not self.data.get('uri'):
+            return self.__make_template_profiles_compliant()
         elif self.state == "compliant":
             changed, msg, server_profile = self.__make_compliant()
             return dict(
                 changed=changed, msg=msg, ansible_facts=self.__gather_facts()
             )
 
-    def __present(self):
-        server_template_name = self.data.pop('serverProfileTemplateName', '')
-        server_hardware_name = self.data.pop('serverHardwareName', '')
+    def __present(self, data):
         changed = False
         created = False
 
-        ServerProfileReplaceNamesByUris().replace(self.oneview_client, self.data)
-
-        if server_hardware_name:
-            selected_server_hardware = self.__get_server_hardware_by_name(server_hardware_name)
-            if not selected_server_hardware:
-                raise OneViewModuleValueError(self.MSG_HARDWARE_NOT_FOUND.format(server_hardware_name))
-            self.data['serverHardwareUri'] = selected_server_hardware['uri']
-
-        if server_template_name:
-            self.server_template = self.server_profile_templates.get_by_name(server_template_name)
-            if not self.server_template:
-                raise OneViewModuleValueError(self.MSG_TEMPLATE_NOT_FOUND.format(server_template_name))
-            self.data['serverProfileTemplateUri'] = self.server_template.data['uri']
-        elif self.data.get('serverProfileTemplateUri'):
-            self.server_template = self.server_profile_templates.get_by_uri(self.data['serverProfileTemplateUri'])
+        self.data = data
+        self.__replace_names_by_uris()
 
         if not self.current_resource:
             self.current_resource = self.__create_profile()
@@ -345,10 +462,10 @@ class ServerProfileModule(OneViewModule):
             self.__validations_for_os_custom_attributes(merged_data, self.current_resource.data)
 
             # removed the below fields as part of idempotency checks
-            updated_data = deepcopy(merged_data)
+            updated_data = dict(merged_data)
             updated_data.pop('initialScopeUris', None)
 
-            if not compare(self.current_resource.data, updated_data):
+            if not compare(self.current_resource.data, updated_data, rules=SERVER_PROFILE_COMPARISON_RULES):
                 self.__update_server_profile(merged_data)
                 changed = True
                 msg = self.MSG_UPDATED
@@ -357,6 +474,138 @@ class ServerProfileModule(OneViewModule):
 
         return created, changed, msg, self.current_resource.data
 
+    def __present_profiles(self):
+        profiles = [dict(profile) if isinstance(profile, dict) else dict(name=profile)
+                    for profile in self.data.pop('profiles')]
+        names = [profile.get('name') for profile in profiles]
+        if not all(names):
+            raise OneViewModuleValueError(self.MSG_PROFILE_NAME_MISSING)
+        for index, name in enumerate(names):
+            if name in names[:index]:
+                raise OneViewModuleValueError(self.MSG_PROFILE_NAME_DUPLICATED.format(name))
+
+        self.__replace_names_by_uris()
+        self.__remove_inconsistent_data()
+
+        # The existing profiles are found with a single query, they are reported as present without being updated
+        self.name_resolver.prefetch(self.resource_client, names)
+        results = {}
+        new_profiles = []
+        for profile in profiles:
+            existing_profile = self.name_resolver.get(self.resource_client, profile['name'])
+            if existing_profile:
+                results[profile['name']] = dict(name=profile['name'], uri=existing_profile['uri'], created=False,
+                                                changed=False, failed=False, msg=self.MSG_ALREADY_PRESENT)
+            else:
+                new_profiles.append(profile)
+
+        self.__replace_server_hardware_names_by_uris(new_profiles)
+        server_hardware_plan = self.__plan_server_hardware(new_profiles)
+
+        # The new profile skeleton of the template is requested once for all the profiles
+        new_profile_data = self.server_template.get_new_profile() if self.server_template else {}
+        new_profile_data.update(self.data)
+
+        for result in run_concurrently(
+                lambda profile: self.__create_bulk_profile(new_profile_data, profile,
+                                                           server_hardware_plan.get(profile['name'])),
+                new_profiles, self.module.params['max_workers']):
+            results[result['name']] = result
+
+        results = [results[name] for name in names]
+        created = [result for result in results if result['created']]
+        failed = [result for result in results if result['failed']]
+        if failed:
+            self.module.fail_json(msg=self.MSG_PROFILES_FAILED.format(len(failed)), changed=bool(created),
+                                  ansible_facts=dict(server_profiles_results=results), **self._get_timing_result())
+        return dict(changed=bool(created), msg=self.MSG_PROFILES_CREATED.format(len(created)),
+                    ansible_facts=dict(server_profiles_results=results))
+
+    def __replace_server_hardware_names_by_uris(self, profiles):
+        server_hardware_names = [profile['serverHardwareName'] for profile in profiles if profile.get('serverHardwareName')]
+        self.name_resolver.prefetch(self.server_hardware, server_hardware_names)
+
+        for profile in profiles:
+            server_hardware_name = profile.pop('serverHardwareName', None)
+            if server_hardware_name:
+                server_hardware = self.name_resolver.get(self.server_hardware, server_hardware_name)
+                if not server_hardware:
+                    raise OneViewModuleValueError(self.MSG_HARDWARE_NOT_FOUND.format(server_hardware_name))
+                profile['serverHardwareUri'] = server_hardware['uri']
+
+    def __plan_server_hardware(self, profiles):
+        # Assigns distinct server hardware to the profiles without one, requesting the available ones once
+        keys = ['serverHardwareUri', 'enclosureUri', 'enclosureBay']
+        names = [profile['name'] for profile in profiles
+                 if not any(profile.get(key) or self.data.get(key) for key in keys)]
+        if not names or not self.auto_assign_server_hardware:
+            return {}
+
+        self.module.log(msg="Planning the server hardware of {} Server Profiles".format(len(names)))
+        assigned_uris = [profile.get('serverHardwareUri') for profile in profiles]
+        available_uris = [uri for uri in self.__get_available_server_hardware_uris() or [] if uri not in assigned_uris]
+        return self.server_hardware_allocator.plan(names, available_uris)
+
+    def __create_bulk_profile(self, new_profile_data, profile, planned_server_hardware_uri):
+        name = profile['name']
+        server_hardware_uri = profile.get('serverHardwareUri') or planned_server_hardware_uri
+        unavailable_server_hardware = []
+        result = dict(name=name, created=False, changed=False, failed=True, msg=self.MSG_ERROR_ALLOCATE_SERVER_HARDWARE)
+
+        for attempt in range(self.CONCURRENCY_FAILOVER_RETRIES):
+            server_profile_data = dict(new_profile_data)
+            server_profile_data.update(profile)
+            if server_hardware_uri:
+                server_profile_data['serverHardwareUri'] = server_hardware_uri
+
+            try:
+                if server_hardware_uri:
+                    self.__set_server_hardware_power_state(server_hardware_uri, 'Off')
+                server_profile = self.resource_client.create(server_profile_data, **self.params)
+                return dict(result, uri=server_profile.data.get('uri'), created=True, changed=True, failed=False,
+                            serverHardwareUri=server_profile.data.get('serverHardwareUri'), msg=self.MSG_CREATED)
+            except (OneViewModuleTaskError, HPEOneViewTaskError) as task_error:
+                # Only the server hardware selected by the allocator are replaced, the ones given are not retried
+                if task_error.error_code not in self.ASSIGN_HARDWARE_ERROR_CODES or not planned_server_hardware_uri:
+                    result['msg'] = task_error.msg
+                    break
+                # Another profile was assigned to the server hardware meanwhile, a different one is selected
+                unavailable_server_hardware.append(server_hardware_uri)
+                self.server_hardware_allocator.release(server_hardware_uri)
+                time.sleep(self.task_waiter.delay(attempt))
+                server_hardware_uri = self.server_hardware_allocator.select(
+                    name, self.__get_available_server_hardware_uris() or [], avoid=unavailable_server_hardware)
+                if not server_hardware_uri:
+                    result['msg'] = self.MSG_ERROR_ALLOCATE_SERVER_HARDWARE
+                    break
+            except (OneViewModuleException, HPEOneViewException) as exception:
+                result['msg'] = '; '.join(str(e) for e in exception.args)
+                break
+
+        if planned_server_hardware_uri:
+            self.server_hardware_allocator.release(server_hardware_uri)
+        return result
+
+    def __replace_names_by_uris(self):
+        server_template_name = self.data.pop('serverProfileTemplateName', '')
+        server_hardware_name = self.data.pop('serverHardwareName', '')
+
+        ServerProfileReplaceNamesByUris().replace(self.oneview_client, self.data, self.name_resolver)
+
+        if server_hardware_name:
+            selected_server_hardware = self.__get_server_hardware_by_name(server_hardware_name)
+            if not selected_server_hardware:
+                raise OneViewModuleValueError(self.MSG_HARDWARE_NOT_FOUND.format(server_hardware_name))
+            self.data['serverHardwareUri'] = selected_server_hardware['uri']
+
+        if server_template_name:
+            self.server_template = self.server_profile_templates.get_by_name(server_template_name)
+            if not self.server_template:
+                raise OneViewModuleValueError(self.MSG_TEMPLATE_NOT_FOUND.format(server_template_name))
+            self.data['serverProfileTemplateUri'] = self.server_template.data['uri']
+        elif self.data.get('serverProfileTemplateUri'):
+            self.server_template = self.server_profile_templates.get_by_uri(self.data['serverProfileTemplateUri'])
+
     # Removes .mac entries from resource os_custom_attributes if no .mac passed into data params.
     # Swaps True values for 'true' string, and False values for 'false' string to avoid common user errors.
     # Changes the value of 'Password' attribute to 'None' in merged_data
@@ -426,11 +675,10 @@ class ServerProfileModule(OneViewModule):
             power_on_msg = 'Some server profile attributes cannot be changed while the server hardware is powered on.'
             if power_on_msg in error_msg:
                 self.module.log("Update failed due to powered on Server Hardware. Powering off before retrying.")
-                time.sleep(10)  # sleep timer to avoid timing issues after update operation failed
 
                 # When reassigning Server Hardwares, both the original and the new SH should be set to OFF
-                self.__set_server_hardware_power_state(self.current_resource.data['serverHardwareUri'], 'Off')
-                self.__set_server_hardware_power_state(profile_with_updates['serverHardwareUri'], 'Off')
+                self.__set_server_hardware_power_states([self.current_resource.data['serverHardwareUri'],
+                                                         profile_with_updates['serverHardwareUri']], 'Off')
 
                 self.module.log("Retrying update operation after server power off")
                 self.current_resource.update(profile_with_updates, **self.params)
@@ -458,20 +706,29 @@ class ServerProfileModule(OneViewModule):
                 self.module.log(msg="Request Server Profile creation")
                 return self.resource_client.create(server_profile, **self.params)
 
-            except OneViewModuleTaskError as task_error:
+            except (OneViewModuleTaskError, HPEOneViewTaskError) as task_error:
                 self.module.log("Error code: {} Message: {}".format(str(task_error.error_code), str(task_error.msg)))
                 if task_error.error_code in self.ASSIGN_HARDWARE_ERROR_CODES:
                     # if this is because the server is already assigned, someone grabbed it before we assigned,
-                    # ignore and try again
-                    # This waiting time was chosen empirically and it could differ according to the hardware.
-                    time.sleep(10)
+                    # ignore and try again after a randomized backoff, so that competing tasks do not collide again
+                    if server_hardware_uri not in self.unavailable_server_hardware:
+                        self.unavailable_server_hardware.append(server_hardware_uri)
+                    self.__release_server_hardware(server_hardware_uri)
+                    time.sleep(self.task_waiter.delay(tries - 1))
                 else:
+                    self.__release_server_hardware(server_hardware_uri)
                     raise task_error
 
         raise OneViewModuleException(self.MSG_ERROR_ALLOCATE_SERVER_HARDWARE)
 
+    def __release_server_hardware(self, server_hardware_uri):
+        # Only the automatically selected server hardware are leased
+        if not self.data.get('serverHardwareUri'):
+            self.server_hardware_allocator.release(server_hardware_uri)
+
     def __build_new_profile_data(self, server_hardware_uri):
-        server_profile_data = deepcopy(self.data)
+        # The profile data is only changed at the top level, the nested values are shared with the module data
+        server_profile_data = dict(self.data)
 
         if self.server_template:
             self.module.log(msg="Get new Profile from template")
@@ -523,6 +780,17 @@ class ServerProfileModule(OneViewModule):
                         volume.pop(SPKeys.LUN, None)
 
     def __get_available_server_hardware_uri(self):
+        available_server_hardware_uris = self.__get_available_server_hardware_uris()
+        if available_server_hardware_uris is None:
+            return
+
+        server_hardware_uri = self.server_hardware_allocator.select(
+            self.data.get('name', ''), available_server_hardware_uris, avoid=self.unavailable_server_hardware)
+
+        self.module.log(msg="Found available server hardware: '{}'".format(server_hardware_uri))
+        return server_hardware_uri
+
+    def __get_available_server_hardware_uris(self):
 
         # Retrive scopeUri from oneview for scoped user if initialScopeUris is null
         scope_uri = ''
@@ -574,15 +842,8 @@ class ServerProfileModule(OneViewModule):
                     enclosureGroupUri=enclosure_group,
                     serverHardwareTypeUri=server_hardware_type)
 
-        # targets will list empty bays. We need to pick one that has a server
-        index = 0
-        server_hardware_uri = None
-        while not server_hardware_uri and index < len(available_server_hardware):
-            server_hardware_uri = available_server_hardware[index]['serverHardwareUri']
-            index = index + 1
-
-        self.module.log(msg="Found available server hardware: '{}'".format(server_hardware_uri))
-        return server_hardware_uri
+        # targets will list empty bays, the allocator only selects the ones that have a server
+        return [target['serverHardwareUri'] for target in available_server_hardware]
 
     def __delete_profile(self):
         if not self.current_resource:
@@ -634,6 +895,87 @@ class ServerProfileModule(OneViewModule):
 
         return changed, msg, self.current_resource.data
 
+    def __make_template_profiles_compliant(self):
+        max_offline = self.module.params.get('max_offline')
+        if max_offline is not None and max_offline < 0:
+            raise OneViewModuleValueError(self.MSG_INVALID_MAX_OFFLINE)
+
+        self.__replace_names_by_uris()
+        template_uri = self.data.get('serverProfileTemplateUri')
+        if not template_uri:
+            raise OneViewModuleValueError(self.MSG_TEMPLATE_REQUIRED)
+
+        # All the non-compliant profiles of the template are requested together
+        query = "serverProfileTemplateUri='{0}' AND templateCompliance='NonCompliant'".format(template_uri)
+        profiles = [self.resource_client.new(self.oneview_client.connection, profile)
+                    for profile in self.resource_client.get_all(filter='"{0}"'.format(query))]
+
+        max_workers = self.module.params['max_workers']
+        previews = run_concurrently(lambda profile: profile.get_compliance_preview(), profiles, max_workers)
+        online_profiles = [profile for profile, preview in zip(profiles, previews) if preview.get('isOnlineUpdate') is not False]
+        offline_profiles = [profile for profile, preview in zip(profiles, previews) if preview.get('isOnlineUpdate') is False]
+
+        # No server hardware is powered off with max_offline 0, the profiles with Offline updates are skipped
+        skipped_profiles = offline_profiles if max_offline == 0 else []
+        if skipped_profiles:
+            offline_profiles = []
+
+        waves = self.__build_compliance_waves(online_profiles, offline_profiles, max_workers, max_offline)
+        results = []
+        for number, wave in enumerate(waves, 1):
+            self.module.log(msg="Remediating compliance issues of wave {0}/{1} with {2} Server Profiles".format(
+                number, len(waves), len(wave)))
+            wave_results = run_concurrently(lambda item: self.__remediate_compliance(*item), wave, max_workers)
+            for result in wave_results:
+                result['wave'] = number
+            results.extend(wave_results)
+            self.module.log(msg="Remediated {0} of {1} Server Profiles".format(len(results), len(profiles)))
+
+        for profile in skipped_profiles:
+            results.append(dict(name=profile.data.get('name'), uri=profile.data.get('uri'), online=False, wave=None,
+                                changed=False, failed=False, msg=self.MSG_OFFLINE_UPDATE_SKIPPED))
+
+        remediated = [result for result in results if result['changed']]
+        failed = [result for result in results if result['failed']]
+        if failed:
+            self.module.fail_json(msg=self.MSG_PROFILES_REMEDIATION_FAILED.format(len(failed)), changed=bool(remediated),
+                                  ansible_facts=dict(compliance_results=results), **self._get_timing_result())
+        return dict(changed=bool(remediated), msg=self.MSG_PROFILES_REMEDIATED.format(len(remediated)),
+                    ansible_facts=dict(compliance_results=results))
+
+    def __build_compliance_waves(self, online_profiles, offline_profiles, max_workers, max_offline):
+        # Each wave has up to max_workers profiles, of which up to max_offline have their server hardware powered off
+        max_workers = max(max_workers, 1)
+        max_offline = max_workers if not max_offline else min(max_offline, max_workers)
+        online_profiles = list(online_profiles)
+        offline_profiles = list(offline_profiles)
+        waves = []
+        while online_profiles or offline_profiles:
+            wave = [(profile, False) for profile in offline_profiles[:max_offline]]
+            offline_profiles = offline_profiles[max_offline:]
+            size = max_workers - len(wave)
+            wave.extend((profile, True) for profile in online_profiles[:size])
+            online_profiles = online_profiles[size:]
+            waves.append(wave)
+        return waves
+
+    def __remediate_compliance(self, server_profile, is_online_update):
+        data = server_profile.data
+        result = dict(name=data.get('name'), uri=data.get('uri'), online=is_online_update, changed=False,
+                      failed=False, msg=self.MSG_REMEDIATED_COMPLIANCE)
+        try:
+            if not is_online_update:
+                self.__set_server_hardware_power_state(data.get('serverHardwareUri'), 'Off')
+
+            server_profile.patch('replace', '/templateCompliance', 'Compliant')
+            result['changed'] = True
+
+            if not is_online_update:
+                self.__set_server_hardware_power_state(data.get('serverHardwareUri'), 'On')
+        except (OneViewModuleException, HPEOneViewException) as exception:
+            result.update(failed=True, msg='; '.join(str(e) for e in exception.args))
+        return result
+
     def __gather_facts(self):
 
         server_hardware = None
@@ -663,13 +1005,17 @@ class ServerProfileModule(OneViewModule):
 
     def __set_server_hardware_power_state(self, hardware_uri, power_state='On'):
         if hardware_uri is not None:
-            hardware = self.server_hardware.get_by_uri(hardware_uri)
             if power_state in ['On']:
-                hardware.update_power_state(
-                    dict(powerState='On', powerControl='MomentaryPress'))
+                configuration = dict(powerState='On', powerControl='MomentaryPress')
             else:
-                hardware.update_power_state(
-                    dict(powerState='Off', powerControl='PressAndHold'))
+                configuration = dict(powerState='Off', powerControl='PressAndHold')
+            self.task_waiter.update(hardware_uri + '/powerState', configuration)
+
+    def __set_server_hardware_power_states(self, hardware_uris, power_state):
+        # The power state of different server hardware is changed concurrently
+        hardware_uris = [uri for index, uri in enumerate(hardware_uris) if uri and uri not in hardware_uris[:index]]
+        run_concurrently(lambda uri: self.__set_server_hardware_power_state(uri, power_state),
+                         hardware_uris, len(hardware_uris))
 
     def _auto_assign_server_profile(self):
         server_hardware_uri = self.data.get('serverHardwareUri')
@@ -253,7 +253,7 @@ class ServerProfileFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ServerProfileFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ServerProfileFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.server_profiles)
 
     def execute_module(self):
@@ -263,7 +263,7 @@ class ServerProfileFactsModule(OneViewModule):
         if self.current_resource:
             server_profiles = [self.current_resource.data]
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            server_profiles = self.resource_client.get_all(**self.facts_params)
+            server_profiles = self.get_all_facts(self.resource_client)
 
         if self.options:
             ansible_facts = self.__gather_option_facts()
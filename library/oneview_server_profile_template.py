@@ -118,7 +118,9 @@ server_profile_template:
 '''
 
 from copy import deepcopy
-from ansible.module_utils.oneview import OneViewModule, ServerProfileReplaceNamesByUris, ServerProfileMerger, compare
+
+from ansible.module_utils.oneview import (OneViewModule, OneViewNameResolver, ServerProfileReplaceNamesByUris,
+                                          ServerProfileMerger, SERVER_PROFILE_COMPARISON_RULES, compare)
 
 
 class ServerProfileTemplateModule(OneViewModule):
@@ -145,20 +147,24 @@ class ServerProfileTemplateModule(OneViewModule):
 
         self.set_resource_object(self.oneview_client.server_profile_templates)
         self.server_profiles = self.oneview_client.server_profiles
+        self.name_resolver = OneViewNameResolver.from_params(self.module.params, self.oneview_client)
 
     def execute_module(self):
         params = self.module.params.get("params")
         self.params = params if params else {}
 
         if self.state == 'present':
-            result = self.__present()
+            # A name resolved from the cache may refer to a resource deleted since, it is then resolved again
+            data = deepcopy(self.data)
+            result = self.name_resolver.call(lambda: self.__present(deepcopy(data)))
         else:
             result = self.__absent()
 
         return result
 
-    def __present(self):
-        ServerProfileReplaceNamesByUris().replace(self.oneview_client, self.data)
+    def __present(self, data):
+        self.data = data
+        ServerProfileReplaceNamesByUris().replace(self.oneview_client, self.data, self.name_resolver)
 
         data = self.__spt_from_sp() or self.data
 
@@ -194,9 +200,9 @@ class ServerProfileTemplateModule(OneViewModule):
 
     def __update(self, data):
         merged_data = ServerProfileMerger().merge_data(self.current_resource.data, data)
-        updated_data = deepcopy(merged_data)
+        updated_data = dict(merged_data)
         updated_data.pop('initialScopeUris', None)
-        equal = compare(updated_data, self.current_resource.data)
+        equal = compare(updated_data, self.current_resource.data, rules=SERVER_PROFILE_COMPARISON_RULES)
 
         if equal:
             msg = self.MSG_ALREADY_PRESENT
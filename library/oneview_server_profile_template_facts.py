@@ -144,7 +144,7 @@ class ServerProfileTemplateFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ServerProfileTemplateFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ServerProfileTemplateFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
 
         self.set_resource_object(self.oneview_client.server_profile_templates)
 
@@ -179,7 +179,7 @@ class ServerProfileTemplateFactsModule(OneViewModule):
         return facts
 
     def __get_all(self):
-        templates = self.resource_client.get_all(**self.facts_params)
+        templates = self.get_all_facts(self.resource_client)
         return dict(server_profile_templates=templates)
 
 
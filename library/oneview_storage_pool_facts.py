@@ -121,7 +121,7 @@ class StoragePoolFactsModule(OneViewModule):
             params=dict(required=False, type='dict'),
             options=dict(required=False, type='list')
         )
-        super(StoragePoolFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(StoragePoolFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.storage_pools)
 
     def execute_module(self):
@@ -130,7 +130,7 @@ class StoragePoolFactsModule(OneViewModule):
         if self.module.params['name']:
             pools = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            pools = self.resource_client.get_all(**self.facts_params)
+            pools = self.get_all_facts(self.resource_client)
 
         facts['storage_pools'] = pools
         self.__get_options(facts)
@@ -199,7 +199,7 @@ class StorageSystemFactsModule(OneViewModule):
             storage_hostname=dict(type='str')
         )
 
-        super(StorageSystemFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(StorageSystemFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.storage_systems)
 
     def execute_module(self):
@@ -218,7 +218,7 @@ class StorageSystemFactsModule(OneViewModule):
         if self.current_resource:
             storage_systems = [self.current_resource.data]
         else:
-            storage_systems = self.resource_client.get_all(**self.facts_params)
+            storage_systems = self.get_all_facts(self.resource_client)
             is_specific_storage_system = False
 
         self.__get_options(facts, is_specific_storage_system)
@@ -188,7 +188,7 @@ class StorageVolumeAttachmentFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
         )
-        super(StorageVolumeAttachmentFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(StorageVolumeAttachmentFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.storage_volume_attachments)
 
         resource_uri = self.oneview_client.storage_volume_attachments.URI
@@ -204,7 +204,7 @@ class StorageVolumeAttachmentFactsModule(OneViewModule):
             attachments = self.__get_specific_attachment(params)
             self.__get_paths(attachments, self.options, facts)
         else:
-            attachments = self.resource_client.get_all(**self.facts_params)
+            attachments = self.get_all_facts(self.resource_client)
 
         facts['storage_volume_attachments'] = attachments
 
@@ -151,7 +151,7 @@ class StorageVolumeTemplateFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
         )
-        super(StorageVolumeTemplateFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(StorageVolumeTemplateFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.storage_volume_templates)
 
     def execute_module(self):
@@ -162,7 +162,7 @@ class StorageVolumeTemplateFactsModule(OneViewModule):
             ansible_facts['compatible_systems'] = self.current_resource.get_compatible_systems()
             storage_volume_templates = [self.current_resource.data]
         else:
-            storage_volume_templates = self.resource_client.get_all(**self.facts_params)
+            storage_volume_templates = self.get_all_facts(self.resource_client)
 
         ansible_facts['storage_volume_templates'] = storage_volume_templates
 
@@ -113,7 +113,7 @@ class SwitchFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict'),
         )
 
-        super(SwitchFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(SwitchFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
 
         self.resource_client = self.oneview_client.switches
 
@@ -128,7 +128,7 @@ class SwitchFactsModule(OneViewModuleBase):
                 environmental_configuration = self.resource_client.get_environmental_configuration(id_or_uri=uri)
                 facts['switch_environmental_configuration'] = environmental_configuration
         else:
-            facts['switches'] = self.resource_client.get_all(**self.facts_params)
+            facts['switches'] = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=facts)
 
@@ -34,6 +34,8 @@ options:
       description:
         - "List with parameters to help filter the tasks.
           Params allowed: C(count), C(fields), C(filter), C(query), C(sort), C(start), C(childLimit), C(topCount) and C(view)."
+        - "To page through the tasks: C(page_size), the number of tasks requested at a time, and C(output_file), the
+          path of a local file where the tasks are written as JSON Lines instead of being returned in the facts."
       required: false
 
 extends_documentation_fragment:
@@ -95,6 +97,11 @@ tasks:
     description: The list of tasks.
     returned: Always, but can be null.
     type: list
+
+facts_output:
+    description: The path of the output file and the number of resources written to it.
+    returned: When the output_file param is provided.
+    type: dict
 '''
 
 from ansible.module_utils.oneview import OneViewModule
@@ -105,12 +112,12 @@ class TaskFactsModule(OneViewModule):
         argument_spec = dict(
             params=dict(required=False, type='dict')
         )
-        super(TaskFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(TaskFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
 
         self.set_resource_object(self.oneview_client.tasks)
 
     def execute_module(self):
-        facts = self.resource_client.get_all(**self.facts_params)
+        facts = self.get_all_facts(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(tasks=facts))
 
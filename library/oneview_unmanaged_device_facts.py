@@ -105,7 +105,7 @@ class UnmanagedDeviceFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(UnmanagedDeviceFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(UnmanagedDeviceFactsModule, self).__init__(additional_arg_spec=self.argument_spec, cache_responses=True)
         self.resource_client = self.oneview_client.unmanaged_devices
 
     def execute_module(self):
@@ -119,7 +119,7 @@ class UnmanagedDeviceFactsModule(OneViewModuleBase):
             if environmental_configuration is not None:
                 facts["unmanaged_device_environmental_configuration"] = environmental_configuration
         else:
-            unmanaged_devices = self.resource_client.get_all(**self.facts_params)
+            unmanaged_devices = self.get_all_facts(self.resource_client)
 
         facts["unmanaged_devices"] = unmanaged_devices
         return dict(ansible_facts=facts)
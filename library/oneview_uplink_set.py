@@ -107,7 +107,8 @@ uplink_set:
     returned: On state 'present'. Can be null.
     type: dict
 '''
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError,
+                                          OneViewNetworkResolver)
 
 
 class UplinkSetModule(OneViewModule):
@@ -128,6 +129,7 @@ class UplinkSetModule(OneViewModule):
         )
         super(UplinkSetModule, self).__init__(additional_arg_spec=argument_spec, validate_etag_support=True)
         self.set_resource_object(self.oneview_client.uplink_sets)
+        self.network_resolver = OneViewNetworkResolver(self.oneview_client)
 
     def execute_module(self):
         self.__validate_key()
@@ -156,45 +158,30 @@ class UplinkSetModule(OneViewModule):
             else:
                 raise OneViewModuleResourceNotFound(self.MSG_LOGICAL_INTERCONNECT_NOT_FOUND)
 
-    def __get_ethernet_network_by_name(self, name):
-
-        result = self.oneview_client.ethernet_networks.get_by_name(name)
-        return result if result else None
-
-    def __get_fc_network_by_name(self, name):
-
-        result = self.oneview_client.fc_networks.get_by_name(name)
-        return result if result else None
-
-    def __get_fcoe_network_by_name(self, name):
-
-        result = self.oneview_client.fcoe_networks.get_by_name(name)
-        return result if result else None
-
-    def __get_network_uri(self, network_name_or_uri, net_type):
+    def __get_network_uri(self, network_name_or_uri, category):
 
         if network_name_or_uri and network_name_or_uri.startswith('/rest/'):
             return network_name_or_uri
         else:
-            if net_type == 'Ethernet':
-                network = self.__get_ethernet_network_by_name(network_name_or_uri)
-            elif net_type == 'FcNetwork':
-                network = self.__get_fc_network_by_name(network_name_or_uri)
-            elif net_type == 'FcoeNetwork':
-                network = self.__get_fcoe_network_by_name(network_name_or_uri)
-            if network:
-                return network.data['uri']
+            network_uri = self.network_resolver.get_uri(network_name_or_uri, category)
+            if network_uri:
+                return network_uri
             else:
                 raise OneViewModuleResourceNotFound(self.MSG_NETWORK_NOT_FOUND + network_name_or_uri)
 
     def __replace_network_name_by_uri(self):
         data = self.data
-        if 'networkUris' in data and data['networkUris']:
-            data['networkUris'] = [self.__get_network_uri(x, 'Ethernet') for x in data['networkUris']]
-        if 'fcNetworkUris' in data and data['fcNetworkUris']:
-            data['fcNetworkUris'] = [self.__get_network_uri(x, 'FcNetwork') for x in data['fcNetworkUris']]
-        if 'fcoeNetworkUris' in data and data['fcoeNetworkUris']:
-            data['fcoeNetworkUris'] = [self.__get_network_uri(x, 'FcoeNetwork') for x in data['fcoeNetworkUris']]
+        network_keys = [('networkUris', OneViewNetworkResolver.ETHERNET_NETWORKS),
+                        ('fcNetworkUris', OneViewNetworkResolver.FC_NETWORKS),
+                        ('fcoeNetworkUris', OneViewNetworkResolver.FCOE_NETWORKS)]
+
+        names = [x for key, category in network_keys for x in data.get(key) or []
+                 if x and not x.startswith('/rest/')]
+        self.network_resolver.prefetch(names, [category for key, category in network_keys])
+
+        for key, category in network_keys:
+            if key in data and data[key]:
+                data[key] = [self.__get_network_uri(x, category) for x in data[key]]
 
     def __set_current_resource(self, name, logical_interconnect_uri):
         uplink_sets = self.resource_client.get_by('name', name)
@@ -91,14 +91,14 @@ class UplinkSetFactsModule(OneViewModule):
             name=dict(required=False, type='str'),
             params=dict(required=False, type='dict'),
         )
-        super(UplinkSetFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(UplinkSetFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.uplink_sets)
 
     def execute_module(self):
         if self.module.params['name']:
             resources = [self.current_resource.data] if self.current_resource else []
         else:
-            resources = self.resource_client.get_all(**self.facts_params)
+            resources = self.get_all_facts(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(uplink_sets=resources))
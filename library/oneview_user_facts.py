@@ -116,7 +116,7 @@ class UserFactsModule(OneViewModule):
             options=dict(required=False, type='list')
         )
 
-        super(UserFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(UserFactsModule, self).__init__(additional_arg_spec=argument_spec, cache_responses=True)
         self.set_resource_object(self.oneview_client.users)
 
     def execute_module(self):
@@ -128,7 +128,7 @@ class UserFactsModule(OneViewModule):
         elif self.module.params['role']:
             ansible_facts['role'] = self.resource_client.get_user_by_role(self.module.params['role'])
         else:
-            ansible_facts['users'] = self.resource_client.get_all(**self.facts_params)
+            ansible_facts['users'] = self.get_all_facts(self.resource_client)
 
         if self.module.params['userName'] and self.options.get('getUserRoles'):
             ansible_facts['user_roles'] = self.resource_client.get_role_associated_with_userName(self.module.params['userName'])
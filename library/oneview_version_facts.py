@@ -30,6 +30,9 @@ version_added: "2.5"
 requirements:
     - "hpeOneView >= 4.3.0"
 author: "Priyanka Sood (@soodpr)"
+notes:
+    - When C(cache_dir) is provided, the version is served from the cache while it is valid, as defined by
+      C(api_version_cache_ttl).
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
@@ -50,15 +53,24 @@ version:
     type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase
+from ansible.module_utils.oneview import OneViewModuleBase, OneViewVersionCache
 
 
 class VersionFactsModule(OneViewModuleBase):
     def __init__(self):
-        super(VersionFactsModule, self).__init__(additional_arg_spec=dict())
+        super(VersionFactsModule, self).__init__(additional_arg_spec=dict(), cache_responses=True)
 
     def execute_module(self):
-        version = self.oneview_client.versions.get_version()
+        version_cache = OneViewVersionCache.from_params(self.module.params)
+        if not version_cache:
+            version = self.oneview_client.versions.get_version()
+        else:
+            hostname = self.oneview_client.connection.get_host()
+            version = version_cache.get_version(hostname)
+            if not version or 'minimumVersion' not in version:
+                version = self.oneview_client.versions.get_version()
+                version_cache.set_version(hostname, version)
+
         return dict(changed=False,
                     ansible_facts=dict(version=version))
 
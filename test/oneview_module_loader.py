@@ -36,7 +36,11 @@ from module_utils.oneview import (OneViewModuleBase,
                                   OneViewModuleTaskError,
                                   OneViewModuleValueError,
                                   OneViewModuleResourceNotFound,
+                                  OneViewResourceIndex,
+                                  OneViewVersionCache,
                                   SPKeys,
+                                  SERVER_PROFILE_COMPARISON_RULES,
+                                  ServerHardwareAllocator,
                                   ServerProfileMerger,
                                   ServerProfileReplaceNamesByUris,
                                   _str_sorted,
@@ -71,6 +75,7 @@ from oneview_appliance_ssh_access_facts import ApplianceSshAccessFactsModule
 from oneview_appliance_ssh_access import ApplianceSshAccessModule
 from oneview_appliance_time_and_locale_configuration_facts import ApplianceTimeAndLocaleConfigurationFactsModule
 from oneview_appliance_time_and_locale_configuration import ApplianceTimeAndLocaleConfigurationModule
+from oneview_batch import BatchModule
 from oneview_certificates_server import CertificatesServerModule
 from oneview_certificates_server_facts import CertificatesServerFactsModule
 from oneview_connection_template import ConnectionTemplateModule
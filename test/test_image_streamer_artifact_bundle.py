@@ -22,7 +22,7 @@ import yaml
 
 from copy import deepcopy
 from hpe_test_utils import ImageStreamerBaseTest
-from oneview_module_loader import ArtifactBundleModule
+from oneview_module_loader import ArtifactBundleModule, ONEVIEW_MODULE_UTILS_PATH
 
 
 YAML_ARTIFACT_BUNDLE = """
@@ -109,6 +109,10 @@ YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD = """
 
 DICT_DEFAULT_ARTIFACT_BUNDLE = yaml.load(YAML_ARTIFACT_BUNDLE)["data"]
 
+DOWNLOAD_RESULT = dict(path='ab_path', size=10, sha256='ab12', downloaded=True, attempts=1, resumed_from=0,
+                       duration=1.0, rate=10)
+UPLOAD_RESULT = dict(path='ab_path', size=10, attempts=1, duration=1.0, rate=10)
+
 
 @pytest.mark.resource(TestArtifactBundleModule='artifact_bundles')
 class TestArtifactBundleModule(ImageStreamerBaseTest):
@@ -116,6 +120,12 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
     ImageStreamerBaseTest has common tests for main function,
     also provides the mocks used in this test case
     """
+    @pytest.fixture(autouse=True)
+    def specific_set_up(self, tmpdir):
+        self.file_path = str(tmpdir.join('ab_path'))
+        with open(self.file_path, 'wb') as bundle_file:
+            bundle_file.write(b'bundle')
+
     def test_should_create_when_resource_not_exist(self):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
@@ -159,18 +169,32 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
 
     def test_should_upload_when_data_has_destination_path(self):
         self.resource.get_by_name.return_value = None
-        self.resource.upload_bundle_from_file.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_UPLOAD)
+        params = yaml.load(YAML_ARTIFACT_BUNDLE_UPLOAD)
+        params['data']['localArtifactBundleFilePath'] = self.file_path
+        self.mock_ansible_module.params = params
 
-        ArtifactBundleModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.upload',
+                        return_value=(DICT_DEFAULT_ARTIFACT_BUNDLE, UPLOAD_RESULT)) as upload:
+            ArtifactBundleModule().run()
 
+        upload.assert_called_once_with('/rest/artifact-bundles', self.file_path)
+        self.resource.upload_bundle_from_file.assert_not_called()
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ArtifactBundleModule.MSG_UPLOADED,
-            ansible_facts=dict(artifact_bundle=DICT_DEFAULT_ARTIFACT_BUNDLE)
+            ansible_facts=dict(artifact_bundle=DICT_DEFAULT_ARTIFACT_BUNDLE, artifact_bundle_upload=UPLOAD_RESULT)
         )
 
+    def test_upload_should_fail_when_the_file_does_not_exist(self):
+        self.resource.get_by_name.return_value = None
+        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_UPLOAD)
+
+        ArtifactBundleModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ArtifactBundleModule.MSG_FILE_NOT_FOUND.format('ab_path'))
+
     def test_should_delete_when_resource_exist(self):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
         self.resource.delete.return_value = True
@@ -196,15 +220,56 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
 
     def test_should_download(self):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.resource.download.return_value = True
         self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD)
 
-        ArtifactBundleModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=DOWNLOAD_RESULT) as download:
+            ArtifactBundleModule().run()
 
+        download.assert_called_once_with('/rest/artifact-bundles/download/4671582d-1746-4122-9cf0-642a59543509',
+                                         'ab_path', version=None, checksum=None)
+        self.resource.download.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ArtifactBundleModule.MSG_DOWNLOADED,
+            ansible_facts=dict(artifact_bundle_downloads=[DOWNLOAD_RESULT])
+        )
+
+    def test_should_not_download_when_the_local_file_matches(self):
+        self.resource.data = dict(DICT_DEFAULT_ARTIFACT_BUNDLE, eTag='1')
+        skipped = dict(path='ab_path', size=10, sha256='ab12', downloaded=False)
+        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD)
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download', return_value=skipped) as download:
+            ArtifactBundleModule().run()
+
+        download.assert_called_once_with(mock.ANY, 'ab_path', version='1', checksum=None)
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
+            msg=ArtifactBundleModule.MSG_ALREADY_DOWNLOADED,
+            ansible_facts=dict(artifact_bundle_downloads=[skipped])
+        )
+
+    def test_should_download_many_artifact_bundles_concurrently(self):
+        self.resource.get_all.return_value = [dict(name='AB1', uri='/rest/artifact-bundles/1'),
+                                              dict(name='AB2', uri='/rest/artifact-bundles/2')]
+        downloads = [dict(name='AB1', destinationFilePath='ab1.zip'),
+                     dict(name='AB2', destinationFilePath='ab2.zip', checksum='ab12')]
+        self.mock_ansible_module.params = dict(config='config.json', state='download', max_workers=2,
+                                               data=dict(downloads=downloads))
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=DOWNLOAD_RESULT) as download:
+            ArtifactBundleModule().run()
+
+        self.resource.get_all.assert_called_once_with()
+        assert sorted(download.call_args_list) == [
+            mock.call('/rest/artifact-bundles/download/1', 'ab1.zip', version=None, checksum=None),
+            mock.call('/rest/artifact-bundles/download/2', 'ab2.zip', version=None, checksum='ab12')]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
             msg=ArtifactBundleModule.MSG_DOWNLOADED,
-            ansible_facts=dict()
+            ansible_facts=dict(artifact_bundle_downloads=[DOWNLOAD_RESULT, DOWNLOAD_RESULT])
         )
 
     def test_download_should_fail(self):
@@ -251,17 +316,20 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
 
     def test_should_download_backup(self):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.resource.get_all_backups.return_value = [DICT_DEFAULT_ARTIFACT_BUNDLE]
-        self.resource.get_backup.return_value = self.resource
-        self.resource.download_archive.return_value = True
+        self.resource.get_all_backups.return_value = [dict(uri='/rest/artifact-bundles/backups/b1')]
         self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD)
 
-        ArtifactBundleModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=DOWNLOAD_RESULT) as download:
+            ArtifactBundleModule().run()
 
+        download.assert_called_once_with('/rest/artifact-bundles/backups/archive/b1', 'ab_backup',
+                                         version=None, checksum=None)
+        self.resource.download_archive.assert_not_called()
         self.mock_ansible_module.exit_json.assert_called_once_with(
-            changed=False,
+            changed=True,
             msg=ArtifactBundleModule.MSG_ARCHIVE_DOWNLOADED,
-            ansible_facts=dict()
+            ansible_facts=dict(artifact_bundle_downloads=[DOWNLOAD_RESULT])
         )
 
     def test_backup_download_should_fail(self):
@@ -297,15 +365,21 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
 
     def test_should_upload_backup(self):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.resource.upload_backup_bundle_from_file.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_UPLOAD)
+        params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_UPLOAD)
+        params['data']['localBackupArtifactBundleFilePath'] = self.file_path
+        self.mock_ansible_module.params = params
 
-        ArtifactBundleModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.upload',
+                        return_value=(DICT_DEFAULT_ARTIFACT_BUNDLE, UPLOAD_RESULT)) as upload:
+            ArtifactBundleModule().run()
 
+        upload.assert_called_once_with(
+            '/rest/artifact-bundles/backups/archive?deploymentGrpUri=/rest/deployment-groups/test', self.file_path)
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ArtifactBundleModule.MSG_BACKUP_UPLOADED,
-            ansible_facts=dict(artifact_bundle_deployment_group=DICT_DEFAULT_ARTIFACT_BUNDLE)
+            ansible_facts=dict(artifact_bundle_deployment_group=DICT_DEFAULT_ARTIFACT_BUNDLE,
+                               artifact_bundle_upload=UPLOAD_RESULT)
         )
 
 
@@ -20,9 +20,12 @@ import mock
 import pytest
 
 from hpe_test_utils import ImageStreamerBaseTest
-from oneview_module_loader import GoldenImageModule
+from oneview_module_loader import GoldenImageModule, ONEVIEW_MODULE_UTILS_PATH
 
 FAKE_MSG_ERROR = 'Fake message error'
+DOWNLOAD_RESULT = dict(path='/home/user/downloaded_image.zip', size=10, sha256='ab12', downloaded=True, attempts=1,
+                       resumed_from=0, duration=1.0, rate=10)
+UPLOAD_RESULT = dict(path='/home/user/image_file.zip', size=10, attempts=1, duration=1.0, rate=10)
 
 
 @pytest.mark.resource(TestGoldenImageModule='golden_images')
@@ -33,7 +36,12 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
     """
 
     @pytest.fixture(autouse=True)
-    def specific_set_up(self):
+    def specific_set_up(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.image_file_path = str(tmpdir.join('image_file.zip'))
+        with open(self.image_file_path, 'wb') as image_file:
+            image_file.write(b'image')
+
         # Load scenarios from module examples
         self.GOLDEN_IMAGE_UPLOAD = dict(
             config='config.json',
@@ -41,7 +49,7 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
             data=dict(
                 name='Demo Golden Image upload',
                 description='Test',
-                localImageFilePath='~/image_file.zip'
+                localImageFilePath=self.image_file_path
             )
         )
 
@@ -117,24 +125,33 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
 
     def test_upload_a_golden_image(self):
         self.resource.get_by.return_value = []
-        self.resource.upload.return_value = {"name": "name"}
-
         self.mock_ansible_module.params = self.GOLDEN_IMAGE_UPLOAD
 
-        file_path = self.GOLDEN_IMAGE_UPLOAD['data']['localImageFilePath']
-
-        GoldenImageModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.upload',
+                        return_value=({"name": "name"}, UPLOAD_RESULT)) as upload:
+            GoldenImageModule().run()
 
-        self.resource.upload.assert_called_once_with(
-            file_path,
-            self.GOLDEN_IMAGE_UPLOAD['data'])
+        upload.assert_called_once_with('/rest/golden-images?name=Demo%20Golden%20Image%20upload&description=Test',
+                                       self.image_file_path)
+        self.resource.upload.assert_not_called()
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=GoldenImageModule.MSG_UPLOADED,
-            ansible_facts=dict(golden_image={"name": "name"})
+            ansible_facts=dict(golden_image={"name": "name"}, golden_image_upload=UPLOAD_RESULT)
         )
 
+    def test_should_fail_when_the_file_to_upload_does_not_exist(self):
+        self.resource.get_by.return_value = []
+        missing_file_path = str(self.tmpdir.join('missing.zip'))
+        self.GOLDEN_IMAGE_UPLOAD['data']['localImageFilePath'] = missing_file_path
+        self.mock_ansible_module.params = self.GOLDEN_IMAGE_UPLOAD
+
+        GoldenImageModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=GoldenImageModule.MSG_FILE_NOT_FOUND.format(missing_file_path))
+
     def test_update_golden_image(self):
         self.resource.get_by.return_value = [self.GOLDEN_IMAGE_CREATE['data']]
         self.resource.update.return_value = {"name": "name"}
@@ -153,18 +170,73 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         golden_image = self.GOLDEN_IMAGE_CREATE['data']
         golden_image['uri'] = '/rest/golden-images/1'
 
+        golden_image['eTag'] = '2021-06-01T10:00:00.000Z'
+
         self.resource.get_by.return_value = [golden_image]
         self.mock_ansible_module.params = self.GOLDEN_IMAGE_DOWNLOAD
 
-        GoldenImageModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=DOWNLOAD_RESULT) as download:
+            GoldenImageModule().run()
 
         download_file = self.GOLDEN_IMAGE_DOWNLOAD['data']['destination_file_path']
-        self.resource.download.assert_called_once_with('/rest/golden-images/1', download_file)
+        download.assert_called_once_with('/rest/golden-images/download/1', download_file,
+                                         version='2021-06-01T10:00:00.000Z', checksum=None)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=GoldenImageModule.MSG_DOWNLOADED,
-            ansible_facts={})
+            ansible_facts=dict(golden_image_downloads=[DOWNLOAD_RESULT]))
+
+    def test_should_not_download_when_the_local_file_matches(self):
+        golden_image = dict(self.GOLDEN_IMAGE_CREATE['data'], uri='/rest/golden-images/1')
+        skipped = dict(path='/home/user/downloaded_image.zip', size=10, sha256='ab12', downloaded=False)
+
+        self.resource.get_by.return_value = [golden_image]
+        self.GOLDEN_IMAGE_DOWNLOAD['data']['checksum'] = 'AB12'
+        self.mock_ansible_module.params = self.GOLDEN_IMAGE_DOWNLOAD
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=skipped) as download:
+            GoldenImageModule().run()
+
+        download.assert_called_once_with('/rest/golden-images/download/1', '~/downloaded_image.zip',
+                                         version=None, checksum='AB12')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=GoldenImageModule.MSG_ALREADY_DOWNLOADED,
+            ansible_facts=dict(golden_image_downloads=[skipped]))
+
+    def test_should_download_many_golden_images_concurrently(self):
+        self.resource.get_all.return_value = [dict(name='GI 1', uri='/rest/golden-images/1'),
+                                              dict(name='GI 2', uri='/rest/golden-images/2')]
+        downloads = [dict(name='GI 1', destination_file_path='/tmp/gi1.zip'),
+                     dict(name='GI 2', destination_file_path='/tmp/gi2.zip')]
+        self.mock_ansible_module.params = dict(config='config.json', state='downloaded', max_workers=2,
+                                               data=dict(downloads=downloads))
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=DOWNLOAD_RESULT) as download:
+            GoldenImageModule().run()
+
+        self.resource.get_all.assert_called_once_with()
+        self.resource.get_by.assert_not_called()
+        assert sorted(call[0] for call in download.call_args_list) == [
+            ('/rest/golden-images/download/1', '/tmp/gi1.zip'), ('/rest/golden-images/download/2', '/tmp/gi2.zip')]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=GoldenImageModule.MSG_DOWNLOADED,
+            ansible_facts=dict(golden_image_downloads=[DOWNLOAD_RESULT, DOWNLOAD_RESULT]))
+
+    def test_should_fail_when_a_golden_image_to_download_is_not_found(self):
+        self.resource.get_all.return_value = [dict(name='GI 1', uri='/rest/golden-images/1')]
+        self.mock_ansible_module.params = dict(config='config.json', state='downloaded',
+                                               data=dict(downloads=[dict(name='GI 2', destination_file_path='/tmp/gi2.zip')]))
+
+        GoldenImageModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=GoldenImageModule.MSG_WAS_NOT_FOUND + ' GI 2')
 
     def test_golden_image_download_nonexistent(self):
         self.resource.get_by.return_value = []
@@ -181,15 +253,17 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         self.resource.get_by.return_value = [golden_image]
         self.mock_ansible_module.params = self.GOLDEN_IMAGE_ARCHIVE_DOWNLOAD
 
-        GoldenImageModule().run()
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewFileTransfer.download',
+                        return_value=DOWNLOAD_RESULT) as download:
+            GoldenImageModule().run()
 
         download_file = self.GOLDEN_IMAGE_ARCHIVE_DOWNLOAD['data']['destination_file_path']
-        self.resource.download_archive.assert_called_once_with('/rest/golden-images/1', download_file)
+        download.assert_called_once_with('/rest/golden-images/archive/1', download_file, version=None, checksum=None)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=GoldenImageModule.MSG_ARCHIVE_DOWNLOADED,
-            ansible_facts={})
+            ansible_facts=dict(golden_image_downloads=[DOWNLOAD_RESULT]))
 
     def test_golden_image_archive_download_nonexistent(self):
         self.resource.get_by.return_value = []
@@ -16,10 +16,18 @@
 # limitations under the License.
 ###
 
+import csv
+import hashlib
+import io
+import json
 import mock
 import logging
+import os
 import pytest
 import sys
+import threading
+import time
+import tracemalloc
 
 from module_utils import oneview
 
@@ -27,24 +35,50 @@ ONEVIEW_MODULE_UTILS_PATH = 'module_utils.oneview'
 
 sys.modules['ansible.module_utils.oneview'] = oneview
 
+from collections import OrderedDict
 from copy import deepcopy
+from hpeOneView.exceptions import HPEOneViewException
 from module_utils.oneview import (OneViewModuleBase,
+                                  OneViewBandwidthLimiter,
+                                  OneViewBusyRetry,
                                   OneViewModule,
                                   OneViewClient,
                                   OneViewModuleException,
+                                  OneViewModuleTaskError,
                                   OneViewModuleValueError,
                                   OneViewModuleResourceNotFound,
+                                  OneViewFileCache,
+                                  OneViewFileDownload,
+                                  OneViewFileTransfer,
+                                  OneViewNameResolver,
+                                  OneViewNetworkResolver,
+                                  OneViewResourceIndex,
+                                  OneViewTimer,
+                                  OneViewUtilizationExport,
+                                  OneViewResponseCache,
+                                  OneViewSessionCache,
+                                  OneViewTaskWaiter,
+                                  OneViewVersionCache,
                                   SPKeys,
+                                  ServerHardwareAllocator,
                                   ServerProfileMerger,
                                   ServerProfileReplaceNamesByUris,
                                   LIGMerger,
                                   sort_by_uplink_set_location,
+                                  _get_all_pages,
                                   _sort_by_keys,
                                   _str_sorted,
+                                  merge_copy_on_write,
                                   merge_list_by_key,
                                   transform_list_to_dict,
                                   compare,
+                                  differences_to_diff,
                                   compare_lig,
+                                  create_oneview_client,
+                                  run_concurrently,
+                                  file_sha256,
+                                  run_concurrently_by_key,
+                                  gather_concurrently,
                                   get_logger)
 
 MSG_GENERIC_ERROR = 'Generic error message'
@@ -95,6 +129,14 @@ class TestOneViewModule():
                          'password': {'type': 'str', 'no_log': True},
                          'username': {'type': 'str'},
                          'auth_login_domain': {'type': 'str'},
+                         'cache_dir': {'type': 'path'},
+                         'session_cache_ttl': {'type': 'int', 'default': 1800},
+                         'api_version_cache_ttl': {'type': 'int', 'default': 3600},
+                         'name_cache_ttl': {'type': 'int', 'default': 3600},
+                         'prefetch': {'type': 'bool', 'default': False},
+                         'prefetch_ttl': {'type': 'int', 'default': 600},
+                         'timing': {'type': 'bool', 'default': False},
+                         'timing_file': {'type': 'path'},
                          'validate_etag': {'type': 'bool', 'default': True}}
 
     @pytest.fixture(autouse=True)
@@ -144,6 +186,20 @@ class TestOneViewModule():
             ansible_facts={'ansible_facts': None}
         )
 
+    def test_should_return_the_timing_when_requested(self):
+        self.mock_ansible_module.params = dict(self.PARAMS_FOR_PRESENT, timing=True)
+        get = self.mock_ov_client.connection.get
+        get.return_value = {}
+
+        base_mod = OneViewModule()
+        base_mod.execute_module = lambda: base_mod.oneview_client.connection.get('/rest/resource/id')
+        base_mod.run()
+
+        timing = self.mock_ansible_module.exit_json.call_args[1]['oneview_timing']
+        assert list(timing['operations']) == ['login', 'GET']
+        assert timing['operations']['GET']['count'] == 1
+        get.assert_called_once_with('/rest/resource/id')
+
     def test_should_call_exit_json_adding_changed_false_when_undefined(self):
 
         self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
@@ -439,6 +495,36 @@ class TestOneViewModule():
         assert dict(changed=facts['changed'], msg=facts['msg']) == dict(changed=True,
                                                                         msg=OneViewModule.MSG_UPDATED)
 
+    def test_resource_present_should_return_diff_when_in_diff_mode(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+        self.mock_ansible_module._diff = True
+
+        ov_base = OneViewModule()
+        ov_base.resource_client = mock.Mock()
+        ov_base.resource_client.get_by_name.return_value = mock.Mock()
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.current_resource.data = self.RESOURCE_COMMON.copy()
+
+        ov_base.data = {'newName': 'Resource Name New'}
+        facts = ov_base.resource_present('resource')
+
+        assert facts['diff'] == dict(before=dict(name='Resource Name'), after=dict(name='Resource Name New'))
+
+    def test_resource_present_should_not_return_diff_when_not_in_diff_mode(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+        self.mock_ansible_module._diff = False
+
+        ov_base = OneViewModule()
+        ov_base.resource_client = mock.Mock()
+        ov_base.resource_client.get_by_name.return_value = mock.Mock()
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.current_resource.data = self.RESOURCE_COMMON.copy()
+
+        ov_base.data = {'newName': 'Resource Name New'}
+        facts = ov_base.resource_present('resource')
+
+        assert 'diff' not in facts
+
     def test_to_check_resource_present_should_update_when_data_has_modified_attributes(self):
         self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
 
@@ -691,6 +777,112 @@ class TestOneViewModule():
 
         assert res is None
 
+    def create_prefetch_module(self, resources):
+        self.mock_ansible_module.params = dict(self.PARAMS_FOR_PRESENT, prefetch=True)
+        ov_base = OneViewModule()
+        ov_base.resource_client = mock.Mock()
+        ov_base.resource_client.get_all.return_value = resources
+        ov_base.resource_client.new.side_effect = lambda connection, data: mock.Mock(data=data)
+        return ov_base
+
+    def test_set_resource_object_should_use_prefetched_collection(self):
+        ov_base = self.create_prefetch_module([dict(name='Resource Name', uri='/rest/resource/id')])
+
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        assert ov_base.current_resource.data == dict(name='Resource Name', uri='/rest/resource/id')
+        assert ov_base.get_by_name('resource name')['uri'] == '/rest/resource/id'
+        ov_base.resource_client.get_all.assert_called_once_with(start=0, count=OneViewResourceIndex.PAGE_SIZE)
+        ov_base.resource_client.get_by_name.assert_not_called()
+        ov_base.resource_client.get_by.assert_not_called()
+
+    def test_set_resource_object_should_not_find_resource_missing_in_prefetched_collection(self):
+        ov_base = self.create_prefetch_module([])
+
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        assert ov_base.current_resource is None
+        ov_base.resource_client.get_by_name.assert_not_called()
+
+    def create_cached_prefetch_module(self, resources):
+        ov_base = self.create_prefetch_module(resources)
+        ov_base.resource_index = OneViewResourceIndex(ov_base.resource_client).load()
+        ov_base.resource_index.loaded_from_cache = True
+        return ov_base
+
+    def test_set_resource_object_should_read_again_the_resource_of_a_cached_collection(self):
+        ov_base = self.create_cached_prefetch_module([dict(name='Resource Name', uri='/rest/resource/id', eTag='1')])
+        current = mock.Mock(data=dict(name='Resource Name', uri='/rest/resource/id', eTag='2'))
+        ov_base.resource_client.get_by_uri.return_value = current
+
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        assert ov_base.current_resource is current
+        ov_base.resource_client.get_by_uri.assert_called_once_with('/rest/resource/id')
+        assert ov_base.resource_index.get_by_name('Resource Name')['eTag'] == '2'
+        assert not ov_base.resource_index_updated
+
+    def test_set_resource_object_should_look_up_the_resource_deleted_since_the_collection_was_cached(self):
+        ov_base = self.create_cached_prefetch_module([dict(name='Resource Name', uri='/rest/resource/id')])
+        ov_base.resource_client.get_by_uri.side_effect = HPEOneViewException(dict(errorCode='RESOURCE_NOT_FOUND'))
+        ov_base.resource_client.get_by_name.return_value = None
+
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        assert ov_base.current_resource is None
+        ov_base.resource_client.get_by_name.assert_called_once_with('resource name')
+        assert ov_base.resource_index.get_by_uri('/rest/resource/id') is None
+
+    def test_set_resource_object_should_look_up_the_resource_missing_in_a_cached_collection(self):
+        ov_base = self.create_cached_prefetch_module([])
+        created = mock.Mock(data=dict(name='Resource Name', uri='/rest/resource/id'))
+        ov_base.resource_client.get_by_name.return_value = created
+
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        assert ov_base.current_resource is created
+        assert ov_base.resource_index.get_by_uri('/rest/resource/id') == created.data
+
+    def test_resource_present_should_add_created_resource_to_prefetched_collection(self):
+        ov_base = self.create_prefetch_module([])
+        ov_base.resource_client.create.return_value = mock.Mock(data=self.RESOURCE_COMMON.copy())
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        ov_base.resource_present('resource')
+
+        assert ov_base.resource_index.get_by_name('Resource Name') == self.RESOURCE_COMMON
+        assert ov_base.resource_index_updated
+
+    def test_resource_absent_should_remove_deleted_resource_from_prefetched_collection(self):
+        ov_base = self.create_prefetch_module([dict(name='Resource Name', uri='/rest/resource/id')])
+        ov_base.set_resource_object(ov_base.resource_client)
+
+        ov_base.resource_absent()
+
+        assert ov_base.resource_index.get_by_uri('/rest/resource/id') is None
+
+    def test_run_should_invalidate_prefetched_collection_when_changed_by_module(self):
+        ov_base = self.create_prefetch_module([])
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.resource_index = mock.Mock()
+        ov_base.execute_module = mock.Mock(return_value=self.MODULE_EXECUTE_RETURN_VALUE.copy())
+
+        ov_base.run()
+
+        ov_base.resource_index.invalidate.assert_called_once_with()
+
+    def test_run_should_save_the_changes_of_the_prefetched_collection(self):
+        ov_base = self.create_prefetch_module([])
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.resource_index = mock.Mock()
+        ov_base.resource_index_updated = True
+        ov_base.execute_module = mock.Mock(return_value=self.MODULE_EXECUTE_RETURN_VALUE.copy())
+
+        ov_base.run()
+
+        ov_base.resource_index.save.assert_called_once_with()
+        ov_base.resource_index.invalidate.assert_not_called()
+
 
 class TestOneViewModuleBase():
     """
@@ -725,6 +917,14 @@ class TestOneViewModuleBase():
                          'password': {'type': 'str', 'no_log': True},
                          'username': {'type': 'str'},
                          'auth_login_domain': {'type': 'str'},
+                         'cache_dir': {'type': 'path'},
+                         'session_cache_ttl': {'type': 'int', 'default': 1800},
+                         'api_version_cache_ttl': {'type': 'int', 'default': 3600},
+                         'name_cache_ttl': {'type': 'int', 'default': 3600},
+                         'prefetch': {'type': 'bool', 'default': False},
+                         'prefetch_ttl': {'type': 'int', 'default': 600},
+                         'timing': {'type': 'bool', 'default': False},
+                         'timing_file': {'type': 'path'},
                          'validate_etag': {'type': 'bool', 'default': True}}
 
     @pytest.fixture(autouse=True)
@@ -1405,6 +1605,32 @@ class TestOneViewModuleBase():
         }
         assert not compare_lig(dict1, dict2)
 
+    def test_compare_lig_uplink_sets_with_same_port_locations_in_diff_order(self):
+        uplink_set1 = deepcopy(self.DICT_UPLINK_SET1['uplinkSets'][0])
+        uplink_set1['name'] = 'Uplink 1'
+        uplink_set2 = deepcopy(uplink_set1)
+        uplink_set2['name'] = 'Uplink 2'
+        changed_uplink_set1 = deepcopy(uplink_set1)
+        changed_uplink_set1['logicalPortConfigInfos'][0]['desiredSpeed'] = 'Speed10G'
+        changed_uplink_set1['logicalPortConfigInfos'][0]['logicalLocation']['locationEntries'].reverse()
+
+        assert compare_lig(dict(uplinkSets=[uplink_set1, uplink_set2]),
+                           dict(uplinkSets=[uplink_set2, changed_uplink_set1]))
+        assert not compare(dict(uplinkSets=[uplink_set1, uplink_set2]),
+                           dict(uplinkSets=[uplink_set2, changed_uplink_set1]))
+
+    def test_compare_with_rules_should_pair_list_elements_by_keys(self):
+        rules = dict(key_comparators=dict(ports=lambda ports1, ports2: set(ports1) <= set(ports2)),
+                     list_keys=('name',))
+        dict1 = {"values": [dict(name='b', ports=[1]), dict(name='a', ports=[2])]}
+        dict2 = {"values": [dict(name='a', ports=[2, 3]), dict(name='b', ports=[1, 4])]}
+
+        assert compare(dict1, dict2, rules=rules)
+        assert not compare(dict2, dict1, rules=rules)
+
+    def test_sort_by_uplink_set_location_with_null_list(self):
+        assert sort_by_uplink_set_location(None, self.DICT_UPLINK_SET1['uplinkSets'][0]['logicalPortConfigInfos'])
+
     def test_merge_when_having_diff_uplink_set_attributes(self):
         merged_data = LIGMerger().merge_data(self.DICT_UPLINK_SET1, self.DICT_UPLINK_SET2)
 
@@ -1924,6 +2150,80 @@ class TestOneViewModuleBase():
         }
         assert not compare(dict1, dict2)
 
+    def test_comparison_list_of_dicts_with_null_values_and_diff_order(self):
+        dict1 = {
+            "value": [{'name': 'value1', 'id': None},
+                      {'name': 'value2', 'id': ''}]
+        }
+
+        dict2 = {
+            "value": [{'name': 'value2', 'id': None},
+                      {'name': 'value1'}]
+        }
+        assert compare(dict1, dict2)
+
+    def test_comparison_list_with_repeated_elements(self):
+        dict1 = {
+            "value": [1, 1, 2]
+        }
+
+        dict2 = {
+            "value": [1, 2, 2]
+        }
+        assert not compare(dict1, dict2)
+
+    def test_comparison_should_not_format_resources_when_debug_is_disabled(self):
+        class Value(object):
+            formatted = 0
+
+            def __repr__(self):
+                Value.formatted += 1
+                return 'value'
+
+            def __str__(self):
+                return 'value'
+
+        value = Value()
+        with mock.patch.object(oneview.logger, 'isEnabledFor', return_value=False):
+            compare(dict(name='name', value=[dict(other=value)]), dict(name='other', value=[dict(other=value)]))
+
+        assert Value.formatted == 0
+
+    def test_comparison_should_collect_differences(self):
+        dict1 = {
+            "name": "name",
+            "settings": {"enabled": True, "speed": 10, "mode": None},
+            "values": [1, 2],
+            "removed": "value"
+        }
+
+        dict2 = {
+            "name": "name",
+            "settings": {"enabled": True, "speed": 20, "mode": "Auto"},
+            "values": [2, 3],
+            "added": "value"
+        }
+        differences = []
+
+        assert not compare(dict1, dict2, differences)
+        assert sorted(differences, key=lambda difference: difference['path']) == [
+            dict(path='added', old=None, new='value'),
+            dict(path='removed', old='value', new=None),
+            dict(path='settings.mode', old=None, new='Auto'),
+            dict(path='settings.speed', old=10, new=20),
+            dict(path='values', old=[1, 2], new=[2, 3])]
+
+    def test_comparison_should_not_collect_differences_when_equal(self):
+        differences = []
+
+        assert compare(dict(name='name', values=[1, 2]), dict(name='name', values=[2, 1]), differences)
+        assert differences == []
+
+    def test_differences_to_diff(self):
+        differences = [dict(path='settings.speed', old=10, new=20)]
+
+        assert differences_to_diff(differences) == dict(before={'settings.speed': 10}, after={'settings.speed': 20})
+
     def test_merge_list_by_key_when_original_list_is_empty(self):
         original_list = []
         list_with_changes = [dict(id=1, value="123")]
@@ -2025,6 +2325,17 @@ class TestOneViewModuleBase():
                          dict(networkType="Ethernet", name="name-2")]
         assert result1 == expected_list
 
+    def test_sort_by_keys_by_priority(self):
+        resource_list = [dict(enclosureIndex=2, name="name-1"),
+                         dict(enclosureIndex=1, name="name-2"),
+                         dict(enclosureIndex=1, name="name-1")]
+        result1, result2 = _sort_by_keys(resource_list, list(reversed(resource_list)))
+        expected_list = [dict(enclosureIndex=1, name="name-1"),
+                         dict(enclosureIndex=1, name="name-2"),
+                         dict(enclosureIndex=2, name="name-1")]
+        assert result1 == expected_list
+        assert result2 == expected_list
+
 
 class TestServerProfileReplaceNamesByUris():
     SERVER_PROFILE_NAME = "Profile101"
@@ -2047,6 +2358,11 @@ class TestServerProfileReplaceNamesByUris():
                            {"name": "connection-4", "networkName": "Network Set"},
                            {"name": "connection-5", "networkName": 'Ethernet Network'}]
 
+    INDEX_NETWORKS = [dict(name='FC Network', category='fc-networks', uri='/rest/fc-networks/14'),
+                      dict(name='FCoE Network', category='fcoe-networks', uri='/rest/fcoe-networks/16'),
+                      dict(name='Network Set', category='network-sets', uri='/rest/network-sets/20'),
+                      dict(name='Ethernet Network', category='ethernet-networks', uri='/rest/ethernet-networks/18')]
+
     PROFILE_CONNECTIONS_WITH_NETWORK_URIS = [{"name": "connection-1", "networkUri": "/rest/fc-networks/98"},
                                              {"name": "connection-2", "networkUri": "/rest/fc-networks/14"},
                                              {"name": "connection-3", "networkUri": "/rest/fcoe-networks/16"},
@@ -2120,10 +2436,10 @@ class TestServerProfileReplaceNamesByUris():
         sp_data = deepcopy(self.BASIC_PROFILE)
         sp_data[SPKeys.CONNECTIONS] = self.PROFILE_CONNECTIONS
 
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/20')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = self.INDEX_NETWORKS
+        # The networks found in the index are not in their collections under the other categories
+        for resource_client in ('fc_networks', 'fcoe_networks', 'network_sets', 'ethernet_networks'):
+            getattr(self.mock_ov_client, resource_client).get_by.return_value = []
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2134,22 +2450,48 @@ class TestServerProfileReplaceNamesByUris():
         sp_data = deepcopy(self.BASIC_PROFILE)
         sp_data["connectionSettings"] = {SPKeys.CONNECTIONS: self.PROFILE_CONNECTIONS}
 
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/20')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = self.INDEX_NETWORKS
+        # The networks found in the index are not in their collections under the other categories
+        for resource_client in ('fc_networks', 'fcoe_networks', 'network_sets', 'ethernet_networks'):
+            getattr(self.mock_ov_client, resource_client).get_by.return_value = []
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
         expected_connections = self.PROFILE_CONNECTIONS_WITH_NETWORK_URIS
         assert sp_data["connectionSettings"][SPKeys.CONNECTIONS] == expected_connections
 
+    def test_replace_network_name_by_uri_with_single_index_search(self):
+        sp_data = deepcopy(self.BASIC_PROFILE)
+        sp_data[SPKeys.CONNECTIONS] = [dict(name="connection-1", networkName=network['name'])
+                                       for network in self.INDEX_NETWORKS]
+
+        self.mock_ov_client.index_resources.get_all.return_value = self.INDEX_NETWORKS
+
+        ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
+
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['fc-networks', 'fcoe-networks', 'network-sets', 'ethernet-networks'],
+            filter="\"name='FC Network' OR name='FCoE Network' OR name='Network Set' OR name='Ethernet Network'\"")
+
+    def test_replace_network_name_by_uri_should_prefer_fc_networks(self):
+        sp_data = deepcopy(self.BASIC_PROFILE)
+        sp_data[SPKeys.CONNECTIONS] = [dict(name="connection-1", networkName='Network')]
+
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(name='Network', category='ethernet-networks', uri='/rest/ethernet-networks/18'),
+            dict(name='Network', category='fc-networks', uri='/rest/fc-networks/14')]
+
+        ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
+
+        assert sp_data[SPKeys.CONNECTIONS] == [dict(name="connection-1", networkUri='/rest/fc-networks/14')]
+
     def test_should_fail_when_network_not_found(self):
         conn = dict(name="connection-1", networkName='FC Network')
 
         sp_data = deepcopy(self.BASIC_PROFILE)
         sp_data[SPKeys.CONNECTIONS] = [conn]
 
+        self.mock_ov_client.index_resources.get_all.return_value = []
         self.mock_ov_client.fc_networks.get_by.return_value = []
         self.mock_ov_client.fcoe_networks.get_by.return_value = []
         self.mock_ov_client.network_sets.get_by.return_value = []
@@ -2206,7 +2548,7 @@ class TestServerProfileReplaceNamesByUris():
         expected_dict['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeUri": "/rest/storage-volumes/1"}
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeUri": "/rest/storage-volumes/2"}
 
-        self.mock_ov_client.volumes.get_by.side_effect = [[volume1], [volume2]]
+        self.mock_ov_client.volumes.get_all.return_value = [volume1, volume2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2225,7 +2567,7 @@ class TestServerProfileReplaceNamesByUris():
         expected_dict['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeName": "volume1", "volumeUri": None}
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeUri": "/rest/storage-volumes/2"}
 
-        self.mock_ov_client.volumes.get_by.side_effect = [{}, [volume2]]
+        self.mock_ov_client.volumes.get_all.return_value = [volume2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2282,7 +2624,7 @@ class TestServerProfileReplaceNamesByUris():
         expected_dict['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeStoragePoolUri": "/rest/storage-pools/1"}
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeStoragePoolUri": "/rest/storage-pools/2"}
 
-        self.mock_ov_client.storage_pools.get_by.side_effect = [[pool1], [pool2]]
+        self.mock_ov_client.storage_pools.get_all.return_value = [pool1, pool2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2358,7 +2700,7 @@ class TestServerProfileReplaceNamesByUris():
         expected['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeStorageSystemUri": "/rest/storage-systems/1"}
         expected['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeStorageSystemUri": "/rest/storage-systems/2"}
 
-        self.mock_ov_client.storage_systems.get_by.side_effect = [[storage_system1], [storage_system2]]
+        self.mock_ov_client.storage_systems.get_all.return_value = [storage_system1, storage_system2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2495,7 +2837,7 @@ class TestServerProfileReplaceNamesByUris():
         expected['connections'][0] = {"id": 1, "interconnectUri": "/rest/interconnects/1"}
         expected['connections'][1] = {"id": 2, "interconnectUri": "/rest/interconnects/2"}
 
-        self.mock_ov_client.interconnects.get_by.side_effect = [[interconnect1], [interconnect2]]
+        self.mock_ov_client.interconnects.get_all.return_value = [interconnect1, interconnect2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2603,7 +2945,7 @@ class TestServerProfileReplaceNamesByUris():
         expected['localStorage']['sasLogicalJBODs'][0] = {"id": 1, "sasLogicalJBODUri": "/rest/sas-logical-jbods/1"}
         expected['localStorage']['sasLogicalJBODs'][1] = {"id": 2, "sasLogicalJBODUri": "/rest/sas-logical-jbods/2"}
 
-        self.mock_ov_client.sas_logical_jbods.get_by.side_effect = [[sas_logical_jbod1], [sas_logical_jbod2]]
+        self.mock_ov_client.sas_logical_jbods.get_all.return_value = [sas_logical_jbod1, sas_logical_jbod2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -3563,6 +3905,1390 @@ class TestServerProfileMerger():
         fake_logger.addHandler.assert_called_once_with(logging.NullHandler())
         mock_logging_config.not_been_called()
 
+    def build_large_profile(self):
+        # Realistic payload of a profile with many connections, SAN volumes and logical drives
+        profile = deepcopy(self.CREATED_BASIC_PROFILE)
+        profile['bios'] = dict(manageBios=True, overriddenSettings=[dict(id='Setting{0}'.format(index), value='Enabled')
+                                                                    for index in range(200)])
+        profile['connections'] = [dict(id=index, name='connection-{0}'.format(index), portId='Mezz 3:1-a',
+                                       networkUri='/rest/ethernet-networks/{0}'.format(index), requestedMbps=2500,
+                                       boot=dict(priority='NotBootable', chapLevel='none', targets=[]))
+                                  for index in range(64)]
+        profile['sanStorage'] = dict(manageSanStorage=True, volumeAttachments=[
+            dict(id=index, volumeUri='/rest/storage-volumes/{0}'.format(index), lunType='Auto',
+                 storagePaths=[dict(connectionId=path, isEnabled=True, storageTargets=['20:00:00:02:AC:00:08:D6'])
+                               for path in range(4)])
+            for index in range(32)])
+        profile['localStorage'] = dict(sasLogicalJBODs=[], controllers=[
+            dict(deviceSlot='Mezz {0}'.format(slot), mode='RAID', initialize=False, logicalDrives=[
+                dict(name='drive-{0}'.format(index), raidLevel='RAID1', bootable=False, numPhysicalDrives=2)
+                for index in range(16)])
+            for slot in range(2)])
+        return profile
+
+    def test_merge_should_share_the_values_not_changed_by_the_data(self):
+        resource = self.build_large_profile()
+        original_resource = deepcopy(resource)
+        data = dict(description='Updated', connections=[dict(id=1, requestedMbps=5000, boot=dict(priority='Primary'))])
+
+        merged_data = ServerProfileMerger().merge_data(resource, data)
+
+        assert resource == original_resource
+        assert merged_data['description'] == 'Updated'
+        assert merged_data['connections'][0]['requestedMbps'] == 5000
+        assert merged_data['connections'][0]['boot'] == dict(priority='Primary', chapLevel='none', targets=[])
+        assert merged_data['bios'] is resource['bios']
+        assert merged_data['sanStorage'] is resource['sanStorage']
+        assert merged_data['localStorage'] is resource['localStorage']
+
+    def test_merge_should_allocate_less_than_copying_the_profile(self):
+        # Micro-benchmark: merging a small change into a large profile only copies the changed values
+        resource = self.build_large_profile()
+        data = dict(description='Updated', connections=[dict(id=1, requestedMbps=5000)],
+                    sanStorage=dict(manageSanStorage=True, volumeAttachments=[dict(id=1, lunType='Manual', lun=1)]))
+
+        def peak_allocation(function):
+            tracemalloc.start()
+            try:
+                function()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        merge_peak = peak_allocation(lambda: ServerProfileMerger().merge_data(resource, data))
+        copy_peak = peak_allocation(lambda: deepcopy(resource))
+
+        assert merge_peak * 4 < copy_peak
+
+    def test_merge_copy_on_write_should_copy_only_the_changed_dicts(self):
+        original = dict(a=dict(b=dict(c=1), d=dict(e=2)), f=[1, 2])
+
+        merged = merge_copy_on_write(original, dict(a=dict(b=dict(c=3)), g=None))
+
+        assert merged == dict(a=dict(b=dict(c=3), d=dict(e=2)), f=[1, 2], g=None)
+        assert original == dict(a=dict(b=dict(c=1), d=dict(e=2)), f=[1, 2])
+        assert merged['a']['d'] is original['a']['d']
+        assert merged['f'] is original['f']
+
+
+class TestOneViewSessionCache():
+    CONFIG = dict(ip='172.16.1.1',
+                  credentials=dict(userName='admin', password='mypass', authLoginDomain=''),
+                  api_version=2800)
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.cache_dir = str(tmpdir)
+        patcher_client = mock.patch('module_utils.oneview.OneViewClient')
+        self.mock_ov_client_class = patcher_client.start()
+        self.mock_ov_client_class.return_value.connection.get_session_id.return_value = 'session-1'
+
+        yield
+        patcher_client.stop()
+
+    def test_file_cache_should_store_and_delete_entries(self):
+        cache = OneViewFileCache(os.path.join(self.cache_dir, 'cache.json'), ttl=60)
+
+        cache.set('key', 'value')
+        assert cache.get('key') == 'value'
+
+        cache.delete('key')
+        assert cache.get('key') is None
+
+    def test_file_cache_should_evict_expired_entries(self):
+        cache = OneViewFileCache(os.path.join(self.cache_dir, 'cache.json'), ttl=60)
+        cache.set('key', 'value')
+
+        with mock.patch('module_utils.oneview.time.time', return_value=time.time() + 61):
+            assert cache.get('key') is None
+
+    def test_should_not_create_cache_when_cache_dir_not_provided(self):
+        assert OneViewSessionCache.from_params(dict(config='config.json')) is None
+
+    def test_should_login_and_store_session_when_cache_is_empty(self):
+        session_cache = OneViewSessionCache.from_params(dict(cache_dir=self.cache_dir))
+
+        client = session_cache.create_client(deepcopy(self.CONFIG))
+
+        assert client == self.mock_ov_client_class.return_value
+        self.mock_ov_client_class.assert_called_once_with(self.CONFIG)
+        assert session_cache.cache.get('172.16.1.1|admin||2800') == 'session-1'
+
+    def test_should_reuse_cached_session(self):
+        session_cache = OneViewSessionCache.from_params(dict(cache_dir=self.cache_dir))
+        session_cache.create_client(deepcopy(self.CONFIG))
+        self.mock_ov_client_class.reset_mock()
+
+        session_cache.create_client(deepcopy(self.CONFIG))
+
+        expected_config = deepcopy(self.CONFIG)
+        expected_config['credentials']['sessionID'] = 'session-1'
+        self.mock_ov_client_class.assert_called_once_with(expected_config)
+
+    def test_should_login_again_when_cached_session_is_rejected(self):
+        session_cache = OneViewSessionCache.from_params(dict(cache_dir=self.cache_dir))
+        session_cache.cache.set('172.16.1.1|admin||2800', 'expired-session')
+        self.mock_ov_client_class.side_effect = [HPEOneViewException('Unauthorized'),
+                                                 self.mock_ov_client_class.return_value]
+
+        session_cache.create_client(deepcopy(self.CONFIG))
+
+        self.mock_ov_client_class.assert_called_with(self.CONFIG)
+        assert session_cache.cache.get('172.16.1.1|admin||2800') == 'session-1'
+
+    def test_should_use_session_cache_when_creating_client_from_config_file(self):
+        config_file = os.path.join(self.cache_dir, 'config.json')
+        with open(config_file, 'w') as config:
+            json.dump(self.CONFIG, config)
+
+        create_oneview_client(dict(config=config_file, cache_dir=self.cache_dir))
+
+        self.mock_ov_client_class.assert_called_once_with(self.CONFIG)
+        self.mock_ov_client_class.from_json_file.not_been_called()
+
+
+class TestOneViewVersionCache():
+    CONFIG = dict(ip='172.16.1.1',
+                  credentials=dict(userName='admin', password='mypass', authLoginDomain=''),
+                  api_version=None)
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.version_cache = OneViewVersionCache.from_params(dict(cache_dir=str(tmpdir)))
+        self.client_factory = mock.Mock()
+        self.client_factory.return_value.api_version = 2800
+
+    def test_should_not_use_cache_when_api_version_is_provided(self):
+        config = dict(self.CONFIG, api_version=1200)
+
+        self.version_cache.create_client(config, self.client_factory)
+
+        self.client_factory.assert_called_once_with(config)
+        assert self.version_cache.get_version('172.16.1.1') is None
+
+    def test_should_store_negotiated_version(self):
+        self.version_cache.create_client(self.CONFIG, self.client_factory)
+
+        self.client_factory.assert_called_once_with(self.CONFIG)
+        assert self.version_cache.get_version('172.16.1.1') == dict(currentVersion=2800)
+
+    def test_should_use_cached_version(self):
+        self.version_cache.set_version('172.16.1.1', dict(currentVersion=2600))
+
+        self.version_cache.create_client(self.CONFIG, self.client_factory)
+
+        self.client_factory.assert_called_once_with(dict(self.CONFIG, api_version=2600))
+
+    def test_should_negotiate_again_when_cached_version_is_refused(self):
+        self.version_cache.set_version('172.16.1.1', dict(currentVersion=3000))
+        self.client_factory.side_effect = [HPEOneViewException('Unsupported API Version'),
+                                           self.client_factory.return_value]
+
+        self.version_cache.create_client(self.CONFIG, self.client_factory)
+
+        self.client_factory.assert_called_with(self.CONFIG)
+        assert self.version_cache.get_version('172.16.1.1') == dict(currentVersion=2800)
+
+    def test_should_negotiate_again_when_the_version_validation_fails(self):
+        self.version_cache.set_version('172.16.1.1', dict(currentVersion=3000))
+        error = 'Failure during login attempt.\n Traceback:\n  File "connection.py", line 456, in login\n' \
+                '    self.validateVersion()\nHPEOneViewException: Bad request'
+        self.client_factory.side_effect = [HPEOneViewException(error), self.client_factory.return_value]
+
+        self.version_cache.create_client(self.CONFIG, self.client_factory)
+
+        assert self.client_factory.call_count == 2
+
+    def test_should_keep_cached_version_when_the_login_fails(self):
+        self.version_cache.set_version('172.16.1.1', dict(currentVersion=2600))
+        self.client_factory.side_effect = HPEOneViewException(dict(errorCode='AUTHN_AUTH_FAIL', message='Invalid user'))
+
+        with pytest.raises(HPEOneViewException):
+            self.version_cache.create_client(self.CONFIG, self.client_factory)
+
+        self.client_factory.assert_called_once_with(dict(self.CONFIG, api_version=2600))
+        assert self.version_cache.get_version('172.16.1.1') == dict(currentVersion=2600)
+
+
+class TestOneViewNameResolver():
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.cache_dir = str(tmpdir)
+        self.oneview_client = mock.Mock()
+        self.oneview_client.connection.get_host.return_value = '172.16.1.1'
+        self.resource_client = mock.Mock()
+        self.resource_client.URI = '/rest/volumes'
+
+    def test_should_not_use_persistent_cache_when_cache_dir_not_provided(self):
+        resolver = OneViewNameResolver.from_params(dict(cache_dir=None), self.oneview_client)
+
+        assert resolver.cache is None
+
+    def test_should_get_single_name_by_name(self):
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/1')]
+
+        resolver = OneViewNameResolver()
+
+        assert resolver.get(self.resource_client, 'Vol1') == dict(name='Vol1', uri='/rest/volumes/1')
+        self.resource_client.get_by.assert_called_once_with('name', 'Vol1')
+
+    def test_should_resolve_many_names_with_single_query(self):
+        self.resource_client.get_all.return_value = [dict(name='Vol1', uri='/rest/volumes/1'),
+                                                     dict(name='Vol2', uri='/rest/volumes/2')]
+
+        resolver = OneViewNameResolver()
+        resolver.prefetch(self.resource_client, ['Vol1', 'Vol2', 'Vol1', 'Vol3'])
+
+        self.resource_client.get_all.assert_called_once_with(filter="\"name='Vol1' OR name='Vol2' OR name='Vol3'\"")
+        assert resolver.get(self.resource_client, 'Vol2')['uri'] == '/rest/volumes/2'
+        assert resolver.get(self.resource_client, 'Vol3') is None
+        self.resource_client.get_by.not_been_called()
+
+    def test_should_memoize_resolved_names(self):
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/1')]
+
+        resolver = OneViewNameResolver()
+        resolver.get(self.resource_client, 'Vol1')
+        resolver.get(self.resource_client, 'vol1')
+
+        self.resource_client.get_by.assert_called_once_with('name', 'Vol1')
+
+    def test_should_look_up_names_with_quotes_one_by_one(self):
+        self.resource_client.get_all.return_value = [dict(name='Vol1', uri='/rest/volumes/1'),
+                                                     dict(name='Vol2', uri='/rest/volumes/2')]
+        self.resource_client.get_by.return_value = [dict(name="Bob's Vol", uri='/rest/volumes/3')]
+
+        resolver = OneViewNameResolver()
+        resolver.prefetch(self.resource_client, ['Vol1', "Bob's Vol", 'Vol2'])
+
+        self.resource_client.get_all.assert_called_once_with(filter="\"name='Vol1' OR name='Vol2'\"")
+        self.resource_client.get_by.assert_called_once_with('name', "Bob's Vol")
+        assert resolver.get(self.resource_client, "Bob's Vol")['uri'] == '/rest/volumes/3'
+
+    def test_should_reuse_cached_uris_without_requests(self):
+        self.resource_client.get_all.return_value = [dict(name='Vol1', uri='/rest/volumes/1', eTag='1'),
+                                                     dict(name='Vol2', uri='/rest/volumes/2', eTag='2')]
+        OneViewNameResolver.from_params(dict(cache_dir=self.cache_dir), self.oneview_client).prefetch(
+            self.resource_client, ['Vol1', 'Vol2'])
+
+        resolver = OneViewNameResolver.from_params(dict(cache_dir=self.cache_dir), self.oneview_client)
+        resolver.prefetch(self.resource_client, ['Vol1', 'Vol2'])
+
+        assert resolver.get(self.resource_client, 'Vol2')['uri'] == '/rest/volumes/2'
+        self.resource_client.get_all.assert_called_once()
+        self.oneview_client.connection.get.assert_not_called()
+
+    def test_should_query_again_when_cached_uri_expired(self):
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/1', eTag='1')]
+        OneViewNameResolver.from_params(dict(cache_dir=self.cache_dir), self.oneview_client).get(self.resource_client,
+                                                                                                 'Vol1')
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/9', eTag='1')]
+
+        resolver = OneViewNameResolver.from_params(dict(cache_dir=self.cache_dir), self.oneview_client)
+        with mock.patch('time.time', return_value=time.time() + OneViewNameResolver.CACHE_TTL + 1):
+            assert resolver.get(self.resource_client, 'Vol1')['uri'] == '/rest/volumes/9'
+
+        assert self.resource_client.get_by.call_count == 2
+
+    def test_should_expire_cached_uris_after_the_name_cache_ttl(self):
+        params = dict(cache_dir=self.cache_dir, name_cache_ttl=60)
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/1', eTag='1')]
+        OneViewNameResolver.from_params(params, self.oneview_client).get(self.resource_client, 'Vol1')
+
+        resolver = OneViewNameResolver.from_params(params, self.oneview_client)
+        with mock.patch('time.time', return_value=time.time() + 61):
+            resolver.get(self.resource_client, 'Vol1')
+
+        assert resolver.cache.ttl == 60
+        assert self.resource_client.get_by.call_count == 2
+
+    def test_should_resolve_again_the_cached_names_when_a_resource_is_not_found(self):
+        params = dict(cache_dir=self.cache_dir)
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/1', eTag='1')]
+        OneViewNameResolver.from_params(params, self.oneview_client).get(self.resource_client, 'Vol1')
+        self.resource_client.get_by.return_value = [dict(name='Vol1', uri='/rest/volumes/9', eTag='2')]
+        resolver = OneViewNameResolver.from_params(params, self.oneview_client)
+        sent_uris = []
+
+        def create():
+            sent_uris.append(resolver.get(self.resource_client, 'Vol1')['uri'])
+            if sent_uris[-1] == '/rest/volumes/1':
+                raise HPEOneViewException(dict(errorCode='RESOURCE_NOT_FOUND', message='Not found'))
+            return 'created'
+
+        assert resolver.call(create) == 'created'
+        assert sent_uris == ['/rest/volumes/1', '/rest/volumes/9']
+        assert OneViewNameResolver.from_params(params, self.oneview_client).get(
+            self.resource_client, 'Vol1')['uri'] == '/rest/volumes/9'
+
+    def test_should_not_call_again_when_no_cached_name_was_used(self):
+        resolver = OneViewNameResolver.from_params(dict(cache_dir=self.cache_dir), self.oneview_client)
+        function = mock.Mock(side_effect=HPEOneViewException(dict(errorCode='RESOURCE_NOT_FOUND')))
+
+        with pytest.raises(HPEOneViewException):
+            resolver.call(function)
+
+        function.assert_called_once_with()
+
+
+class TestOneViewNetworkResolver():
+    NETWORKS = [dict(name='Network', category='ethernet-networks', uri='/rest/ethernet-networks/1'),
+                dict(name='Network', category='fc-networks', uri='/rest/fc-networks/2')]
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.oneview_client = mock.Mock()
+        self.oneview_client.index_resources.get_all.return_value = self.NETWORKS
+        for resource_client in OneViewNetworkResolver.RESOURCE_CLIENTS.values():
+            getattr(self.oneview_client, resource_client).get_by.return_value = []
+        self.resolver = OneViewNetworkResolver(self.oneview_client)
+
+    def test_should_resolve_names_by_category_order(self):
+        networks = self.resolver.resolve(['Network', 'Other'])
+
+        assert networks == dict(Network=dict(category='fc-networks', uri='/rest/fc-networks/2'))
+
+    def test_should_get_uri_by_category(self):
+        uri = self.resolver.get_uri('network', OneViewNetworkResolver.ETHERNET_NETWORKS)
+
+        assert uri == '/rest/ethernet-networks/1'
+        self.oneview_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks'], filter="\"name='network'\"")
+
+    def test_should_memoize_searched_names(self):
+        self.resolver.prefetch(['Network', 'Other'])
+        self.resolver.get_uri('Network', OneViewNetworkResolver.FC_NETWORKS)
+        self.resolver.get_uri('Other', OneViewNetworkResolver.NETWORK_SETS)
+
+        self.oneview_client.index_resources.get_all.assert_called_once_with(
+            category=OneViewNetworkResolver.CATEGORIES, filter="\"name='Network' OR name='Other'\"")
+
+    def test_should_look_up_the_names_missing_from_the_index_in_each_collection(self):
+        self.oneview_client.ethernet_networks.get_by.return_value = [dict(name='New', uri='/rest/ethernet-networks/3')]
+
+        networks = self.resolver.resolve(['Network', 'New'])
+
+        assert networks['New'] == dict(category='ethernet-networks', uri='/rest/ethernet-networks/3')
+        self.oneview_client.ethernet_networks.get_by.assert_called_once_with('name', 'New')
+        self.oneview_client.fc_networks.get_by.assert_called_once_with('name', 'New')
+
+    def test_should_look_up_each_category_missing_from_the_index(self):
+        self.oneview_client.index_resources.get_all.return_value = [
+            dict(name='Shared', category='network-sets', uri='/rest/network-sets/5')]
+        self.oneview_client.ethernet_networks.get_by.return_value = [dict(name='Shared', uri='/rest/ethernet-networks/6')]
+
+        self.resolver.prefetch(['Shared'])
+
+        assert self.resolver.get_uri('Shared', OneViewNetworkResolver.NETWORK_SETS) == '/rest/network-sets/5'
+        assert self.resolver.get_uri('Shared', OneViewNetworkResolver.ETHERNET_NETWORKS) == '/rest/ethernet-networks/6'
+        self.oneview_client.network_sets.get_by.assert_not_called()
+        self.oneview_client.ethernet_networks.get_by.assert_called_once_with('name', 'Shared')
+
+    def test_should_look_up_names_with_quotes_in_each_collection(self):
+        self.oneview_client.fc_networks.get_by.return_value = [dict(name="Bob's", uri='/rest/fc-networks/4')]
+
+        uri = self.resolver.get_uri("Bob's", OneViewNetworkResolver.FC_NETWORKS)
+
+        assert uri == '/rest/fc-networks/4'
+        self.oneview_client.index_resources.get_all.assert_not_called()
+
+
+class TestServerHardwareAllocator():
+    SERVER_HARDWARE_URIS = ['', '/rest/server-hardware/1', '/rest/server-hardware/2', '/rest/server-hardware/3']
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.params = dict(cache_dir=str(tmpdir), server_hardware_selection='hash', server_hardware_lease_ttl=300)
+
+    def test_should_select_the_first_server_hardware_by_default(self):
+        allocator = ServerHardwareAllocator.from_params(dict(cache_dir=None))
+
+        assert allocator.leases is None
+        assert allocator.select('Profile 1', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/1'
+
+    def test_should_rank_server_hardware_by_profile_name_hash(self):
+        allocator = ServerHardwareAllocator('hash')
+
+        ranks = [allocator.rank('Profile {0}'.format(index), self.SERVER_HARDWARE_URIS) for index in range(20)]
+
+        assert ranks[0] == allocator.rank('Profile 0', list(reversed(self.SERVER_HARDWARE_URIS)))
+        assert all(sorted(rank) == self.SERVER_HARDWARE_URIS[1:] for rank in ranks)
+        assert len(set(rank[0] for rank in ranks)) > 1
+
+    def test_should_select_a_random_server_hardware(self):
+        allocator = ServerHardwareAllocator('random')
+
+        with mock.patch.object(oneview.random, 'shuffle', side_effect=lambda uris: uris.reverse()):
+            assert allocator.select('Profile 1', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/3'
+
+    def test_should_select_avoided_server_hardware_last(self):
+        allocator = ServerHardwareAllocator()
+        avoid = ['/rest/server-hardware/1', '/rest/server-hardware/2', '/rest/server-hardware/3']
+
+        assert allocator.select('Profile 1', self.SERVER_HARDWARE_URIS, avoid=avoid[:2]) == '/rest/server-hardware/3'
+        assert allocator.select('Profile 1', self.SERVER_HARDWARE_URIS, avoid=avoid) == '/rest/server-hardware/1'
+
+    def test_should_not_select_server_hardware_leased_by_other_forks(self):
+        first_fork = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+        second_fork = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+
+        assert first_fork.select('Profile 1', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/1'
+        assert second_fork.select('Profile 2', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/2'
+        assert first_fork.select('Profile 1', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/1'
+
+    def test_should_not_take_over_server_hardware_leased_by_other_forks(self):
+        first_fork = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+        second_fork = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+
+        assert first_fork.select('Profile 1', self.SERVER_HARDWARE_URIS[:2]) == '/rest/server-hardware/1'
+        assert second_fork.select('Profile 2', self.SERVER_HARDWARE_URIS[:2]) is None
+        assert first_fork.leases.get(ServerHardwareAllocator.LEASES_KEY)['/rest/server-hardware/1']['profile'] == \
+            'Profile 1'
+
+    def test_should_select_server_hardware_again_when_the_lease_is_released(self):
+        first_fork = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+        second_fork = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+
+        first_fork.select('Profile 1', self.SERVER_HARDWARE_URIS)
+        first_fork.release('/rest/server-hardware/1')
+
+        assert second_fork.select('Profile 2', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/1'
+
+    def test_should_select_server_hardware_again_when_the_lease_expires(self):
+        allocator = ServerHardwareAllocator.from_params(dict(self.params, server_hardware_selection='first'))
+        allocator.select('Profile 1', self.SERVER_HARDWARE_URIS)
+
+        with mock.patch.object(time, 'time', return_value=time.time() + 301):
+            assert allocator.select('Profile 2', self.SERVER_HARDWARE_URIS) == '/rest/server-hardware/1'
+
+    def test_should_plan_distinct_server_hardware_for_each_profile(self):
+        allocator = ServerHardwareAllocator.from_params(self.params)
+        names = ['Profile 1', 'Profile 2', 'Profile 3', 'Profile 4']
+
+        plan = allocator.plan(names, self.SERVER_HARDWARE_URIS)
+
+        assert list(plan.keys()) == names
+        assert sorted(uri for uri in plan.values() if uri) == self.SERVER_HARDWARE_URIS[1:]
+        assert list(plan.values()).count(None) == 1
+        assert ServerHardwareAllocator.from_params(self.params).plan(['Profile 5'], self.SERVER_HARDWARE_URIS) == \
+            dict([('Profile 5', None)])
+
+
+class TestOneViewResourceIndex():
+    RESOURCES = [dict(name='Resource 1', uri='/rest/resources/1'),
+                 dict(name='Resource 2', uri='/rest/resources/2'),
+                 dict(name='Resource 3', uri='/rest/resources/3')]
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.params = dict(cache_dir=str(tmpdir), prefetch_ttl=600)
+        self.connection = mock.Mock()
+        self.connection.get_host.return_value = '172.16.1.1'
+        self.resource_client = mock.Mock()
+        self.resource_client.URI = '/rest/resources'
+        self.resource_client.get_all.side_effect = lambda start, count: deepcopy(self.RESOURCES[start:start + count])
+
+    def test_should_load_collection_by_pages(self):
+        index = OneViewResourceIndex(self.resource_client).load(page_size=2)
+
+        assert index.get_by_name('resource 1') == self.RESOURCES[0]
+        assert index.get_by_uri('/rest/resources/3') == self.RESOURCES[2]
+        assert index.get_by_name('Resource 4') is None
+        self.resource_client.get_all.assert_has_calls([mock.call(start=0, count=2), mock.call(start=2, count=2)])
+        assert self.resource_client.get_all.call_count == 2
+
+    def test_should_read_again_the_resource_found(self):
+        index = OneViewResourceIndex(self.resource_client).load()
+        current = mock.Mock(data=dict(name='Resource 1', uri='/rest/resources/1', eTag='2'))
+        self.resource_client.get_by_uri.return_value = current
+
+        assert index.read('resource 1') is current
+        assert index.get_by_name('Resource 1')['eTag'] == '2'
+        self.resource_client.get_by_uri.assert_called_once_with('/rest/resources/1')
+
+    def test_should_not_look_up_the_resource_missing_in_a_loaded_collection(self):
+        index = OneViewResourceIndex(self.resource_client).load()
+
+        assert index.read('Resource 4') is None
+        self.resource_client.get_by_name.assert_not_called()
+
+    def test_should_look_up_the_resource_renamed_after_the_collection_was_cached(self):
+        OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+        self.resource_client.get_by_uri.return_value = mock.Mock(data=dict(name='Renamed', uri='/rest/resources/1'))
+        created = mock.Mock(data=dict(name='Resource 1', uri='/rest/resources/4'))
+        self.resource_client.get_by_name.return_value = created
+
+        assert index.read('Resource 1') is created
+        assert index.get_by_name('Renamed')['uri'] == '/rest/resources/1'
+        assert index.get_by_name('Resource 1')['uri'] == '/rest/resources/4'
+
+    def test_should_replace_renamed_resource(self):
+        index = OneViewResourceIndex(self.resource_client).load()
+
+        index.set(dict(name='Renamed', uri='/rest/resources/1'))
+
+        assert index.get_by_name('Resource 1') is None
+        assert index.get_by_name('Renamed') == dict(name='Renamed', uri='/rest/resources/1')
+
+    def test_should_remove_resource(self):
+        index = OneViewResourceIndex(self.resource_client).load()
+
+        index.remove(self.RESOURCES[1])
+
+        assert index.get_by_name('Resource 2') is None
+        assert index.get_by_uri('/rest/resources/2') is None
+
+    def test_should_not_use_persistent_cache_when_cache_dir_not_provided(self):
+        index = OneViewResourceIndex.from_params(dict(cache_dir=None), self.resource_client, self.connection)
+
+        assert index.cache is None
+
+    def test_should_reuse_cached_collection(self):
+        loaded = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+
+        assert not loaded.loaded_from_cache
+        assert index.loaded_from_cache
+        assert index.get_by_name('Resource 3') == self.RESOURCES[2]
+        self.resource_client.get_all.assert_called_once_with(start=0, count=OneViewResourceIndex.PAGE_SIZE)
+
+    def test_should_keep_cached_collection_up_to_date(self):
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+        index.set(dict(name='Resource 4', uri='/rest/resources/4'))
+        index.set(dict(name='Resource 1', uri='/rest/resources/1', description='Updated'))
+        index.remove(self.RESOURCES[1])
+        index.save()
+
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+
+        assert index.get_by_name('Resource 4') == dict(name='Resource 4', uri='/rest/resources/4')
+        assert index.get_by_name('Resource 1')['description'] == 'Updated'
+        assert index.get_by_name('Resource 2') is None
+        self.resource_client.get_all.assert_called_once()
+
+    def test_should_load_collection_again_after_invalidated(self):
+        OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load().invalidate()
+        OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+
+        assert self.resource_client.get_all.call_count == 2
+
+    def test_should_not_cache_changes_of_an_expired_collection(self):
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+        index.invalidate()
+        index.set(dict(name='Resource 4', uri='/rest/resources/4'))
+        index.save()
+
+        assert index.cache.get(index.cache_key) is None
+
+    def test_should_not_write_changes_until_saved(self):
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+
+        with mock.patch.object(index.cache, 'update', wraps=index.cache.update) as mock_update:
+            index.set(dict(name='Resource 4', uri='/rest/resources/4'))
+            index.set(dict(name='Resource 5', uri='/rest/resources/5'))
+            assert len(index.cache.get(index.cache_key)) == 3
+            index.save()
+            index.save()
+
+        mock_update.assert_called_once()
+        assert len(index.cache.get(index.cache_key)) == 5
+
+    def test_should_keep_each_collection_in_its_own_file(self):
+        other_client = mock.Mock(URI='/rest/others')
+        other_client.get_all.return_value = []
+        index = OneViewResourceIndex.from_params(self.params, self.resource_client, self.connection).load()
+        other_index = OneViewResourceIndex.from_params(self.params, other_client, self.connection).load()
+
+        assert index.cache.path != other_index.cache.path
+        assert os.path.dirname(index.cache.path) == os.path.join(self.params['cache_dir'],
+                                                                 OneViewResourceIndex.CACHE_DIR_NAME)
+
+
+class TestOneViewResponseCache():
+    COLLECTION = dict(members=[dict(name='Server 1')], nextPageUri=None, total=1)
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.cache_dir = str(tmpdir)
+        self.connection = mock.Mock()
+        self.connection.get_host.return_value = '172.16.1.1'
+        self.connection._apiVersion = 2800
+        self.response_cache = OneViewResponseCache.from_params(dict(cache_dir=self.cache_dir), self.connection)
+
+    def response(self, status, etag=None):
+        response = mock.Mock(status=status)
+        response.getheader.return_value = etag
+        return response
+
+    def test_should_not_cache_when_cache_dir_not_provided(self):
+        assert OneViewResponseCache.from_params(dict(cache_dir=None), self.connection) is None
+
+    def test_should_serve_not_modified_response_from_disk(self):
+        self.connection.do_http.side_effect = [(self.response(200, '"etag-1"'), self.COLLECTION),
+                                               (self.response(304), '')]
+
+        self.response_cache.get('/rest/server-hardware?start=0&count=-1')
+        body = self.response_cache.get('/rest/server-hardware?start=0&count=-1')
+
+        assert body == self.COLLECTION
+        self.connection.do_http.assert_called_with('GET', '/rest/server-hardware?start=0&count=-1', '',
+                                                   custom_headers={'If-None-Match': '"etag-1"'})
+
+    def test_should_replace_modified_response(self):
+        modified = dict(self.COLLECTION, total=2)
+        self.connection.do_http.side_effect = [(self.response(200, '"etag-1"'), self.COLLECTION),
+                                               (self.response(200, '"etag-2"'), modified),
+                                               (self.response(304), '')]
+
+        self.response_cache.get('/rest/server-hardware')
+        assert self.response_cache.get('/rest/server-hardware') == modified
+        assert self.response_cache.get('/rest/server-hardware') == modified
+
+        self.connection.do_http.assert_called_with('GET', '/rest/server-hardware', '',
+                                                   custom_headers={'If-None-Match': '"etag-2"'})
+
+    def test_should_use_etag_from_body_when_header_missing(self):
+        resource = dict(name='Server 1', eTag='etag-1')
+        self.connection.do_http.side_effect = [(self.response(200), resource), (self.response(304), '')]
+
+        self.response_cache.get('/rest/server-hardware/1')
+
+        assert self.response_cache.get('/rest/server-hardware/1') == resource
+
+    def test_should_key_responses_by_uri_and_query(self):
+        self.connection.do_http.side_effect = [(self.response(200, '"etag-1"'), self.COLLECTION),
+                                               (self.response(200, '"etag-2"'), self.COLLECTION)]
+
+        self.response_cache.get('/rest/server-hardware?filter=a')
+        self.response_cache.get('/rest/server-hardware?filter=b')
+
+        self.connection.do_http.assert_called_with('GET', '/rest/server-hardware?filter=b', '', custom_headers={})
+
+    def test_should_raise_error_responses(self):
+        self.connection.do_http.return_value = (self.response(404), dict(message='Not found'))
+
+        with pytest.raises(HPEOneViewException):
+            self.response_cache.get('/rest/server-hardware/1')
+
+    def test_should_install_on_modules_with_cache_responses_when_cache_dir_provided(self):
+        with mock.patch(OneViewModule.__module__ + '.create_oneview_client'), \
+                mock.patch(OneViewModule.__module__ + '.AnsibleModule') as ansible_module:
+            ansible_module.return_value.params = dict(config='config.json', cache_dir=self.cache_dir)
+
+            connection = OneViewModule().oneview_client.connection
+            assert isinstance(connection.get, mock.Mock)
+
+            OneViewModule(cache_responses=True)
+            assert isinstance(connection.get.__self__, OneViewResponseCache)
+
+    def test_should_discard_responses_not_used_within_the_ttl(self):
+        self.connection.do_http.side_effect = [(self.response(200, '"etag-1"'), self.COLLECTION),
+                                               (self.response(200, '"etag-1"'), self.COLLECTION)]
+        self.response_cache.get('/rest/server-hardware')
+
+        with mock.patch('time.time', return_value=time.time() + OneViewResponseCache.CACHE_TTL + 1):
+            self.response_cache.get('/rest/server-hardware')
+
+        self.connection.do_http.assert_called_with('GET', '/rest/server-hardware', '', custom_headers={})
+
+    def test_should_evict_the_least_recently_used_responses(self):
+        self.connection.do_http.return_value = (self.response(200, '"etag-1"'), self.COLLECTION)
+        cache_path = os.path.join(self.cache_dir, OneViewResponseCache.CACHE_DIR_NAME)
+
+        with mock.patch.object(OneViewResponseCache, 'MAX_ENTRIES', 2):
+            for index in range(3):
+                self.response_cache.get('/rest/server-hardware/{0}'.format(index))
+                os.utime(self.response_cache._file_path('/rest/server-hardware/{0}'.format(index)),
+                         (time.time() - 10 + index, time.time() - 10 + index))
+            self.response_cache.get('/rest/server-hardware/3')
+
+        assert len(os.listdir(cache_path)) == 2
+        assert not os.path.exists(self.response_cache._file_path('/rest/server-hardware/0'))
+        assert os.path.exists(self.response_cache._file_path('/rest/server-hardware/3'))
+
+
+class TestOneViewUtilizationExport():
+    URI = '/rest/server-hardware/1'
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.path = os.path.join(str(tmpdir), 'utilization.csv')
+
+    def utilization(self, *samples):
+        return dict(metricList=[dict(metricName='AveragePower', metricSamples=list(samples))])
+
+    def test_from_params_should_return_none_without_output_file(self):
+        assert OneViewUtilizationExport.from_params(True) is None
+        assert OneViewUtilizationExport.from_params(dict(fields='AveragePower')) is None
+
+    def test_should_raise_when_output_format_is_invalid(self):
+        with pytest.raises(OneViewModuleValueError):
+            OneViewUtilizationExport(self.path, 'parquet')
+
+    def test_should_write_one_csv_row_per_sample(self):
+        export = OneViewUtilizationExport.from_params(dict(output_file=self.path))
+
+        result = export.write({self.URI: self.utilization([1464578700000, 302], [1464578400000, 301])})
+
+        assert result == dict(path=self.path, count=2)
+        with open(self.path) as output:
+            assert output.read().splitlines() == ['uri,metric,timestamp,value',
+                                                  self.URI + ',AveragePower,1464578400000,301',
+                                                  self.URI + ',AveragePower,1464578700000,302']
+
+    def test_should_write_csv_lines_that_are_read_back_as_the_same_rows(self):
+        uri = '/rest/server-hardware/1,2'
+        OneViewUtilizationExport(self.path).write({uri: self.utilization([1464578400000, 301])})
+        OneViewUtilizationExport(self.path).write({uri: self.utilization([1464578700000, 302])})
+
+        with open(self.path, 'rb') as output:
+            assert output.read().count(b'\r\n') == 3
+        with io.open(self.path, newline='') as output:
+            assert list(csv.reader(output)) == [['uri', 'metric', 'timestamp', 'value'],
+                                                [uri, 'AveragePower', '1464578400000', '301'],
+                                                [uri, 'AveragePower', '1464578700000', '302']]
+
+    def test_should_open_the_csv_file_in_binary_mode_on_python_2(self):
+        export = OneViewUtilizationExport(self.path)
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.six.PY2', True), \
+                mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.open', create=True) as mock_open:
+            export._open_csv('a')
+
+        mock_open.assert_called_once_with(self.path, 'ab')
+
+    def test_should_request_and_append_only_the_samples_since_the_last_run(self):
+        OneViewUtilizationExport(self.path).write({self.URI: self.utilization([1464578400000, 301])})
+        export = OneViewUtilizationExport(self.path)
+
+        request_filter = export.filter(self.URI, ['startDate=2016-05-01T00:00:00.000Z', 'endDate=2016-06-01T00:00:00.000Z'])
+        result = export.write({self.URI: self.utilization([1464578400000, 301], [1464578700000, 302])})
+
+        assert request_filter == ['endDate=2016-06-01T00:00:00.000Z', 'startDate=2016-05-30T03:20:00.001Z']
+        assert result['count'] == 1
+        with open(self.path) as output:
+            assert len(output.read().splitlines()) == 3
+
+    def test_should_not_change_the_filter_of_resources_never_exported(self):
+        export = OneViewUtilizationExport(self.path)
+
+        assert export.filter(self.URI, 'startDate=2016-05-01T00:00:00.000Z') == 'startDate=2016-05-01T00:00:00.000Z'
+
+    def test_should_rewrite_the_file_when_not_incremental(self):
+        OneViewUtilizationExport(self.path).write({self.URI: self.utilization([1464578400000, 301])})
+
+        result = OneViewUtilizationExport(self.path, incremental=False).write({self.URI: self.utilization([1464578400000, 301])})
+
+        assert result['count'] == 1
+        with open(self.path) as output:
+            assert len(output.read().splitlines()) == 2
+
+    def test_should_write_arrays_of_timestamps_and_values_per_metric_in_json(self):
+        path = self.path.replace('.csv', '.json')
+        OneViewUtilizationExport(path, 'json').write({self.URI: self.utilization([1464578400000, 301])})
+
+        OneViewUtilizationExport(path, 'json').write({self.URI: self.utilization([1464578700000, 302]), '/rest/other': None})
+
+        with open(path) as output:
+            assert json.load(output) == dict(resources={
+                self.URI: dict(AveragePower=dict(timestamps=[1464578400000, 1464578700000], values=[301, 302]))})
+
+
+class TestOneViewBusyRetry():
+    BUSY = dict(errorCode='CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT', message='Busy')
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.connection = mock.Mock()
+        self.connection.get.return_value = dict(members=[])
+        self.function = mock.Mock()
+
+    def test_should_return_the_result_without_retrying(self):
+        self.function.return_value = 'result'
+
+        assert OneViewBusyRetry(connection=self.connection).call(self.function, '/rest/logical-interconnects/1') == 'result'
+        self.connection.get.assert_not_called()
+
+    def test_should_retry_with_backoff_while_busy(self):
+        self.function.side_effect = [HPEOneViewException(self.BUSY), HPEOneViewException(self.BUSY), 'result']
+        busy_retry = OneViewBusyRetry(connection=self.connection, initial_delay=1, max_delay=4)
+
+        with mock.patch('time.sleep') as mock_sleep:
+            result = busy_retry.call(self.function, '/rest/logical-interconnects/1')
+
+        assert result == 'result'
+        assert busy_retry.attempts == 3
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        assert 0.5 <= delays[0] <= 1 and 1 <= delays[1] <= 2
+
+    def test_should_wait_for_the_running_task_instead_of_sleeping(self):
+        self.function.side_effect = [HPEOneViewException(self.BUSY), 'result']
+        running_task = dict(uri='/rest/tasks/1', taskState='Running')
+        self.connection.get.side_effect = [dict(members=[running_task]), dict(running_task, taskState='Error')]
+
+        with mock.patch('time.sleep'):
+            assert OneViewBusyRetry(connection=self.connection).call(self.function, '/rest/logical-interconnects/1') == 'result'
+
+        self.connection.get.assert_called_with('/rest/tasks/1')
+
+    def test_should_retry_the_error_code_of_task_errors_and_call_before_retry(self):
+        self.function.side_effect = [OneViewModuleTaskError('Stale', 'CRM_ETAG_CHECK_FAILED'), 'result']
+        before_retry = mock.Mock()
+
+        with mock.patch('time.sleep'):
+            OneViewBusyRetry().call(self.function, before_retry=before_retry)
+
+        before_retry.assert_called_once_with()
+
+    def test_should_not_retry_other_errors(self):
+        self.function.side_effect = HPEOneViewException(dict(errorCode='RESOURCE_NOT_FOUND', message='Not found'))
+
+        with pytest.raises(HPEOneViewException):
+            OneViewBusyRetry().call(self.function)
+
+        self.function.assert_called_once_with()
+
+    def test_should_raise_the_busy_error_after_the_max_time(self):
+        self.function.side_effect = HPEOneViewException(self.BUSY)
+
+        with mock.patch('time.sleep') as mock_sleep:
+            with pytest.raises(HPEOneViewException):
+                OneViewBusyRetry.from_params(dict(busy_timeout=0)).call(self.function)
+
+        self.function.assert_called_once_with()
+        mock_sleep.assert_not_called()
+
+    def test_should_use_the_default_max_time(self):
+        assert OneViewBusyRetry.from_params(dict()).max_time == 600
+
+
+class TestOneViewTimer():
+    TASK_URI = '/rest/tasks/1'
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.path = os.path.join(str(tmpdir), 'timing.jsonl')
+        self.requests = mock.Mock()
+        self.connection = mock.Mock(get=self.requests.get, post=self.requests.post, put=self.requests.put,
+                                    patch=self.requests.patch, delete=self.requests.delete)
+        self.timer = OneViewTimer(self.path).install(self.connection)
+
+    def test_from_params_should_return_none_when_not_enabled(self):
+        assert OneViewTimer.from_params(dict(timing=False)) is None
+        assert OneViewTimer.from_params(dict(timing_file=self.path)).path == self.path
+
+    def test_should_summarize_the_requests_of_each_method(self):
+        self.requests.get.return_value = {}
+        self.requests.put.return_value = (None, {})
+
+        self.connection.get('/rest/resource/1')
+        self.connection.get('/rest/resource/2')
+        self.connection.put('/rest/resource/1', {})
+
+        operations = self.timer.summary()['operations']
+        assert [(operation, stats['count']) for operation, stats in operations.items()] == [('GET', 2), ('PUT', 1)]
+        assert self.requests.put.call_args == mock.call('/rest/resource/1', {})
+
+    def test_should_record_the_wait_of_the_tasks(self):
+        self.requests.post.return_value = (dict(uri=self.TASK_URI, name='Create', taskState='Running'), None)
+        self.requests.get.side_effect = [dict(uri=self.TASK_URI, name='Create', taskState='Running'),
+                                         dict(uri=self.TASK_URI, name='Create', taskState='Completed')]
+
+        self.connection.post('/rest/resource', {})
+        self.connection.get(self.TASK_URI)
+        self.connection.get(self.TASK_URI)
+
+        task_waits = self.timer.summary()['task_waits']
+        assert len(task_waits) == 1
+        assert task_waits[0]['uri'] == self.TASK_URI
+        assert task_waits[0]['state'] == 'Completed'
+        assert task_waits[0]['polls'] == 2
+        assert task_waits[0]['duration'] >= 0
+
+    def test_should_record_the_failed_requests(self):
+        self.requests.delete.side_effect = OneViewModuleException('error')
+
+        with pytest.raises(OneViewModuleException):
+            self.connection.delete('/rest/resource/1')
+
+        assert self.timer.summary()['operations']['DELETE']['count'] == 1
+
+    def test_should_append_each_execution_to_the_timing_file(self):
+        with self.timer.measure('login'):
+            pass
+
+        self.timer.write('Module', self.timer.summary())
+        self.timer.write('Module', self.timer.summary())
+
+        with open(self.path) as timing_file:
+            lines = [json.loads(line) for line in timing_file]
+        assert len(lines) == 2
+        assert lines[0]['module'] == 'Module'
+        assert lines[0]['calls'][0]['operation'] == 'login'
+
+
+class TestOneViewBandwidthLimiter():
+    def test_should_wait_until_the_rate_is_below_the_ceiling(self):
+        limiter = OneViewBandwidthLimiter(1000)
+
+        with mock.patch('time.sleep') as mock_sleep:
+            limiter.consume(500)
+
+        assert 0.4 < mock_sleep.call_args[0][0] <= 0.5
+
+    def test_should_not_wait_without_ceiling(self):
+        limiter = OneViewBandwidthLimiter()
+
+        with mock.patch('time.sleep') as mock_sleep:
+            limiter.consume(10 ** 9)
+
+        mock_sleep.assert_not_called()
+
+    def test_file_sha256_should_read_the_file_in_chunks(self, tmpdir):
+        path = tmpdir.join('bundle.iso')
+        path.write_binary(b'bundle' * 100)
+
+        assert file_sha256(str(path), chunk_size=7) == hashlib.sha256(b'bundle' * 100).hexdigest()
+
+
+class FakeDownloadResponse(object):
+    def __init__(self, status, body=b'', headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    def read(self, size=None):
+        chunk, self.body = (self.body, b'') if size is None else (self.body[:size], self.body[size:])
+        return chunk
+
+    def getheader(self, name):
+        return self.headers.get(name)
+
+
+class TestOneViewFileDownload():
+    CONTENT = b'0123456789'
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.file_path = str(tmpdir.join('image.zip'))
+        self.connection = mock.Mock()
+        self.connection._headers = {'auth': 'session', 'X-API-Version': 600}
+        self.http = self.connection.get_connection.return_value
+
+    def respond(self, *responses):
+        self.http.getresponse.side_effect = list(responses)
+
+    def sent_headers(self):
+        return [call[0][3] for call in self.http.request.call_args_list]
+
+    def test_should_stream_the_file_to_disk_in_chunks(self):
+        self.respond(FakeDownloadResponse(200, self.CONTENT, {'Content-Length': '10'}))
+
+        result = OneViewFileDownload(self.connection, chunk_size=3).get('/rest/golden-images/download/1', self.file_path)
+
+        assert result == dict(path=self.file_path, size=10, sha256=hashlib.sha256(self.CONTENT).hexdigest())
+        with open(self.file_path, 'rb') as downloaded_file:
+            assert downloaded_file.read() == self.CONTENT
+        assert not os.path.exists(self.file_path + '.part')
+        assert 'Range' not in self.sent_headers()[0]
+
+    def test_should_resume_from_the_partial_file(self):
+        with open(self.file_path + '.part', 'wb') as partial_file:
+            partial_file.write(self.CONTENT[:4])
+        self.respond(FakeDownloadResponse(206, self.CONTENT[4:], {'Content-Range': 'bytes 4-9/10'}))
+
+        downloader = OneViewFileDownload(self.connection, chunk_size=3)
+        result = downloader.get('/rest/golden-images/download/1', self.file_path)
+
+        assert self.sent_headers()[0]['Range'] == 'bytes=4-'
+        assert result['sha256'] == hashlib.sha256(self.CONTENT).hexdigest()
+        assert downloader.resumed_from == 4
+        with open(self.file_path, 'rb') as downloaded_file:
+            assert downloaded_file.read() == self.CONTENT
+
+    def test_should_resume_an_interrupted_download(self):
+        self.respond(FakeDownloadResponse(200, self.CONTENT[:6], {'Content-Length': '10'}),
+                     FakeDownloadResponse(206, self.CONTENT[6:], {'Content-Range': 'bytes 6-9/10'}))
+        downloader = OneViewFileDownload(self.connection, chunk_size=4, retries=1)
+
+        with mock.patch('time.sleep'):
+            result = downloader.get('/rest/golden-images/download/1', self.file_path)
+
+        assert downloader.attempts == 2
+        assert self.sent_headers()[1]['Range'] == 'bytes=6-'
+        assert result['size'] == 10
+        assert result['sha256'] == hashlib.sha256(self.CONTENT).hexdigest()
+
+    def test_should_start_again_when_the_range_is_ignored(self):
+        with open(self.file_path + '.part', 'wb') as partial_file:
+            partial_file.write(b'stale')
+        self.respond(FakeDownloadResponse(200, self.CONTENT, {'Content-Length': '10'}))
+
+        OneViewFileDownload(self.connection).get('/rest/golden-images/download/1', self.file_path)
+
+        with open(self.file_path, 'rb') as downloaded_file:
+            assert downloaded_file.read() == self.CONTENT
+
+    def test_should_complete_when_the_partial_file_has_the_whole_file(self):
+        with open(self.file_path + '.part', 'wb') as partial_file:
+            partial_file.write(self.CONTENT)
+        self.respond(FakeDownloadResponse(416, headers={'Content-Range': 'bytes */10'}))
+
+        result = OneViewFileDownload(self.connection).get('/rest/golden-images/download/1', self.file_path)
+
+        assert result['sha256'] == hashlib.sha256(self.CONTENT).hexdigest()
+        assert os.path.exists(self.file_path)
+
+    def test_should_fail_after_the_retries(self):
+        self.respond(*[FakeDownloadResponse(200, self.CONTENT[:6], {'Content-Length': '10'}) for attempt in range(2)])
+
+        with mock.patch('time.sleep'):
+            with pytest.raises(OneViewModuleException) as exception:
+                OneViewFileDownload(self.connection, retries=1).get('/rest/golden-images/download/1', self.file_path)
+
+        assert 'failed after 2 attempt(s)' in exception.value.msg
+        assert not os.path.exists(self.file_path)
+
+    def test_should_fail_when_the_checksum_does_not_match(self):
+        self.respond(FakeDownloadResponse(200, self.CONTENT, {'Content-Length': '10'}))
+
+        with pytest.raises(OneViewModuleException):
+            OneViewFileDownload(self.connection).get('/rest/golden-images/download/1', self.file_path, checksum='ab12')
+
+        assert not os.path.exists(self.file_path)
+        assert not os.path.exists(self.file_path + '.part')
+
+    def test_should_raise_the_appliance_error(self):
+        self.respond(FakeDownloadResponse(404, b'{"errorCode": "RESOURCE_NOT_FOUND"}'))
+
+        with pytest.raises(HPEOneViewException):
+            OneViewFileDownload(self.connection).get('/rest/golden-images/download/1', self.file_path)
+
+
+class TestOneViewFileTransfer():
+    CONTENT = b'0123456789'
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.file_path = str(tmpdir.join('image.zip'))
+        self.connection = mock.Mock()
+        self.connection._headers = {'auth': 'session'}
+        self.connection.get_host.return_value = '172.16.1.2'
+        self.http = self.connection.get_connection.return_value
+        self.http.getresponse.side_effect = lambda: FakeDownloadResponse(200, self.CONTENT, {'Content-Length': '10'})
+
+    def test_should_skip_the_download_when_the_local_file_matches_the_checksum(self):
+        with open(self.file_path, 'wb') as local_file:
+            local_file.write(self.CONTENT)
+        checksum = hashlib.sha256(self.CONTENT).hexdigest().upper()
+
+        result = OneViewFileTransfer(self.connection).download('/rest/golden-images/download/1', self.file_path,
+                                                               checksum=checksum)
+
+        assert result == dict(path=self.file_path, size=10, sha256=checksum.lower(), downloaded=False)
+        self.connection.get_connection.assert_not_called()
+
+    def test_should_skip_the_download_of_the_same_version_with_cache(self):
+        params = dict(cache_dir=str(self.tmpdir.join('cache')), max_bandwidth=100)
+        uri = '/rest/golden-images/download/1'
+
+        first = OneViewFileTransfer.from_params(params, self.connection).download(uri, self.file_path, version='1')
+        second = OneViewFileTransfer.from_params(params, self.connection).download(uri, self.file_path, version='1')
+        third = OneViewFileTransfer.from_params(params, self.connection).download(uri, self.file_path, version='2')
+
+        assert first['downloaded'] and first['attempts'] == 1
+        assert not second['downloaded']
+        assert second['sha256'] == hashlib.sha256(self.CONTENT).hexdigest()
+        assert third['downloaded']
+        assert self.connection.get_connection.call_count == 2
+
+    def test_should_download_again_when_the_local_file_changed(self):
+        params = dict(cache_dir=str(self.tmpdir.join('cache')))
+        uri = '/rest/golden-images/download/1'
+        OneViewFileTransfer.from_params(params, self.connection).download(uri, self.file_path, version='1')
+        with open(self.file_path, 'wb') as local_file:
+            local_file.write(b'changed')
+
+        result = OneViewFileTransfer.from_params(params, self.connection).download(uri, self.file_path, version='1')
+
+        assert result['downloaded']
+
+    def test_should_log_the_progress(self):
+        log = mock.Mock()
+
+        transfer = OneViewFileTransfer(self.connection, chunk_size=5, log=log)
+        transfer.download('/rest/golden-images/download/1', self.file_path)
+
+        assert log.call_count == 2
+
+    def test_should_upload_and_get_the_resource_of_the_task(self):
+        with open(self.file_path, 'wb') as local_file:
+            local_file.write(self.CONTENT)
+        task = dict(uri='/rest/tasks/1', taskState='Completed',
+                    associatedResource=dict(resourceUri='/rest/golden-images/1'))
+        self.connection.get.return_value = dict(name='GI', uri='/rest/golden-images/1')
+
+        with mock.patch.object(oneview.OneViewMultipartUpload, 'post', return_value=(task, {})) as post:
+            resource, upload = OneViewFileTransfer(self.connection).upload('/rest/golden-images?name=GI',
+                                                                           self.file_path)
+
+        post.assert_called_once_with('/rest/golden-images?name=GI', self.file_path)
+        self.connection.get.assert_called_once_with('/rest/golden-images/1')
+        assert resource == dict(name='GI', uri='/rest/golden-images/1')
+        assert upload['size'] == 10 and upload['attempts'] == 0
+
+    def test_should_run_the_transfers_concurrently(self):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def transfer(item):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return item
+
+        assert OneViewFileTransfer(self.connection, max_workers=2).run_concurrently(transfer, [1, 2, 3]) == [1, 2, 3]
+        assert peak[0] == 2
+
+
+class TestGetAllPages():
+    RESOURCES = [dict(name='Resource {0}'.format(number)) for number in range(7)]
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.resource_client = mock.Mock()
+        self.resource_client.get_all.side_effect = lambda start, count, **kwargs: self.RESOURCES[start:start + count]
+
+    def test_should_get_all_at_once_without_paging_params(self):
+        self.resource_client.get_all.side_effect = None
+        self.resource_client.get_all.return_value = self.RESOURCES
+
+        resources, output = _get_all_pages(self.resource_client, dict(filter='name=a', fields='name'))
+
+        assert resources == self.RESOURCES
+        assert output is None
+        self.resource_client.get_all.assert_called_once_with(filter='name=a', fields='name')
+
+    def test_should_get_all_page_by_page(self):
+        resources, output = _get_all_pages(self.resource_client, dict(page_size=3, view='expand'))
+
+        assert resources == self.RESOURCES
+        assert output is None
+        assert self.resource_client.get_all.call_args_list == [mock.call(start=0, count=3, view='expand'),
+                                                               mock.call(start=3, count=3, view='expand'),
+                                                               mock.call(start=6, count=3, view='expand')]
+
+    def test_should_respect_start_and_count(self):
+        resources, output = _get_all_pages(self.resource_client, dict(page_size=2, start=1, count=3))
+
+        assert resources == self.RESOURCES[1:4]
+        assert self.resource_client.get_all.call_args_list == [mock.call(start=1, count=2),
+                                                               mock.call(start=3, count=1)]
+
+    def test_should_write_pages_to_output_file(self, tmpdir):
+        output_file = str(tmpdir.join('resources.jsonl'))
+
+        resources, output = _get_all_pages(self.resource_client, dict(output_file=output_file))
+
+        assert resources == []
+        assert output == dict(path=output_file, count=7)
+        self.resource_client.get_all.assert_called_once_with(start=0, count=oneview.FACTS_PAGE_SIZE)
+        with open(output_file) as lines:
+            assert [json.loads(line) for line in lines] == self.RESOURCES
+
+    def test_should_call_on_page_with_each_page_written_to_output_file(self, tmpdir):
+        pages = []
+
+        _get_all_pages(self.resource_client, dict(page_size=3, output_file=str(tmpdir.join('resources.jsonl'))),
+                       pages.append)
+
+        assert pages == [self.RESOURCES[0:3], self.RESOURCES[3:6], self.RESOURCES[6:]]
+
+
+class TestOneViewTaskWaiter():
+    TASK = dict(uri='/rest/tasks/1', name='Update', taskState='Running')
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.connection = mock.Mock()
+        patcher = mock.patch.object(time, 'sleep')
+        self.mock_sleep = patcher.start()
+        yield
+        patcher.stop()
+
+    def test_should_grow_the_delay_exponentially_up_to_the_maximum(self):
+        waiter = OneViewTaskWaiter(self.connection, initial_delay=1, max_delay=8)
+
+        for attempt, maximum in enumerate([1, 2, 4, 8, 8]):
+            delay = waiter.delay(attempt)
+            assert maximum / 2.0 <= delay <= maximum
+
+    def test_should_poll_until_the_task_completes(self):
+        completed = dict(self.TASK, taskState='Completed')
+        self.connection.get.side_effect = [self.TASK, completed]
+
+        assert OneViewTaskWaiter(self.connection).wait(self.TASK) == completed
+        assert self.connection.get.call_args_list == [mock.call('/rest/tasks/1')] * 2
+        assert self.mock_sleep.call_count == 2
+
+    def test_should_raise_the_task_error(self):
+        error = dict(message='Fake message error', errorCode='FAKE_ERROR')
+        self.connection.get.return_value = dict(self.TASK, taskState='Error', taskErrors=[error])
+
+        with pytest.raises(OneViewModuleTaskError) as exception:
+            OneViewTaskWaiter(self.connection).wait(self.TASK)
+
+        assert exception.value.msg == 'Fake message error'
+        assert exception.value.error_code == 'FAKE_ERROR'
+
+    def test_should_raise_when_the_timeout_expires(self):
+        self.connection.get.return_value = self.TASK
+
+        with mock.patch.object(time, 'time', side_effect=[0, 0, 5, 10]):
+            with pytest.raises(OneViewModuleTaskError) as exception:
+                OneViewTaskWaiter(self.connection, timeout=10, initial_delay=2, max_delay=2).wait(self.TASK)
+
+        assert exception.value.msg == OneViewTaskWaiter.MSG_TIMEOUT.format(10, 'Update')
+
+    def test_should_return_the_body_when_the_update_starts_no_task(self):
+        self.connection.put.return_value = (None, dict(name='Resource'))
+
+        assert OneViewTaskWaiter(self.connection).update('/rest/resource/1', dict(name='Resource')) == dict(name='Resource')
+        self.connection.get.assert_not_called()
+
+
+class TestRunConcurrently():
+    def test_should_return_results_in_order(self):
+        assert run_concurrently(lambda x: x * 2, [3, 1, 2], 3) == [6, 2, 4]
+
+    def test_should_run_sequentially_with_one_worker(self):
+        calls = []
+
+        run_concurrently(calls.append, [1, 2, 3], 1)
+
+        assert calls == [1, 2, 3]
+
+    def test_should_raise_the_first_error(self):
+        def function(item):
+            if item > 1:
+                raise OneViewModuleException(str(item))
+            return item
+
+        with pytest.raises(OneViewModuleException) as exception:
+            run_concurrently(function, [1, 2, 3], 3)
+
+        assert exception.value.msg == '2'
+
+    def test_should_finish_all_the_calls_before_raising_the_error(self):
+        calls = []
+
+        def function(item):
+            if item == 1:
+                raise OneViewModuleException(str(item))
+            time.sleep(0.1)
+            calls.append(item)
+
+        with pytest.raises(OneViewModuleException):
+            run_concurrently(function, [1, 2, 3], 3)
+
+        assert sorted(calls) == [2, 3]
+
+    def test_should_raise_when_a_call_does_not_finish_within_the_timeout(self):
+        event = threading.Event()
+
+        try:
+            with pytest.raises(OneViewModuleException) as exception:
+                run_concurrently(lambda item: item == 'b' and event.wait(), ['a', 'b'], 1, timeout=1)
+        finally:
+            event.set()
+
+        assert exception.value.msg == oneview.MSG_GATHER_TIMEOUT.format(1, 'b')
+
+
+class TestRunConcurrentlyByKey():
+    def test_should_return_results_in_order(self):
+        assert run_concurrently_by_key(lambda x: x * 2, [3, 1, 2], 3, key=lambda x: x % 2, max_per_key=1) == [6, 2, 4]
+
+    def test_should_limit_the_concurrent_calls_of_the_same_key(self):
+        lock = threading.Lock()
+        running, peaks = {}, {}
+
+        def function(item):
+            with lock:
+                running[item[0]] = running.get(item[0], 0) + 1
+                peaks[item[0]] = max(peaks.get(item[0], 0), running[item[0]])
+            time.sleep(0.01)
+            with lock:
+                running[item[0]] -= 1
+
+        items = [(enclosure, bay) for enclosure in 'ab' for bay in range(6)]
+        run_concurrently_by_key(function, items, 8, key=lambda item: item[0], max_per_key=2)
+
+        assert peaks == dict(a=2, b=2)
+
+    def test_should_raise_the_first_error_after_all_the_calls(self):
+        calls = []
+
+        def function(item):
+            calls.append(item)
+            if item > 1:
+                raise OneViewModuleException(str(item))
+
+        with pytest.raises(OneViewModuleException) as exception:
+            run_concurrently_by_key(function, [1, 2, 3], 3, key=lambda x: 'enclosure', max_per_key=1)
+
+        assert exception.value.msg == '2'
+        assert calls == [1, 2, 3]
+
+
+class TestGatherConcurrently():
+    def test_should_return_results_by_key(self):
+        functions = dict(bios=lambda: 'bios', firmware=lambda: 'firmware')
+
+        assert gather_concurrently(functions, 2) == dict(bios='bios', firmware='firmware')
+
+    def test_should_run_sequentially_with_one_worker(self):
+        calls = []
+        functions = OrderedDict([('a', lambda: calls.append('a')), ('b', lambda: calls.append('b'))])
+
+        gather_concurrently(functions, 1)
+
+        assert calls == ['a', 'b']
+
+    def test_should_run_the_functions_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        functions = dict(a=barrier.wait, b=barrier.wait)
+
+        assert sorted(gather_concurrently(functions, 2).values()) == [0, 1]
+
+    def test_should_raise_the_first_error(self):
+        def fail(msg):
+            raise OneViewModuleException(msg)
+
+        functions = OrderedDict([('a', lambda: 'a'), ('b', lambda: fail('b')), ('c', lambda: fail('c'))])
+
+        with pytest.raises(OneViewModuleException) as exception:
+            gather_concurrently(functions, 3)
+
+        assert exception.value.msg == 'b'
+
+    def test_should_raise_when_a_function_does_not_finish_within_the_timeout(self):
+        event = threading.Event()
+        functions = OrderedDict([('a', lambda: 'a'), ('b', event.wait)])
+
+        try:
+            with pytest.raises(OneViewModuleException) as exception:
+                gather_concurrently(functions, 2, timeout=1)
+        finally:
+            event.set()
+
+        assert exception.value.msg == oneview.MSG_GATHER_TIMEOUT.format(1, 'b')
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
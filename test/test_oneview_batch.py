@@ -0,0 +1,263 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from hpeOneView.exceptions import HPEOneViewException
+from oneview_module_loader import BatchModule, OneViewModuleException, OneViewResourceIndex
+from module_utils.oneview import run_concurrently
+
+FAKE_MSG_ERROR = 'Fake message error'
+
+NETWORK_1 = dict(name='Network 1', vlanId=201, uri='/rest/ethernet-networks/1')
+NETWORK_2 = dict(name='Network 2', vlanId=202, uri='/rest/ethernet-networks/2')
+NETWORK_SET = dict(name='Network Set', networkUris=[], uri='/rest/network-sets/1')
+
+
+def item(name, state='present', module='oneview_ethernet_network', **data):
+    data['name'] = name
+    return dict(module=module, state=state, data=data)
+
+
+def resource(data):
+    resource = mock.Mock(data=data)
+    resource.update.side_effect = lambda data: setattr(resource, 'data', data)
+    return resource
+
+
+@pytest.mark.resource(TestBatchModule='ethernet_networks')
+class TestBatchModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def specific_set_up(self, setUp):
+        self.mock_ansible_module.check_mode = False
+        self.resource.get_all.return_value = [NETWORK_1, NETWORK_2]
+        self.resource.new.side_effect = lambda connection, data: resource(data)
+        self.resource.get_by_uri.side_effect = self.get_current
+        self.mock_ov_client.network_sets.get_all.return_value = [NETWORK_SET]
+        self.mock_ov_client.network_sets.get_by_uri.side_effect = lambda uri: resource(dict(NETWORK_SET))
+        # The Ethernet Networks in the appliance, by URI
+        self.current = dict((data['uri'], dict(data)) for data in [NETWORK_1, NETWORK_2])
+
+    def get_current(self, uri):
+        if uri not in self.current:
+            raise HPEOneViewException(dict(errorCode='RESOURCE_NOT_FOUND'))
+        current = resource(self.current[uri])
+
+        def update(data):
+            self.current[uri] = current.data = data
+
+        current.update.side_effect = update
+        current.delete.side_effect = lambda: self.current.pop(uri)
+        return current
+
+    def set_created(self, created):
+        def create(data):
+            self.current[created['uri']] = created
+            return resource(created)
+
+        self.resource.create.side_effect = create
+
+    def set_items(self, *items, **params):
+        self.mock_ansible_module.params = dict(config='config.json', items=list(items),
+                                               max_workers=params.get('max_workers', 4),
+                                               validate_etag=True)
+
+    def get_results(self):
+        return self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['batch_results']
+
+    def test_should_load_each_resource_type_once(self):
+        self.set_items(item('Network 1', vlanId=201), item('Network 2', vlanId=202),
+                       item('Network Set', module='oneview_network_set', networkUris=[]))
+
+        BatchModule().run()
+
+        self.resource.get_all.assert_called_once_with(start=0, count=OneViewResourceIndex.PAGE_SIZE)
+        self.mock_ov_client.network_sets.get_all.assert_called_once_with(start=0, count=OneViewResourceIndex.PAGE_SIZE)
+        self.resource.get_by.assert_not_called()
+        self.resource.create.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=BatchModule.MSG_COMPLETED.format(0),
+            ansible_facts=mock.ANY
+        )
+        assert [r['msg'] for r in self.get_results()] == [BatchModule.MSG_ALREADY_PRESENT] * 3
+
+    def test_should_create_update_and_delete_in_order(self):
+        created = dict(name='Network 3', vlanId=203, uri='/rest/ethernet-networks/3')
+        self.set_created(created)
+        self.set_items(item('Network 3', vlanId=203), item('Network 1', vlanId=301),
+                       item('Network 2', state='absent'))
+
+        BatchModule().run()
+
+        self.resource.create.assert_called_once_with(dict(name='Network 3', vlanId=203))
+        results = self.get_results()
+        assert [r['name'] for r in results] == ['Network 3', 'Network 1', 'Network 2']
+        assert [r['msg'] for r in results] == [BatchModule.MSG_CREATED, BatchModule.MSG_UPDATED,
+                                               BatchModule.MSG_DELETED]
+        assert results[0]['resource'] == created
+        assert results[1]['resource']['vlanId'] == 301
+        assert sorted(self.current) == ['/rest/ethernet-networks/1', '/rest/ethernet-networks/3']
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=BatchModule.MSG_COMPLETED.format(3),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_save_each_cached_collection_once(self):
+        self.set_items(item('Network 1', vlanId=301), item('Network 2', vlanId=302))
+
+        with mock.patch.object(OneViewResourceIndex, 'save') as mock_save:
+            BatchModule().run()
+
+        mock_save.assert_called_once_with()
+
+    def test_should_apply_items_of_the_same_resource_sequentially(self):
+        created = dict(name='Network 3', vlanId=203, uri='/rest/ethernet-networks/3')
+        self.set_created(created)
+        self.set_items(item('Network 3', vlanId=203), item('Network 3', vlanId=203),
+                       item('Network 3', state='absent'))
+
+        BatchModule().run()
+
+        self.resource.create.assert_called_once_with(dict(name='Network 3', vlanId=203))
+        assert [r['msg'] for r in self.get_results()] == [BatchModule.MSG_CREATED,
+                                                          BatchModule.MSG_ALREADY_PRESENT,
+                                                          BatchModule.MSG_DELETED]
+
+    def test_should_rename_and_update_scopes(self):
+        renamed = dict(NETWORK_1, name='Network 1 - Renamed')
+        patched = dict(renamed, scopeUris=['/rest/scopes/1'])
+        updated_resource = resource(dict(NETWORK_1))
+        updated_resource.patch.return_value = resource(patched)
+        self.resource.get_by_uri.side_effect = None
+        self.resource.get_by_uri.return_value = updated_resource
+        self.set_items(item('Network 1', newName='Network 1 - Renamed', scopeUris=['/rest/scopes/1']))
+
+        BatchModule().run()
+
+        updated_resource.update.assert_called_once_with(renamed)
+        updated_resource.patch.assert_called_once_with(operation='replace', path='/scopeUris',
+                                                       value=['/rest/scopes/1'])
+        assert self.get_results()[0]['resource'] == patched
+
+    def test_should_apply_the_items_of_a_new_name_after_the_rename(self):
+        self.set_items(item('Network 1', newName='Network 9'), item('Network 2', vlanId=302),
+                       item('Network 9', vlanId=309))
+
+        with mock.patch('oneview_batch.run_concurrently', wraps=run_concurrently) as mock_run:
+            BatchModule().run()
+
+        groups = mock_run.call_args_list[-1][0][1]
+        assert [[position for position, item in group] for group in groups] == [[0, 2], [1]]
+        self.resource.create.assert_not_called()
+        assert self.get_results()[2]['resource'] == dict(NETWORK_1, name='Network 9', vlanId=309)
+
+    def test_should_not_change_resources_in_check_mode(self):
+        self.mock_ansible_module.check_mode = True
+        self.set_items(item('Network 3', vlanId=203), item('Network 1', vlanId=301),
+                       item('Network 2', state='absent'))
+
+        BatchModule().run()
+
+        self.resource.create.assert_not_called()
+        assert self.current == dict((data['uri'], data) for data in [NETWORK_1, NETWORK_2])
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=BatchModule.MSG_COMPLETED.format(3),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_report_failed_items_after_processing_all(self):
+        self.resource.create.side_effect = OneViewModuleException(FAKE_MSG_ERROR)
+        self.set_items(item('Network 3', vlanId=203), item('Network 2', state='absent'))
+
+        BatchModule().run()
+
+        results = self.mock_ansible_module.fail_json.call_args[1]['ansible_facts']['batch_results']
+        assert results[0]['failed'] and results[0]['msg'] == FAKE_MSG_ERROR
+        assert not results[1]['failed'] and results[1]['changed']
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            changed=True,
+            msg=BatchModule.MSG_FAILED.format(1),
+            ansible_facts=dict(batch_results=results)
+        )
+
+    def test_should_compare_and_update_the_current_resource(self):
+        # Changed by others after the collection was loaded
+        self.current[NETWORK_1['uri']] = dict(NETWORK_1, vlanId=301, eTag='2')
+        self.set_items(item('Network 1', vlanId=301), item('Network 2', vlanId=302))
+
+        BatchModule().run()
+
+        assert [r['msg'] for r in self.get_results()] == [BatchModule.MSG_ALREADY_PRESENT, BatchModule.MSG_UPDATED]
+        assert self.current[NETWORK_2['uri']] == dict(NETWORK_2, vlanId=302)
+
+    def test_should_create_the_resource_deleted_after_the_collection_was_loaded(self):
+        del self.current[NETWORK_1['uri']]
+        self.set_created(dict(NETWORK_1, uri='/rest/ethernet-networks/11'))
+        self.set_items(item('Network 1', vlanId=201))
+
+        BatchModule().run()
+
+        self.resource.create.assert_called_once_with(dict(name='Network 1', vlanId=201))
+        assert self.get_results()[0]['msg'] == BatchModule.MSG_CREATED
+
+    def test_should_run_sequentially_with_one_worker(self):
+        self.set_items(item('Network 1', vlanId=201), item('Network 2', vlanId=202), max_workers=1)
+
+        BatchModule().run()
+
+        assert [r['changed'] for r in self.get_results()] == [False, False]
+
+    def test_should_fail_when_module_is_not_supported(self):
+        self.set_items(item('Server', module='oneview_server_profile'))
+
+        BatchModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=BatchModule.MSG_UNSUPPORTED_MODULE + 'oneview_server_profile'
+        )
+        self.resource.get_all.assert_not_called()
+
+    def test_should_fail_when_name_is_missing(self):
+        self.set_items(dict(module='oneview_ethernet_network', state='present', data=dict(vlanId=1)))
+
+        BatchModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=BatchModule.MSG_MANDATORY_FIELD_MISSING
+        )
+
+    def test_should_fail_when_new_name_is_not_a_string(self):
+        self.set_items(item('Network 1', newName=10))
+
+        BatchModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=BatchModule.MSG_INVALID_NAME.format('newName') + '10'
+        )
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
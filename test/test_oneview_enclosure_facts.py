@@ -16,6 +16,7 @@
 # limitations under the License.
 ###
 
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
@@ -158,6 +159,43 @@ class TestEnclosureFactsModule(OneViewBaseFactsTest):
         self.resource.get_utilization.assert_called_once_with(fields='AveragePower',
                                                               filter=date_filter, view='day', refresh=True)
 
+    def test_should_get_options_of_all_the_enclosures_matched_by_the_params(self):
+        enclosures = [dict(name='Enclosure 1', uri='/rest/enclosures/1'), dict(name='Enclosure 2', uri='/rest/enclosures/2')]
+        self.resource.get_all.return_value = enclosures
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            data=data, get_script=mock.Mock(return_value='script of ' + data['name']))
+        self.mock_ansible_module.params = dict(config='config.json', name=None, params=dict(filter='status=OK'),
+                                               options=['script'], max_workers=2)
+
+        EnclosureFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter='status=OK')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(enclosures=enclosures,
+                               enclosure_options={'/rest/enclosures/1': dict(enclosure_script='script of Enclosure 1'),
+                                                  '/rest/enclosures/2': dict(enclosure_script='script of Enclosure 2')})
+        )
+
+    def test_should_get_options_of_each_page_written_to_the_output_file(self, tmpdir):
+        output_file = str(tmpdir.join('enclosures.jsonl'))
+        self.resource.get_all.side_effect = [[dict(name='Enclosure 1', uri='/rest/enclosures/1')],
+                                             [dict(name='Enclosure 2', uri='/rest/enclosures/2')], []]
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            data=data, get_script=mock.Mock(return_value='script of ' + data['name']))
+        self.mock_ansible_module.params = dict(config='config.json', name=None, options=['script'],
+                                               params=dict(page_size=1, output_file=output_file))
+
+        EnclosureFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(enclosures=[],
+                               facts_output=dict(path=output_file, count=2),
+                               enclosure_options={'/rest/enclosures/1': dict(enclosure_script='script of Enclosure 1'),
+                                                  '/rest/enclosures/2': dict(enclosure_script='script of Enclosure 2')})
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
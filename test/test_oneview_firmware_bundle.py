@@ -16,10 +16,13 @@
 # limitations under the License.
 ###
 
+import hashlib
+import mock
 import pytest
+import socket
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import FirmwareBundleModule
+from oneview_module_loader import FirmwareBundleModule, ONEVIEW_MODULE_UTILS_PATH
 
 FAKE_MSG_ERROR = 'Fake message error'
 DEFAULT_FIRMWARE_FILE_PATH = '/path/to/file.rpm'
@@ -35,6 +38,8 @@ DEFAULT_FIRMWARE_TEMPLATE = dict(
                        swKeyNameList=['hp-firmware-hdd-a1b08f8a6b'])]
 )
 
+UPLOADED_FIRMWARE_BUNDLE = dict(DEFAULT_FIRMWARE_TEMPLATE, uri='/rest/firmware-drivers/hotfix')
+
 PARAMS_FOR_PRESENT = dict(
     config='config.json',
     state='present',
@@ -44,20 +49,108 @@ PARAMS_FOR_PRESENT = dict(
 
 @pytest.mark.resource(TestFirmwareBundleModule='firmware_bundles')
 class TestFirmwareBundleModule(OneViewBaseTest):
-    def test_should_upload(self):
-        self.mock_ov_client.firmware_drivers.get_by_file_name.return_value = None
-        self.resource.upload.side_effect = [DEFAULT_FIRMWARE_TEMPLATE]
+    @pytest.fixture(autouse=True)
+    def setUpFile(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.file_path = str(tmpdir.join('hp-firmware-hdd-a1b08f8a6b-HPGH-1.1.x86_64.rpm'))
+        with open(self.file_path, 'wb') as firmware_file:
+            firmware_file.write(b'firmware' * 1000)
+        self.params = dict(PARAMS_FOR_PRESENT, file_path=self.file_path, chunk_size=1024, upload_retries=1)
 
-        self.mock_ansible_module.params = PARAMS_FOR_PRESENT
+        self.mock_ov_client.firmware_drivers.get_all.return_value = []
+        self.connection = self.mock_ov_client.connection
+        self.connection._headers = dict(auth='session')
+        self.connection._apiVersion = 2400
+        self.connection.get_host.return_value = '172.16.1.1'
+        self.http = self.connection.get_connection.return_value
+        self.http.getresponse.return_value.status = 202
+        self.http.getresponse.return_value.getheader.return_value = '/rest/tasks/1'
+        self.http.getresponse.return_value.read.return_value = b''
+        task = dict(uri='/rest/tasks/1', taskState='Completed',
+                    associatedResource=dict(resourceUri='/rest/firmware-drivers/hotfix'))
+        self.connection.get.side_effect = lambda uri: task if uri == '/rest/tasks/1' else UPLOADED_FIRMWARE_BUNDLE
+
+    def sent_bytes(self):
+        return b''.join(call[0][0] for call in self.http.send.call_args_list)
+
+    def test_should_upload(self):
+        self.mock_ansible_module.params = self.params
 
         FirmwareBundleModule().run()
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_UPLOADED,
-            ansible_facts=dict(firmware_bundle=DEFAULT_FIRMWARE_TEMPLATE)
+            ansible_facts=dict(firmware_bundle=UPLOADED_FIRMWARE_BUNDLE, firmware_bundle_upload=mock.ANY)
+        )
+        self.http.putrequest.assert_called_once_with('POST', '/rest/firmware-bundles')
+        assert b'firmware' * 1000 in self.sent_bytes()
+        assert self.http.send.call_count == 10
+
+    def test_should_not_upload_when_the_appliance_has_a_driver_with_the_same_file_name_and_size(self):
+        firmware_driver = dict(DEFAULT_FIRMWARE_TEMPLATE, bundleSize='8000', uri='/rest/firmware-drivers/hotfix')
+        self.mock_ov_client.firmware_drivers.get_all.return_value = [firmware_driver]
+        self.mock_ansible_module.params = self.params
+
+        FirmwareBundleModule().run()
+
+        self.http.send.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+            ansible_facts=dict(firmware_bundle=firmware_driver, firmware_bundle_upload=dict(size=8000))
         )
 
+    def test_should_not_upload_a_file_with_the_same_digest_again(self):
+        self.mock_ansible_module.params = dict(self.params, cache_dir=str(self.tmpdir.join('cache')))
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.create_oneview_client', return_value=self.mock_ov_client):
+            FirmwareBundleModule().run()
+            FirmwareBundleModule().run()
+
+        assert self.http.putrequest.call_count == 1
+        assert self.mock_ansible_module.exit_json.call_args[1]['changed'] is False
+        upload = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['firmware_bundle_upload']
+        assert upload['sha256'] == hashlib.sha256(b'firmware' * 1000).hexdigest()
+
+    def test_should_not_compute_the_digest_without_cache(self):
+        self.mock_ansible_module.params = self.params
+
+        with mock.patch.object(hashlib, 'sha256') as sha256:
+            FirmwareBundleModule().run()
+
+        sha256.assert_not_called()
+        upload = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['firmware_bundle_upload']
+        assert upload == dict(size=8000, attempts=1, duration=mock.ANY, rate=mock.ANY)
+
+    def test_should_start_the_upload_again_when_the_connection_fails(self):
+        self.http.getresponse.side_effect = [socket.error('Connection reset'), self.http.getresponse.return_value]
+        self.mock_ansible_module.params = self.params
+
+        with mock.patch('time.sleep'):
+            FirmwareBundleModule().run()
+
+        assert self.http.putrequest.call_count == 2
+        assert self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['firmware_bundle_upload']['attempts'] == 2
+
+    def test_should_fail_when_the_upload_fails_after_the_retries(self):
+        self.http.getresponse.side_effect = socket.error('Connection reset')
+        self.mock_ansible_module.params = self.params
+
+        with mock.patch('time.sleep'):
+            FirmwareBundleModule().run()
+
+        assert self.http.putrequest.call_count == 2
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=mock.ANY)
+
+    def test_should_fail_when_the_file_does_not_exist(self):
+        self.mock_ansible_module.params = dict(self.params, file_path='/path/to/missing.rpm')
+
+        FirmwareBundleModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=FirmwareBundleModule.MSG_FILE_NOT_FOUND.format('/path/to/missing.rpm'))
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -20,7 +20,9 @@ import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseTest
+from hpeOneView.exceptions import HPEOneViewException
 from oneview_module_loader import LogicalInterconnectModule
+from module_utils.oneview import run_concurrently_by_key
 
 FAKE_MSG_ERROR = 'Fake message error'
 
@@ -83,6 +85,9 @@ PARAMS_INTERNAL_NETWORKS = dict(
               internalNetworks=[dict(name='Network Name 1'), dict(name='Network Name 2'), dict(uri='/path/3')])
 )
 
+ETHERNET_NETWORKS = [dict(name='Network Name 1', category='ethernet-networks', uri='/path/1'),
+                     dict(name='Network Name 2', category='ethernet-networks', uri='/path/2')]
+
 PARAMS_SETTINGS = dict(
     config='config.json',
     state='settings_updated',
@@ -294,6 +299,41 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
             ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT)
         )
 
+    def test_should_wait_for_the_ongoing_operation_and_retry_the_compliance(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        busy = HPEOneViewException(dict(errorCode='CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT', message='Busy'))
+        self.resource.update_compliance.side_effect = [busy, LOGICAL_INTERCONNECT]
+        running_task = dict(uri='/rest/tasks/1', name='Update', taskState='Running')
+        self.mock_ov_client.connection.get.side_effect = [dict(members=[running_task]),
+                                                          dict(running_task, taskState='Completed')]
+
+        self.mock_ansible_module.params = PARAMS_COMPLIANCE
+
+        with mock.patch('time.sleep') as mock_sleep:
+            LogicalInterconnectModule().run()
+
+        assert self.resource.update_compliance.call_count == 2
+        assert "associatedResource.resourceUri%3D%27/rest/logical-interconnects/id%27" in \
+            self.mock_ov_client.connection.get.call_args_list[0][0][0]
+        assert mock_sleep.call_count == 1
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectModule.MSG_CONSISTENT,
+            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT)
+        )
+
+    def test_should_fail_when_the_logical_interconnect_is_busy_for_longer_than_the_busy_timeout(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        busy = HPEOneViewException(dict(errorCode='CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT', message='Busy'))
+        self.resource.update_compliance.side_effect = busy
+
+        self.mock_ansible_module.params = dict(PARAMS_COMPLIANCE, busy_timeout=0)
+
+        with pytest.raises(HPEOneViewException):
+            LogicalInterconnectModule().run()
+
+        self.resource.update_compliance.assert_called_once_with()
+
     def test_should_fail_when_logical_interconnect_not_found(self):
         self.resource.get_by_name.return_value = None
 
@@ -342,7 +382,10 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
 
     def test_should_update_internal_networks(self):
         self.resource.data = LOGICAL_INTERCONNECT
-        self.mock_ov_client.ethernet_networks.get_by.side_effect = [[{'uri': '/path/1'}], [{'uri': '/path/2'}]]
+        self.mock_ov_client.index_resources.get_all.return_value = ETHERNET_NETWORKS
+        self.mock_ov_client.connection.get.return_value = dict(members=[dict(generalNetworkUri='/path/1', internalVlanId=1),
+                                                                        dict(generalNetworkUri='/path/4', internalVlanId=4)])
+        self.mock_ov_client.uplink_sets.get_all.return_value = []
         self.resource.update_internal_networks.return_value = LOGICAL_INTERCONNECT
 
         self.mock_ansible_module.params = PARAMS_INTERNAL_NETWORKS
@@ -352,12 +395,61 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=LogicalInterconnectModule.MSG_INTERNAL_NETWORKS_UPDATED,
-            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT)
+            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT,
+                               internal_networks_changes=dict(added=['/path/2', '/path/3'], removed=['/path/4']))
+        )
+
+    def test_should_not_update_internal_networks_when_no_changes(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.mock_ov_client.index_resources.get_all.return_value = ETHERNET_NETWORKS
+        self.mock_ov_client.connection.get.return_value = dict(members=[dict(generalNetworkUri='/path/3', internalVlanId=3),
+                                                                        dict(generalNetworkUri='/path/2', internalVlanId=2),
+                                                                        dict(generalNetworkUri='/path/1', internalVlanId=1)])
+        self.mock_ov_client.uplink_sets.get_all.return_value = []
+
+        self.mock_ansible_module.params = PARAMS_INTERNAL_NETWORKS
+
+        LogicalInterconnectModule().run()
+
+        self.mock_ov_client.connection.get.assert_called_once_with(LOGICAL_INTERCONNECT['uri'] + '/internalVlans')
+        self.resource.update_internal_networks.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=LogicalInterconnectModule.MSG_NO_CHANGES_PROVIDED,
+            ansible_facts=dict(internal_networks_changes=dict(added=[], removed=[]))
+        )
+
+    def test_should_compare_only_the_internal_networks_of_every_page(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.mock_ov_client.index_resources.get_all.return_value = ETHERNET_NETWORKS
+        vlans_uri = LOGICAL_INTERCONNECT['uri'] + '/internalVlans'
+        self.mock_ov_client.connection.get.side_effect = [
+            dict(uri=vlans_uri, nextPageUri=vlans_uri + '?start=3&count=3',
+                 members=[dict(generalNetworkUri='/path/1'), dict(generalNetworkUri='/path/2'),
+                          dict(generalNetworkUri='/path/uplink')]),
+            dict(uri=vlans_uri + '?start=3&count=3', nextPageUri=None,
+                 members=[dict(generalNetworkUri='/path/3'), dict(generalNetworkUri='/path/network-set-member')])]
+        self.mock_ov_client.uplink_sets.get_all.return_value = [
+            dict(networkUris=['/path/uplink'], networkSetUris=['/rest/network-sets/1'])]
+        self.mock_ov_client.network_sets.get_by_uri.return_value = mock.Mock(
+            data=dict(networkUris=['/path/network-set-member']))
+
+        self.mock_ansible_module.params = PARAMS_INTERNAL_NETWORKS
+
+        LogicalInterconnectModule().run()
+
+        self.mock_ov_client.uplink_sets.get_all.assert_called_once_with(
+            filter="logicalInterconnectUri='{0}'".format(LOGICAL_INTERCONNECT['uri']))
+        self.resource.update_internal_networks.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=LogicalInterconnectModule.MSG_NO_CHANGES_PROVIDED,
+            ansible_facts=dict(internal_networks_changes=dict(added=[], removed=[]))
         )
 
     def test_should_update_internal_networks_with_given_list(self):
         self.resource.data = LOGICAL_INTERCONNECT
-        self.mock_ov_client.ethernet_networks.get_by.side_effect = [[{'uri': '/path/1'}], [{'uri': '/path/2'}]]
+        self.mock_ov_client.index_resources.get_all.return_value = ETHERNET_NETWORKS
         self.resource.update_internal_networks.return_value = LOGICAL_INTERCONNECT
 
         self.mock_ansible_module.params = PARAMS_INTERNAL_NETWORKS
@@ -367,10 +459,13 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
         expected_list = ['/path/1', '/path/2', '/path/3']
         self.resource.update_internal_networks.assert_called_once_with(
             expected_list)
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks'], filter="\"name='Network Name 1' OR name='Network Name 2'\"")
 
     def test_should_fail_when_ethernet_network_not_found(self):
         self.resource.data = LOGICAL_INTERCONNECT
-        self.mock_ov_client.ethernet_networks.get_by.side_effect = [[{'uri': '/path/1'}], []]
+        self.mock_ov_client.index_resources.get_all.return_value = ETHERNET_NETWORKS[:1]
+        self.mock_ov_client.ethernet_networks.get_by.return_value = []
         self.resource.update_internal_networks.return_value = {}
 
         self.mock_ansible_module.params = PARAMS_INTERNAL_NETWORKS
@@ -674,6 +769,95 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
 
         self.resource.install_firmware.assert_called_once_with(self.expected_data)
 
+    def test_should_return_the_logical_interconnects_of_a_group_to_a_consistent_state(self):
+        lig = mock.Mock(data=dict(uri='/rest/logical-interconnect-groups/1'))
+        self.mock_ov_client.logical_interconnect_groups.get_by_name.return_value = lig
+        self.resource.get_all.return_value = [
+            dict(name='LI 1', uri='/rest/logical-interconnects/1', consistencyStatus='NOT_CONSISTENT'),
+            dict(name='LI 2', uri='/rest/logical-interconnects/2', consistencyStatus='CONSISTENT')]
+        self.mock_ov_client.connection.put.return_value = (None, {})
+
+        self.mock_ansible_module.params = dict(config='config.json', state='compliant', max_workers=4,
+                                               data=dict(logicalInterconnectGroupName='LIG'))
+
+        LogicalInterconnectModule().run()
+
+        self.resource.get_all.assert_called_once_with(
+            filter=["logicalInterconnectGroupUri='/rest/logical-interconnect-groups/1'"])
+        self.mock_ov_client.connection.put.assert_called_once_with('/rest/logical-interconnects/1/compliance', None)
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectModule.MSG_LOGICAL_INTERCONNECTS_UPDATED.format(1),
+            ansible_facts=dict(logical_interconnect_results=[
+                dict(name='LI 1', uri='/rest/logical-interconnects/1', changed=True, failed=False,
+                     msg=LogicalInterconnectModule.MSG_CONSISTENT, wave=1),
+                dict(name='LI 2', uri='/rest/logical-interconnects/2', changed=False, failed=False,
+                     msg=LogicalInterconnectModule.MSG_ALREADY_CONSISTENT, wave=None)])
+        )
+
+    def test_should_fail_when_the_logical_interconnect_group_is_not_found(self):
+        self.mock_ov_client.logical_interconnect_groups.get_by_name.return_value = None
+
+        self.mock_ansible_module.params = dict(config='config.json', state='compliant', max_workers=4,
+                                               data=dict(logicalInterconnectGroupName='LIG'))
+
+        LogicalInterconnectModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=LogicalInterconnectModule.MSG_LIG_NOT_FOUND.format('LIG'))
+
+    def test_should_install_the_firmware_in_waves_serialized_by_enclosure_group(self):
+        self.resource.get_all.return_value = [
+            dict(name='LI {0}'.format(index), uri='/rest/logical-interconnects/{0}'.format(index),
+                 enclosureUris=['/rest/enclosures/{0}'.format(index)]) for index in range(1, 4)]
+        self.mock_ov_client.enclosures.get_all.return_value = [
+            dict(uri='/rest/enclosures/1', enclosureGroupUri='/rest/enclosure-groups/1'),
+            dict(uri='/rest/enclosures/2', enclosureGroupUri='/rest/enclosure-groups/1'),
+            dict(uri='/rest/enclosures/3', enclosureGroupUri='/rest/enclosure-groups/2')]
+        self.mock_ov_client.connection.put.return_value = (None, {})
+
+        self.mock_ansible_module.params = dict(
+            config='config.json', state='firmware_installed', max_workers=4, batch_size=2,
+            max_per_enclosure_group=1,
+            data=dict(filter="enclosureType='SY12000'", firmware=dict(command='Stage', spp='filename')))
+
+        with mock.patch('oneview_logical_interconnect.run_concurrently_by_key',
+                        wraps=run_concurrently_by_key) as mock_run:
+            LogicalInterconnectModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter=["enclosureType='SY12000'"])
+        assert [len(call[0][1]) for call in mock_run.call_args_list] == [2, 1]
+        key = mock_run.call_args_list[0][1]['key']
+        assert key(dict(uri='/rest/logical-interconnects/2')) == '/rest/enclosure-groups/1'
+        assert mock_run.call_args_list[0][1]['max_per_key'] == 1
+        assert sorted(self.mock_ov_client.connection.put.call_args_list) == [
+            mock.call('/rest/logical-interconnects/{0}/firmware'.format(index),
+                      dict(command='Stage', sppUri='/rest/firmware-drivers/filename')) for index in range(1, 4)]
+        results = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['logical_interconnect_results']
+        assert [result['wave'] for result in results] == [1, 1, 2]
+
+    def test_should_not_start_the_next_waves_when_a_logical_interconnect_fails(self):
+        self.resource.get_all.return_value = [
+            dict(name='LI 1', uri='/rest/logical-interconnects/1'),
+            dict(name='LI 2', uri='/rest/logical-interconnects/2')]
+        self.mock_ov_client.connection.put.side_effect = HPEOneViewException(FAKE_MSG_ERROR)
+
+        self.mock_ansible_module.params = dict(config='config.json', state='compliant', max_workers=4, batch_size=1,
+                                               data=dict(filter="name matches 'LI%'"))
+
+        LogicalInterconnectModule().run()
+
+        self.mock_ov_client.connection.put.assert_called_once()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            changed=False,
+            msg=LogicalInterconnectModule.MSG_LOGICAL_INTERCONNECTS_FAILED.format(1),
+            ansible_facts=dict(logical_interconnect_results=[
+                dict(name='LI 1', uri='/rest/logical-interconnects/1', changed=False, failed=True,
+                     msg=FAKE_MSG_ERROR, wave=1),
+                dict(name='LI 2', uri='/rest/logical-interconnects/2', changed=False, failed=False,
+                     msg=LogicalInterconnectModule.MSG_NOT_STARTED, wave=2)])
+        )
+
     def test_update_telemetry_configuration(self):
         self.resource.data = LOGICAL_INTERCONNECT
         self.resource.update_telemetry_configurations.return_value = LOGICAL_INTERCONNECT
@@ -21,6 +21,7 @@ import pytest
 
 from copy import deepcopy
 from hpe_test_utils import OneViewBaseTest
+from hpeOneView.exceptions import HPEOneViewException
 from oneview_module_loader import LogicalInterconnectGroupModule
 
 FAKE_MSG_ERROR = 'Fake message error'
@@ -291,8 +292,23 @@ UPLINK_SETS = [dict(
 ]
 
 
+INDEX_RESOURCES = [
+    dict(name='test1', category='ethernet-networks', uri='/rest/ethernet-networks/18'),
+    dict(name='Ethernet1', category='ethernet-networks', uri='/rest/ethernet-networks/7568956'),
+    dict(name='TestNetwork_1', category='ethernet-networks', uri='/rest/ethernet-networks/7568957'),
+    dict(name='TestEthernet2', category='ethernet-networks', uri='/rest/ethernet-networks/7568958'),
+    dict(name='FC1', category='fc-networks', uri='/rest/fc-networks/7568956'),
+    dict(name='NetworkSet1', category='network-sets', uri='/rest/network-sets/8985690'),
+    dict(name='test_1', category='network-sets', uri='/rest/network-sets/8985691')
+]
+
+
 @pytest.mark.resource(TestLogicalInterconnectGroupModule='logical_interconnect_groups')
 class TestLogicalInterconnectGroupModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def specific_set_up(self, setUp):
+        self.mock_ov_client.index_resources.get_all.return_value = INDEX_RESOURCES
+
     def test_should_create_new_lig(self):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
@@ -313,13 +329,13 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
         self.resource.data = DEFAULT_LIG_TEMPLATE_WITH_UPLINKSETS
         self.resource.create.return_value = self.resource
 
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/7568956')]
-        self.mock_ov_client.network_sets.get_by.return_value = [dict(uri='/rest/network-sets/8985690')]
-
         self.mock_ansible_module.params = PARAMS_FOR_CREATE
 
         LogicalInterconnectGroupModule().run()
 
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks', 'fc-networks', 'network-sets'],
+            filter="\"name='test1' OR name='TestNetwork_1' OR name='test_1'\"")
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=LogicalInterconnectGroupModule.MSG_CREATED,
@@ -331,9 +347,6 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
         self.resource.data = deepcopy(DEFAULT_LIG_TEMPLATE_WITH_FC_NETWORK_UPLINKSETS['data'])
         self.resource.create.return_value = self.resource
 
-        self.mock_ov_client.fc_networks.get_by.return_value = [dict(uri='/rest/fc-networks/7568956')]
-        self.mock_ov_client.network_sets.get_by.return_value = [dict(uri='/rest/network-sets/8985690')]
-
         self.mock_ansible_module.params = PARAMS_FOR_CREATE_FC
 
         LogicalInterconnectGroupModule().run()
@@ -348,7 +361,6 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
         self.resource.data = PARAMS_FOR_PRESENT
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
         self.mock_ov_client.logical_interconnect_groups.get_by.return_value = UPLINK_SETS
         self.mock_ansible_module.params = deepcopy(PARAMS_LIG_TEMPLATE_WITH_MAP)
 
@@ -386,6 +398,52 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
             ansible_facts=dict(logical_interconnect_group=DEFAULT_LIG_TEMPLATE)
         )
 
+    def test_should_return_diff_when_updated_in_diff_mode(self):
+        self.resource.data = deepcopy(DEFAULT_LIG_TEMPLATE)
+        self.mock_ansible_module._diff = True
+        self.mock_ansible_module.params = dict(config='config.json', state='present',
+                                               data=dict(name=DEFAULT_LIG_NAME, enclosureType='SY12000'))
+
+        LogicalInterconnectGroupModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectGroupModule.MSG_UPDATED,
+            ansible_facts=dict(logical_interconnect_group=self.resource.data),
+            diff=dict(before=dict(enclosureType='C7000'), after=dict(enclosureType='SY12000'))
+        )
+
+    def test_should_reload_and_retry_the_update_when_the_etag_is_stale(self):
+        uplink_set_1 = dict(name='US1', networkType='Ethernet', ethernetNetworkType='Tagged')
+        uplink_set_2 = dict(name='US2', networkType='Ethernet', ethernetNetworkType='Tagged')
+        self.resource.data = dict(deepcopy(DEFAULT_LIG_TEMPLATE), uplinkSets=[uplink_set_1, uplink_set_2])
+        reloaded_data = dict(deepcopy(DEFAULT_LIG_TEMPLATE), uplinkSets=[uplink_set_1])
+        stale = HPEOneViewException(dict(errorCode='CRM_ETAG_CHECK_FAILED', message='Stale eTag'))
+        updated_uplink_sets = []
+
+        def update(data):
+            updated_uplink_sets.append([uplink_set['name'] for uplink_set in data['uplinkSets']])
+            if len(updated_uplink_sets) == 1:
+                raise stale
+
+        self.resource.update.side_effect = update
+        self.resource.refresh.side_effect = lambda: setattr(self.resource, 'data', reloaded_data)
+        self.mock_ansible_module.params = dict(config='config.json', state='present',
+                                               data=dict(name=DEFAULT_LIG_NAME, enclosureType='SY12000',
+                                                         uplinkSets=[dict(uplink_set_1, ethernetNetworkType='Untagged')]))
+
+        with mock.patch('time.sleep'):
+            LogicalInterconnectGroupModule().run()
+
+        # The uplink set deleted by the concurrent update is not added back
+        assert updated_uplink_sets == [['US1', 'US2'], ['US1']]
+        self.resource.refresh.assert_called_once_with()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectGroupModule.MSG_UPDATED,
+            ansible_facts=dict(logical_interconnect_group=self.resource.data)
+        )
+
     def test_update_when_data_has_modified_uplinkset_attributes(self):
         self.resource.data = DEFAULT_LIG_TEMPLATE
         self.mock_ansible_module.params = PARAMS_WITH_CHANGES
@@ -426,8 +484,11 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
 
     def test_should_fail_when_uplinkset_network_not_found(self):
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.ethernet_networks.get_by_name.return_value = None
-        self.mock_ov_client.fc_networks.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            x for x in INDEX_RESOURCES if x['category'] == 'network-sets']
+        self.mock_ov_client.ethernet_networks.get_by.return_value = []
+        self.mock_ov_client.fc_networks.get_by.return_value = []
+        self.mock_ov_client.network_sets.get_by.return_value = []
 
         self.mock_ansible_module.params = deepcopy(PARAMS_LIG_TEMPLATE_WITH_MAP)
 
@@ -438,7 +499,11 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
 
     def test_should_fail_when_uplinkset_network_set_not_found(self):
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.network_sets.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            x for x in INDEX_RESOURCES if x['category'] != 'network-sets']
+        self.mock_ov_client.ethernet_networks.get_by.return_value = []
+        self.mock_ov_client.fc_networks.get_by.return_value = []
+        self.mock_ov_client.network_sets.get_by.return_value = []
 
         self.mock_ansible_module.params = deepcopy(PARAMS_LIG_TEMPLATE_WITH_MAP)
 
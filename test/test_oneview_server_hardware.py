@@ -21,7 +21,7 @@ import pytest
 import yaml
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import ServerHardwareModule
+from oneview_module_loader import ServerHardwareModule, OneViewModuleException
 
 FAKE_MSG_ERROR = 'Fake message error'
 
@@ -256,6 +256,65 @@ class TestServerHardwareModule(OneViewBaseTest):
             ansible_facts=dict(server_hardware={"name": "name"})
         )
 
+    def test_should_set_power_state_of_the_server_hardware_matched_by_the_filter(self):
+        server_hardwares = [dict(name='bay 1', uri='/rest/server-hardware/1', powerState='On', locationUri='/rest/enclosures/1'),
+                            dict(name='bay 2', uri='/rest/server-hardware/2', powerState='Off', locationUri='/rest/enclosures/1'),
+                            dict(name='bay 3', uri='/rest/server-hardware/3', powerState='On', locationUri='/rest/enclosures/2')]
+        self.resource.get_all.return_value = server_hardwares
+        self.mock_ov_client.connection.put.return_value = (None, {})
+        power_state_data = dict(powerState='Off', powerControl='PressAndHold')
+        self.mock_ansible_module.params = dict(config='config.json', state='power_state_set', max_workers=8, max_per_enclosure=1,
+                                               data=dict(filter="powerState='On'", powerStateData=power_state_data))
+
+        ServerHardwareModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter="powerState='On'")
+        assert sorted(self.mock_ov_client.connection.put.call_args_list) == [
+            mock.call('/rest/server-hardware/1/powerState', power_state_data),
+            mock.call('/rest/server-hardware/3/powerState', power_state_data)]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ServerHardwareModule.MSG_POWER_STATES_UPDATED.format(2),
+            ansible_facts=dict(server_hardware_power_results=[
+                dict(name='bay 1', uri='/rest/server-hardware/1', changed=True, failed=False, batch=1,
+                     msg=ServerHardwareModule.MSG_POWER_STATE_UPDATED),
+                dict(name='bay 2', uri='/rest/server-hardware/2', changed=False, failed=False, batch=1,
+                     msg=ServerHardwareModule.MSG_POWER_STATE_ALREADY_SET),
+                dict(name='bay 3', uri='/rest/server-hardware/3', changed=True, failed=False, batch=1,
+                     msg=ServerHardwareModule.MSG_POWER_STATE_UPDATED)])
+        )
+
+    def test_should_not_start_the_next_batches_when_a_power_state_change_fails(self):
+        self.resource.get_all.return_value = [dict(name='bay 1', uri='/rest/server-hardware/1', powerState='On'),
+                                              dict(name='bay 2', uri='/rest/server-hardware/2', powerState='On')]
+        self.mock_ov_client.connection.put.side_effect = OneViewModuleException(FAKE_MSG_ERROR)
+        self.mock_ansible_module.params = dict(config='config.json', state='power_state_set', max_workers=8, batch_size=1,
+                                               data=dict(names=['bay 1', 'bay 2'],
+                                                         powerStateData=dict(powerState='On', powerControl='ColdBoot')))
+
+        ServerHardwareModule().run()
+
+        self.mock_ov_client.connection.put.assert_called_once()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            changed=False,
+            msg=ServerHardwareModule.MSG_POWER_STATES_FAILED.format(1),
+            ansible_facts=dict(server_hardware_power_results=[
+                dict(name='bay 1', uri='/rest/server-hardware/1', changed=False, failed=True, batch=1, msg=FAKE_MSG_ERROR),
+                dict(name='bay 2', uri='/rest/server-hardware/2', changed=False, failed=False, batch=2,
+                     msg=ServerHardwareModule.MSG_NOT_STARTED)])
+        )
+
+    def test_should_fail_when_a_server_hardware_name_was_not_found(self):
+        self.resource.get_all.return_value = [dict(name='bay 1', uri='/rest/server-hardware/1')]
+        self.mock_ansible_module.params = dict(config='config.json', state='power_state_set', max_workers=8,
+                                               data=dict(names=['bay 1', 'bay 9'],
+                                                         powerStateData=dict(powerState='On', powerControl='MomentaryPress')))
+
+        ServerHardwareModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerHardwareModule.MSG_SERVER_HARDWARE_NAME_NOT_FOUND.format('bay 9'))
+
     def test_should_fail_when_set_power_state_and_server_hardware_was_not_found(self):
         self.resource.get_by_name.return_value = None
 
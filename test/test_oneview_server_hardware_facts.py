@@ -16,6 +16,8 @@
 # limitations under the License.
 ###
 
+import json
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
@@ -67,6 +69,23 @@ PARAMS_WITH_ALL_FIRMWARES_WITH_FILTERS = dict(
 
 @pytest.mark.resource(TestServerHardwareFactsModule='server_hardware')
 class TestServerHardwareFactsModule(OneViewBaseFactsTest):
+    def test_should_write_all_server_hardware_to_output_file_page_by_page(self, tmpdir):
+        output_file = str(tmpdir.join('server_hardware.jsonl'))
+        self.resource.get_all.side_effect = [[dict(name='SH1'), dict(name='SH2')], [dict(name='SH3')]]
+        self.mock_ansible_module.params = dict(config='config.json', name=None,
+                                               params=dict(fields='name', page_size=2, output_file=output_file))
+
+        ServerHardwareFactsModule().run()
+
+        self.resource.get_all.assert_any_call(start=0, count=2, fields='name')
+        self.resource.get_all.assert_called_with(start=2, count=2, fields='name')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_hardwares=[], facts_output=dict(path=output_file, count=3))
+        )
+        with open(output_file) as lines:
+            assert [json.loads(line) for line in lines] == [dict(name='SH1'), dict(name='SH2'), dict(name='SH3')]
+
     def test_should_get_all_server_hardware(self):
         self.resource.get_all.return_value = {"name": "Server Hardware Name"}
         self.mock_ansible_module.params = PARAMS_GET_ALL
@@ -127,6 +146,89 @@ class TestServerHardwareFactsModule(OneViewBaseFactsTest):
                            'server_hardware_firmware': {'subresource': 'firmware'}}
         )
 
+    def test_should_get_server_hardware_options_concurrently(self):
+        self.resource.data = [{"name": "Server Hardware Name", "uri": "res_uri"}]
+        self.resource.get_bios.return_value = {'subresource': 'bios'}
+        self.resource.get_firmware.return_value = {'subresource': 'firmware'}
+        self.mock_ansible_module.params = dict(config='config.json', name="Test Server Hardware",
+                                               options=['bios', 'firmware'], max_workers=2, request_timeout=30)
+
+        ServerHardwareFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts={'server_hardwares': [{'name': 'Server Hardware Name', 'uri': 'res_uri'}],
+                           'server_hardware_bios': {'subresource': 'bios'},
+                           'server_hardware_firmware': {'subresource': 'firmware'}}
+        )
+
+    def test_should_get_options_of_all_the_server_hardware_matched_by_the_params(self):
+        server_hardwares = [dict(name='Server 1', uri='/rest/server-hardware/1'),
+                            dict(name='Server 2', uri='/rest/server-hardware/2')]
+        self.resource.get_all.return_value = server_hardwares
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            data=data,
+            get_bios=mock.Mock(return_value={'bios': data['name']}),
+            get_utilization=mock.Mock(return_value={'utilization': data['name']}))
+        self.mock_ansible_module.params = dict(config='config.json', params=dict(filter="powerState='Off'"),
+                                               options=['bios', 'utilization'], max_workers=4)
+
+        ServerHardwareFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter="powerState='Off'")
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts={'server_hardwares': server_hardwares,
+                           'server_hardware_options': {
+                               '/rest/server-hardware/1': {'server_hardware_bios': {'bios': 'Server 1'},
+                                                           'server_hardware_utilization': {'utilization': 'Server 1'}},
+                               '/rest/server-hardware/2': {'server_hardware_bios': {'bios': 'Server 2'},
+                                                           'server_hardware_utilization': {'utilization': 'Server 2'}}}}
+        )
+
+    def test_should_get_options_of_each_page_written_to_the_output_file(self, tmpdir):
+        output_file = str(tmpdir.join('server_hardware.jsonl'))
+        self.resource.get_all.side_effect = [[dict(name='Server 1', uri='/rest/server-hardware/1'),
+                                              dict(name='Server 2', uri='/rest/server-hardware/2')],
+                                             [dict(name='Server 3', uri='/rest/server-hardware/3')]]
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            data=data, get_bios=mock.Mock(return_value={'bios': data['name']}))
+        self.mock_ansible_module.params = dict(config='config.json', options=['bios'],
+                                               params=dict(page_size=2, output_file=output_file))
+
+        ServerHardwareFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts={'server_hardwares': [],
+                           'facts_output': dict(path=output_file, count=3),
+                           'server_hardware_options': {
+                               '/rest/server-hardware/1': {'server_hardware_bios': {'bios': 'Server 1'}},
+                               '/rest/server-hardware/2': {'server_hardware_bios': {'bios': 'Server 2'}},
+                               '/rest/server-hardware/3': {'server_hardware_bios': {'bios': 'Server 3'}}}}
+        )
+
+    def test_should_write_the_utilization_samples_to_the_output_file(self, tmpdir):
+        output_file = str(tmpdir.join('utilization.csv'))
+        self.resource.data = {"name": "Server Hardware Name", "uri": "/rest/server-hardware/1"}
+        self.resource.get_utilization.return_value = dict(metricList=[
+            dict(metricName='AveragePower', metricSamples=[[1464578400000, 301], [1464578700000, 302]])])
+        self.mock_ansible_module.params = dict(config='config.json', name="Server Hardware Name",
+                                               options=[dict(utilization=dict(fields='AveragePower',
+                                                                              output_file=output_file))])
+
+        ServerHardwareFactsModule().run()
+        ServerHardwareFactsModule().run()
+
+        self.resource.get_utilization.assert_called_with(fields='AveragePower', filter=['startDate=2016-05-30T03:25:00.001Z'],
+                                                         refresh=None, view=None)
+        self.mock_ansible_module.exit_json.assert_called_with(
+            changed=False,
+            ansible_facts=dict(server_hardwares=self.resource.data,
+                               utilization_output=dict(path=output_file, count=0))
+        )
+        assert len(tmpdir.join('utilization.csv').readlines()) == 3
+
     def test_should_get_all_firmwares_across_the_servers(self):
         self.resource.get_all.return_value = []
         self.resource.get_all_firmwares.return_value = [{'subresource': 'firmware'}]
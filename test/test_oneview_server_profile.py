@@ -19,11 +19,14 @@ import mock
 import pytest
 
 from copy import deepcopy
+from hpeOneView.exceptions import HPEOneViewTaskError
 from hpe_test_utils import OneViewBaseTest
 from oneview_module_loader import (ServerProfileModule,
                                    OneViewModuleException,
                                    OneViewModuleTaskError,
                                    SPKeys,
+                                   ServerHardwareAllocator,
+                                   SERVER_PROFILE_COMPARISON_RULES,
                                    ServerProfileMerger,
                                    ServerProfileReplaceNamesByUris)
 
@@ -248,6 +251,7 @@ class TestServerProfileModule(OneViewBaseTest):
     @pytest.fixture(autouse=True)
     def specific_set_up(self):
         self.mock_ov_client.api_version = 1000
+        self.mock_ov_client.connection.put.return_value = (None, {})
         self.sleep_patch = mock.patch('time.sleep')
         self.sleep_patch.start()
         self.sleep_patch.return_value = None
@@ -281,6 +285,25 @@ class TestServerProfileModule(OneViewBaseTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False, msg=ServerProfileModule.MSG_ALREADY_COMPLIANT, ansible_facts=mock_facts)
 
+    def test_should_update_when_not_compliant_and_only_the_uri_is_provided(self):
+        fake_server = deepcopy(CREATED_BASIC_PROFILE)
+        fake_server['templateCompliance'] = 'NonCompliant'
+
+        self.resource.data = fake_server
+        self.resource.get_by_uri.return_value = self.resource
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ansible_module.params = dict(config='config.json', state='compliant',
+                                               data=dict(uri=CREATED_BASIC_PROFILE['uri']))
+
+        ServerProfileModule().run()
+
+        self.resource.get_by_uri.assert_called_once_with(CREATED_BASIC_PROFILE['uri'])
+        self.resource.patch.assert_called_once_with('replace', '/templateCompliance', 'Compliant')
+        self.resource.get_all.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True, msg=ServerProfileModule.MSG_REMEDIATED_COMPLIANCE, ansible_facts=mock.ANY)
+
     def test_should_update_when_not_compliant(self):
         fake_server = deepcopy(CREATED_BASIC_PROFILE)
         fake_server['templateCompliance'] = 'NonCompliant'
@@ -306,7 +329,6 @@ class TestServerProfileModule(OneViewBaseTest):
         fake_server['templateCompliance'] = 'NonCompliant'
 
         self.resource.data = fake_server
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ov_client.server_hardware.data = {}
         self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
 
@@ -321,11 +343,12 @@ class TestServerProfileModule(OneViewBaseTest):
         self.resource.patch.assert_called_once_with(
             'replace', '/templateCompliance', 'Compliant')
 
+        power_state_uri = fake_server['serverHardwareUri'] + '/powerState'
         power_set_calls = [
-            mock.call(dict(powerState='Off', powerControl='PressAndHold')),
-            mock.call(dict(powerState='On', powerControl='MomentaryPress'))]
+            mock.call(power_state_uri, dict(powerState='Off', powerControl='PressAndHold')),
+            mock.call(power_state_uri, dict(powerState='On', powerControl='MomentaryPress'))]
 
-        self.mock_ov_client.server_hardware.update_power_state.assert_has_calls(power_set_calls)
+        assert self.mock_ov_client.connection.put.call_args_list == power_set_calls
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True, msg=ServerProfileModule.MSG_REMEDIATED_COMPLIANCE, ansible_facts=mock_facts)
@@ -502,7 +525,6 @@ class TestServerProfileModule(OneViewBaseTest):
         self.mock_ov_client.server_profile_templates.data = template
         self.mock_ov_client.server_profile_templates.get_by_name.return_value = self.mock_ov_client.server_profile_templates
         self.mock_ov_client.server_profile_templates.get_new_profile.return_value = profile_from_template
-        self.resource.server_hardware.update_power_state.return_value = {}
         self.mock_ov_client.server_hardware.data = {}
         self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
         self.mock_ansible_module.params = param_for_present
@@ -540,7 +562,6 @@ class TestServerProfileModule(OneViewBaseTest):
         self.mock_ov_client.api_version = 1200
         self.mock_ov_client.server_profile_templates.get_by_uri.return_value = self.mock_ov_client.server_profile_templates
         self.mock_ov_client.server_profile_templates.get_new_profile.return_value = profile_from_template
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ov_client.server_hardware.data = {}
         self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
 
@@ -717,6 +738,54 @@ class TestServerProfileModule(OneViewBaseTest):
 
         self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=ServerProfileModule.MSG_ERROR_ALLOCATE_SERVER_HARDWARE)
 
+    def test_should_select_another_hardware_when_the_selected_one_was_assigned_meanwhile(self):
+        self.resource.get_by_name.return_value = None
+        self.resource.data = CREATED_BASIC_PROFILE
+        self.resource.create.side_effect = [TASK_ERROR, self.resource]
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
+        self.mock_ov_client.api_version = 1200
+
+        ServerProfileModule().run()
+
+        assigned_uris = [call[0][0]['serverHardwareUri'] for call in self.resource.create.call_args_list]
+        assert assigned_uris == [AVAILABLE_SERVERS[1]['serverHardwareUri'], AVAILABLE_SERVERS[2]['serverHardwareUri']]
+
+    def test_should_select_another_hardware_when_the_sdk_task_fails_to_assign_the_selected_one(self):
+        self.resource.get_by_name.return_value = None
+        self.resource.data = CREATED_BASIC_PROFILE
+        self.resource.create.side_effect = [HPEOneViewTaskError(FAKE_MSG_ERROR, 'AssignProfileToDeviceBayError'),
+                                            self.resource]
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
+        self.mock_ov_client.api_version = 1200
+
+        with mock.patch('time.sleep'):
+            ServerProfileModule().run()
+
+        assigned_uris = [call[0][0]['serverHardwareUri'] for call in self.resource.create.call_args_list]
+        assert assigned_uris == [AVAILABLE_SERVERS[1]['serverHardwareUri'], AVAILABLE_SERVERS[2]['serverHardwareUri']]
+
+    def test_should_select_hardware_by_profile_name_hash(self):
+        self.resource.get_by_name.return_value = None
+        self.resource.data = CREATED_BASIC_PROFILE
+        self.resource.create.return_value = self.resource
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ansible_module.params = dict(deepcopy(PARAMS_FOR_PRESENT), server_hardware_selection='hash')
+        self.mock_ov_client.api_version = 1200
+
+        ServerProfileModule().run()
+
+        expected_uri = ServerHardwareAllocator('hash').rank(
+            SERVER_PROFILE_NAME, [server['serverHardwareUri'] for server in AVAILABLE_SERVERS])[0]
+        assert self.resource.create.call_args[0][0]['serverHardwareUri'] == expected_uri
+
     def test_should_stop_trying_create_when_unexpected_error_code_is_raised(self):
         self.resource.get_by_name.return_value = None
         self.resource.create.side_effect = OneViewModuleTaskError(msg=FAKE_MSG_ERROR, error_code='unexpected')
@@ -798,7 +867,6 @@ class TestServerProfileModule(OneViewBaseTest):
         self.resource.create.return_value = self.resource
         self.mock_ov_client.server_profiles.get_available_servers.return_value = []
         self.mock_ov_client.server_hardware.get_by_uri.return_value = None
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ov_client.api_version = 1200
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
         mock_facts = gather_facts(self.mock_ov_client, created=True)
@@ -807,7 +875,7 @@ class TestServerProfileModule(OneViewBaseTest):
         ServerProfileModule().run()
 
         self.resource.create.assert_called_once_with(deepcopy(BASIC_PROFILE))
-        power_set_calls = self.mock_ov_client.server_hardware.update_power_state.call_count
+        power_set_calls = self.mock_ov_client.connection.put.call_count
         assert(0 == power_set_calls)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
@@ -886,10 +954,14 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn_1, conn_2, conn_3, conn_4, conn_5]
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/15')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(name='FC Network', category='fc-networks', uri='/rest/fc-networks/14'),
+            dict(name='FCoE Network', category='fcoe-networks', uri='/rest/fcoe-networks/16'),
+            dict(name='Network Set', category='network-sets', uri='/rest/network-sets/15'),
+            dict(name='Ethernet Network', category='ethernet-networks', uri='/rest/ethernet-networks/18')]
+        # The networks found in the index are not in their collections under the other categories
+        for resource_client in ('fc_networks', 'fcoe_networks', 'network_sets', 'ethernet_networks'):
+            getattr(self.mock_ov_client, resource_client).get_by.return_value = []
         self.mock_ansible_module.params = deepcopy(params)
         self.mock_ov_client.api_version = 1200
 
@@ -911,10 +983,11 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn]
 
         self.resource.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.return_value = []
         self.mock_ov_client.fc_networks.get_by.return_value = []
         self.mock_ov_client.fcoe_networks.get_by.return_value = []
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
         self.mock_ov_client.network_sets.get_by.return_value = []
+        self.mock_ov_client.ethernet_networks.get_by.return_value = []
         self.mock_ansible_module.params = deepcopy(params)
 
         ServerProfileModule().run()
@@ -967,7 +1040,7 @@ class TestServerProfileModule(OneViewBaseTest):
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeUri": "/rest/storage-volumes/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.volumes.get_by.side_effect = [[volume1], [volume2]]
+        self.mock_ov_client.volumes.get_all.return_value = [volume1, volume2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1046,7 +1119,7 @@ class TestServerProfileModule(OneViewBaseTest):
                                                                "volumeStoragePoolUri": "/rest/storage-pools/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.storage_pools.get_by.side_effect = [[pool1], [pool2]]
+        self.mock_ov_client.storage_pools.get_all.return_value = [pool1, pool2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1143,7 +1216,7 @@ class TestServerProfileModule(OneViewBaseTest):
                                                           "volumeStorageSystemUri": "/rest/storage-systems/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.storage_systems.get_by.side_effect = [[storage_system1], [storage_system2]]
+        self.mock_ov_client.storage_systems.get_all.return_value = [storage_system1, storage_system2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1268,7 +1341,7 @@ class TestServerProfileModule(OneViewBaseTest):
         expected['connections'][1] = {"id": 2, "interconnectUri": "/rest/interconnects/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.interconnects.get_by.side_effect = [[interconnect1], [interconnect2]]
+        self.mock_ov_client.interconnects.get_all.return_value = [interconnect1, interconnect2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1403,7 +1476,7 @@ class TestServerProfileModule(OneViewBaseTest):
         expected['localStorage']['sasLogicalJBODs'][1] = {"id": 2, "sasLogicalJBODUri": "/rest/sas-logical-jbods/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.sas_logical_jbods.get_by.side_effect = [[sas_logical_jbod1], [sas_logical_jbod2]]
+        self.mock_ov_client.sas_logical_jbods.get_all.return_value = [sas_logical_jbod1, sas_logical_jbod2]
 
         self.mock_ansible_module.params = params
         self.mock_ov_client.api_version = 1200
@@ -1638,7 +1711,6 @@ class TestServerProfileModule(OneViewBaseTest):
         mock_resource_compare.return_value = False
 
         self.resource.data = deepcopy(BASIC_PROFILE)
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
         self.mock_ov_client.api_version = 1200
 
@@ -1656,7 +1728,6 @@ class TestServerProfileModule(OneViewBaseTest):
 
         self.resource.data = fake_profile_data
         self.resource.update.side_effect = [OneViewModuleException(power_on_msg), CREATED_BASIC_PROFILE]
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ov_client.server_hardware.data = {}
         self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
@@ -1664,14 +1735,67 @@ class TestServerProfileModule(OneViewBaseTest):
 
         ServerProfileModule().run()
 
+        power_state_uri = SERVER_HARDWARE_TEMPLATE_URI + '/powerState'
         power_set_calls = [
-            mock.call(dict(powerState='Off', powerControl='PressAndHold')),
-            mock.call(dict(powerState='On', powerControl='MomentaryPress'))]
-        self.mock_ov_client.server_hardware.update_power_state.assert_has_calls(power_set_calls)
+            mock.call(power_state_uri, dict(powerState='Off', powerControl='PressAndHold')),
+            mock.call(power_state_uri, dict(powerState='On', powerControl='MomentaryPress'))]
+        assert self.mock_ov_client.connection.put.call_args_list == power_set_calls
 
         assert self.resource.update.mock_calls == [
             mock.call(fake_profile_data), mock.call(fake_profile_data)]
 
+    @mock.patch('oneview_server_profile.compare')
+    def test_should_power_off_old_and_new_hardware_before_reassigning(self, mock_resource_compare):
+        old_hardware_uri = '/rest/server-hardware/old'
+        profile_data = deepcopy(BASIC_PROFILE)
+        profile_data['serverHardwareUri'] = old_hardware_uri
+        power_on_msg = 'Some server profile attributes cannot be changed while the server hardware is powered on.'
+
+        mock_resource_compare.return_value = False
+
+        self.resource.data = profile_data
+        self.resource.update.side_effect = [OneViewModuleException(power_on_msg), CREATED_BASIC_PROFILE]
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        params = deepcopy(PARAMS_FOR_PRESENT)
+        params['data']['serverHardwareUri'] = SERVER_HARDWARE_TEMPLATE_URI
+        self.mock_ansible_module.params = params
+        self.mock_ov_client.api_version = 1200
+
+        ServerProfileModule().run()
+
+        power_off = dict(powerState='Off', powerControl='PressAndHold')
+        power_off_calls = self.mock_ov_client.connection.put.call_args_list[:2]
+        assert sorted(power_off_calls) == sorted([mock.call(old_hardware_uri + '/powerState', power_off),
+                                                  mock.call(SERVER_HARDWARE_TEMPLATE_URI + '/powerState', power_off)])
+        assert self.resource.update.call_count == 2
+
+    def test_should_wait_for_power_tasks_with_backoff(self):
+        sh_uri = '/rest/server-hardware/37333036-3831-76jh-4831-303658389766'
+        profile_data = deepcopy(BASIC_PROFILE)
+        profile_data['serverHardwareUri'] = sh_uri
+        running_task = dict(uri='/rest/tasks/1', name='Power off', taskState='Running')
+
+        self.resource.data = profile_data
+        self.mock_ov_client.connection.put.return_value = (running_task, {})
+        self.mock_ov_client.connection.get.side_effect = [running_task, dict(running_task, taskState='Completed')]
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_ABSENT)
+
+        ServerProfileModule().run()
+
+        assert self.mock_ov_client.connection.get.call_args_list == [mock.call('/rest/tasks/1')] * 2
+        self.resource.delete.assert_called_once_with()
+
+    def test_should_pass_task_timeout_to_profile_operations(self):
+        profile_data = deepcopy(BASIC_PROFILE)
+
+        self.resource.data = profile_data
+        self.mock_ansible_module.params = dict(deepcopy(PARAMS_FOR_ABSENT), task_timeout=600)
+
+        ServerProfileModule().run()
+
+        self.resource.delete.assert_called_once_with(timeout=600)
+
     @mock.patch('oneview_server_profile.compare')
     def test_should_return_error_during_update_when_unrelated_to_power(self, mock_resource_compare):
         fake_profile_data = deepcopy(BASIC_PROFILE)
@@ -1681,7 +1805,6 @@ class TestServerProfileModule(OneViewBaseTest):
 
         self.resource.data = fake_profile_data
         self.resource.update.side_effect = OneViewModuleException('test')
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
         self.mock_ov_client.api_version = 1200
 
@@ -1724,7 +1847,7 @@ class TestServerProfileModule(OneViewBaseTest):
 
         ServerProfileModule().run()
 
-        self.mock_ov_client.server_hardware.update_power_state.not_been_called()
+        self.mock_ov_client.connection.put.assert_not_called()
 
     @mock.patch('oneview_server_profile.compare')
     def test_fail_when_informed_template_not_exist_for_update(self, mock_resource_compare):
@@ -1775,7 +1898,6 @@ class TestServerProfileModule(OneViewBaseTest):
         server_profile['serverHardwareUri'] = None
         self.resource.data = server_profile
         self.resource.update.return_value = CREATED_BASIC_PROFILE
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
         self.mock_ov_client.api_version = 1200
 
@@ -1790,7 +1912,6 @@ class TestServerProfileModule(OneViewBaseTest):
         merged_data = dict(name="merged data")
         self.resource.data = server_profile
         self.resource.update.return_value = CREATED_BASIC_PROFILE
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
         self.mock_ov_client.api_version = 1200
 
@@ -1798,7 +1919,8 @@ class TestServerProfileModule(OneViewBaseTest):
 
         ServerProfileModule().run()
 
-        mock_resource_compare.assert_called_once_with(server_profile, merged_data)
+        mock_resource_compare.assert_called_once_with(server_profile, merged_data,
+                                                      rules=SERVER_PROFILE_COMPARISON_RULES)
 
     @mock.patch('oneview_server_profile.compare')
     def test_should_replace_os_deployment_name_by_uri_on_update(self, mock_resource_compare):
@@ -1874,10 +1996,14 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn_1, conn_2, conn_3, conn_4, conn_5]
 
         self.resource.data = deepcopy(BASIC_PROFILE)
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/20')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(name='FC Network', category='fc-networks', uri='/rest/fc-networks/14'),
+            dict(name='FCoE Network', category='fcoe-networks', uri='/rest/fcoe-networks/16'),
+            dict(name='Network set', category='network-sets', uri='/rest/network-sets/20'),
+            dict(name='Ethernet Network', category='ethernet-networks', uri='/rest/ethernet-networks/18')]
+        # The networks found in the index are not in their collections under the other categories
+        for resource_client in ('fc_networks', 'fcoe_networks', 'network_sets', 'ethernet_networks'):
+            getattr(self.mock_ov_client, resource_client).get_by.return_value = []
         self.mock_ansible_module.params = deepcopy(params)
         self.mock_ov_client.api_version = 1200
 
@@ -1899,10 +2025,11 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn]
 
         self.resource.data = deepcopy(BASIC_PROFILE)
+        self.mock_ov_client.index_resources.get_all.return_value = []
         self.mock_ov_client.fc_networks.get_by.return_value = []
         self.mock_ov_client.fcoe_networks.get_by.return_value = []
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
         self.mock_ov_client.network_sets.get_by.return_value = []
+        self.mock_ov_client.ethernet_networks.get_by.return_value = []
         self.mock_ansible_module.params = deepcopy(params)
         self.mock_ov_client.api_version = 1200
 
@@ -2052,7 +2179,6 @@ class TestServerProfileModule(OneViewBaseTest):
 
     def test_should_do_nothing_when_server_hardware_already_absent(self):
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
 
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_ABSENT)
         self.mock_ov_client.api_version = 1200
@@ -2074,15 +2200,14 @@ class TestServerProfileModule(OneViewBaseTest):
         self.resource.data = profile_data
         hardware = self.mock_ov_client.server_hardware
         self.mock_ov_client.server_hardware.get_by_uri.return_value = hardware
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
 
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_ABSENT)
         self.mock_ov_client.api_version = 1200
 
         ServerProfileModule().run()
 
-        hardware.update_power_state.assert_called_once_with(
-            {'powerControl': 'PressAndHold', 'powerState': 'Off'})
+        self.mock_ov_client.connection.put.assert_called_once_with(
+            sh_uri + '/powerState', {'powerControl': 'PressAndHold', 'powerState': 'Off'})
 
         self.resource.delete.assert_called_once_with()
 
@@ -2101,7 +2226,7 @@ class TestServerProfileModule(OneViewBaseTest):
 
         ServerProfileModule().run()
 
-        times_power_off_was_called = self.mock_ov_client.server_hardware.update_power_state.call_count
+        times_power_off_was_called = self.mock_ov_client.connection.put.call_count
         assert(0 == times_power_off_was_called)
 
         self.resource.delete.assert_called_once_with()
@@ -2154,7 +2279,6 @@ class TestServerProfileModule(OneViewBaseTest):
         self.resource.data = deepcopy(CREATED_BASIC_PROFILE)
 
         self.mock_ov_client.server_hardware.get_by_uri.return_value = None
-        self.mock_ov_client.server_hardware.update_power_state.return_value = {}
         self.mock_ov_client.api_version = 1200
         self.mock_ansible_module.params = deepcopy(params_for_unassign)
 
@@ -2194,6 +2318,250 @@ class TestServerProfileModule(OneViewBaseTest):
 
         self.resource.update.assert_called_once_with(sp_exit_value)
 
+    def set_bulk_params(self, *profiles):
+        self.mock_ansible_module.params = dict(
+            config='config.json', state='present', auto_assign_server_hardware=True, max_workers=4,
+            data=dict(serverProfileTemplateName='Template', initialScopeUris=[SCOPE_URI], profiles=list(profiles)))
+        self.mock_ov_client.api_version = 1200
+
+        template = mock.Mock()
+        template.data = dict(uri='/rest/server-profile-templates/1', enclosureGroupUri=ENCLOSURE_GROUP_URI,
+                             serverHardwareTypeUri=SERVER_HARDWARE_TEMPLATE_URI)
+        template.get_new_profile.return_value = dict(serverProfileTemplateUri='/rest/server-profile-templates/1',
+                                                     serverHardwareTypeUri=SERVER_HARDWARE_TEMPLATE_URI)
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value = template
+        self.resource.get_by.return_value = []
+        self.resource.get_all.return_value = []
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.resource.create.side_effect = lambda data, **kwargs: mock.Mock(
+            data=dict(data, uri='/rest/server-profiles/' + data['name']))
+
+    def get_bulk_results(self):
+        # The failures are reported with fail_json, carrying the same results
+        call_args = self.mock_ansible_module.fail_json.call_args or self.mock_ansible_module.exit_json.call_args
+        return call_args[1]['ansible_facts']['server_profiles_results']
+
+    def test_should_create_profiles_from_template_with_distinct_hardware(self):
+        self.set_bulk_params('Profile 1', dict(name='Profile 2', description='Second'), 'Profile 3')
+        self.resource.get_all.return_value = [dict(name='Profile 3', uri='/rest/server-profiles/3')]
+
+        ServerProfileModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter='"name=\'Profile 1\' OR name=\'Profile 2\' OR name=\'Profile 3\'"')
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value.get_new_profile.assert_called_once_with()
+        self.resource.get_available_servers.assert_called_once_with(
+            serverHardwareTypeUri=SERVER_HARDWARE_TEMPLATE_URI, enclosureGroupUri=ENCLOSURE_GROUP_URI, scopeUris=SCOPE_URI)
+
+        created_profiles = sorted((call[0][0] for call in self.resource.create.call_args_list), key=lambda p: p['name'])
+        assert [p['name'] for p in created_profiles] == ['Profile 1', 'Profile 2']
+        assert created_profiles[1]['description'] == 'Second'
+        assert created_profiles[0]['serverProfileTemplateUri'] == '/rest/server-profile-templates/1'
+        assert created_profiles[0]['serverHardwareUri'] != created_profiles[1]['serverHardwareUri']
+        assert self.mock_ov_client.connection.put.call_count == 2
+
+        results = self.get_bulk_results()
+        assert [(r['name'], r['created'], r['failed']) for r in results] == [
+            ('Profile 1', True, False), ('Profile 2', True, False), ('Profile 3', False, False)]
+        assert results[2]['msg'] == ServerProfileModule.MSG_ALREADY_PRESENT
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ServerProfileModule.MSG_PROFILES_CREATED.format(2),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_report_failed_profiles_after_creating_all(self):
+        def create(data, **kwargs):
+            if data['name'] == 'Profile 1':
+                raise OneViewModuleTaskError(msg=FAKE_MSG_ERROR, error_code='unexpected')
+            return mock.Mock(data=dict(data, uri='/rest/server-profiles/2'))
+
+        self.set_bulk_params('Profile 1', 'Profile 2')
+        self.resource.create.side_effect = create
+
+        ServerProfileModule().run()
+
+        results = self.get_bulk_results()
+        assert results[0]['failed'] and results[0]['msg'] == FAKE_MSG_ERROR
+        assert results[1]['created'] and results[1]['uri'] == '/rest/server-profiles/2'
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            changed=True,
+            msg=ServerProfileModule.MSG_PROFILES_FAILED.format(1),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_select_another_hardware_for_bulk_profile_when_assigned_meanwhile(self):
+        created = mock.Mock(data=dict(name='Profile 1', uri='/rest/server-profiles/1'))
+        self.set_bulk_params('Profile 1')
+        self.resource.create.side_effect = [TASK_ERROR, created]
+
+        ServerProfileModule().run()
+
+        assigned_uris = [call[0][0]['serverHardwareUri'] for call in self.resource.create.call_args_list]
+        assert assigned_uris == [AVAILABLE_SERVERS[1]['serverHardwareUri'], AVAILABLE_SERVERS[2]['serverHardwareUri']]
+        assert self.get_bulk_results()[0]['created']
+
+    def test_should_select_another_hardware_for_bulk_profile_when_the_sdk_task_fails_to_assign_it(self):
+        created = mock.Mock(data=dict(name='Profile 1', uri='/rest/server-profiles/1'))
+        self.set_bulk_params('Profile 1')
+        self.resource.create.side_effect = [HPEOneViewTaskError(FAKE_MSG_ERROR, 'AssignProfileToDeviceBayError'),
+                                            created]
+
+        with mock.patch('time.sleep'):
+            ServerProfileModule().run()
+
+        assigned_uris = [call[0][0]['serverHardwareUri'] for call in self.resource.create.call_args_list]
+        assert assigned_uris == [AVAILABLE_SERVERS[1]['serverHardwareUri'], AVAILABLE_SERVERS[2]['serverHardwareUri']]
+        assert self.get_bulk_results()[0]['created']
+
+    def test_should_not_retry_the_server_hardware_given_for_a_bulk_profile(self):
+        self.set_bulk_params(dict(name='Profile 1', serverHardwareUri=FAKE_SERVER_HARDWARE['uri']))
+        self.resource.create.side_effect = TASK_ERROR
+
+        with mock.patch('time.sleep') as mock_sleep:
+            ServerProfileModule().run()
+
+        self.resource.create.assert_called_once()
+        mock_sleep.assert_not_called()
+        self.resource.get_available_servers.assert_not_called()
+        assert self.get_bulk_results()[0]['failed']
+
+    def test_should_resolve_server_hardware_names_of_bulk_profiles(self):
+        self.set_bulk_params(dict(name='Profile 1', serverHardwareName='Encl1, bay 1'))
+        self.mock_ov_client.server_hardware.get_by.return_value = [FAKE_SERVER_HARDWARE]
+
+        ServerProfileModule().run()
+
+        self.mock_ov_client.server_hardware.get_by.assert_called_once_with('name', 'Encl1, bay 1')
+        self.resource.get_available_servers.assert_not_called()
+        assert self.resource.create.call_args[0][0]['serverHardwareUri'] == FAKE_SERVER_HARDWARE['uri']
+        assert 'serverHardwareName' not in self.resource.create.call_args[0][0]
+
+    def test_should_fail_when_bulk_profile_has_no_name(self):
+        self.set_bulk_params('Profile 1', dict(description='No name'))
+
+        ServerProfileModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerProfileModule.MSG_PROFILE_NAME_MISSING)
+        self.resource.create.assert_not_called()
+
+    def set_template_compliance_params(self, profiles, offline_names, **params):
+        self.mock_ansible_module.params = dict(config='config.json', state='compliant', max_workers=2,
+                                               data=dict(serverProfileTemplateName='Template'), **params)
+        template = mock.Mock()
+        template.data = dict(uri='/rest/server-profile-templates/1')
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value = template
+        self.resource.get_all.return_value = profiles
+
+        self.profiles = {}
+
+        def new(connection, data):
+            profile = mock.Mock(data=data)
+            profile.get_compliance_preview.return_value = dict(isOnlineUpdate=data['name'] not in offline_names)
+            self.profiles[data['name']] = profile
+            return profile
+
+        self.resource.new.side_effect = new
+
+    def get_compliance_results(self):
+        # The failures are reported with fail_json, carrying the same results
+        call_args = self.mock_ansible_module.fail_json.call_args or self.mock_ansible_module.exit_json.call_args
+        return call_args[1]['ansible_facts']['compliance_results']
+
+    def test_should_remediate_template_profiles_in_waves_with_offline_budget(self):
+        profiles = [dict(name='Profile {0}'.format(index), uri='/rest/server-profiles/{0}'.format(index),
+                         serverHardwareUri='/rest/server-hardware/{0}'.format(index)) for index in range(1, 5)]
+        self.set_template_compliance_params(profiles, ['Profile 1', 'Profile 2'], max_offline=1)
+
+        ServerProfileModule().run()
+
+        self.resource.get_all.assert_called_once_with(
+            filter='"serverProfileTemplateUri=\'/rest/server-profile-templates/1\' AND templateCompliance=\'NonCompliant\'"')
+        results = self.get_compliance_results()
+        assert [(r['name'], r['wave'], r['online']) for r in results] == [
+            ('Profile 1', 1, False), ('Profile 3', 1, True), ('Profile 2', 2, False), ('Profile 4', 2, True)]
+        for profile in self.profiles.values():
+            profile.patch.assert_called_once_with('replace', '/templateCompliance', 'Compliant')
+
+        power_uris = sorted(call[0][0] for call in self.mock_ov_client.connection.put.call_args_list)
+        assert power_uris == ['/rest/server-hardware/1/powerState'] * 2 + ['/rest/server-hardware/2/powerState'] * 2
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ServerProfileModule.MSG_PROFILES_REMEDIATED.format(4),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_skip_template_profiles_with_offline_updates_when_max_offline_is_zero(self):
+        profiles = [dict(name='Profile {0}'.format(index), uri='/rest/server-profiles/{0}'.format(index),
+                         serverHardwareUri='/rest/server-hardware/{0}'.format(index)) for index in range(1, 4)]
+        self.set_template_compliance_params(profiles, ['Profile 1'], max_offline=0)
+
+        ServerProfileModule().run()
+
+        results = self.get_compliance_results()
+        assert [(r['name'], r['wave'], r['changed']) for r in results] == [
+            ('Profile 2', 1, True), ('Profile 3', 1, True), ('Profile 1', None, False)]
+        assert results[2]['msg'] == ServerProfileModule.MSG_OFFLINE_UPDATE_SKIPPED
+        self.profiles['Profile 1'].patch.assert_not_called()
+        self.mock_ov_client.connection.put.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ServerProfileModule.MSG_PROFILES_REMEDIATED.format(2),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_fail_to_make_template_profiles_compliant_with_negative_max_offline(self):
+        self.set_template_compliance_params([], [], max_offline=-1)
+
+        ServerProfileModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerProfileModule.MSG_INVALID_MAX_OFFLINE)
+        self.resource.get_all.assert_not_called()
+
+    def test_should_report_template_profiles_failed_to_remediate(self):
+        profiles = [dict(name='Profile 1', uri='/rest/server-profiles/1'),
+                    dict(name='Profile 2', uri='/rest/server-profiles/2')]
+        self.set_template_compliance_params(profiles, [])
+        failed_profile = mock.Mock(data=profiles[0])
+        failed_profile.get_compliance_preview.return_value = dict(isOnlineUpdate=True)
+        failed_profile.patch.side_effect = OneViewModuleException(FAKE_MSG_ERROR)
+        remediated_profile = mock.Mock(data=profiles[1])
+        remediated_profile.get_compliance_preview.return_value = dict(isOnlineUpdate=True)
+        self.resource.new.side_effect = [failed_profile, remediated_profile]
+
+        ServerProfileModule().run()
+
+        results = self.get_compliance_results()
+        assert results[0]['failed'] and results[0]['msg'] == FAKE_MSG_ERROR
+        assert results[1]['changed'] and not results[1]['failed']
+        self.mock_ov_client.connection.put.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            changed=True,
+            msg=ServerProfileModule.MSG_PROFILES_REMEDIATION_FAILED.format(1),
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_not_change_when_template_profiles_are_compliant(self):
+        self.set_template_compliance_params([], [])
+
+        ServerProfileModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ServerProfileModule.MSG_PROFILES_REMEDIATED.format(0),
+            ansible_facts=dict(compliance_results=[])
+        )
+
+    def test_should_fail_to_make_profiles_compliant_without_name_and_template(self):
+        self.mock_ansible_module.params = dict(config='config.json', state='compliant', max_workers=2,
+                                               data=dict(description='No name'))
+
+        ServerProfileModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerProfileModule.MSG_TEMPLATE_REQUIRED)
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
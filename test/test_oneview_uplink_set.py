@@ -30,13 +30,13 @@ LOGICAL_INTERCONNECT = dict(uri="/rest/logical-interconnects/0de81de6-6652-4861-
                             name='Name of the Logical Interconnect')
 
 ETHERNET = dict(uri="/rest/ethernet-networks/0de81de6-6652-4861-94f9-9104b2fd0d77",
-                name='EthernetNetwork')
+                name='EthernetNetwork', category='ethernet-networks')
 
 FCNETWORK = dict(uri="/rest/fc-networks/0de94de6-6652-4861-94f9-9c24b2fd0d87",
-                 name='FcNetwork')
+                 name='FcNetwork', category='fc-networks')
 
 FCOENETWORK = dict(uri="/rest/fcoe-networks/0de89de6-6652-4861-94f9-9c24b2fd0d99",
-                   name='FcoeNetwork')
+                   name='FcoeNetwork', category='fcoe-networks')
 
 EXISTENT_UPLINK_SETS = [
     dict(name=DEFAULT_UPLINK_NAME,
@@ -178,28 +178,15 @@ class TestUplinkSetModule(OneViewBaseTest):
         obj.data = UPLINK_SETS
         self.resource.create.return_value = obj
 
-        eth_obj = mock.Mock()
-        eth_obj.data = ETHERNET
-        self.mock_ov_client.ethernet_networks.get_by_name.return_value = eth_obj
-
-        fc_obj = mock.Mock()
-        fc_obj.data = FCNETWORK
-        self.mock_ov_client.fc_networks.get_by_name.return_value = fc_obj
-
-        fcoe_obj = mock.Mock()
-        fcoe_obj.data = FCOENETWORK
-        self.mock_ov_client.fcoe_networks.get_by_name.return_value = fcoe_obj
+        self.mock_ov_client.index_resources.get_all.return_value = [ETHERNET, FCNETWORK, FCOENETWORK]
 
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT_WITH_NETWORK_NAME)
 
         UplinkSetModule().run()
 
-        self.mock_ov_client.ethernet_networks.get_by_name.assert_called_once_with(
-            'EthernetNetwork')
-        self.mock_ov_client.fc_networks.get_by_name.assert_called_once_with(
-            'FcNetwork')
-        self.mock_ov_client.fcoe_networks.get_by_name.assert_called_once_with(
-            'FcoeNetwork')
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks', 'fc-networks', 'fcoe-networks'],
+            filter="\"name='EthernetNetwork' OR name='FcNetwork' OR name='FcoeNetwork'\"")
         self.resource.create.assert_called_once_with(PARAMS_FOR_PRESENT_WITH_NETWORK['data'])
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
@@ -208,6 +195,19 @@ class TestUplinkSetModule(OneViewBaseTest):
             ansible_facts=dict(uplink_set=UPLINK_SETS)
         )
 
+    def test_should_fail_when_network_not_found(self):
+        self.resource.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.return_value = [ETHERNET, FCOENETWORK]
+        self.mock_ov_client.ethernet_networks.get_by.return_value = []
+        self.mock_ov_client.fc_networks.get_by.return_value = []
+        self.mock_ov_client.fcoe_networks.get_by.return_value = []
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT_WITH_NETWORK_NAME)
+
+        UplinkSetModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=UplinkSetModule.MSG_NETWORK_NOT_FOUND + 'FcNetwork')
+
     def test_should_replace_logical_interconnect_name_by_uri(self):
         self.resource.get_by_name.return_value = None
         obj = mock.Mock()
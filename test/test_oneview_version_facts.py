@@ -16,10 +16,11 @@
 # limitations under the License.
 ###
 
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import VersionFactsModule
+from oneview_module_loader import VersionFactsModule, OneViewVersionCache, ONEVIEW_MODULE_UTILS_PATH
 
 PARAMS_GET = dict(
     config='config.json'
@@ -43,6 +44,32 @@ class TestVersionFactsModule(OneViewBaseTest):
             ansible_facts=dict(version=DICT_DEFAULT_VERSION)
         )
 
+    def test_should_get_version_from_cache(self, tmpdir):
+        version = dict(currentVersion=2800, minimumVersion=120)
+        OneViewVersionCache(str(tmpdir)).set_version('172.16.1.1', version)
+        self.mock_ov_client.connection.get_host.return_value = '172.16.1.1'
+        self.mock_ansible_module.params = dict(config='config.json', cache_dir=str(tmpdir))
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.create_oneview_client', return_value=self.mock_ov_client):
+            VersionFactsModule().run()
+
+        self.resource.get_version.not_been_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(version=version)
+        )
+
+    def test_should_store_version_in_cache(self, tmpdir):
+        version = dict(currentVersion=2800, minimumVersion=120)
+        self.resource.get_version.return_value = version
+        self.mock_ov_client.connection.get_host.return_value = '172.16.1.1'
+        self.mock_ansible_module.params = dict(config='config.json', cache_dir=str(tmpdir))
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.create_oneview_client', return_value=self.mock_ov_client):
+            VersionFactsModule().run()
+
+        assert OneViewVersionCache(str(tmpdir)).get_version('172.16.1.1') == version
+
 
 if __name__ == '__main__':
     pytest.main([__file__])